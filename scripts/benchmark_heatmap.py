@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the ledger keyword heatmap (POST /context/update_heatmap).
+
+Seeds a throwaway SQLite database with memories, tags and a warm heatmap, then
+times `update_heatmap` calls with a realistic handful of mentioned keywords.
+Runs four ways and checks they all end in the same memory scores:
+    - legacy: the original per-memory rescoring (one tag SELECT and one INSERT
+      per memory) on every call
+    - full rebuild: the set-based rebuild of heatmap_memories on every call
+    - incremental: keyword deltas propagated to the memories they tag
+    - lazy: ledger.heatmap_decay = "lazy"; only mentioned keywords are written and
+      memory scores are summed at read time (read latency is reported separately)
+
+Run from the repository root with the ledger's dependencies installed and a
+config at /app/config/config.json (the same environment the ledger runs in):
+
+    python scripts/benchmark_heatmap.py --memories 50000 --keywords 2000
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "services" / "ledger"))
+
+from app.setup import SCHEMA_SQL  # noqa: E402
+import app.services.context.heatmap as heatmap  # noqa: E402
+
+WEIGHTS = list(heatmap.DEFAULT_SCORES)
+_set_based_recalculate = heatmap._recalculate_memory_scores
+
+
+def seed_database(path: str, memories: int, keywords: int, tags_per_memory: int, seed: int) -> list:
+    rng = random.Random(seed)
+    words = [f"keyword{i}" for i in range(keywords)]
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode=WAL;")
+    conn.executescript(SCHEMA_SQL)
+    conn.executemany(
+        "INSERT INTO memories (id, memory, created_at) VALUES (?, ?, datetime('now'))",
+        ((f"mem-{i}", f"memory {i}") for i in range(memories)),
+    )
+    conn.executemany(
+        "INSERT OR IGNORE INTO memory_tags (memory_id, tag) VALUES (?, ?)",
+        ((f"mem-{i}", rng.choice(words)) for i in range(memories) for _ in range(tags_per_memory)),
+    )
+    # Start from a warm heatmap: every keyword present with a score well above MIN_SCORE
+    conn.executemany(
+        "INSERT INTO heatmap_score (keyword, score, last_updated) VALUES (?, ?, datetime('now'))",
+        ((word, rng.uniform(0.5, 2.0)) for word in words),
+    )
+    conn.commit()
+    conn.close()
+    return words
+
+
+async def _legacy_recalculate_memory_scores(cursor) -> int:
+    """The pre-delta rescoring loop, kept here as the benchmark baseline."""
+    cursor.execute("DELETE FROM heatmap_memories")
+    cursor.execute("SELECT keyword, score FROM heatmap_score")
+    keyword_scores = dict(cursor.fetchall())
+    if not keyword_scores:
+        return 0
+    cursor.execute("""
+        SELECT DISTINCT m.id, m.memory
+        FROM memories m
+        JOIN memory_tags mt ON m.id = mt.memory_id
+        WHERE mt.tag IN ({})
+    """.format(','.join('?' * len(keyword_scores))), list(keyword_scores.keys()))
+    memory_scores = {}
+    for memory_id, _ in cursor.fetchall():
+        cursor.execute("SELECT tag FROM memory_tags WHERE memory_id = ?", (memory_id,))
+        total_score = sum(keyword_scores.get(row[0], 0.0) for row in cursor.fetchall())
+        if total_score > 0:
+            memory_scores[memory_id] = total_score
+    for memory_id, score in memory_scores.items():
+        cursor.execute(
+            "INSERT INTO heatmap_memories (memory_id, score, last_updated) VALUES (?, ?, datetime('now'))",
+            (memory_id, score)
+        )
+    return len(memory_scores)
+
+
+async def memory_scores(path: str, mode: str) -> dict:
+    if mode == "lazy":
+        return {m["id"]: m["heatmap_score"] for m in await heatmap.get_top_memories_by_heatmap(10**9)}
+    conn = sqlite3.connect(path)
+    scores = dict(conn.execute("SELECT memory_id, score FROM heatmap_memories").fetchall())
+    conn.close()
+    return scores
+
+
+async def run_mode(path: str, words: list, iterations: int, mentions: int, mode: str, seed: int) -> tuple:
+    decay_mode = "lazy" if mode == "lazy" else "eager"
+    heatmap._get_decay_mode = lambda: decay_mode
+    heatmap.FULL_RESCORE_INTERVAL = 10**9 if mode == "incremental" else 1
+    heatmap._updates_since_full_rescore = 0
+    heatmap._recalculate_memory_scores = (
+        _legacy_recalculate_memory_scores if mode == "legacy" else _set_based_recalculate
+    )
+
+    def _open_conn():
+        conn = sqlite3.connect(path, timeout=5.0)
+        conn.execute("PRAGMA foreign_keys=ON;")
+        return conn
+
+    heatmap._open_conn = _open_conn
+
+    # Build an initial memory score table so both modes start from the same state
+    conn = _open_conn()
+    await heatmap._recalculate_memory_scores(conn.cursor())
+    conn.commit()
+    conn.close()
+
+    rng = random.Random(seed)
+    timings = []
+    read_timings = []
+    for _ in range(iterations):
+        keywords = {rng.choice(words): rng.choice(WEIGHTS) for _ in range(mentions)}
+        start = time.perf_counter()
+        await heatmap.update_heatmap(keywords)
+        timings.append((time.perf_counter() - start) * 1000)
+        start = time.perf_counter()
+        await heatmap.get_top_memories_by_heatmap(10)
+        read_timings.append((time.perf_counter() - start) * 1000)
+    return timings, read_timings
+
+
+def report(label: str, timings: list):
+    timings = sorted(timings)
+    p95 = timings[int(len(timings) * 0.95) - 1]
+    print(f"{label:<14} mean {statistics.mean(timings):9.2f} ms  p50 {statistics.median(timings):9.2f} ms  p95 {p95:9.2f} ms")
+
+
+async def main_async(args):
+    results = {}
+    for mode in ("legacy", "full rebuild", "incremental", "lazy"):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "ledger.db")
+            words = seed_database(path, args.memories, args.keywords, args.tags, args.seed)
+            timings, read_timings = await run_mode(path, words, args.iterations, args.mentions, mode, args.seed)
+            report(mode, timings)
+            report("  top memories", read_timings)
+            results[mode] = (statistics.mean(timings), await memory_scores(path, mode))
+
+    legacy_mean, legacy_scores = results["legacy"]
+    for mode in ("full rebuild", "incremental", "lazy"):
+        mean, scores = results[mode]
+        drift = max((abs(legacy_scores[k] - scores.get(k, 0.0)) for k in legacy_scores), default=0.0)
+        print(
+            f"{mode}: {legacy_mean / mean:.1f}x vs legacy, "
+            f"memories scored {len(scores)} vs {len(legacy_scores)}, max drift {drift:.2e}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark ledger heatmap updates")
+    parser.add_argument("--memories", type=int, default=50_000)
+    parser.add_argument("--keywords", type=int, default=2_000)
+    parser.add_argument("--tags", type=int, default=4, help="Tags per memory")
+    parser.add_argument("--mentions", type=int, default=8, help="Keywords mentioned per update")
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=7)
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Benchmark for period/day/turn message retrieval from the ledger
+(`_get_user_messages`, the input of every summary job).
+
+Seeds a throwaway SQLite database with a multi-year history for one user and
+times three request shapes against the previous full-table approach (load every
+row for the user, build models, filter in Python):
+
+- day:    one day's messages (daily summary)
+- period: one six-hour period (periodic summary)
+- turns:  the last N turns
+
+With the window pushed into SQL and idx_user_msgs_created, the day and period
+reads only touch that window's rows, so their latency stays flat as the history
+grows.
+
+Run from the repository root with the ledger's dependencies installed:
+
+    python scripts/benchmark_ledger_messages.py --years 1 3 --per-day 60
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "services" / "ledger"))
+
+from app.setup import SCHEMA_SQL  # noqa: E402
+from app.services.user.util import _get_period_range  # noqa: E402
+import app.services.user.get_messages as get_messages_module  # noqa: E402
+from shared.models.ledger import CanonicalUserMessage, UserMessagesRequest  # noqa: E402
+
+USER_ID = "benchmark-user"
+END_DATE = datetime(2025, 6, 30)
+
+
+def seed_database(path: str, years: int, per_day: int) -> int:
+    """Insert `per_day` messages a day for `years` years (user/assistant/tool mix)."""
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode=WAL;")
+    conn.executescript(SCHEMA_SQL)
+    columns = [row[1] for row in conn.execute("PRAGMA table_info(user_messages)")]
+    if "tool_call_id" not in columns:
+        conn.execute("ALTER TABLE user_messages ADD COLUMN tool_call_id TEXT")
+    roles = ("user", "assistant", "tool", "assistant")
+    step = timedelta(seconds=86400 // per_day)
+    first_day = END_DATE - timedelta(days=365 * years)
+
+    def rows():
+        day = first_day
+        while day <= END_DATE:
+            for i in range(per_day):
+                created_at = (day + step * i).strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
+                yield (USER_ID, "api", roles[i % 4], f"message {created_at}", created_at, created_at)
+            day += timedelta(days=1)
+
+    conn.executemany(
+        "INSERT INTO user_messages (user_id, platform, role, content, created_at, updated_at) "
+        "VALUES (?, ?, ?, ?, ?, ?)",
+        rows(),
+    )
+    conn.commit()
+    count = conn.execute("SELECT COUNT(*) FROM user_messages").fetchone()[0]
+    conn.close()
+    return count
+
+
+def legacy_get_messages(conn, request: UserMessagesRequest):
+    """The previous implementation: load the user's whole table, then filter in Python."""
+    cur = conn.cursor()
+    cur.execute("SELECT * FROM user_messages WHERE user_id = ? ORDER BY id", (request.user_id,))
+    columns = [col[0] for col in cur.description]
+    raw_messages = [dict(zip(columns, row)) for row in cur.fetchall()]
+    for msg in raw_messages:
+        for field in ("tool_calls", "function_call"):
+            if msg.get(field):
+                msg[field] = json.loads(msg[field])
+    messages = [CanonicalUserMessage(**msg) for msg in raw_messages]
+    if request.turns is not None:
+        grouped, current = [], []
+        for msg in messages:
+            if msg.role == "user":
+                if current:
+                    grouped.append(current)
+                current = [msg]
+            elif current:
+                current.append(msg)
+        if current:
+            grouped.append(current)
+        return [m for turn in grouped[-request.turns:] for m in turn]
+    messages = [m for m in messages if not (m.role == "tool" or (m.role == "assistant" and not m.content))]
+    start_dt, end_dt = _get_period_range(request.period, request.date)
+    return [
+        m for m in messages
+        if start_dt <= datetime.strptime(m.created_at, "%Y-%m-%d %H:%M:%S.%f") <= end_dt
+    ]
+
+
+def time_calls(func, iterations: int):
+    timings = []
+    result = None
+    for _ in range(iterations):
+        started = time.perf_counter()
+        result = func()
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings, result
+
+
+def run(years_list, per_day: int, iterations: int, turns: int) -> None:
+    date = END_DATE.strftime("%Y-%m-%d")
+    shapes = {
+        "day": UserMessagesRequest(user_id=USER_ID, period="day", date=date),
+        "period": UserMessagesRequest(user_id=USER_ID, period="afternoon", date=date),
+        "turns": UserMessagesRequest(user_id=USER_ID, turns=turns),
+    }
+    print(f"{'years':>5} {'messages':>9} {'request':>8} {'rows':>5} {'new ms':>8} {'old ms':>9} {'speedup':>8}")
+    for years in years_list:
+        with tempfile.TemporaryDirectory() as tmp:
+            db_path = os.path.join(tmp, "ledger.db")
+            count = seed_database(db_path, years, per_day)
+
+            def _open_conn():
+                return sqlite3.connect(db_path, timeout=5.0)
+
+            get_messages_module._open_conn = _open_conn
+
+            for label, request in shapes.items():
+                new, new_result = time_calls(lambda: get_messages_module._get_user_messages(request), iterations)
+                conn = _open_conn()
+                old, old_result = time_calls(lambda: legacy_get_messages(conn, request), max(1, iterations // 10))
+                conn.close()
+                if [m.id for m in new_result] != [m.id for m in old_result]:
+                    raise SystemExit(f"{label}: results differ from the previous implementation")
+                new_ms, old_ms = statistics.median(new), statistics.median(old)
+                print(
+                    f"{years:>5} {count:>9} {label:>8} {len(new_result):>5} "
+                    f"{new_ms:>8.2f} {old_ms:>9.1f} {old_ms / new_ms:>7.0f}x"
+                )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark ledger period/day/turn message retrieval")
+    parser.add_argument("--years", type=int, nargs="+", default=[1, 3])
+    parser.add_argument("--per-day", type=int, default=60, help="Messages per day in the seeded history")
+    parser.add_argument("--iterations", type=int, default=50, help="Calls per request shape (the old path runs a tenth)")
+    parser.add_argument("--turns", type=int, default=15, help="Turns requested in the turns shape")
+    args = parser.parse_args()
+    run(args.years, args.per_day, args.iterations, args.turns)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the ledger user buffer sync (POST /user/{user_id}/sync).
+
+Seeds a throwaway SQLite database with N historical messages for one user and
+times `_sync_user_buffer_helper` for a mix of snapshot shapes (fresh append,
+duplicate user message, assistant edit). Because sync only reads the tail window
+of the buffer, per-call latency should stay flat as N grows from 1k to 1M.
+
+Run from the repository root with the ledger's dependencies installed and a
+config at /app/config/config.json (the same environment the ledger runs in):
+
+    python scripts/benchmark_ledger_sync.py --sizes 1000 10000 100000 1000000
+"""
+
+import argparse
+import os
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "services" / "ledger"))
+
+from app.setup import SCHEMA_SQL  # noqa: E402
+import app.services.user.sync as sync_module  # noqa: E402
+from shared.models.ledger import RawUserMessage, UserSyncRequest  # noqa: E402
+
+USER_ID = "benchmark-user"
+
+
+def seed_database(path: str, count: int) -> None:
+    """Create the ledger schema and insert `count` alternating user/assistant rows."""
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode=WAL;")
+    conn.executescript(SCHEMA_SQL)
+    columns = [row[1] for row in conn.execute("PRAGMA table_info(user_messages)")]
+    if "tool_call_id" not in columns:
+        conn.execute("ALTER TABLE user_messages ADD COLUMN tool_call_id TEXT")
+    rows = (
+        (USER_ID, "api", "user" if i % 2 == 0 else "assistant", f"message {i}")
+        for i in range(count)
+    )
+    conn.executemany(
+        "INSERT INTO user_messages (user_id, platform, role, content) VALUES (?, ?, ?, ?)",
+        rows,
+    )
+    conn.commit()
+    conn.close()
+
+
+def build_requests(iterations: int):
+    """Snapshots exercising the append, dedup and assistant-edit branches."""
+    requests = []
+    for i in range(iterations):
+        user_text = f"benchmark question {i}"
+        requests.append(UserSyncRequest(user_id=USER_ID, snapshot=[
+            RawUserMessage(user_id=USER_ID, platform="api", role="user", content=user_text),
+        ]))
+        requests.append(UserSyncRequest(user_id=USER_ID, snapshot=[
+            RawUserMessage(user_id=USER_ID, platform="api", role="user", content=user_text),
+        ]))
+        requests.append(UserSyncRequest(user_id=USER_ID, snapshot=[
+            RawUserMessage(user_id=USER_ID, platform="api", role="user", content=user_text),
+            RawUserMessage(user_id=USER_ID, platform="api", role="assistant", content=f"answer {i}"),
+        ]))
+    return requests
+
+
+def run(sizes, iterations: int, turns: int) -> None:
+    sync_module._get_turns_limit = lambda: turns
+    print(f"{'messages':>10} {'calls':>6} {'mean ms':>9} {'p50 ms':>8} {'p95 ms':>8}")
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            db_path = os.path.join(tmp, "ledger.db")
+            seed_database(db_path, size)
+
+            def _open_conn():
+                conn = sqlite3.connect(db_path, timeout=5.0)
+                conn.execute("PRAGMA foreign_keys=ON;")
+                return conn
+
+            sync_module._open_conn = _open_conn
+
+            timings = []
+            for request in build_requests(iterations):
+                start = time.perf_counter()
+                sync_module._sync_user_buffer_helper(request)
+                timings.append((time.perf_counter() - start) * 1000)
+
+            timings.sort()
+            p95 = timings[int(len(timings) * 0.95) - 1]
+            print(
+                f"{size:>10} {len(timings):>6} {statistics.mean(timings):>9.3f} "
+                f"{statistics.median(timings):>8.3f} {p95:>8.3f}"
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark ledger user buffer sync latency")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000, 1_000_000])
+    parser.add_argument("--iterations", type=int, default=50, help="Snapshot rounds per size (3 syncs each)")
+    parser.add_argument("--turns", type=int, default=15, help="Value used for ledger.turns")
+    args = parser.parse_args()
+    run(args.sizes, args.iterations, args.turns)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for proxy system-prompt rendering.
+
+Writes a throwaway prompt tree (one context file and one template) and renders
+it N times through `shared.prompt_loader.PromptLoader`, comparing:
+
+- cached: the normal path, reusing the parsed context and compiled template
+- uncached: the cache cleared before every render (re-read, re-parse, re-compile)
+
+Run from the repository root with jinja2 installed:
+
+    python scripts/benchmark_prompts.py --iterations 5000
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from shared.prompt_loader import PromptLoader  # noqa: E402
+
+TEMPLATE = """You are {{ persona }}.
+{% if time %}The current time is {{ time }}.{% endif %}
+
+{% for rule in rules %}
+- {{ rule }}
+{% endfor %}
+
+{% if memories %}
+## Memories
+{{ memories }}
+{% endif %}
+{% if summaries %}
+## Recent conversation summaries
+{{ summaries }}
+{% endif %}
+{% if agent_prompt %}
+{{ agent_prompt }}
+{% endif %}
+"""
+
+
+def write_prompt_tree(base: Path) -> None:
+    """Create proxy/contexts/openai-default.json and proxy/templates/default.j2 under `base`."""
+    (base / "proxy" / "contexts").mkdir(parents=True)
+    (base / "proxy" / "templates").mkdir(parents=True)
+    context = {
+        "template": "default",
+        "persona": "a helpful assistant",
+        "rules": [f"Rule number {i}: be concise and accurate." for i in range(40)],
+    }
+    (base / "proxy" / "contexts" / "openai-default.json").write_text(json.dumps(context))
+    (base / "proxy" / "templates" / "default.j2").write_text(TEMPLATE)
+
+
+def build_request():
+    return SimpleNamespace(
+        timestamp="2025-01-01T12:00:00",
+        summaries="\n".join(f"Summary {i}: talked about the weather." for i in range(10)),
+        agent_prompt="Use tools when they help.",
+        memories=[SimpleNamespace(content=f"memory {i}") for i in range(20)],
+    )
+
+
+def time_renders(loader: PromptLoader, request, iterations: int, clear: bool):
+    durations = []
+    for _ in range(iterations):
+        if clear:
+            loader.clear_cache()
+        started = time.perf_counter()
+        loader.load_proxy_prompt("openai", "default", request)
+        durations.append(time.perf_counter() - started)
+    return durations
+
+
+def report(label: str, durations) -> float:
+    mean_us = statistics.mean(durations) * 1e6
+    p95_us = sorted(durations)[int(len(durations) * 0.95) - 1] * 1e6
+    print(f"{label:>9}: mean {mean_us:8.1f} us   p95 {p95_us:8.1f} us")
+    return mean_us
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        base = Path(tmp)
+        write_prompt_tree(base)
+        loader = PromptLoader(str(base))
+        request = build_request()
+
+        # Warm up both paths once
+        loader.load_proxy_prompt("openai", "default", request)
+
+        uncached = report("uncached", time_renders(loader, request, args.iterations, clear=True))
+        cached = report("cached", time_renders(loader, request, args.iterations, clear=False))
+        print(f"speedup: {uncached / cached:.1f}x")
+        print(f"cache: {loader.cache_stats()}")
+
+
+if __name__ == "__main__":
+    main()
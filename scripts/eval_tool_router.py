@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Offline evaluation of the brain's local embedding tool router.
+
+Scores every labelled message against the routed tool catalog with
+`LocalToolRouter` and reports per-tool and micro-averaged precision/recall at
+one or more thresholds, the share of tools that would be sent to the LLM router
+as ambiguous, and scoring latency.
+
+The labelled file is JSONL, one message per line, listing the routed tools it
+should select (an empty list means none):
+
+    {"message": "Remind me to call the bank at 3pm", "tools": ["stickynotes"]}
+
+Run from the repository root with the brain's dependencies installed
+(sentence-transformers):
+
+    python scripts/eval_tool_router.py --data scripts/tool_router_eval_sample.jsonl \\
+        --thresholds 0.35 0.4 0.45 0.5 --margin 0.08
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "services" / "brain"))
+
+from app.tools import get_routed_tools_catalog  # noqa: E402
+from app.tools.router import (  # noqa: E402
+    DEFAULT_EMBEDDING_MODEL,
+    DEFAULT_MARGIN,
+    EMBEDDINGS_AVAILABLE,
+    LocalToolRouter,
+    split_by_score,
+)
+
+
+def load_examples(path: Path):
+    examples = []
+    with open(path, encoding="utf-8") as f:
+        for line_no, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            row = json.loads(line)
+            if "message" not in row or not isinstance(row.get("tools"), list):
+                raise ValueError(f"{path}:{line_no}: expected {{'message': str, 'tools': [str]}}")
+            examples.append((row["message"], set(row["tools"])))
+    return examples
+
+
+def evaluate(scored, catalog, threshold: float, margin: float):
+    """Precision/recall per tool and micro-averaged, plus the ambiguous share."""
+    counts = {name: {"tp": 0, "fp": 0, "fn": 0} for name in catalog}
+    ambiguous = 0
+    for scores, expected in scored:
+        predicted = {name for name, score in scores.items() if score >= threshold}
+        ambiguous += len(split_by_score(scores, threshold, margin)[1])
+        for name in catalog:
+            if name in predicted and name in expected:
+                counts[name]["tp"] += 1
+            elif name in predicted:
+                counts[name]["fp"] += 1
+            elif name in expected:
+                counts[name]["fn"] += 1
+
+    def _ratio(num, den):
+        return num / den if den else 0.0
+
+    per_tool = {
+        name: (_ratio(c["tp"], c["tp"] + c["fp"]), _ratio(c["tp"], c["tp"] + c["fn"]))
+        for name, c in counts.items()
+    }
+    tp = sum(c["tp"] for c in counts.values())
+    fp = sum(c["fp"] for c in counts.values())
+    fn = sum(c["fn"] for c in counts.values())
+    micro = (_ratio(tp, tp + fp), _ratio(tp, tp + fn))
+    ambiguous_share = _ratio(ambiguous, len(scored) * len(catalog))
+    return per_tool, micro, ambiguous_share
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--data", type=Path, required=True, help="Labelled JSONL file")
+    parser.add_argument("--model", default=DEFAULT_EMBEDDING_MODEL)
+    parser.add_argument("--thresholds", type=float, nargs="+", default=[0.35, 0.4, 0.45, 0.5, 0.55])
+    parser.add_argument("--margin", type=float, default=DEFAULT_MARGIN)
+    args = parser.parse_args()
+
+    if not EMBEDDINGS_AVAILABLE:
+        sys.exit("sentence-transformers is not installed")
+
+    catalog = get_routed_tools_catalog()
+    if not catalog:
+        sys.exit("No routed tools registered")
+    examples = load_examples(args.data)
+    unknown = {name for _, expected in examples for name in expected} - set(catalog)
+    if unknown:
+        print(f"warning: labels reference tools that are not routed: {sorted(unknown)}")
+
+    router = LocalToolRouter()
+    started = time.perf_counter()
+    router.warm_up(catalog, args.model)
+    print(f"Indexed {len(catalog)} routed tools with {args.model} in {time.perf_counter() - started:.1f}s")
+
+    scored = []
+    latencies = []
+    for message, expected in examples:
+        started = time.perf_counter()
+        scores = router.score(message, catalog, args.model)
+        latencies.append(time.perf_counter() - started)
+        scored.append((scores, expected))
+
+    latencies.sort()
+    print(
+        f"{len(examples)} messages, scoring latency: "
+        f"median {statistics.median(latencies) * 1000:.1f} ms, "
+        f"p95 {latencies[max(0, int(len(latencies) * 0.95) - 1)] * 1000:.1f} ms"
+    )
+
+    for threshold in args.thresholds:
+        per_tool, (precision, recall), ambiguous_share = evaluate(scored, catalog, threshold, args.margin)
+        print(f"\nthreshold {threshold:.2f}: precision {precision:.3f}  recall {recall:.3f}  "
+              f"ambiguous (sent to LLM) {ambiguous_share:.1%}")
+        for name, (tool_precision, tool_recall) in sorted(per_tool.items()):
+            print(f"  {name:<24} precision {tool_precision:.3f}  recall {tool_recall:.3f}")
+
+
+if __name__ == "__main__":
+    main()
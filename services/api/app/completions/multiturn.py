@@ -7,6 +7,7 @@ Endpoints:
     - POST /v1/chat/completions: Processes chat completion requests, supporting:
         1. Special task routing for messages starting with '### Task'
         2. Multi-turn conversation handling via internal brain service
+        3. `stream: true`, returning OpenAI-format `chat.completion.chunk` server-sent events
 
 Features:
     - Redirects legacy endpoints to versioned endpoints.
@@ -25,8 +26,9 @@ Dependencies:
 
 """
 
-from shared.models.proxy import MultiTurnRequest, ProxyResponse
-from shared.models.api import ChatCompletionRequest, ChatCompletionResponse, ChatCompletionChoice, ChatUsage, CompletionRequest
+from shared.models.proxy import MultiTurnRequest, ProxyResponse, ProxyStreamChunk
+from shared.models.api import ChatCompletionRequest, ChatCompletionResponse, ChatCompletionChoice, ChatUsage, CompletionRequest, ChatCompletionChunk, ChatCompletionChunkChoice
+from shared.sse import iter_sse_data, prime_stream, SSE_DONE
 
 from app.completions.singleturn import openai_v1_completions
 
@@ -37,9 +39,10 @@ import uuid
 import httpx
 import os
 from datetime import datetime
+from typing import AsyncIterator
 
 from fastapi import APIRouter, HTTPException, status
-from fastapi.responses import RedirectResponse
+from fastapi.responses import RedirectResponse, StreamingResponse
 router = APIRouter()
 
 import json
@@ -153,6 +156,8 @@ async def _chat_completions(data: ChatCompletionRequest):
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Error converting completions response to chat format: {e}"
             )
+        if data.stream:
+            return _streaming_response(_chat_response_chunks(chat_response, data))
         return chat_response
 
     # Multi-turn: Use data.messages directly (assume already validated)
@@ -162,6 +167,10 @@ async def _chat_completions(data: ChatCompletionRequest):
         messages=data.messages,
         platform="api"
     )
+    if data.stream:
+        chunks = await prime_stream(_stream_chat_completion_chunks(data, multiturn_request))
+        return _streaming_response(chunks)
+
     async with httpx.AsyncClient(timeout=TIMEOUT) as client:
         try:
             # get brain's port from environment
@@ -225,4 +234,115 @@ async def _chat_completions(data: ChatCompletionRequest):
         )
     )
     logger.debug(f"/chat/completions Returns:\n{chat_response.model_dump_json(indent=4)}")
-    return chat_response
\ No newline at end of file
+    return chat_response
+
+
+def _streaming_response(chunks: AsyncIterator[ChatCompletionChunk]) -> StreamingResponse:
+    async def _events():
+        try:
+            async for chunk in chunks:
+                exclude = {"usage"} if chunk.usage is None else None
+                yield f"data: {chunk.model_dump_json(exclude=exclude)}\n\n"
+        except Exception as e:
+            # Headers are already sent; report the failure in-band like OpenAI does
+            logger.error(f"/v1/chat/completions stream failed: {e}")
+            detail = e.detail if isinstance(e, HTTPException) else str(e)
+            yield f"data: {json.dumps({'error': {'message': detail, 'type': 'server_error'}})}\n\n"
+        yield f"data: {SSE_DONE}\n\n"
+
+    return StreamingResponse(_events(), media_type="text/event-stream")
+
+
+async def _chat_response_chunks(chat_response: ChatCompletionResponse, data: ChatCompletionRequest) -> AsyncIterator[ChatCompletionChunk]:
+    """Replay a complete ChatCompletionResponse as a single-delta chunk stream."""
+    for choice in chat_response.choices:
+        yield ChatCompletionChunk(
+            id=chat_response.id,
+            created=chat_response.created,
+            model=chat_response.model,
+            choices=[ChatCompletionChunkChoice(index=choice.index, delta=choice.message, finish_reason=choice.finish_reason)],
+        )
+    if (data.stream_options or {}).get("include_usage"):
+        yield ChatCompletionChunk(id=chat_response.id, created=chat_response.created, model=chat_response.model, usage=chat_response.usage)
+
+
+async def _stream_chat_completion_chunks(data: ChatCompletionRequest, multiturn_request: MultiTurnRequest) -> AsyncIterator[ChatCompletionChunk]:
+    """
+    Forward a multi-turn request to brain's streaming endpoint and translate its
+    ProxyStreamChunk events into OpenAI `chat.completion.chunk` objects.
+
+    The first chunk carries the assistant role, content deltas follow as brain
+    relays them, and a final empty delta carries the finish reason. A usage chunk
+    is added when the request sets `stream_options.include_usage`.
+
+    Raises:
+        HTTPException: If brain rejects the request or the stream reports an error.
+    """
+    completion_id = f"chatcmpl-{uuid.uuid4()}"
+    created_unix = int(datetime.now().timestamp())
+
+    def _chunk(delta: dict, finish_reason: str = None) -> ChatCompletionChunk:
+        # Note: the mode string is reported as the model, as in the non-streaming response
+        return ChatCompletionChunk(
+            id=completion_id,
+            created=created_unix,
+            model=data.model,
+            choices=[ChatCompletionChunkChoice(index=0, delta=delta, finish_reason=finish_reason)],
+        )
+
+    brain_port = os.getenv("BRAIN_PORT", 4207)
+    async with httpx.AsyncClient(timeout=TIMEOUT) as client:
+        try:
+            async with client.stream(
+                "POST",
+                f"http://brain:{brain_port}/api/multiturn/stream",
+                json=multiturn_request.model_dump()
+            ) as response:
+                if response.is_error:
+                    await response.aread()
+                    logger.error(f"HTTP error forwarding to brain: {response.status_code} - {response.text}")
+                    raise HTTPException(
+                        status_code=response.status_code,
+                        detail=f"Error from multi-turn brain: {response.text}"
+                    )
+
+                role_sent = False
+                async for event in iter_sse_data(response):
+                    chunk = ProxyStreamChunk.model_validate_json(event)
+                    if chunk.type == "error":
+                        raise HTTPException(
+                            status_code=status.HTTP_502_BAD_GATEWAY,
+                            detail=f"Error from multi-turn brain: {chunk.detail}"
+                        )
+                    if not role_sent:
+                        yield _chunk({"role": "assistant", "content": ""})
+                        role_sent = True
+                    if chunk.type == "delta" and chunk.content:
+                        yield _chunk({"content": chunk.content})
+                    elif chunk.type == "done":
+                        yield _chunk({}, finish_reason=chunk.finish_reason or "stop")
+                        if (data.stream_options or {}).get("include_usage"):
+                            prompt_tokens = chunk.prompt_eval_count or 0
+                            completion_tokens = chunk.eval_count or 0
+                            yield ChatCompletionChunk(
+                                id=completion_id,
+                                created=created_unix,
+                                model=data.model,
+                                usage=ChatUsage(
+                                    prompt_tokens=prompt_tokens,
+                                    completion_tokens=completion_tokens,
+                                    total_tokens=prompt_tokens + completion_tokens
+                                )
+                            )
+                        return
+        except httpx.RequestError as e:
+            logger.error(f"Request error when forwarding to brain: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_502_BAD_GATEWAY,
+                detail=f"Connection error to brain: {e}"
+            )
+
+    raise HTTPException(
+        status_code=status.HTTP_502_BAD_GATEWAY,
+        detail="Multi-turn brain stream ended before completion"
+    )
@@ -113,7 +113,8 @@ async def _openai_v1_completions(request: Union[OpenAICompletionRequest, Complet
     
     # Treat request.model as a mode name; fallback to 'default'
     mode_name = getattr(request, 'model', None) or 'default'
-    singleturn_req = SingleTurnRequest(model=mode_name, prompt=prompt_text)
+    # An API client is waiting on this, unlike most single-turn callers
+    singleturn_req = SingleTurnRequest(model=mode_name, prompt=prompt_text, priority="interactive")
     singleturn_payload = singleturn_req.model_dump()
 
     # Sequentially call the proxy service n times
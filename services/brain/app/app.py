@@ -39,6 +39,12 @@ from app.notification.post import router as notification_post_router
 from app.routes.admin import router as admin_router
 from app.routes.mcp import router as mcp_router
 
+from app.services.brainlet_executor import brainlet_executor
+from app.services.timings import pre_turn_timings
+from app.tools import get_routed_tools_catalog
+from app.tools.router import local_tool_router, warm_up_tool_router
+
+from shared.config_store import config_store
 from shared.docs_exporter import router as docs_router
 from shared.routes import router as routes_router, register_list_routes
 
@@ -51,7 +57,9 @@ from fastapi import FastAPI
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     verify_database()
+    await warm_up_tool_router(get_routed_tools_catalog())
     yield
+    await brainlet_executor.drain()
 
 
 app = FastAPI(lifespan=lifespan)
@@ -74,6 +82,31 @@ app.include_router(notification_post_router, tags=["notification"])
 app.include_router(admin_router, tags=["admin"])
 app.include_router(mcp_router, prefix="/mcp", tags=["mcp"])
 
+
+@app.get("/_config", tags=["system"])
+def config_stats():
+    """Config hot-reload counters: reloads, failures and when the current version was loaded."""
+    return {"status": "ok", "stats": config_store.stats()}
+
+
+@app.get("/_timings", tags=["system"])
+def pre_turn_timing_stats():
+    """Per-stage latency of the multi-turn pre-turn pipeline (user context, summaries, tool routing, ledger sync)."""
+    return {"status": "ok", "stats": pre_turn_timings.stats()}
+
+
+@app.get("/_brainlets", tags=["system"])
+def brainlet_stats():
+    """Per-brainlet latency histograms, timeouts and errors, and running background post-brainlets."""
+    return {"status": "ok", "stats": brainlet_executor.stats()}
+
+
+@app.get("/_tool_router", tags=["system"])
+def tool_router_stats():
+    """Local embedding tool router counters: local decisions, LLM fallbacks for ambiguous scores, scoring latency."""
+    return {"status": "ok", "stats": local_tool_router.stats()}
+
+
 register_list_routes(app)
 
 import json
@@ -2,7 +2,7 @@
 Performs a memory search based on the most recent user and assistant messages in a conversation.
 
 This function:
-- Loads configuration for database path and model selection.
+- Reads the brainlet's model selection from the cached config store.
 - Filters the conversation messages to include only those from the user or assistant with non-empty content.
 - Builds a human-readable chat log from the filtered messages.
 - Constructs a prompt to extract keywords from the conversation using a language model.
@@ -30,6 +30,7 @@ from app.message.singleturn import incoming_singleturn_message
 
 from app.tools.memory_management import memory_search_tool
 from shared.prompt_loader import load_prompt
+from shared.config_store import config_store
 
 from shared.log_config import get_logger
 logger = get_logger(f"brain.{__name__}")
@@ -58,11 +59,6 @@ async def memory_search(brainlets_output: Dict[str, Any], message: MultiTurnRequ
         dict or str: A dictionary containing the assistant's function call and tool's response if memories are found,
                      otherwise a string indicating no memories were found.
     """
-    # Load config (for db path and model selection)
-    with open('/app/config/config.json') as f:
-        _config = json.load(f)
-
-
     # topic isn't actually what we want to search for, but rather the keywords
     # that we want to use for the memory search
     messages = message.messages
@@ -107,7 +103,7 @@ async def memory_search(brainlets_output: Dict[str, Any], message: MultiTurnRequ
 
     # --- Get model/options from brainlets config ---
     brainlet_config = None
-    for brainlet in _config.get('brainlets', []):
+    for brainlet in config_store.get('brainlets', []):
         if brainlet.get('name') == 'memory_search':
             brainlet_config = brainlet
             break
@@ -116,7 +112,7 @@ async def memory_search(brainlets_output: Dict[str, Any], message: MultiTurnRequ
         model = brainlet_config.get('model')  # Interpreted as a mode name for SingleTurnRequest
 
     # Build SingleTurnRequest (mode-style). Fallback to 'default' if not set.
-    singleturn_req = SingleTurnRequest(model=model or 'default', prompt=prompt)
+    singleturn_req = SingleTurnRequest(model=model or 'default', prompt=prompt, priority="router")
     response = await incoming_singleturn_message(singleturn_req)
     keyword_response = response.response
 
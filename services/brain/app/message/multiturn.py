@@ -2,7 +2,7 @@
 This module implements the multi-turn conversation endpoint for the brain service.
 It provides the `/api/multiturn` FastAPI route, which orchestrates a complex workflow for handling multi-turn chat requests, including:
 - Retrieving user memories and context
-- Running pre- and post-execution brainlets (customizable logic modules)
+- Running pre- and post-execution brainlets (customizable logic modules), level by level along their `depends_on` DAG
 - Managing agent-managed prompts and recent summaries
 - Interfacing with a proxy service for LLM responses
 - Executing tool/function calls in a loop as required by the LLM
@@ -11,20 +11,24 @@ It provides the `/api/multiturn` FastAPI route, which orchestrates a complex wor
 Key Functions:
 - `get_agent_managed_prompt(user_id: str) -> str`: Fetches all enabled prompts for a user from the brainlets database, returning them as a formatted string.
 - `outgoing_multiturn_message(message: MultiTurnRequest) -> ProxyResponse`: Main endpoint handler for multi-turn chat, coordinating memory retrieval, brainlet execution, proxy interaction, tool call execution, and ledger synchronization.
+- `outgoing_multiturn_message_stream(message: MultiTurnRequest) -> StreamingResponse`: The same pipeline on `/api/multiturn/stream`, relaying content deltas as server-sent events and syncing the assistant message when the stream completes.
 Dependencies:
 - FastAPI, httpx, sqlite3, shared models and utilities, app-specific modules for memory, tools, and brainlets.
 Configuration:
-- Reads from `/app/config/config.json` for settings. Tool definitions provided by the decorator-based registry in `app.tools`. Tool selection uses a cheap LLM router (`app.tools.router`) to include only relevant tools per message.
+- Reads `/app/config/config.json` through `shared.config_store`, which hot-reloads it in the background. Tool definitions provided by the decorator-based registry in `app.tools`. Tool selection uses a cheap LLM router (`app.tools.router`) to include only relevant tools per message.
 Logging:
 - Uses a structured logger for debugging and error reporting throughout the workflow.
 """
  
-from shared.models.proxy import MultiTurnRequest, ProxyResponse
+from shared.models.proxy import MultiTurnRequest, ProxyResponse, ProxyStreamChunk
+from shared.sse import iter_sse_data, prime_stream
+from shared.config_store import config_store
 from app.util import get_admin_user_id, get_user_alias, sanitize_messages, get_recent_summaries
 
 from shared.log_config import get_logger
 logger = get_logger(f"brain.{__name__}")
 
+import asyncio
 import json
 from app.tools import get_openai_tools, get_always_tools, get_routed_tools_catalog, get_openai_tools_by_names, call_tool, get_tool_meta
 from app.tools.router import route_tools
@@ -32,17 +36,24 @@ import sqlite3
 from pathlib import Path
 import httpx
 import os
+from datetime import datetime
+from typing import AsyncIterator, Dict, Tuple
 
-import app.brainlets
-from collections import defaultdict, deque
+from app.services.brainlet_executor import brainlet_executor, topo_levels
+from app.services.timings import pre_turn_timings
 
 from fastapi import APIRouter, HTTPException, status
+from fastapi.responses import StreamingResponse
 router = APIRouter()
 
-with open('/app/config/config.json') as f:
-    _config = json.load(f)
 
-TIMEOUT = _config["timeout"]
+def _timeout() -> float:
+    """Request timeout, read at call time so config reloads apply."""
+    return config_store.config["timeout"]
+
+
+# Proxy round trips allowed per turn while the model keeps calling tools
+MAX_TOOL_ITERATIONS = 10
 
 
 def get_agent_managed_prompt(user_id: str) -> str:
@@ -52,9 +63,7 @@ def get_agent_managed_prompt(user_id: str) -> str:
     If no prompts are found, returns an empty string.
     """
     try:
-        with open('/app/config/config.json') as f:
-            _config = json.load(f)
-        db_path = _config['db']['brainlets']
+        db_path = config_store.config['db']['brainlets']
         if not db_path or not Path(db_path).exists():
             return ""
         with sqlite3.connect(db_path) as conn:
@@ -69,40 +78,33 @@ def get_agent_managed_prompt(user_id: str) -> str:
         return ""
 
 
-@router.post("/api/multiturn", response_model=ProxyResponse)
-async def outgoing_multiturn_message(message: MultiTurnRequest) -> ProxyResponse:
+async def _gather_or_cancel(*aws):
     """
-    Handles multi-turn conversation requests by processing messages through a complex workflow:
-    - Retrieves memories and user context
-    - Runs pre-execution brainlets
-    - Sends request to proxy service
-    - Handles tool calls and function execution
-    - Syncs messages with ledger service
-    - Runs post-execution brainlets
-
-    Args:
-        message (MultiTurnRequest): The incoming multi-turn conversation request
-
-    Returns:
-        ProxyResponse: The final response from the conversation processing pipeline
+    Like `asyncio.gather`, but the first failure cancels the remaining awaitables
+    instead of leaving them running, and is re-raised as is.
     """
-    logger.debug(f"brain: /api/multiturn Request:")
+    tasks = [asyncio.ensure_future(aw) for aw in aws]
+    try:
+        return await asyncio.gather(*tasks)
+    finally:
+        pending = [task for task in tasks if not task.done()]
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
 
-    # Memories only apply to ollama requests - we should not be sending them to openai requests.
-    memories = []
-    if message.provider == "ollama":
-        # sanitize proxy messages
-        message.messages = sanitize_messages(message.messages)
 
-    # get username
+async def _load_user_context(message: MultiTurnRequest, timings: Dict[str, float]) -> Tuple[str, str]:
+    """Resolve the user id, then fetch the user's alias and agent-managed prompt together."""
     if not message.user_id:
-        message.user_id = await get_admin_user_id()
-    username = await get_user_alias(message.user_id)
-    platform = message.platform or "api"
+        message.user_id = await pre_turn_timings.timed("user_id", get_admin_user_id(), timings)
+    return await _gather_or_cancel(
+        pre_turn_timings.timed("user_alias", get_user_alias(message.user_id), timings),
+        pre_turn_timings.timed("agent_prompt", asyncio.to_thread(get_agent_managed_prompt, message.user_id), timings),
+    )
 
-    # construct the agent-managed prompt
-    agent_prompt = get_agent_managed_prompt(message.user_id)
-    
+
+async def _load_summaries() -> str:
     # get a list of the last 4 summaries - this returns a formatted string
     summaries = await get_recent_summaries(limit=1)
     if not summaries:
@@ -112,49 +114,35 @@ async def outgoing_multiturn_message(message: MultiTurnRequest) -> ProxyResponse
             detail="No summaries found for the specified period."
         )
     # summaries is already a formatted string, no need to re-parse or join
+    return summaries
 
-    # Build new MultiTurnRequest with updated fields
-    # Get always-on tools + route additional tools based on user message
+
+async def _select_tools(messages: list) -> list:
+    """Always-on tools plus the tools routed for the latest user message."""
     always_tools = get_always_tools(client_type="internal")
     routed_catalog = get_routed_tools_catalog()
-    if routed_catalog:
-        # Extract latest user message for router context
-        user_message = ""
-        for msg in reversed(message.messages):
-            if msg.get("role") == "user" and msg.get("content"):
-                user_message = msg["content"]
-                break
-        selected_names = await route_tools(user_message, routed_catalog)
-        selected_tools = get_openai_tools_by_names(selected_names, client_type="internal")
-        tools = always_tools + selected_tools
-        if selected_names:
-            logger.info("Router selected tools: %s", selected_names)
-    else:
-        tools = always_tools
+    if not routed_catalog:
+        return always_tools
+    # Extract latest user message for router context
+    user_message = ""
+    for msg in reversed(messages):
+        if msg.get("role") == "user" and msg.get("content"):
+            user_message = msg["content"]
+            break
+    selected_names = await route_tools(user_message, routed_catalog)
+    selected_tools = get_openai_tools_by_names(selected_names, client_type="internal")
+    if selected_names:
+        logger.info("Router selected tools: %s", selected_names)
+    return always_tools + selected_tools
 
-    # Provider logic can be kept if needed for other fields
-    def resolve_provider_from_mode(mode: str):
-        llm_modes = _config.get("llm", {}).get("mode", {})
-        mode_config = llm_modes.get(mode) or llm_modes.get("default")
-        if mode_config:
-            return mode_config.get("provider", "openai")
-        return "openai"
-    provider = resolve_provider_from_mode(message.model)
 
-    updated_request = message.copy(update={
-        "memories": [m.model_dump() for m in memories],
-        "messages": message.messages,
-        "username": username,
-        "summaries": summaries,
-        "platform": platform,
-        "tools": tools,
-        "agent_prompt": agent_prompt,
-        "provider": provider  # Set the resolved provider
-    })
-
-    # --- Send last 4 messages to ledger ---
+async def _sync_ledger_buffer(message: MultiTurnRequest, platform: str) -> list:
+    """
+    Send the last 4 messages to the ledger and return its updated buffer as
+    message dicts, preserving tool_calls/function_call/tool_call_id fields.
+    """
     try:
-        last_msgs = updated_request.messages[-4:]
+        last_msgs = message.messages[-4:]
         sync_snapshot = [
             {
                 "platform": platform,
@@ -171,7 +159,7 @@ async def outgoing_multiturn_message(message: MultiTurnRequest) -> ProxyResponse
 
         ledger_port = os.getenv("LEDGER_PORT", 4203)
 
-        async with httpx.AsyncClient(timeout=TIMEOUT) as client:
+        async with httpx.AsyncClient(timeout=_timeout()) as client:
             get_sync = await client.post(f"http://ledger:{ledger_port}/sync/user", json={"snapshot": sync_snapshot})
             get_sync.raise_for_status()
         
@@ -182,20 +170,6 @@ async def outgoing_multiturn_message(message: MultiTurnRequest) -> ProxyResponse
             )
             get_response.raise_for_status()
             ledger_buffer = get_response.json()
-        
-        # Use dicts for messages, not ChatMessage, and preserve tool_calls/function_call/tool_call_id fields
-        updated_request = updated_request.model_copy(update={
-            "messages": [
-                {
-                    "role": msg["role"],
-                    "content": msg["content"],
-                    **({"tool_calls": msg["tool_calls"]} if msg.get("tool_calls") is not None else {}),
-                    **({"function_call": msg["function_call"]} if msg.get("function_call") is not None else {}),
-                    **({"tool_call_id": msg["tool_call_id"]} if msg.get("tool_call_id") is not None else {}),
-                }
-                for msg in ledger_buffer
-            ]
-        })
     except Exception as e:
         logger.error(f"Error sending messages to ledger sync endpoint: {e}")
         raise HTTPException(
@@ -203,48 +177,91 @@ async def outgoing_multiturn_message(message: MultiTurnRequest) -> ProxyResponse
             detail="Failed to sync messages with ledger service."
         )
 
-    # Run the brainlets!
-    # Load brainlets config and import brainlets
-    brainlets_config = _config.get('brainlets', [])
-
-    # Topological sort to respect depends_on
-    def topo_sort_brainlets(brainlets):
-        name_to_brainlet = {b['name']: b for b in brainlets}
-        graph = defaultdict(list)
-        indegree = defaultdict(int)
-        for b in brainlets:
-            for dep in b.get('depends_on', []):
-                graph[dep].append(b['name'])
-                indegree[b['name']] += 1
-            if b['name'] not in indegree:
-                indegree[b['name']] = 0
-        # Kahn's algorithm
-        queue = deque([name for name, deg in indegree.items() if deg == 0])
-        sorted_names = []
-        while queue:
-            name = queue.popleft()
-            sorted_names.append(name)
-            for neighbor in graph[name]:
-                indegree[neighbor] -= 1
-                if indegree[neighbor] == 0:
-                    queue.append(neighbor)
-        # Only return brainlets that are in the config and in the sorted order
-        return [name_to_brainlet[name] for name in sorted_names if name in name_to_brainlet]
-
-    brainlets_sorted = topo_sort_brainlets(brainlets_config)
-    # Filter for pre-execution brainlets only
-    pre_brainlets = [b for b in brainlets_sorted if b.get('execution_stage') == 'pre']
+    return [
+        {
+            "role": msg["role"],
+            "content": msg["content"],
+            **({"tool_calls": msg["tool_calls"]} if msg.get("tool_calls") is not None else {}),
+            **({"function_call": msg["function_call"]} if msg.get("function_call") is not None else {}),
+            **({"tool_call_id": msg["tool_call_id"]} if msg.get("tool_call_id") is not None else {}),
+        }
+        for msg in ledger_buffer
+    ]
+
+
+async def _prepare_multiturn_request(message: MultiTurnRequest) -> Tuple[MultiTurnRequest, str, list, dict]:
+    """
+    Build the request sent to the proxy: user context, summaries, routed tools, the
+    ledger buffer and pre-execution brainlet output.
+
+    The user context chain (user id, then alias and agent prompt) and summaries
+    are read-only and run concurrently. The ledger sync, which stores the
+    incoming messages, starts once both have succeeded, so a failed load never
+    leaves a persisted message behind. Tool routing runs alongside the whole
+    chain; it never fails, falling back to every tool. Stage durations are
+    recorded in `pre_turn_timings`.
+
+    Returns:
+        Tuple[MultiTurnRequest, str, list, dict]: The proxy request, the platform,
+        the brainlet dependency levels and the pre-brainlets' output.
+
+    Raises:
+        HTTPException: If no summaries exist or the ledger sync fails.
+    """
+    # Memories only apply to ollama requests - we should not be sending them to openai requests.
+    memories = []
+    if message.provider == "ollama":
+        # sanitize proxy messages
+        message.messages = sanitize_messages(message.messages)
+
+    platform = message.platform or "api"
+
+    timings: Dict[str, float] = {}
+
+    async def _load_then_sync():
+        loaded = await _gather_or_cancel(
+            _load_user_context(message, timings),
+            pre_turn_timings.timed("summaries", _load_summaries(), timings),
+        )
+        # The sync persists the incoming messages, so it only runs once the reads that
+        # can fail have succeeded; a failed load leaves nothing behind for a retry to
+        # duplicate. Tool routing falls back to all tools instead of failing.
+        ledger_messages = await pre_turn_timings.timed("ledger_sync", _sync_ledger_buffer(message, platform), timings)
+        return (*loaded, ledger_messages)
+
+    async def _pre_turn():
+        return await _gather_or_cancel(
+            _load_then_sync(),
+            pre_turn_timings.timed("route_tools", _select_tools(message.messages), timings),
+        )
+
+    ((username, agent_prompt), summaries, ledger_messages), tools = await pre_turn_timings.timed(
+        "pre_turn", _pre_turn(), timings
+    )
+    logger.debug(f"Pre-turn stage timings (ms): {timings}")
+
+    # Provider logic can be kept if needed for other fields
+    try:
+        provider = config_store.mode(message.model).get("provider", "openai")
+    except ValueError:
+        provider = "openai"
+
+    # Build new MultiTurnRequest with updated fields
+    updated_request = message.copy(update={
+        "memories": [m.model_dump() for m in memories],
+        "messages": ledger_messages,
+        "username": username,
+        "summaries": summaries,
+        "platform": platform,
+        "tools": tools,
+        "agent_prompt": agent_prompt,
+        "provider": provider  # Set the resolved provider
+    })
+
+    # Run the pre-execution brainlets, each dependency level concurrently
+    brainlet_levels = topo_levels(config_store.get('brainlets', []))
     brainlets_output = {}
-    for brainlet in pre_brainlets:
-        modes = brainlet.get('modes', [])
-        if message.model in modes:
-            logger.debug(f"Running brainlet: {brainlet['name']} for mode: {message.model}")
-            brainlet_name = brainlet['name']
-            brainlet_func = getattr(app.brainlets, brainlet_name, None)
-            if brainlet_func:
-                logger.debug(f"Found brainlet function: {brainlet_func.__name__}")
-                brainlet_result = await brainlet_func(brainlets_output, updated_request)
-                brainlets_output[brainlet_name] = brainlet_result
+    await brainlet_executor.run_stage(brainlet_levels, 'pre', message.model, brainlets_output, updated_request, brainlets_output)
 
     # Merge brainlets_output lists into updated_request.messages
     # brainlets output is *not* saved to ledger's tool endpoint
@@ -257,16 +274,164 @@ async def outgoing_multiturn_message(message: MultiTurnRequest) -> ProxyResponse
                 if isinstance(val, list):
                     updated_request.messages.extend(val)
 
+    return updated_request, platform, brainlet_levels, brainlets_output
+
+
+async def _execute_tool_call(tool_call: dict):
+    """Run one function tool call and return its result (an error dict on failure)."""
+    fn = tool_call['function']['name']
+    args = tool_call['function'].get('arguments', '{}')
+    try:
+        args_dict = json.loads(args) if isinstance(args, str) else args
+    except Exception as e:
+        logger.error(f"Failed to parse tool arguments for {fn}: {e}")
+        return {"error": f"Failed to parse tool arguments: {e}"}
+    tool_response = await call_tool(fn, args_dict)
+    if tool_response.success:
+        logger.info(f"Tool {fn} executed: {tool_response.result}")
+        return tool_response.result
+    logger.error(f"Tool {fn} failed: {tool_response.error}")
+    return {"error": tool_response.error}
+
+
+def _is_serial_tool(name: str) -> bool:
+    meta = get_tool_meta(name)
+    return bool(meta and meta.serial)
+
+
+async def _execute_tool_calls(tool_calls: list) -> list:
+    """
+    Run tool calls concurrently and return their results in call order.
+
+    A tool whose ToolMeta sets `serial` runs alone: after every earlier call has
+    finished and before any later call starts.
+    """
+    results = [None] * len(tool_calls)
+    batch = []
+
+    async def _flush():
+        outputs = await asyncio.gather(*(_execute_tool_call(tool_calls[i]) for i in batch))
+        for i, output in zip(batch, outputs):
+            results[i] = output
+        batch.clear()
+
+    for i, tool_call in enumerate(tool_calls):
+        if _is_serial_tool(tool_call['function']['name']):
+            await _flush()
+            results[i] = await _execute_tool_call(tool_call)
+        else:
+            batch.append(i)
+    await _flush()
+    return results
+
+
+async def _run_tool_calls(tool_calls: list, updated_request: MultiTurnRequest, message: MultiTurnRequest, platform: str):
+    """
+    Execute the model's tool calls, sync every call and result to the ledger in one
+    bulk request, and append both to the conversation for the next proxy round.
+
+    Independent tool calls run concurrently; results are recorded in call order.
+    """
+    function_calls = [tool_call for tool_call in tool_calls if tool_call.get('type') == 'function']
+    if not function_calls:
+        return
+    tool_results = await _execute_tool_calls(function_calls)
+    tool_outputs = [
+        json.dumps(tool_result) if not isinstance(tool_result, str) else tool_result
+        for tool_result in tool_results
+    ]
+
+    # Sync tool calls and results to ledger
+    tool_sync_request = {
+        "calls": [
+            {
+                "model": message.model if hasattr(message, 'model') else None,
+                "platform": platform,
+                "tool_call": json.dumps(tool_call),
+                "tool_output": tool_output,
+                "tool_call_id": tool_call.get("id")
+            }
+            for tool_call, tool_output in zip(function_calls, tool_outputs)
+        ]
+    }
+    ledger_port = os.getenv("LEDGER_PORT", 4203)
+    async with httpx.AsyncClient(timeout=_timeout()) as client:
+        sync_response = await client.post(f"http://ledger:{ledger_port}/sync/tool", json=tool_sync_request)
+        sync_response.raise_for_status()
+
+    for tool_call, tool_output in zip(function_calls, tool_outputs):
+        # Add tool call message to conversation
+        updated_request.messages.append({
+            "role": "assistant",
+            "content": "",
+            "tool_calls": [tool_call]
+        })
+        # Add tool result message to conversation
+        updated_request.messages.append({
+            "role": "tool",
+            "content": tool_output,
+            "tool_call_id": tool_call.get("id")
+        })
+
+
+async def _sync_assistant_message(updated_request: MultiTurnRequest, message: MultiTurnRequest, platform: str, content: str):
+    """Sync the final assistant reply to the ledger and append it to the conversation."""
+    ledger_port = os.getenv("LEDGER_PORT", 4203)
+    assistant_sync_request = {
+        "model": message.model if hasattr(message, 'model') else None,
+        "platform": platform,
+        "content": content
+    }
+    
+    async with httpx.AsyncClient(timeout=_timeout()) as client:
+        sync_response = await client.post(f"http://ledger:{ledger_port}/sync/assistant", json=assistant_sync_request)
+        sync_response.raise_for_status()
+    
+    # Add assistant message to conversation
+    updated_request.messages.append({
+        "role": "assistant",
+        "content": content
+    })
+
+
+def _run_post_brainlets(brainlet_levels: list, brainlets_output: dict, updated_request: MultiTurnRequest, message: MultiTurnRequest):
+    """
+    Start the post-execution brainlets for the mode in the background, passing the
+    pre-brainlets' output and the final request. Their output is not synced to
+    the ledger and the response doesn't wait for them.
+    """
+    brainlet_executor.run_in_background(brainlet_levels, 'post', message.model, brainlets_output, updated_request)
+
+
+@router.post("/api/multiturn", response_model=ProxyResponse)
+async def outgoing_multiturn_message(message: MultiTurnRequest) -> ProxyResponse:
+    """
+    Handles multi-turn conversation requests by processing messages through a complex workflow:
+    - Retrieves memories and user context
+    - Runs pre-execution brainlets
+    - Sends request to proxy service
+    - Handles tool calls and function execution
+    - Syncs messages with ledger service
+    - Runs post-execution brainlets
+
+    Args:
+        message (MultiTurnRequest): The incoming multi-turn conversation request
+
+    Returns:
+        ProxyResponse: The final response from the conversation processing pipeline
+    """
+    logger.debug(f"brain: /api/multiturn Request:")
+
+    updated_request, platform, brainlet_levels, brainlets_output = await _prepare_multiturn_request(message)
+
     # send the payload to the proxy service and handle tool call loop
     final_response = None
     proxy_port = os.getenv("PROXY_PORT", 4205)
-    ledger_port = os.getenv("LEDGER_PORT", 4203)
-    max_iterations = 10
     iteration = 0
-    while iteration < max_iterations:
+    while iteration < MAX_TOOL_ITERATIONS:
         iteration += 1
         # 1. Send to proxy
-        async with httpx.AsyncClient(timeout=TIMEOUT) as client:
+        async with httpx.AsyncClient(timeout=_timeout()) as client:
             try:
                 response = await client.post(f"http://proxy:{proxy_port}/api/multiturn", json=updated_request.model_dump())
                 response.raise_for_status()
@@ -291,93 +456,172 @@ async def outgoing_multiturn_message(message: MultiTurnRequest) -> ProxyResponse
         tool_calls = getattr(proxy_response, 'tool_calls', None)
         
         if tool_calls:
-            # Handle tool calls
-            for tool_call in tool_calls:
-                if tool_call.get('type') == 'function':
-                    fn = tool_call['function']['name']
-                    args = tool_call['function'].get('arguments', '{}')
-                    try:
-                        args_dict = json.loads(args) if isinstance(args, str) else args
-                    except Exception as e:
-                        logger.error(f"Failed to parse tool arguments for {fn}: {e}")
-                        tool_result = {"error": f"Failed to parse tool arguments: {e}"}
-                    else:
-                        tool_response = await call_tool(fn, args_dict)
-                        if tool_response.success:
-                            tool_result = tool_response.result
-                            logger.info(f"Tool {fn} executed: {tool_result}")
-                        else:
-                            tool_result = {"error": tool_response.error}
-                            logger.error(f"Tool {fn} failed: {tool_response.error}")
-                    # Sync tool call and result to ledger
-                    tool_sync_request = {
-                        "model": message.model if hasattr(message, 'model') else None,
-                        "platform": platform,
-                        "tool_call": json.dumps(tool_call),
-                        "tool_output": json.dumps(tool_result) if not isinstance(tool_result, str) else tool_result,
-                        "tool_call_id": tool_call.get("id")
-                    }
-                    async with httpx.AsyncClient(timeout=TIMEOUT) as client:
-                        sync_response = await client.post(f"http://ledger:{ledger_port}/sync/tool", json=tool_sync_request)
-                        sync_response.raise_for_status()
-                    # Add tool call message to conversation
-                    updated_request.messages.append({
-                        "role": "assistant",
-                        "content": "",
-                        "tool_calls": [tool_call]
-                    })
-                    # Add tool result message to conversation  
-                    updated_request.messages.append({
-                        "role": "tool",
-                        "content": json.dumps(tool_result) if not isinstance(tool_result, str) else tool_result,
-                        "tool_call_id": tool_call.get("id")
-                    })
+            await _run_tool_calls(tool_calls, updated_request, message, platform)
             # Continue loop with updated messages
             continue
             
         elif proxy_response.response:
             # Handle assistant content
-            assistant_sync_request = {
-                "model": message.model if hasattr(message, 'model') else None,
-                "platform": platform,
-                "content": proxy_response.response
-            }
-            
-            async with httpx.AsyncClient(timeout=TIMEOUT) as client:
-                sync_response = await client.post(f"http://ledger:{ledger_port}/sync/assistant", json=assistant_sync_request)
-                sync_response.raise_for_status()
-            
-            # Add assistant message to conversation
-            updated_request.messages.append({
-                "role": "assistant",
-                "content": proxy_response.response
-            })
-            
+            await _sync_assistant_message(updated_request, message, platform, proxy_response.response)
             final_response = proxy_response
             break
         
-    if iteration >= max_iterations:
-        logger.warning("Tool execution loop hit max iterations (%d); forcing response", max_iterations)
+    if iteration >= MAX_TOOL_ITERATIONS:
+        logger.warning("Tool execution loop hit max iterations (%d); forcing response", MAX_TOOL_ITERATIONS)
 
     if final_response is None:
         final_response = proxy_response
 
     
-    # Run post-execution brainlets
+    # Start post-execution brainlets in the background
     # these do not get synced to ledger.
-    post_brainlets = [b for b in brainlets_sorted if b.get('execution_stage') == 'post']
-    post_brainlets_output = {}
-    for brainlet in post_brainlets:
-        modes = brainlet.get('modes', [])
-        if message.model in modes:
-            logger.debug(f"Running post brainlet: {brainlet['name']} for mode: {message.model}")
-            brainlet_name = brainlet['name']
-            brainlet_func = getattr(app.brainlets, brainlet_name, None)
-            if brainlet_func:
-                logger.debug(f"Found post brainlet function: {brainlet_func.__name__}")
-                # Pass the latest brainlets_output and updated_request (with final_response)
-                post_result = await brainlet_func(brainlets_output, updated_request)
-                post_brainlets_output[brainlet_name] = post_result
+    _run_post_brainlets(brainlet_levels, brainlets_output, updated_request, message)
 
     logger.debug(f"brain: /api/multiturn Returns:\n{final_response.model_dump_json(indent=4)}")
     return final_response
+
+
+class _ToolCallBuffer:
+    """Reassembles streamed OpenAI-format tool-call deltas into complete tool calls."""
+
+    def __init__(self):
+        self._calls: Dict[int, dict] = {}
+
+    def __bool__(self) -> bool:
+        return bool(self._calls)
+
+    def add(self, deltas: list):
+        for position, delta in enumerate(deltas):
+            index = delta.get("index", position)
+            call = self._calls.setdefault(index, {"id": None, "type": "function", "function": {"name": "", "arguments": ""}})
+            if delta.get("id"):
+                call["id"] = delta["id"]
+            if delta.get("type"):
+                call["type"] = delta["type"]
+            function = delta.get("function") or {}
+            if function.get("name"):
+                call["function"]["name"] += function["name"]
+            if function.get("arguments"):
+                arguments = function["arguments"]
+                call["function"]["arguments"] += arguments if isinstance(arguments, str) else json.dumps(arguments)
+
+    def tool_calls(self) -> list:
+        return [self._calls[index] for index in sorted(self._calls)]
+
+
+@router.post("/api/multiturn/stream")
+async def outgoing_multiturn_message_stream(message: MultiTurnRequest) -> StreamingResponse:
+    """
+    Streaming variant of /api/multiturn.
+
+    Runs the same pipeline, but relays the model's content deltas to the caller as
+    ProxyStreamChunk server-sent events while the proxy streams them. Tool-call
+    deltas are buffered until the proxy round completes, then the tools run and the
+    next round streams. When the final round completes, the assistant message is
+    synced to the ledger, post-execution brainlets start, and a 'done' event with the
+    token counts ends the stream.
+
+    Failures before the first content delta are returned as HTTP errors; later ones
+    end the stream with an 'error' event. If the caller disconnects mid-stream,
+    the partial reply is not synced.
+
+    Args:
+        message (MultiTurnRequest): The incoming multi-turn conversation request
+
+    Returns:
+        StreamingResponse: Server-sent events of ProxyStreamChunk objects.
+    """
+    logger.debug(f"brain: /api/multiturn/stream Request:")
+
+    updated_request, platform, brainlet_levels, brainlets_output = await _prepare_multiturn_request(message)
+    events = await prime_stream(_stream_multiturn(message, updated_request, platform, brainlet_levels, brainlets_output))
+    return StreamingResponse(events, media_type="text/event-stream")
+
+
+async def _stream_proxy_round(updated_request: MultiTurnRequest) -> AsyncIterator[ProxyStreamChunk]:
+    """Stream one /api/multiturn/stream round from the proxy."""
+    proxy_port = os.getenv("PROXY_PORT", 4205)
+    async with httpx.AsyncClient(timeout=_timeout()) as client:
+        try:
+            async with client.stream("POST", f"http://proxy:{proxy_port}/api/multiturn/stream", json=updated_request.model_dump()) as response:
+                if response.is_error:
+                    await response.aread()
+                    logger.error(f"Error from proxy service stream: {response.status_code} - {response.text}")
+                    raise HTTPException(
+                        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                        detail=f"Failed to send request to proxy service: {response.text}"
+                    )
+                async for data in iter_sse_data(response):
+                    chunk = ProxyStreamChunk.model_validate_json(data)
+                    if chunk.type == "error":
+                        raise HTTPException(
+                            status_code=status.HTTP_502_BAD_GATEWAY,
+                            detail=f"Proxy stream failed: {chunk.detail}"
+                        )
+                    yield chunk
+        except httpx.RequestError as e:
+            logger.error(f"Error sending request to proxy service: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Failed to send request to proxy service: {e}"
+            )
+
+
+async def _stream_multiturn(
+    message: MultiTurnRequest,
+    updated_request: MultiTurnRequest,
+    platform: str,
+    brainlet_levels: list,
+    brainlets_output: dict,
+) -> AsyncIterator[str]:
+    """Proxy/tool loop of the streaming endpoint, yielding SSE-encoded chunks."""
+    relayed = False
+    done = None
+    try:
+        for iteration in range(MAX_TOOL_ITERATIONS):
+            tool_calls = _ToolCallBuffer()
+            # Content of this round only; text streamed before a tool call isn't recorded
+            round_content = []
+            async for chunk in _stream_proxy_round(updated_request):
+                if chunk.type == "done":
+                    done = chunk
+                    continue
+                if chunk.tool_calls:
+                    tool_calls.add(chunk.tool_calls)
+                if chunk.content:
+                    relayed = True
+                    round_content.append(chunk.content)
+                    yield ProxyStreamChunk(type="delta", content=chunk.content).to_sse()
+
+            if not tool_calls:
+                # The final round's reply is what the ledger records, as in /api/multiturn
+                content = "".join(round_content).strip()
+                if content:
+                    await _sync_assistant_message(updated_request, message, platform, content)
+                break
+            await _run_tool_calls(tool_calls.tool_calls(), updated_request, message, platform)
+        else:
+            logger.warning("Tool execution loop hit max iterations (%d); forcing response", MAX_TOOL_ITERATIONS)
+
+        _run_post_brainlets(brainlet_levels, brainlets_output, updated_request, message)
+    except HTTPException as e:
+        if not relayed:
+            # Nothing sent yet; surfaces as the HTTP error response
+            raise
+        logger.error(f"brain: /api/multiturn/stream failed: {e.detail}")
+        yield ProxyStreamChunk(type="error", detail=str(e.detail)).to_sse()
+        return
+    except Exception as e:
+        if not relayed:
+            raise
+        logger.error(f"brain: /api/multiturn/stream failed: {e}")
+        yield ProxyStreamChunk(type="error", detail=f"Streaming pipeline failed: {e}").to_sse()
+        return
+
+    yield ProxyStreamChunk(
+        type="done",
+        finish_reason=done.finish_reason if done else "stop",
+        eval_count=done.eval_count if done else None,
+        prompt_eval_count=done.prompt_eval_count if done else None,
+        timestamp=datetime.now().isoformat(),
+    ).to_sse()
@@ -0,0 +1,178 @@
+"""
+Level-parallel brainlet execution along the `depends_on` DAG.
+
+Brainlets configured in `config.json` are grouped into topological levels: a
+level holds every brainlet whose dependencies all sit in earlier levels. Levels
+run one after another; the brainlets within a level run concurrently, and each
+sees the output of all earlier levels in `brainlets_output`.
+
+Every brainlet runs under a timeout, taken from its config entry (`"timeout"`,
+seconds) or DEFAULT_BRAINLET_TIMEOUT_S. A brainlet that times out or raises is
+logged, counted and left out of the output, so it can't stall or fail the turn.
+
+Post-execution brainlets run as background tasks after the response is returned;
+shutdown waits briefly for those still running.
+"""
+
+from shared.models.proxy import MultiTurnRequest
+
+from shared.log_config import get_logger
+logger = get_logger(f"brain.{__name__}")
+
+import asyncio
+from collections import defaultdict
+from typing import Any, Dict, List, Set
+
+import app.brainlets
+from app.services.timings import brainlet_timings
+
+DEFAULT_BRAINLET_TIMEOUT_S = 30
+
+# How long shutdown waits for background post-brainlets
+DRAIN_TIMEOUT_S = 10
+
+_SKIPPED = object()
+
+
+def topo_levels(brainlets: List[dict]) -> List[List[dict]]:
+    """
+    Group brainlets into dependency levels with Kahn's algorithm.
+
+    Brainlets that are part of a cycle, or depend on a brainlet missing from the
+    config, are left out.
+    """
+    name_to_brainlet = {b['name']: b for b in brainlets}
+    graph = defaultdict(list)
+    indegree = defaultdict(int)
+    for b in brainlets:
+        for dep in b.get('depends_on', []):
+            graph[dep].append(b['name'])
+            indegree[b['name']] += 1
+        if b['name'] not in indegree:
+            indegree[b['name']] = 0
+
+    levels = []
+    current = [name for name, deg in indegree.items() if deg == 0]
+    while current:
+        levels.append([name_to_brainlet[name] for name in current if name in name_to_brainlet])
+        following = []
+        for name in current:
+            for neighbor in graph[name]:
+                indegree[neighbor] -= 1
+                if indegree[neighbor] == 0:
+                    following.append(neighbor)
+        current = following
+    return [level for level in levels if level]
+
+
+class BrainletExecutor:
+    """Runs brainlet levels concurrently with timeouts, and post-brainlets in the background."""
+
+    def __init__(self):
+        self._background: Set[asyncio.Task] = set()
+        self.timeouts: Dict[str, int] = defaultdict(int)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.background_started = 0
+        self.background_failed = 0
+
+    async def _run_one(self, brainlet: dict, brainlets_output: Dict[str, Any], request: MultiTurnRequest):
+        name = brainlet['name']
+        brainlet_func = getattr(app.brainlets, name, None)
+        if brainlet_func is None:
+            logger.warning(f"Brainlet {name} is configured but not defined in app.brainlets")
+            return _SKIPPED
+        timeout = float(brainlet.get('timeout', DEFAULT_BRAINLET_TIMEOUT_S))
+        logger.debug(f"Running brainlet: {name} (timeout {timeout}s)")
+        try:
+            return await brainlet_timings.timed(
+                name,
+                asyncio.wait_for(brainlet_func(brainlets_output, request), timeout),
+            )
+        except asyncio.TimeoutError:
+            self.timeouts[name] += 1
+            logger.warning(f"Brainlet {name} timed out after {timeout}s; continuing without it")
+        except Exception as e:
+            self.errors[name] += 1
+            logger.error(f"Brainlet {name} failed; continuing without it: {e}", exc_info=True)
+        return _SKIPPED
+
+    async def run_stage(
+        self,
+        levels: List[List[dict]],
+        stage: str,
+        mode: str,
+        brainlets_output: Dict[str, Any],
+        request: MultiTurnRequest,
+        results: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        """
+        Run the brainlets of one execution stage ('pre' or 'post') enabled for `mode`.
+
+        Args:
+            levels: Dependency levels from `topo_levels`.
+            stage: The `execution_stage` to run.
+            mode: The requested mode; only brainlets listing it in `modes` run.
+            brainlets_output: Output passed to each brainlet.
+            request: The request passed to each brainlet.
+            results: Receives `name -> output` after each level. Pass
+                `brainlets_output` itself so later levels see earlier results.
+
+        Returns:
+            Dict[str, Any]: `results`.
+        """
+        for level in levels:
+            selected = [b for b in level if b.get('execution_stage') == stage and mode in b.get('modes', [])]
+            if not selected:
+                continue
+            outputs = await asyncio.gather(*(self._run_one(b, brainlets_output, request) for b in selected))
+            for brainlet, output in zip(selected, outputs):
+                if output is not _SKIPPED:
+                    results[brainlet['name']] = output
+        return results
+
+    def run_in_background(self, levels: List[List[dict]], stage: str, mode: str, brainlets_output: Dict[str, Any], request: MultiTurnRequest):
+        """Schedule `run_stage` without waiting for it; the caller's response isn't delayed."""
+        if not any(b.get('execution_stage') == stage and mode in b.get('modes', []) for level in levels for b in level):
+            return
+        task = asyncio.create_task(self.run_stage(levels, stage, mode, brainlets_output, request, {}))
+        self._background.add(task)
+        self.background_started += 1
+        task.add_done_callback(self._background_done)
+
+    def _background_done(self, task: asyncio.Task):
+        self._background.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            self.background_failed += 1
+            logger.error(f"Background brainlets failed: {task.exception()}")
+
+    async def drain(self, timeout: float = DRAIN_TIMEOUT_S):
+        """Wait up to `timeout` seconds for background brainlets, then cancel the rest."""
+        if not self._background:
+            return
+        pending = list(self._background)
+        _, still_running = await asyncio.wait(pending, timeout=timeout)
+        for task in still_running:
+            task.cancel()
+        if still_running:
+            logger.warning(f"Cancelled {len(still_running)} background brainlet run(s) at shutdown")
+
+    def stats(self) -> Dict[str, Any]:
+        """Per-brainlet latency histograms, timeouts and errors, and background task counts."""
+        latency = brainlet_timings.stats()
+        names = set(latency) | set(self.timeouts) | set(self.errors)
+        return {
+            "brainlets": {
+                name: {
+                    **latency.get(name, {}),
+                    "timeouts": self.timeouts.get(name, 0),
+                    "errors": self.errors.get(name, 0),
+                }
+                for name in sorted(names)
+            },
+            "background_running": len(self._background),
+            "background_started": self.background_started,
+            "background_failed": self.background_failed,
+        }
+
+
+brainlet_executor = BrainletExecutor()
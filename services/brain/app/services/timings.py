@@ -0,0 +1,80 @@
+"""
+Per-stage latency counters for the brain's message pipeline.
+
+Stages are timed with `StageTimings.timed()`, which records the duration both in
+the process-wide counters (served on `GET /_timings`) and in an optional
+per-request dict, so a single turn can be logged as one line of stage timings.
+Each stage also keeps a cumulative latency histogram over HISTOGRAM_BUCKETS_MS.
+"""
+
+import bisect
+import time
+from typing import Awaitable, Dict, Optional, TypeVar
+
+T = TypeVar("T")
+
+# Upper bounds (inclusive, milliseconds) of the histogram buckets; slower calls land in "+Inf"
+HISTOGRAM_BUCKETS_MS = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+
+
+class StageTimings:
+    """Count, total, max, last duration and a latency histogram per named stage."""
+
+    def __init__(self):
+        self._stages: Dict[str, dict] = {}
+
+    def record(self, stage: str, elapsed_s: float):
+        entry = self._stages.get(stage)
+        if entry is None:
+            entry = self._stages[stage] = {
+                "count": 0, "total_s": 0.0, "max_s": 0.0, "last_s": 0.0,
+                "buckets": [0] * (len(HISTOGRAM_BUCKETS_MS) + 1),
+            }
+        entry["count"] += 1
+        entry["buckets"][bisect.bisect_left(HISTOGRAM_BUCKETS_MS, elapsed_s * 1000)] += 1
+        entry["total_s"] += elapsed_s
+        entry["max_s"] = max(entry["max_s"], elapsed_s)
+        entry["last_s"] = elapsed_s
+
+    async def timed(self, stage: str, work: Awaitable[T], into: Optional[Dict[str, float]] = None) -> T:
+        """
+        Await `work` and record how long it took, including when it fails.
+
+        Args:
+            stage: Stage name, e.g. 'summaries'.
+            work: The awaitable to time.
+            into: Optional per-request dict that receives `stage -> milliseconds`.
+        """
+        started = time.perf_counter()
+        try:
+            return await work
+        finally:
+            elapsed = time.perf_counter() - started
+            self.record(stage, elapsed)
+            if into is not None:
+                into[stage] = round(elapsed * 1000, 1)
+
+    def stats(self) -> Dict[str, dict]:
+        """
+        Per-stage call counts, average/max/last latency in milliseconds, and a
+        cumulative histogram (`le` bucket bound in ms -> calls at or below it).
+        """
+        result = {}
+        for stage, entry in self._stages.items():
+            histogram = {}
+            cumulative = 0
+            for bound, count in zip([*HISTOGRAM_BUCKETS_MS, "+Inf"], entry["buckets"]):
+                cumulative += count
+                histogram[str(bound)] = cumulative
+            result[stage] = {
+                "count": int(entry["count"]),
+                "avg_ms": round(1000 * entry["total_s"] / entry["count"], 2) if entry["count"] else 0.0,
+                "max_ms": round(1000 * entry["max_s"], 2),
+                "last_ms": round(1000 * entry["last_s"], 2),
+                "histogram_ms": histogram,
+            }
+        return result
+
+
+pre_turn_timings = StageTimings()
+brainlet_timings = StageTimings()
@@ -47,6 +47,8 @@ class ToolMeta(BaseModel):
     clients: List[str] = ["internal"]  # who can call this tool
     service: Optional[str] = None  # which microservice it depends on (informational)
     guidance: Optional[str] = None  # extra context injected into system prompt when tool is available
+    serial: bool = False  # never run concurrently with other tool calls from the same model response
+    examples: List[str] = []  # sample user messages that need this tool (local embedding router)
 
 
 def tool(
@@ -58,6 +60,8 @@ def tool(
     clients: Optional[List[str]] = None,
     service: Optional[str] = None,
     guidance: Optional[str] = None,
+    serial: bool = False,
+    examples: Optional[List[str]] = None,
 ):
     """Decorator that attaches tool metadata to an async function.
 
@@ -79,6 +83,8 @@ def tool(
         clients=clients,
         service=service,
         guidance=guidance,
+        serial=serial,
+        examples=examples or [],
     )
 
     def decorator(fn):
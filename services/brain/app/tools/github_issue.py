@@ -4,12 +4,12 @@ Actions: create, list, view, comment, close, list_comments.
 Uses httpx (async) instead of the legacy sync requests.
 """
 
-import json
 from typing import Any, Dict
 
 import httpx
 
 from app.tools.base import tool, ToolResponse
+from shared.config_store import config_store
 from shared.log_config import get_logger
 
 logger = get_logger(f"brain.{__name__}")
@@ -17,8 +17,7 @@ logger = get_logger(f"brain.{__name__}")
 
 def _load_github_config() -> Dict[str, Any]:
     """Load GitHub config (repo, token, timeout) from config.json."""
-    with open("/app/config/config.json") as f:
-        config = json.load(f)
+    config = config_store.config
     return {
         "repo": config["github"]["repo"],
         "token": config["github"]["token"],
@@ -33,6 +32,13 @@ def _load_github_config() -> Dict[str, Any]:
     always=False,
     clients=["internal", "copilot"],
     service="github",
+    examples=[
+        "File a bug about the login page crashing",
+        "Open a GitHub issue for this",
+        "What issues are still open on the repo?",
+        "Add a comment to issue 42",
+        "Close the ticket about the broken build",
+    ],
     parameters={
         "type": "object",
         "properties": {
@@ -5,7 +5,6 @@ Rewritten from scratch — the old MCP version imported a model that
 no longer exists (MCPToolResponse).
 """
 
-import json
 import sqlite3
 import uuid
 from datetime import datetime
@@ -13,6 +12,7 @@ from pathlib import Path
 from typing import Any, Dict
 
 from app.tools.base import tool, ToolResponse
+from shared.config_store import config_store
 from shared.log_config import get_logger
 
 logger = get_logger(f"brain.{__name__}")
@@ -24,9 +24,7 @@ _USER_ID = "c63989a3-756c-4bdf-b0c2-13d01e129e02"
 
 def _get_db_path() -> str:
     """Resolve the brainlets DB path from config.json."""
-    with open("/app/config/config.json") as f:
-        config = json.load(f)
-    return config["db"]["brainlets"]
+    return config_store.config["db"]["brainlets"]
 
 
 @tool(
@@ -36,6 +34,7 @@ def _get_db_path() -> str:
     always=True,
     clients=["internal"],
     service="brainlets",
+    serial=True,
     parameters={
         "type": "object",
         "properties": {
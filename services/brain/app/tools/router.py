@@ -1,7 +1,24 @@
-"""Tool router — cheap LLM call to select relevant tools per message.
+"""Tool router — selects the routed tools relevant to each message.
 
-With only 4 tools (3 always-on, 1 routed), this is infrastructure for when
-the tool count grows. Currently github_issue is the only routed tool.
+Two strategies, chosen by `tool_router.mode` in config.json:
+
+- "llm" (default): a cheap LLM call through the proxy's `router` mode.
+- "local": each routed tool's description and `examples` (ToolMeta) are
+  embedded once with a small sentence-transformers model; each message is
+  embedded on CPU and scored by cosine similarity against them. Tools scoring
+  at least `threshold + margin` are selected, below `threshold - margin` are
+  dropped, and only the ambiguous ones in between go to the LLM router.
+
+    "tool_router": {
+        "mode": "local",
+        "model": "all-MiniLM-L6-v2",
+        "threshold": 0.45,
+        "margin": 0.08
+    }
+
+If sentence-transformers isn't installed or the model can't be loaded, the
+local mode falls back to the LLM router. `scripts/eval_tool_router.py`
+measures precision/recall of the local scores against labelled messages.
 
 Usage:
     from app.tools.router import route_tools
@@ -12,16 +29,33 @@ Usage:
     # selected is a list of tool name strings
 """
 
+import asyncio
 import json
 import os
-from typing import Dict, List
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
 
 import httpx
 
+from shared.config_store import config_store
 from shared.log_config import get_logger
 
 logger = get_logger(f"brain.{__name__}")
 
+# Try to import sentence-transformers, fall back gracefully
+try:
+    import numpy as np
+    from sentence_transformers import SentenceTransformer
+    EMBEDDINGS_AVAILABLE = True
+except ImportError as e:
+    EMBEDDINGS_AVAILABLE = False
+    logger.info(f"Sentence-transformers not available; local tool routing disabled: {e}")
+
+DEFAULT_EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+DEFAULT_THRESHOLD = 0.45
+DEFAULT_MARGIN = 0.08
+
 # Router prompt — kept small for cheap model consumption (~500 tokens in)
 _ROUTER_PROMPT = """You are a tool router. Given a user message, decide which tools (if any) are relevant.
 
@@ -34,6 +68,107 @@ Return a JSON array of tool names that are relevant, or an empty array if none a
 When in doubt, include the tool. Return ONLY the JSON array, no other text."""
 
 
+def _router_config() -> dict:
+    return config_store.get("tool_router") or {}
+
+
+class LocalToolRouter:
+    """Embedding-similarity scores between a message and each routed tool."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._model = None
+        self._model_name: Optional[str] = None
+        # Catalog the index was built for, and per tool the matrix of its normalized text embeddings
+        self._index_key: Optional[tuple] = None
+        self._index: Dict[str, "np.ndarray"] = {}
+        self.local_decisions = 0
+        self.llm_fallbacks = 0
+        self.failures = 0
+        self.score_s = 0.0
+        self.scored = 0
+
+    def _tool_texts(self, name: str, description: str) -> List[str]:
+        from app.tools import get_tool_meta
+
+        meta = get_tool_meta(name)
+        examples = meta.examples if meta is not None else []
+        return [f"{name}: {description}", *examples]
+
+    def _ensure_index(self, catalog: Dict[str, str], model_name: Optional[str] = None):
+        model_name = model_name or _router_config().get("model", DEFAULT_EMBEDDING_MODEL)
+        key = (model_name, tuple(sorted(catalog.items())))
+        if key == self._index_key:
+            return
+        with self._lock:
+            if key == self._index_key:
+                return
+            if self._model is None or self._model_name != model_name:
+                started = time.perf_counter()
+                self._model = SentenceTransformer(model_name, device="cpu")
+                self._model_name = model_name
+                logger.info(f"Loaded tool router embedding model {model_name} in {time.perf_counter() - started:.1f}s")
+            index = {}
+            for name, description in catalog.items():
+                texts = self._tool_texts(name, description)
+                index[name] = self._model.encode(texts, convert_to_numpy=True, normalize_embeddings=True)
+            self._index = index
+            self._index_key = key
+            logger.info(f"Indexed {len(index)} routed tools for local routing")
+
+    def warm_up(self, catalog: Dict[str, str], model_name: Optional[str] = None):
+        """Load the model and embed the catalog ahead of the first message."""
+        if EMBEDDINGS_AVAILABLE and catalog:
+            self._ensure_index(catalog, model_name)
+
+    def score(self, user_message: str, catalog: Dict[str, str], model_name: Optional[str] = None) -> Dict[str, float]:
+        """
+        Cosine similarity between the message and each tool: the best match among
+        the tool's description and example utterances. Runs on the calling thread.
+
+        Args:
+            model_name: Embedding model; defaults to `tool_router.model` in config.
+        """
+        self._ensure_index(catalog, model_name)
+        started = time.perf_counter()
+        vector = self._model.encode([user_message], convert_to_numpy=True, normalize_embeddings=True)[0]
+        scores = {name: float(np.max(matrix @ vector)) for name, matrix in self._index.items() if name in catalog}
+        self.score_s += time.perf_counter() - started
+        self.scored += 1
+        return scores
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "available": EMBEDDINGS_AVAILABLE,
+            "model": self._model_name,
+            "indexed_tools": len(self._index),
+            "local_decisions": self.local_decisions,
+            "llm_fallbacks": self.llm_fallbacks,
+            "failures": self.failures,
+            "avg_score_ms": round(1000 * self.score_s / self.scored, 2) if self.scored else 0.0,
+        }
+
+
+local_tool_router = LocalToolRouter()
+
+
+def split_by_score(scores: Dict[str, float], threshold: float, margin: float) -> Tuple[List[str], List[str]]:
+    """Return (selected, ambiguous) tool names for the given similarity scores."""
+    selected = [name for name, score in scores.items() if score >= threshold + margin]
+    ambiguous = [name for name, score in scores.items() if threshold - margin <= score < threshold + margin]
+    return selected, ambiguous
+
+
+async def warm_up_tool_router(catalog: Dict[str, str]):
+    """Build the local router's index at startup when local routing is configured."""
+    if _router_config().get("mode") != "local":
+        return
+    try:
+        await asyncio.to_thread(local_tool_router.warm_up, catalog)
+    except Exception as e:
+        logger.warning(f"Local tool router warm-up failed; will retry on first message: {e}")
+
+
 async def route_tools(
     user_message: str,
     catalog: Dict[str, str],
@@ -42,6 +177,9 @@ async def route_tools(
 ) -> List[str]:
     """Determine which routed tools are relevant for a user message.
 
+    Uses the local embedding router when `tool_router.mode` is "local" (sending
+    only ambiguous tools to the LLM), otherwise the LLM router.
+
     Args:
         user_message: The user's current message.
         catalog: {tool_name: description} dict of routable tools.
@@ -55,6 +193,41 @@ async def route_tools(
     if not catalog:
         return []
 
+    router_config = _router_config()
+    if router_config.get("mode") == "local" and EMBEDDINGS_AVAILABLE:
+        try:
+            scores = await asyncio.to_thread(local_tool_router.score, user_message or "", catalog)
+        except Exception as e:
+            local_tool_router.failures += 1
+            logger.warning(f"Local tool router failed ({e.__class__.__name__}: {e}); using the LLM router")
+        else:
+            selected, ambiguous = split_by_score(
+                scores,
+                float(router_config.get("threshold", DEFAULT_THRESHOLD)),
+                float(router_config.get("margin", DEFAULT_MARGIN)),
+            )
+            logger.debug("Local router scores: %s", {name: round(score, 3) for name, score in scores.items()})
+            if not ambiguous:
+                local_tool_router.local_decisions += 1
+                logger.info("Local router selected %d/%d tools: %s", len(selected), len(catalog), selected)
+                return selected
+            local_tool_router.llm_fallbacks += 1
+            resolved = await _route_tools_llm(
+                user_message, {name: catalog[name] for name in ambiguous}, mode, recent_context
+            )
+            return selected + resolved
+
+    return await _route_tools_llm(user_message, catalog, mode, recent_context)
+
+
+async def _route_tools_llm(
+    user_message: str,
+    catalog: Dict[str, str],
+    mode: str,
+    recent_context: str,
+) -> List[str]:
+    """Ask the cheap LLM router which of the catalog's tools are relevant."""
+
     # Build the catalog text
     catalog_text = "\n".join(f"- {name}: {desc}" for name, desc in catalog.items())
 
@@ -78,6 +251,7 @@ async def route_tools(
                 json={
                     "model": mode,
                     "prompt": prompt_text,
+                    "priority": "router",
                 },
             )
             response.raise_for_status()
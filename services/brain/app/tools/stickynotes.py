@@ -30,6 +30,13 @@ _TIMEOUT = 30
     clients=["internal"],
     service="stickynotes",
     guidance="Use ISO 8601 format for dates (e.g. 2026-02-27T09:00:00). For recurring notes, use ISO 8601 repeating intervals (e.g. R/P1D for daily, R/P7D for weekly). Snooze durations use ISO 8601 durations (e.g. PT1H for 1 hour, P1D for 1 day).",
+    examples=[
+        "Remind me to take the trash out tomorrow morning",
+        "Set a reminder to call mom every Sunday",
+        "What reminders do I have?",
+        "Snooze that note for an hour",
+        "Mark the dentist reminder as done",
+    ],
     parameters={
         "type": "object",
         "properties": {
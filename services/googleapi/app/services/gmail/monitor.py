@@ -273,7 +273,8 @@ class EmailMonitor:
                 }
             ],
             platform='gmail',
-            user_id='c63989a3-756c-4bdf-b0c2-13d01e129e02'
+            user_id='c63989a3-756c-4bdf-b0c2-13d01e129e02',
+            priority='batch'
         )
 
         return request
@@ -26,6 +26,11 @@ from app.routes.user import router as user_router
 from app.routes.sync import router as sync_router
 
 from app.setup import init_buffer_db
+from app.services.embedding.index import vector_indexes
+from app.services.embedding.store import embedding_store
+from app.services.summary.llm import summary_llm
+from app.services.summary.rollup import rollup_stats
+from app.util import db_pool
 
 init_buffer_db()
 
@@ -33,9 +38,18 @@ from shared.docs_exporter import router as docs_router
 from shared.routes import router as routes_router, register_list_routes
 
 from shared.models.middleware import CacheRequestBodyMiddleware
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, Query, status
+from typing import List, Optional
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    await summary_llm.close()
+
+
+app = FastAPI(lifespan=lifespan)
 app.add_middleware(CacheRequestBodyMiddleware)
 
 app.include_router(routes_router, tags=["system"])
@@ -48,6 +62,54 @@ app.include_router(context_router, tags=["context"], prefix="/context")
 app.include_router(user_router, tags=["user"], prefix="/user")
 app.include_router(sync_router, tags=["sync"], prefix="/sync")
 
+
+@app.get("/_db_pool", tags=["system"])
+def db_pool_stats():
+    """Connection pool counters for the ledger database."""
+    return {"status": "ok", "stats": db_pool.stats()}
+
+
+@app.get("/_summary_llm", tags=["system"])
+def summary_llm_stats():
+    """Summarize-call counters and concurrency for summary generation."""
+    return {"status": "ok", "stats": summary_llm.stats()}
+
+
+@app.get("/_summary_rollups", tags=["system"])
+def summary_rollup_stats():
+    """Per summary type: nodes reused because their inputs were unchanged, and nodes regenerated."""
+    return {"status": "ok", "stats": rollup_stats.stats()}
+
+
+@app.get("/_embeddings", tags=["system"])
+def embedding_stats():
+    """Embedding model, stored vector counts per entity type and model, and encode counters."""
+    return {"status": "ok", "stats": embedding_store.stats()}
+
+
+@app.post("/_embeddings/backfill", tags=["system"])
+def embedding_backfill(entity_type: Optional[List[str]] = Query(None, description="memory and/or topic (default: both)")):
+    """
+    Store vectors for memories and topics missing one (or with a stale one), prune
+    orphaned vectors, and rebuild the vector index snapshots.
+    """
+    try:
+        stats = embedding_store.backfill(entity_type)
+        for backfilled in stats:
+            stats[backfilled]["indexed"] = vector_indexes[backfilled].rebuild()
+        return {"status": "ok", "stats": stats}
+    except RuntimeError as e:
+        raise HTTPException(status_code=status.HTTP_501_NOT_IMPLEMENTED, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@app.get("/_vector_index", tags=["system"])
+def vector_index_stats():
+    """Per entity type: index backend, snapshot and delta sizes, rebuilds and search timings."""
+    return {"status": "ok", "stats": {entity_type: index.stats() for entity_type, index in vector_indexes.items()}}
+
+
 register_list_routes(app)
 
 import json
@@ -12,9 +12,11 @@ Endpoints:
     - GET    /memories/by-topic/{topic_id}: Retrieve all memories associated with a topic.
     - POST   /memories/_scan: Scan user messages to identify and assign topics (scheduler endpoint).
     - GET    /memories/_search: Search for memories using various filters.
+    - GET    /memories/_similar: Memories most similar to a memory or text, by embedding.
+    - GET    /memories/_access_stats: Counters for batched access-statistics writes.
     - GET    /memories/_dedup: Deduplicate memories using different grouping strategies.
     - POST   /memories/_dedup_topic_based: Topic-based deduplication with timeframe chunking.
-    - GET    /memories/_dedup_semantic: Semantic deduplication using timeframe or keyword grouping.
+    - GET    /memories/_dedup_semantic: Semantic deduplication using timeframe, keyword or similarity grouping.
 Each endpoint handles validation, error handling, and logging, and delegates business logic to the service layer.
 """
 
@@ -27,12 +29,14 @@ from app.services.memory.get_list import _memory_list
 from app.services.memory.patch import _memory_patch
 from app.services.memory.scan import _scan_user_messages
 from app.services.memory.search import _memory_search
+from app.services.memory.similar import _memory_similar
+from app.services.memory.access_stats import access_stats
 from app.services.memory.util import _memory_exists
 from app.services.memory.dedup import _memory_deduplicate
 from app.services.memory.dedup_topic_based import _memory_deduplicate_topic_based
 from app.services.memory.dedup_semantic import _memory_deduplicate_semantic
 
-from shared.models.ledger import MemoryEntry, MemoryListRequest, MemorySearchParams, MemoryDedupResponse
+from shared.models.ledger import MemoryEntry, MemoryListRequest, MemorySearchParams, MemorySimilarParams, MemoryDedupResponse
 
 from typing import List
 
@@ -296,7 +300,8 @@ def memory_search(
     memory_id: str = Query(None, description="Memory ID to search for (ignores other filters if provided)."),
     min_keywords: int = Query(2, description="Minimum number of matching keywords required."),
     created_after: str = Query(None, description="Return memories created after this timestamp (ISO format)."),
-    created_before: str = Query(None, description="Return memories created before this timestamp (ISO format).")
+    created_before: str = Query(None, description="Return memories created before this timestamp (ISO format)."),
+    limit: int = Query(None, ge=1, description="Maximum number of memories to return, best keyword matches first.")
 ):
     """
     FastAPI endpoint for searching memories. Accepts query parameters and converts them
@@ -314,7 +319,8 @@ def memory_search(
         memory_id=memory_id,
         min_keywords=min_keywords,
         created_after=created_after,
-        created_before=created_before
+        created_before=created_before,
+        limit=limit
     )
     
     logger.debug(f"Created params: {params}")
@@ -344,6 +350,32 @@ def memory_search(
         logger.error(f"Unexpected error: {e}")
         return {"status": "error", "detail": f"Unexpected error occurred: {e}"}
 
+@router.get("/_similar", response_model=dict)
+def memory_similar(
+    memory_id: str = Query(None, description="Find memories similar to this memory (excluding itself)."),
+    text: str = Query(None, description="Find memories similar to this text (used if memory_id is not given)."),
+    k: int = Query(10, ge=1, le=100, description="Maximum number of memories to return."),
+    min_score: float = Query(None, ge=-1.0, le=1.0, description="Minimum cosine similarity of returned memories.")
+):
+    """
+    Find the memories most similar to a memory or a piece of text by embedding
+    similarity, most similar first, each with its cosine similarity as `score`.
+    """
+    params = MemorySimilarParams(memory_id=memory_id, text=text, k=k, min_score=min_score)
+    return {"status": "ok", "memories": _memory_similar(params)}
+
+
+@router.get("/_access_stats", response_model=dict)
+def memory_access_stats():
+    """
+    Report the access-statistics accumulator counters.
+
+    Compare `flushes` and `rows_written` with `recorded` to see how many search hits
+    each database write covers.
+    """
+    return {"status": "ok", "stats": access_stats.stats()}
+
+
 @router.get("/_dedup")
 async def deduplicate_memories_by_topic(
     dry_run: bool = Query(False, description="If True, only analyze and return what would be done without making changes"),
@@ -469,19 +501,21 @@ async def deduplicate_memories_topic_based(
 
 @router.get("/_dedup_semantic", response_model=MemoryDedupResponse)
 async def deduplicate_memories_semantic(
-    grouping: str = Query("timeframe", description="Grouping strategy: 'timeframe' or 'keyword'"),
+    grouping: str = Query("timeframe", description="Grouping strategy: 'timeframe', 'keyword' or 'similarity'"),
     timeframe_days: int = Query(7, description="Days for timeframe grouping"),
     min_shared_keywords: int = Query(2, description="Minimum shared keywords for keyword grouping"),
-    dry_run: bool = Query(False, description="If True, only analyze without making changes")
+    dry_run: bool = Query(False, description="If True, only analyze without making changes"),
+    similarity_threshold: float = Query(0.85, ge=0.0, le=1.0, description="Minimum cosine similarity for similarity grouping")
 ):
     """
-    Global memory deduplication using timeframe or keyword grouping.
+    Global memory deduplication using timeframe, keyword or embedding similarity grouping.
     
     Args:
-        grouping: Grouping strategy ("timeframe" or "keyword")
+        grouping: Grouping strategy ("timeframe", "keyword" or "similarity")
         timeframe_days: Number of days for timeframe grouping window
         min_shared_keywords: Minimum number of shared keywords for keyword grouping
         dry_run: If True, only analyze and return what would be done without making changes
+        similarity_threshold: Minimum cosine similarity for similarity grouping (nearest neighbours from the memory vector index)
     
     Returns:
         MemoryDedupResponse: Results of the semantic deduplication operation
@@ -499,7 +533,8 @@ async def deduplicate_memories_semantic(
         grouping=grouping,
         timeframe_days=timeframe_days,
         min_shared_keywords=min_shared_keywords,
-        dry_run=dry_run
+        dry_run=dry_run,
+        similarity_threshold=similarity_threshold
     )
     
     logger.debug(f"Semantic deduplication result: {result.status}")
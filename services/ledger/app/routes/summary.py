@@ -5,11 +5,14 @@ Routes:
     - DELETE /: Delete summaries filtered by ID, period, and timestamp range.
     - POST /: Create a new summary record in the SQLite ledger database.
     - POST /create: Generate summaries based on the provided summary creation request.
+    - POST /backfill: Create the missing period summaries for a date range.
+    - POST /refresh: Regenerate the summaries above a date whose inputs changed.
 Dependencies:
     - app.services.summary.delete: Summary deletion logic.
     - app.services.summary.get: Summary retrieval logic.
     - app.services.summary.insert: Summary insertion logic.
     - app.services.summary.generate: Summary generation logic.
+    - app.services.summary.backfill: Missing summary backfill logic.
     - shared.models.ledger: Data models for summary operations.
     - shared.log_config: Logger configuration.
 All endpoints handle exceptions and log errors appropriately.
@@ -18,14 +21,16 @@ All endpoints handle exceptions and log errors appropriately.
 from app.services.summary.delete import _delete_summary
 from app.services.summary.get import _get_summaries
 from app.services.summary.insert import _insert_summary
-from app.services.summary.generate import _generate_summary
+from app.services.summary.generate import _generate_summary, _refresh_summaries
+from app.services.summary.backfill import _backfill_summaries
 
 from shared.models.ledger import (
     DeleteSummary,
     SummaryDeleteRequest,
     Summary,
     SummaryGetRequest,
-    SummaryCreateRequest
+    SummaryCreateRequest,
+    SummaryBackfillRequest
 )
 
 from shared.log_config import get_logger
@@ -46,6 +51,7 @@ def get_summary(
     timestamp_end: Optional[str] = Query(None, description="Upper bound for summary timestamp (YYYY-MM-DD HH:MM:SS)."),
     keywords: Optional[List[str]] = Query(None, description="List of keywords to search for in summary text."),
     limit: Optional[int] = Query(None, description="Maximum number of summaries to return."),
+    include_rolled_up: bool = Query(False, description="Also return period summaries already rolled up into a daily summary."),
 ) -> List[Summary]:
     """
     Retrieve summaries based on optional filtering criteria.
@@ -56,7 +62,8 @@ def get_summary(
         timestamp_begin=timestamp_begin,
         timestamp_end=timestamp_end,
         keywords=keywords,
-        limit=limit
+        limit=limit,
+        include_rolled_up=include_rolled_up
     )
     try:
         summaries = _get_summaries(request)
@@ -125,3 +132,34 @@ async def generate_summary(request: SummaryCreateRequest) -> List[dict]:
         List[dict]: A list of generated summary dictionaries.
     """
     return await _generate_summary(request)
+
+
+@router.post("/backfill")
+async def backfill_summaries(request: SummaryBackfillRequest) -> List[dict]:
+    """
+    Create the missing period summaries between two dates, a bounded number at a time.
+
+    Args:
+        request (SummaryBackfillRequest): The date range, periods and optional concurrency.
+
+    Returns:
+        List[dict]: The summaries that were created.
+    """
+    return await _backfill_summaries(request)
+
+
+@router.post("/refresh")
+async def refresh_summaries(
+    date: str = Query(..., description="Date whose messages changed (YYYY-MM-DD)."),
+) -> List[dict]:
+    """
+    Bring the summaries covering a date up to date after its messages changed.
+
+    Only the affected path is touched: the date's period and daily summaries, and
+    the weekly and monthly summaries containing it if they exist. Summaries whose
+    inputs are unchanged are returned without an LLM call.
+
+    Returns:
+        List[dict]: The daily, weekly and monthly summaries on the path.
+    """
+    return await _refresh_summaries(date)
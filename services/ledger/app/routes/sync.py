@@ -1,10 +1,10 @@
 from fastapi import APIRouter, HTTPException, Query
-from shared.models.ledger import ToolSyncRequest, AssistantSyncRequest, UserSyncRequest, CanonicalUserMessage
+from shared.models.ledger import ToolSyncRequest, ToolSyncBatchRequest, AssistantSyncRequest, UserSyncRequest, CanonicalUserMessage
 from app.services.sync.tool import _sync_tool_buffer_helper
 from app.services.sync.assistant import _sync_assistant_buffer_helper
 from app.services.sync.user import _sync_user_buffer_helper
 from app.services.sync.get import _get_sync_buffer_helper
-from typing import List, Optional
+from typing import List, Optional, Union
 
 from shared.log_config import get_logger
 logger = get_logger(f"ledger.{__name__}")
@@ -12,9 +12,12 @@ logger = get_logger(f"ledger.{__name__}")
 router = APIRouter()
 
 @router.post("/tool")
-async def sync_tool(request: ToolSyncRequest):
+async def sync_tool(request: Union[ToolSyncBatchRequest, ToolSyncRequest]):
     """
     Endpoint for synchronizing tool calls and outputs.
+
+    Accepts a single tool call, or `{"calls": [...]}` to store several in order
+    in one transaction.
     """
     try:
         _sync_tool_buffer_helper(request)
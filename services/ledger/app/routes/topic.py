@@ -229,12 +229,12 @@ async def deduplicate_topics_semantic(
     dry_run: bool = Query(False, description="If true, only analyze and return what would be done without making changes")
 ):
     """
-    Semantic topic deduplication using sentence-transformers and DBSCAN clustering.
+    Semantic topic deduplication using sentence-transformers embeddings and similarity clustering.
     
     Process:
     1. Get all topics with their memory counts
     2. Generate embeddings for topic names using sentence-transformers
-    3. Use DBSCAN clustering to find similar topics based on cosine similarity
+    3. Cluster topics linked by cosine similarity above the threshold
     4. For each cluster, use LLM to determine the best consolidated topic name
     5. Reassign memories from secondary topics to the primary topic
     6. Delete empty secondary topics
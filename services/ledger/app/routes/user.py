@@ -54,7 +54,7 @@ router = APIRouter()
 @router.get("/stream")
 async def stream_user_messages(
     request: Request,
-    poll_ms: int = Query(250, description="Polling interval in milliseconds"),
+    poll_ms: int = Query(1000, description="Fallback polling interval in milliseconds for writes from other processes"),
     heartbeat_s: int = Query(15, description="Heartbeat interval in seconds"),
 ):
     if poll_ms < 100 or poll_ms > 2000:
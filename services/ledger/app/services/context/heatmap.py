@@ -9,6 +9,24 @@ The system works as follows:
 2. Keyword scores adjust over time based on usage patterns
 3. Memories are scored based on matching keywords from the heatmap
 4. Unused keywords decay and are eventually removed
+
+Decay runs in one of two modes, chosen by `ledger.heatmap_decay` in config.json:
+- "eager" (default): every update decays all unmentioned keywords and keeps
+  heatmap_memories current, so reads are a plain indexed lookup.
+- "lazy": every update only writes the mentioned keywords. Each keyword stores its
+  score as of the update turn it was last written (heatmap_score.turn), and readers
+  apply the decay in closed form:
+
+      score_now = score - DECAY_RATE * (current_turn - turn)
+
+  A keyword is expired once score_now <= MIN_SCORE, the same turn eager mode
+  would have removed it. Both modes compare against EXPIRY_SCORE (MIN_SCORE plus
+  a small tolerance), so eager mode's turn-by-turn subtraction and lazy mode's
+  closed form agree even when float rounding lands right at the boundary. Memory
+  scores are summed at read time, and a periodic sweep deletes expired keywords.
+
+Both modes keep heatmap_state.turn_counter, so switching modes carries the
+heatmap over unchanged.
 """
 
 import sqlite3
@@ -16,7 +34,7 @@ import uuid
 from typing import List, Dict, Optional, Tuple
 from datetime import datetime
 
-from app.util import _open_conn
+from app.util import _open_conn, _load_config
 from shared.log_config import get_logger
 
 logger = get_logger(f"ledger.{__name__}")
@@ -37,13 +55,51 @@ DECAY_RATE = 0.08  # Increased from 0.05 to handle higher scores
 # Minimum score before removal from heatmap
 MIN_SCORE = 0.1
 
+# Decayed scores at or below this are expired, in both decay modes. The tolerance
+# absorbs float rounding, which differs between eager mode (DECAY_RATE subtracted
+# once per turn) and lazy mode (DECAY_RATE * turns subtracted at once).
+EXPIRY_SCORE = MIN_SCORE + 1e-9
+
 # How much to adjust scores when keywords stay the same weight (minimal drift)
 SAME_WEIGHT_ADJUSTMENT = 0.02
 
+# Memory scores are maintained incrementally from keyword deltas; every this many
+# updates they are rebuilt from scratch to pick up tag changes and float drift.
+FULL_RESCORE_INTERVAL = 100
+
+# Memory scores at or below this are treated as zero (no scored keywords left)
+SCORE_EPSILON = 1e-9
+
+_updates_since_full_rescore = 0
+
+DECAY_MODES = ("eager", "lazy")
+
+# In lazy mode, expired keywords are deleted every this many updates
+GC_INTERVAL = 50
+
+
+def _get_decay_mode() -> str:
+    mode = _load_config().get("ledger", {}).get("heatmap_decay", "eager")
+    if mode not in DECAY_MODES:
+        logger.warning(f"Unknown heatmap_decay mode '{mode}', using 'eager'")
+        return "eager"
+    return mode
+
+
+def _current_turn(cursor: sqlite3.Cursor) -> int:
+    cursor.execute("SELECT turn_counter FROM heatmap_state WHERE id = 1")
+    row = cursor.fetchone()
+    return row[0] if row else 0
+
 
 async def update_heatmap(keywords_with_weights: Dict[str, str]) -> Dict[str, any]:
     """
     Update the keyword heatmap with new weighted keywords and recalculate memory scores.
+
+    Mentioned keywords are staged in a temp table and batch-upserted; decay, clamping
+    and removal of unmentioned keywords are single set-based statements. All writes to
+    the main database happen in one short BEGIN IMMEDIATE transaction, so the WAL
+    writer lock is never held while Python iterates over keywords.
     
     Args:
         keywords_with_weights: Dictionary mapping keywords to their weights ("high", "medium", "low")
@@ -51,96 +107,56 @@ async def update_heatmap(keywords_with_weights: Dict[str, str]) -> Dict[str, any
     Returns:
         Dictionary containing update statistics and affected memory count
     """
+    # Resolve target scores before touching the database. Keywords with an unknown
+    # weight are not scored but still count as mentioned, so they don't decay.
+    mentions = []
+    for keyword, weight in keywords_with_weights.items():
+        if weight not in DEFAULT_SCORES:
+            logger.warning(f"Unknown weight '{weight}' for keyword '{keyword}', skipping")
+            mentions.append((keyword, None))
+        else:
+            mentions.append((keyword, DEFAULT_SCORES[weight]))
+
+    mode = _get_decay_mode()
+
     try:
         conn = _open_conn()
         cursor = conn.cursor()
-        
+
         # Get current timestamp
         now = datetime.now().isoformat()
-        
-        # Get all existing keywords
-        cursor.execute("SELECT keyword, score, last_updated FROM heatmap_score")
-        existing_keywords = {row[0]: {"score": row[1], "last_updated": row[2]} for row in cursor.fetchall()}
-        
-        updated_keywords = []
-        new_keywords = []
-        
-        # Process incoming keywords
-        for keyword, weight in keywords_with_weights.items():
-            if weight not in DEFAULT_SCORES:
-                logger.warning(f"Unknown weight '{weight}' for keyword '{keyword}', skipping")
-                continue
-                
-            target_score = DEFAULT_SCORES[weight]
-            
-            if keyword in existing_keywords:
-                current_score = existing_keywords[keyword]["score"]
-                
-                # Check if the current weight matches the incoming weight
-                # (within a small tolerance to account for previous boosts)
-                base_score_for_weight = DEFAULT_SCORES[weight]
-                
-                # If the keyword is being reinforced with the same weight, boost by 10%
-                if abs(current_score - base_score_for_weight) < 0.2:  # Allow some tolerance for previous boosts
-                    new_score = current_score * 1.1  # 10% boost for reinforcement
-                    logger.debug(f"Reinforcing keyword '{keyword}': {current_score:.3f} -> {new_score:.3f}")
-                else:
-                    # Different weight - adjust towards new target
-                    new_score = current_score + (target_score - current_score) * ADJUSTMENT_FACTOR
-                
-                new_score = max(MIN_SCORE, min(2.0, new_score))  # Clamp between MIN_SCORE and 2.0 (allow boosting beyond 1.0)
-                
-                cursor.execute(
-                    "UPDATE heatmap_score SET score = ?, last_updated = ? WHERE keyword = ?",
-                    (new_score, now, keyword)
-                )
-                updated_keywords.append(keyword)
-                existing_keywords[keyword]["score"] = new_score  # Update for decay processing
-            else:
-                # Add new keyword
-                cursor.execute(
-                    "INSERT INTO heatmap_score (keyword, score, last_updated) VALUES (?, ?, ?)",
-                    (keyword, target_score, now)
-                )
-                new_keywords.append(keyword)
-        
-        # Decay keywords not mentioned in this update
-        mentioned_keywords = set(keywords_with_weights.keys())
-        decayed_keywords = []
-        removed_keywords = []
-        
-        for keyword, data in existing_keywords.items():
-            if keyword not in mentioned_keywords:
-                new_score = data["score"] - DECAY_RATE
-                if new_score <= MIN_SCORE:
-                    # Remove keyword and its memory associations
-                    cursor.execute("DELETE FROM heatmap_score WHERE keyword = ?", (keyword,))
-                    removed_keywords.append(keyword)
-                else:
-                    cursor.execute(
-                        "UPDATE heatmap_score SET score = ?, last_updated = ? WHERE keyword = ?",
-                        (new_score, now, keyword)
-                    )
-                    decayed_keywords.append(keyword)
-        
-        # Recalculate memory scores
-        affected_memories = await _recalculate_memory_scores(cursor)
-        
+
+        # Stage mentioned keywords; temp tables live outside the main database
+        cursor.execute("CREATE TEMP TABLE IF NOT EXISTS heatmap_mentions (keyword TEXT PRIMARY KEY, target REAL, old_score REAL)")
+        cursor.execute("CREATE TEMP TABLE IF NOT EXISTS heatmap_deltas (keyword TEXT PRIMARY KEY, delta REAL NOT NULL)")
+        cursor.execute("DELETE FROM heatmap_mentions")
+        cursor.execute("DELETE FROM heatmap_deltas")
+        cursor.executemany("INSERT INTO heatmap_mentions (keyword, target) VALUES (?, ?)", mentions)
+        conn.commit()
+
+        cursor.execute("BEGIN IMMEDIATE")
+
+        # Every update is one decay turn, in either mode
+        cursor.execute("SELECT turn_counter, mode FROM heatmap_state WHERE id = 1")
+        previous_turn, previous_mode = cursor.fetchone()
+        turn = previous_turn + 1
+        cursor.execute("UPDATE heatmap_state SET turn_counter = ?, mode = ? WHERE id = 1", (turn, mode))
+
+        if mode == "lazy":
+            result = await _update_lazy(cursor, turn, now)
+        else:
+            result = await _update_eager(cursor, turn, now, rebuild=previous_mode != "eager")
+
         conn.commit()
         conn.close()
-        
-        logger.info(f"Heatmap updated: {len(new_keywords)} new, {len(updated_keywords)} updated, "
-                   f"{len(decayed_keywords)} decayed, {len(removed_keywords)} removed keywords. "
-                   f"{affected_memories} memories rescored.")
-        
-        return {
-            "new_keywords": new_keywords,
-            "updated_keywords": updated_keywords,
-            "decayed_keywords": decayed_keywords,
-            "removed_keywords": removed_keywords,
-            "affected_memories": affected_memories
-        }
-        
+
+        logger.info(f"Heatmap updated ({mode}): {len(result['new_keywords'])} new, "
+                   f"{len(result['updated_keywords'])} updated, {len(result['decayed_keywords'])} decayed, "
+                   f"{len(result['removed_keywords'])} removed keywords. "
+                   f"{result['affected_memories']} memories rescored.")
+
+        return result
+
     except Exception as e:
         logger.error(f"Error updating heatmap: {e}")
         if 'conn' in locals():
@@ -149,9 +165,277 @@ async def update_heatmap(keywords_with_weights: Dict[str, str]) -> Dict[str, any
         raise
 
 
+def _split_mentions(cursor: sqlite3.Cursor) -> Tuple[List[str], List[str]]:
+    """Return (new_keywords, updated_keywords) for the scored mentions."""
+    cursor.execute("SELECT keyword, old_score IS NULL FROM heatmap_mentions WHERE target IS NOT NULL")
+    new_keywords = []
+    updated_keywords = []
+    for keyword, is_new in cursor.fetchall():
+        (new_keywords if is_new else updated_keywords).append(keyword)
+    return new_keywords, updated_keywords
+
+
+async def _update_eager(cursor: sqlite3.Cursor, turn: int, now: str, rebuild: bool = False) -> Dict[str, any]:
+    """
+    Apply one update turn by decaying every unmentioned keyword in place.
+
+    Leaves every heatmap_score row at `turn`, and keeps heatmap_memories current.
+
+    Args:
+        cursor: Database cursor inside the update's BEGIN IMMEDIATE transaction
+        turn: The update turn being applied
+        now: Timestamp for last_updated columns
+        rebuild: Force a full memory rescore (the previous update ran in lazy mode)
+    """
+    if rebuild:
+        # Fold lazily stored scores back into plain values as of the previous turn
+        await _sweep_expired_keywords(cursor, turn - 1)
+        cursor.execute("""
+            UPDATE heatmap_score SET score = score - ? * (? - turn), turn = ?
+            WHERE turn <> ?
+        """, (DECAY_RATE, turn - 1, turn - 1, turn - 1))
+
+    cursor.execute("""
+        UPDATE heatmap_mentions
+        SET old_score = (SELECT score FROM heatmap_score h WHERE h.keyword = heatmap_mentions.keyword)
+    """)
+
+    # Unmentioned keywords: record deltas, drop those that fall to MIN_SCORE, decay the rest
+    cursor.execute("""
+        INSERT INTO heatmap_deltas (keyword, delta)
+        SELECT keyword, CASE WHEN score - ? <= ? THEN -score ELSE -? END
+        FROM heatmap_score
+        WHERE keyword NOT IN (SELECT keyword FROM heatmap_mentions)
+    """, (DECAY_RATE, EXPIRY_SCORE, DECAY_RATE))
+    cursor.execute("""
+        DELETE FROM heatmap_score
+        WHERE keyword NOT IN (SELECT keyword FROM heatmap_mentions)
+          AND score - ? <= ?
+        RETURNING keyword
+    """, (DECAY_RATE, EXPIRY_SCORE))
+    removed_keywords = [row[0] for row in cursor.fetchall()]
+    cursor.execute("""
+        UPDATE heatmap_score
+        SET score = score - ?, last_updated = ?, turn = ?
+        WHERE keyword NOT IN (SELECT keyword FROM heatmap_mentions)
+        RETURNING keyword
+    """, (DECAY_RATE, now, turn))
+    decayed_keywords = [row[0] for row in cursor.fetchall()]
+
+    # Mentioned keywords: insert new ones at their target score. Existing ones get
+    # a 10% reinforcement boost when already near the target (allowing for
+    # previous boosts), otherwise move gradually towards it; clamp between
+    # MIN_SCORE and 2.0 (allow boosting beyond 1.0).
+    cursor.execute("""
+        INSERT INTO heatmap_score (keyword, score, last_updated, turn)
+        SELECT keyword, target, ?, ? FROM heatmap_mentions WHERE target IS NOT NULL
+        ON CONFLICT(keyword) DO UPDATE SET
+            score = MAX(?, MIN(2.0, CASE
+                WHEN ABS(heatmap_score.score - excluded.score) < 0.2 THEN heatmap_score.score * 1.1
+                ELSE heatmap_score.score + (excluded.score - heatmap_score.score) * ?
+            END)),
+            last_updated = excluded.last_updated,
+            turn = excluded.turn
+    """, (now, turn, MIN_SCORE, ADJUSTMENT_FACTOR))
+    # Mentioned keywords with an unknown weight keep their score but are current
+    cursor.execute("""
+        UPDATE heatmap_score SET turn = ?
+        WHERE keyword IN (SELECT keyword FROM heatmap_mentions WHERE target IS NULL)
+    """, (turn,))
+    cursor.execute("""
+        INSERT INTO heatmap_deltas (keyword, delta)
+        SELECT m.keyword, h.score - COALESCE(m.old_score, 0)
+        FROM heatmap_mentions m
+        JOIN heatmap_score h ON h.keyword = m.keyword
+        WHERE m.target IS NOT NULL
+    """)
+    new_keywords, updated_keywords = _split_mentions(cursor)
+
+    # Propagate keyword deltas to memory scores, with a periodic full rebuild
+    global _updates_since_full_rescore
+    _updates_since_full_rescore += 1
+    if rebuild or _updates_since_full_rescore >= FULL_RESCORE_INTERVAL:
+        affected_memories = await _recalculate_memory_scores(cursor)
+        _updates_since_full_rescore = 0
+    else:
+        affected_memories = await _apply_memory_score_deltas(cursor)
+
+    return {
+        "new_keywords": new_keywords,
+        "updated_keywords": updated_keywords,
+        "decayed_keywords": decayed_keywords,
+        "removed_keywords": removed_keywords,
+        "affected_memories": affected_memories
+    }
+
+
+async def _update_lazy(cursor: sqlite3.Cursor, turn: int, now: str) -> Dict[str, any]:
+    """
+    Apply one update turn by writing only the mentioned keywords.
+
+    Unmentioned keywords are left untouched; their decay is implied by the turn
+    counter and applied by readers. A mentioned keyword's previous score is its
+    decayed score as of the previous turn, so boosts and adjustments match eager
+    mode. heatmap_memories is not maintained; memory scores are summed at read time.
+
+    decayed_keywords is always empty in this mode, and removed_keywords lists the
+    expired keywords deleted by the periodic sweep, if one ran on this turn.
+
+    Args:
+        cursor: Database cursor inside the update's BEGIN IMMEDIATE transaction
+        turn: The update turn being applied
+        now: Timestamp for last_updated columns
+    """
+    previous_turn = turn - 1
+    cursor.execute("""
+        UPDATE heatmap_mentions
+        SET old_score = (
+            SELECT h.score - ? * (? - h.turn) FROM heatmap_score h
+            WHERE h.keyword = heatmap_mentions.keyword
+              AND (h.turn = ? OR h.score - ? * (? - h.turn) > ?)
+        )
+    """, (DECAY_RATE, previous_turn, previous_turn, DECAY_RATE, previous_turn, EXPIRY_SCORE))
+
+    # Same boost/adjust/clamp rules as eager mode, computed from the decayed score.
+    # Expired keywords have no old score and restart at their target.
+    cursor.execute("""
+        INSERT INTO heatmap_score (keyword, score, last_updated, turn)
+        SELECT keyword,
+               CASE WHEN old_score IS NULL THEN target
+                    ELSE MAX(?, MIN(2.0, CASE
+                        WHEN ABS(old_score - target) < 0.2 THEN old_score * 1.1
+                        ELSE old_score + (target - old_score) * ?
+                    END))
+               END,
+               ?, ?
+        FROM heatmap_mentions
+        WHERE target IS NOT NULL
+        ON CONFLICT(keyword) DO UPDATE SET
+            score = excluded.score,
+            last_updated = excluded.last_updated,
+            turn = excluded.turn
+    """, (MIN_SCORE, ADJUSTMENT_FACTOR, now, turn))
+    # Mentioned keywords with an unknown weight skip this turn's decay
+    cursor.execute("""
+        UPDATE heatmap_score SET turn = turn + 1
+        WHERE keyword IN (SELECT keyword FROM heatmap_mentions WHERE target IS NULL AND old_score IS NOT NULL)
+    """)
+    new_keywords, updated_keywords = _split_mentions(cursor)
+
+    removed_keywords = []
+    if turn % GC_INTERVAL == 0:
+        removed_keywords = await _sweep_expired_keywords(cursor, turn)
+
+    cursor.execute("""
+        SELECT COUNT(DISTINCT mt.memory_id)
+        FROM memory_tags mt
+        JOIN heatmap_mentions m ON m.keyword = mt.tag
+        WHERE m.target IS NOT NULL
+    """)
+    affected_memories = cursor.fetchone()[0]
+
+    return {
+        "new_keywords": new_keywords,
+        "updated_keywords": updated_keywords,
+        "decayed_keywords": [],
+        "removed_keywords": removed_keywords,
+        "affected_memories": affected_memories
+    }
+
+
+async def _sweep_expired_keywords(cursor: sqlite3.Cursor, turn: int) -> List[str]:
+    """
+    Delete keywords whose lazily decayed score has reached MIN_SCORE (EXPIRY_SCORE) by `turn`.
+
+    Args:
+        cursor: Database cursor for the current transaction
+        turn: The turn the scores are evaluated at
+
+    Returns:
+        The removed keywords
+    """
+    cursor.execute("""
+        DELETE FROM heatmap_score
+        WHERE turn <> ? AND score - ? * (? - turn) <= ?
+        RETURNING keyword
+    """, (turn, DECAY_RATE, turn, EXPIRY_SCORE))
+    return [row[0] for row in cursor.fetchall()]
+
+
+async def _apply_memory_score_deltas(cursor: sqlite3.Cursor) -> int:
+    """
+    Apply keyword score changes to the memories tagged with those keywords.
+
+    A memory's heatmap score is the sum of the scores of its tags that are in the
+    heatmap, so a change to one keyword's score shifts every memory tagged with it
+    by the same amount. The deltas staged in the heatmap_deltas temp table are
+    folded into heatmap_memories with one grouped join, so the cost scales with
+    the changed keywords and their fan-out rather than with the total memory count.
+
+    Affected memories that have no heatmap_memories row yet (new memories, or ones
+    whose earlier score dropped to zero) get their full score from every scored
+    tag, not just this round's deltas, so tags that were already hot count too.
+
+    Args:
+        cursor: Database cursor for the current transaction, with heatmap_deltas
+            holding keyword -> change in score (removed keywords carry the
+            negative of their last score)
+
+    Returns:
+        Number of memories whose score changed
+    """
+    try:
+        cursor.execute("DELETE FROM heatmap_deltas WHERE delta = 0")
+
+        now = datetime.now().isoformat()
+        # Memories already scored shift by the sum of their tags' deltas
+        cursor.execute("""
+            UPDATE heatmap_memories
+            SET score = score + changes.delta, last_updated = ?
+            FROM (
+                SELECT mt.memory_id, SUM(d.delta) AS delta
+                FROM heatmap_deltas d
+                JOIN memory_tags mt ON mt.tag = d.keyword
+                GROUP BY mt.memory_id
+            ) AS changes
+            WHERE heatmap_memories.memory_id = changes.memory_id
+        """, (now,))
+        affected = cursor.rowcount
+
+        # Memories not scored yet start from the full sum over their scored tags
+        cursor.execute("""
+            INSERT INTO heatmap_memories (memory_id, score, last_updated)
+            SELECT mt.memory_id, SUM(hs.score), ?
+            FROM memory_tags mt
+            JOIN heatmap_score hs ON hs.keyword = mt.tag
+            WHERE mt.memory_id IN (
+                SELECT mt2.memory_id
+                FROM heatmap_deltas d
+                JOIN memory_tags mt2 ON mt2.tag = d.keyword
+                JOIN memories m ON m.id = mt2.memory_id
+            )
+              AND mt.memory_id NOT IN (SELECT memory_id FROM heatmap_memories)
+            GROUP BY mt.memory_id
+            HAVING SUM(hs.score) > 0
+        """, (now,))
+        affected += cursor.rowcount
+
+        # Memories left with no scored keywords drop out, as in a full rebuild
+        cursor.execute("DELETE FROM heatmap_memories WHERE score <= ?", (SCORE_EPSILON,))
+
+        return affected
+
+    except Exception as e:
+        logger.error(f"Error applying memory score deltas: {e}")
+        raise
+
+
 async def _recalculate_memory_scores(cursor: sqlite3.Cursor) -> int:
     """
-    Recalculate scores for all memories based on current heatmap values.
+    Rebuild scores for all memories from the current heatmap values.
+
+    Used periodically by update_heatmap to correct accumulated float drift and
+    pick up memories whose tags changed since they were last scored.
     
     Args:
         cursor: Database cursor for the current transaction
@@ -162,50 +446,19 @@ async def _recalculate_memory_scores(cursor: sqlite3.Cursor) -> int:
     try:
         # Clear existing memory scores
         cursor.execute("DELETE FROM heatmap_memories")
-        
-        # Get all current heatmap keywords and their scores
-        cursor.execute("SELECT keyword, score FROM heatmap_score")
-        keyword_scores = dict(cursor.fetchall())
-        
-        if not keyword_scores:
-            return 0
-        
-        # Get all memories with their keywords (tags)
-        cursor.execute("""
-            SELECT DISTINCT m.id, m.memory
-            FROM memories m
-            JOIN memory_tags mt ON m.id = mt.memory_id
-            WHERE mt.tag IN ({})
-        """.format(','.join('?' * len(keyword_scores))), list(keyword_scores.keys()))
-        
-        memories_with_keywords = cursor.fetchall()
-        
-        memory_scores = {}
-        
-        # Calculate score for each memory
-        for memory_id, memory_text in memories_with_keywords:
-            # Get all tags for this memory
-            cursor.execute("SELECT tag FROM memory_tags WHERE memory_id = ?", (memory_id,))
-            memory_tags = [row[0] for row in cursor.fetchall()]
-            
-            # Calculate total score from matching keywords
-            total_score = 0.0
-            for tag in memory_tags:
-                if tag in keyword_scores:
-                    total_score += keyword_scores[tag]
-            
-            if total_score > 0:
-                memory_scores[memory_id] = total_score
-        
-        # Insert memory scores
+
         now = datetime.now().isoformat()
-        for memory_id, score in memory_scores.items():
-            cursor.execute(
-                "INSERT INTO heatmap_memories (memory_id, score, last_updated) VALUES (?, ?, ?)",
-                (memory_id, score, now)
-            )
-        
-        return len(memory_scores)
+        cursor.execute("""
+            INSERT INTO heatmap_memories (memory_id, score, last_updated)
+            SELECT mt.memory_id, SUM(hs.score), ?
+            FROM heatmap_score hs
+            JOIN memory_tags mt ON mt.tag = hs.keyword
+            JOIN memories m ON m.id = mt.memory_id
+            GROUP BY mt.memory_id
+            HAVING SUM(hs.score) > 0
+        """, (now,))
+
+        return cursor.rowcount
         
     except Exception as e:
         logger.error(f"Error recalculating memory scores: {e}")
@@ -215,6 +468,9 @@ async def _recalculate_memory_scores(cursor: sqlite3.Cursor) -> int:
 async def get_top_memories_by_heatmap(limit: int = 10) -> List[Dict[str, any]]:
     """
     Get the top-scored memories from the heatmap.
+
+    In lazy decay mode the scores are summed here from the decayed keyword scores
+    instead of being read from heatmap_memories.
     
     Args:
         limit: Maximum number of memories to return
@@ -226,13 +482,31 @@ async def get_top_memories_by_heatmap(limit: int = 10) -> List[Dict[str, any]]:
         conn = _open_conn()
         cursor = conn.cursor()
         
-        cursor.execute("""
-            SELECT m.id, m.memory, m.created_at, hm.score, hm.last_updated
-            FROM memories m
-            JOIN heatmap_memories hm ON m.id = hm.memory_id
-            ORDER BY hm.score DESC
-            LIMIT ?
-        """, (limit,))
+        if _get_decay_mode() == "lazy":
+            turn = _current_turn(cursor)
+            cursor.execute("""
+                WITH live AS (
+                    SELECT keyword, score - ? * (? - turn) AS current_score, last_updated
+                    FROM heatmap_score
+                    WHERE turn = ? OR score - ? * (? - turn) > ?
+                )
+                SELECT m.id, m.memory, m.created_at, SUM(live.current_score) AS total, MAX(live.last_updated)
+                FROM live
+                JOIN memory_tags mt ON mt.tag = live.keyword
+                JOIN memories m ON m.id = mt.memory_id
+                GROUP BY m.id
+                HAVING total > 0
+                ORDER BY total DESC
+                LIMIT ?
+            """, (DECAY_RATE, turn, turn, DECAY_RATE, turn, EXPIRY_SCORE, limit))
+        else:
+            cursor.execute("""
+                SELECT m.id, m.memory, m.created_at, hm.score, hm.last_updated
+                FROM memories m
+                JOIN heatmap_memories hm ON m.id = hm.memory_id
+                ORDER BY hm.score DESC
+                LIMIT ?
+            """, (limit,))
         
         results = []
         for row in cursor.fetchall():
@@ -255,6 +529,9 @@ async def get_top_memories_by_heatmap(limit: int = 10) -> List[Dict[str, any]]:
 async def get_keyword_scores() -> Dict[str, float]:
     """
     Get current keyword scores from the heatmap.
+
+    Scores are decayed to the current turn and expired keywords are left out, so
+    the result is the same whichever decay mode wrote them.
     
     Returns:
         Dictionary mapping keywords to their current scores
@@ -263,7 +540,13 @@ async def get_keyword_scores() -> Dict[str, float]:
         conn = _open_conn()
         cursor = conn.cursor()
         
-        cursor.execute("SELECT keyword, score FROM heatmap_score ORDER BY score DESC")
+        turn = _current_turn(cursor)
+        cursor.execute("""
+            SELECT keyword, score - ? * (? - turn) AS current_score
+            FROM heatmap_score
+            WHERE turn = ? OR score - ? * (? - turn) > ?
+            ORDER BY current_score DESC
+        """, (DECAY_RATE, turn, turn, DECAY_RATE, turn, EXPIRY_SCORE))
         scores = dict(cursor.fetchall())
         
         conn.close()
@@ -0,0 +1,471 @@
+"""
+Nearest-neighbour search over the stored memory and topic embeddings.
+
+Each entity type has a `VectorIndex` made of two parts:
+
+- A snapshot: every stored vector for the current model, written to
+  `embeddings.index_dir` (default `vector_index/` next to the ledger database)
+  as an .npy matrix plus a small JSON file naming it. The matrix is opened
+  with `mmap_mode="r"`, so every worker process maps the same pages instead
+  of holding its own copy. A new snapshot is written under a new file name
+  and published by atomically replacing the JSON file; workers notice the
+  change and remap. Rebuilds hold an exclusive flock on `{base}.lock` from
+  reading the table to cleaning up, and remaps hold a shared one, so
+  concurrent rebuilds in other workers never delete the files a newer JSON
+  file names.
+- A delta: vectors written since the snapshot, held in memory. Writes in this
+  process are added directly (`EmbeddingStore` notifies the index); writes by
+  other workers are picked up by polling `embeddings.updated_at` before each
+  search. Deleted ids are masked out, and every result is checked against the
+  embeddings table, so a memory deleted by another worker is never returned.
+
+Once the delta holds more than `embeddings.index_rebuild_threshold` (default
+1000) entries, the snapshot is rebuilt from the table.
+
+Backends (`embeddings.index_backend`):
+    - "flat" (default): exact search; snapshot blocks of `BLOCK_ROWS` vectors
+      are scored with one matmul per block and reduced to their top k with
+      argpartition, so memory stays bounded for any corpus size.
+    - "hnsw": approximate search with hnswlib (if installed), built alongside
+      each snapshot and saved next to it. Each worker loads its own copy of the
+      graph; the delta is still searched exactly. Falls back to "flat" when
+      hnswlib isn't available.
+
+Vectors are normalized, so scores are cosine similarities.
+"""
+
+from shared.log_config import get_logger
+logger = get_logger(f"ledger.{__name__}")
+
+from app.services.embedding.store import EMBEDDINGS_AVAILABLE, TABLE, embedding_setting, embedding_store
+from app.util import _load_config, _open_conn
+
+import fcntl
+import json
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+if EMBEDDINGS_AVAILABLE:
+    import numpy as np
+
+try:
+    import hnswlib
+    HNSW_AVAILABLE = True
+except ImportError:
+    HNSW_AVAILABLE = False
+
+DEFAULT_BACKEND = "flat"
+DEFAULT_REBUILD_THRESHOLD = 1000
+
+# Snapshot rows scored per matmul in flat search
+BLOCK_ROWS = 65536
+
+# Extra candidates fetched per query to make up for masked or deleted ids
+OVERSAMPLE = 8
+
+# Writes committed out of timestamp order by concurrent workers are caught by
+# re-polling this far behind the latest updated_at already seen
+POLL_OVERLAP = timedelta(seconds=2)
+
+# hnswlib build/search parameters
+HNSW_M = 16
+HNSW_EF_CONSTRUCTION = 200
+HNSW_EF_SEARCH = 64
+
+
+def _index_dir() -> str:
+    index_dir = embedding_setting("index_dir", None)
+    if index_dir:
+        return index_dir
+    return os.path.join(os.path.dirname(os.path.abspath(_load_config()["db"]["ledger"])), "vector_index")
+
+
+def _poll_from(watermark: str) -> str:
+    """Lower bound for polling embeddings.updated_at, POLL_OVERLAP behind `watermark`."""
+    try:
+        since = datetime.strptime(watermark, "%Y-%m-%d %H:%M:%S.%f") - POLL_OVERLAP
+    except ValueError:
+        return watermark
+    return since.strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
+
+
+@contextmanager
+def _file_lock(path: str, exclusive: bool):
+    """Advisory lock on `path`, held across every worker process using the index directory."""
+    with open(path, "a") as f:
+        fcntl.flock(f, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def _backend() -> str:
+    backend = embedding_setting("index_backend", DEFAULT_BACKEND)
+    if backend == "hnsw" and not HNSW_AVAILABLE:
+        return DEFAULT_BACKEND
+    return backend
+
+
+class _Snapshot:
+    """A published snapshot: ids, the memory-mapped matrix and optional HNSW graph."""
+
+    def __init__(self, meta: Dict[str, Any], matrix, graph=None, meta_mtime: int = 0):
+        self.ids: List[str] = meta["ids"]
+        self.positions = {entity_id: row for row, entity_id in enumerate(self.ids)}
+        self.watermark: str = meta["watermark"]
+        self.backend: str = meta.get("backend", DEFAULT_BACKEND)
+        self.matrix = matrix
+        self.graph = graph
+        self.meta_mtime = meta_mtime
+
+
+class VectorIndex:
+    """Snapshot plus delta index over one entity type's stored embeddings."""
+
+    def __init__(self, entity_type: str):
+        self.entity_type = entity_type
+        self._lock = threading.RLock()
+        self._model: Optional[str] = None
+        self._snapshot: Optional[_Snapshot] = None
+        self._delta: Dict[str, "np.ndarray"] = {}
+        self._removed: Set[str] = set()
+        # Snapshot rows superseded by the delta or removed, as a row mask
+        self._masked: Optional["np.ndarray"] = None
+        # Latest embeddings.updated_at already pulled into the delta
+        self._polled: str = ""
+        self.searches = 0
+        self.search_s = 0.0
+        self.rebuilds = 0
+        self.rebuild_s = 0.0
+
+    # --- incremental updates -------------------------------------------------
+
+    def add(self, entity_ids: Sequence[str], vectors) -> None:
+        """Add or replace vectors written in this process."""
+        with self._lock:
+            for entity_id, vector in zip(entity_ids, vectors):
+                self._delta[entity_id] = np.asarray(vector, dtype=np.float32)
+                self._removed.discard(entity_id)
+            self._masked = None
+
+    def remove(self, entity_ids: Iterable[str]) -> None:
+        """Stop returning deleted entities."""
+        with self._lock:
+            for entity_id in entity_ids:
+                self._delta.pop(entity_id, None)
+                self._removed.add(entity_id)
+            self._masked = None
+
+    # --- snapshots -----------------------------------------------------------
+
+    def _base_path(self, model: str) -> str:
+        return os.path.join(_index_dir(), f"{self.entity_type}-{re.sub(r'[^A-Za-z0-9_.-]', '_', model)}")
+
+    def _load_snapshot(self, model: str) -> bool:
+        """(Re)map the published snapshot if it changed. Returns False if there is none."""
+        base = self._base_path(model)
+        meta_path = base + ".json"
+        try:
+            mtime = os.stat(meta_path).st_mtime_ns
+        except FileNotFoundError:
+            return False
+        if self._snapshot is not None and self._model == model and self._snapshot.meta_mtime == mtime:
+            return True
+        # Shared lock so a rebuild can't remove the files between reading the JSON and mapping them
+        with _file_lock(base + ".lock", exclusive=False):
+            mtime = os.stat(meta_path).st_mtime_ns
+            with open(meta_path) as f:
+                meta = json.load(f)
+            directory = os.path.dirname(meta_path)
+            matrix = np.load(os.path.join(directory, meta["matrix"]), mmap_mode="r") if meta["ids"] else None
+            graph = None
+            if meta.get("graph") and _backend() == "hnsw":
+                graph = hnswlib.Index(space="ip", dim=meta["dim"])
+                graph.load_index(os.path.join(directory, meta["graph"]), max_elements=len(meta["ids"]))
+                graph.set_ef(HNSW_EF_SEARCH)
+        self._snapshot = _Snapshot(meta, matrix, graph, mtime)
+        self._model = model
+        # The delta restarts from the snapshot's watermark
+        self._delta = {}
+        self._removed = set()
+        self._masked = None
+        self._polled = self._snapshot.watermark
+        return True
+
+    def rebuild(self, model: Optional[str] = None) -> int:
+        """
+        Write a new snapshot of every stored vector for the model and map it.
+
+        Returns:
+            int: Number of vectors in the snapshot.
+        """
+        model = model or embedding_store.model_name()
+        with self._lock:
+            started = time.perf_counter()
+            base = self._base_path(model)
+            os.makedirs(os.path.dirname(base), exist_ok=True)
+            # Exclusive across workers: reading the table, publishing and cleaning
+            # up happen in one step, so the last rebuild to publish is also the
+            # newest, and no rebuild deletes the files another just published
+            with _file_lock(base + ".lock", exclusive=True):
+                with _open_conn() as conn:
+                    watermark = conn.execute(
+                        f"SELECT COALESCE(MAX(updated_at), '') FROM {TABLE} WHERE entity_type = ? AND model = ?",
+                        (self.entity_type, model),
+                    ).fetchone()[0]
+                    rows = conn.execute(
+                        f"SELECT entity_id, dim, vector FROM {TABLE} WHERE entity_type = ? AND model = ? ORDER BY entity_id",
+                        (self.entity_type, model),
+                    ).fetchall()
+                dims = {dim for _, dim, _ in rows}
+                if len(dims) > 1:
+                    logger.warning(f"Mixed vector dimensions {sorted(dims)} for {self.entity_type}/{model}; run the embedding backfill")
+                    dim = max(dims, key=lambda d: sum(1 for row in rows if row[1] == d))
+                    rows = [row for row in rows if row[1] == dim]
+                ids = [entity_id for entity_id, _, _ in rows]
+                dim = rows[0][1] if rows else 0
+
+                generation = time.time_ns()
+                meta = {"ids": ids, "dim": dim, "watermark": watermark, "backend": _backend(),
+                        "matrix": None, "graph": None}
+                if ids:
+                    matrix = np.frombuffer(b"".join(blob for _, _, blob in rows), dtype=np.float32).reshape(len(ids), dim)
+                    meta["matrix"] = f"{os.path.basename(base)}.{generation}.npy"
+                    np.save(os.path.join(os.path.dirname(base), meta["matrix"]), matrix)
+                    if meta["backend"] == "hnsw":
+                        graph = hnswlib.Index(space="ip", dim=dim)
+                        graph.init_index(max_elements=len(ids), ef_construction=HNSW_EF_CONSTRUCTION, M=HNSW_M)
+                        graph.add_items(matrix, np.arange(len(ids)))
+                        meta["graph"] = f"{os.path.basename(base)}.{generation}.hnsw"
+                        graph.save_index(os.path.join(os.path.dirname(base), meta["graph"]))
+                tmp_path = f"{base}.json.{generation}.tmp"
+                with open(tmp_path, "w") as f:
+                    json.dump(meta, f)
+                os.replace(tmp_path, base + ".json")
+                self._remove_stale_files(base, {meta["matrix"], meta["graph"]})
+
+            self._snapshot = None
+            self._load_snapshot(model)
+            self.rebuilds += 1
+            self.rebuild_s += time.perf_counter() - started
+            logger.info(f"Rebuilt {self.entity_type} vector index: {len(ids)} vectors in {time.perf_counter() - started:.2f}s")
+            return len(ids)
+
+    @staticmethod
+    def _remove_stale_files(base: str, keep: Set[Optional[str]]):
+        """Delete older snapshot files. Workers still mapping one keep it open until they remap."""
+        directory, prefix = os.path.dirname(base), os.path.basename(base) + "."
+        for name in os.listdir(directory):
+            if name.startswith(prefix) and name.endswith((".npy", ".hnsw")) and name not in keep:
+                try:
+                    os.remove(os.path.join(directory, name))
+                except OSError:
+                    pass
+
+    def _refresh(self, model: str):
+        """Map the current snapshot, pull other workers' writes into the delta, rebuild if it grew too large."""
+        if not self._load_snapshot(model):
+            self.rebuild(model)
+        with _open_conn() as conn:
+            rows = conn.execute(
+                f"SELECT entity_id, vector, updated_at FROM {TABLE} "
+                "WHERE entity_type = ? AND model = ? AND updated_at >= ?",
+                (self.entity_type, model, _poll_from(self._polled)),
+            ).fetchall()
+        # Rows already in the snapshot at their current version needn't shadow it
+        rows = [row for row in rows if row[2] > self._snapshot.watermark or row[0] not in self._snapshot.positions]
+        if rows:
+            self.add([row[0] for row in rows], [np.frombuffer(row[1], dtype=np.float32) for row in rows])
+            self._polled = max(self._polled, max(row[2] for row in rows))
+        threshold = int(embedding_setting("index_rebuild_threshold", DEFAULT_REBUILD_THRESHOLD))
+        if len(self._delta) + len(self._removed) > threshold:
+            self.rebuild(model)
+
+    def _masked_rows(self) -> "np.ndarray":
+        if self._masked is None:
+            positions = self._snapshot.positions
+            rows = [positions[entity_id] for entity_id in (*self._delta, *self._removed) if entity_id in positions]
+            self._masked = np.asarray(rows, dtype=np.int64)
+        return self._masked
+
+    # --- search --------------------------------------------------------------
+
+    def _search_flat(self, queries: "np.ndarray", k: int) -> List[List[Tuple[int, float]]]:
+        """Top-k (row, score) per query over the snapshot matrix, blockwise."""
+        matrix, masked = self._snapshot.matrix, self._masked_rows()
+        best_rows = np.empty((len(queries), 0), dtype=np.int64)
+        best_scores = np.empty((len(queries), 0), dtype=np.float32)
+        for start in range(0, matrix.shape[0], BLOCK_ROWS):
+            block = np.asarray(matrix[start:start + BLOCK_ROWS])
+            scores = queries @ block.T
+            in_block = masked[(masked >= start) & (masked < start + len(block))] - start
+            scores[:, in_block] = -np.inf
+            take = min(k, scores.shape[1])
+            top = np.argpartition(-scores, take - 1, axis=1)[:, :take]
+            best_rows = np.concatenate([best_rows, top + start], axis=1)
+            best_scores = np.concatenate([best_scores, np.take_along_axis(scores, top, axis=1)], axis=1)
+            if best_rows.shape[1] > k:
+                keep = np.argpartition(-best_scores, k - 1, axis=1)[:, :k]
+                best_rows = np.take_along_axis(best_rows, keep, axis=1)
+                best_scores = np.take_along_axis(best_scores, keep, axis=1)
+        return [
+            [(int(row), float(score)) for row, score in zip(rows, scores) if score != -np.inf]
+            for rows, scores in zip(best_rows, best_scores)
+        ]
+
+    def _search_graph(self, queries: "np.ndarray", k: int) -> List[List[Tuple[int, float]]]:
+        """Approximate top-k (row, score) per query from the HNSW graph."""
+        masked = set(self._masked_rows().tolist())
+        take = min(len(self._snapshot.ids), k + len(masked))
+        labels, distances = self._snapshot.graph.knn_query(queries, k=take)
+        return [
+            [(int(row), 1.0 - float(distance)) for row, distance in zip(rows, dists) if int(row) not in masked]
+            for rows, dists in zip(labels, distances)
+        ]
+
+    def _search_allowed(self, queries: "np.ndarray", allow: Set[str]) -> List[Dict[str, float]]:
+        """Exact scores per query against only the `allow` ids, from the delta or the snapshot."""
+        snapshot = self._snapshot
+        ids, vectors, rows = [], [], []
+        for entity_id in allow:
+            vector = self._delta.get(entity_id)
+            if vector is not None:
+                if vector.shape[0] == queries.shape[1]:
+                    ids.append(entity_id)
+                    vectors.append(vector)
+            elif entity_id not in self._removed and entity_id in snapshot.positions:
+                rows.append((snapshot.positions[entity_id], entity_id))
+        if rows and snapshot.matrix is not None and snapshot.matrix.shape[1] == queries.shape[1]:
+            rows.sort()
+            ids.extend(entity_id for _, entity_id in rows)
+            vectors.extend(np.asarray(snapshot.matrix[[row for row, _ in rows]]))
+        if not ids:
+            return [{} for _ in queries]
+        scores = queries @ np.stack(vectors).T
+        return [dict(zip(ids, row.tolist())) for row in scores]
+
+    def search(
+        self,
+        queries,
+        k: int = 10,
+        min_score: Optional[float] = None,
+        exclude: Optional[Sequence[Set[str]]] = None,
+        allow: Optional[Set[str]] = None,
+    ) -> List[List[Tuple[str, float]]]:
+        """
+        The k most similar stored entities for each query vector.
+
+        Args:
+            queries: Normalized query vectors, shape (m, dim) or (dim,).
+            k: Results per query.
+            min_score: Drop results below this cosine similarity.
+            exclude: Per query, ids that must not be returned (e.g. the query itself).
+            allow: Only consider these ids. They are scored exactly, so entities
+                outside the set can't take the k slots.
+
+        Returns:
+            List[List[Tuple[str, float]]]: Per query, (entity_id, score) best first.
+
+        Raises:
+            RuntimeError: If sentence-transformers is not installed.
+        """
+        if not EMBEDDINGS_AVAILABLE:
+            raise RuntimeError("sentence-transformers is not installed")
+        queries = np.atleast_2d(np.asarray(queries, dtype=np.float32))
+        model = embedding_store.model_name()
+        exclude = exclude or [set()] * len(queries)
+        fetch = k + OVERSAMPLE + max((len(ids) for ids in exclude), default=0)
+        started = time.perf_counter()
+        with self._lock:
+            self._refresh(model)
+            snapshot = self._snapshot
+            candidates: List[Dict[str, float]] = [{} for _ in queries]
+            if allow is not None:
+                candidates = self._search_allowed(queries, allow)
+            else:
+                if snapshot.matrix is not None and snapshot.matrix.shape[1] == queries.shape[1]:
+                    hits = self._search_graph(queries, fetch) if snapshot.graph is not None else self._search_flat(queries, fetch)
+                    for found, query_hits in zip(candidates, hits):
+                        found.update((snapshot.ids[row], score) for row, score in query_hits)
+                delta = [(entity_id, vector) for entity_id, vector in self._delta.items() if vector.shape[0] == queries.shape[1]]
+                if delta:
+                    scores = queries @ np.stack([vector for _, vector in delta]).T
+                    for found, row in zip(candidates, scores):
+                        found.update((entity_id, float(score)) for (entity_id, _), score in zip(delta, row))
+
+        results = []
+        for found, skip in zip(candidates, exclude):
+            ranked = sorted(
+                ((entity_id, score) for entity_id, score in found.items()
+                 if entity_id not in skip and (min_score is None or score >= min_score)),
+                key=lambda hit: hit[1], reverse=True,
+            )
+            results.append(ranked[:fetch])
+        results = self._drop_deleted(results, model)
+        self.searches += len(queries)
+        self.search_s += time.perf_counter() - started
+        return [ranked[:k] for ranked in results]
+
+    def _drop_deleted(self, results: List[List[Tuple[str, float]]], model: str) -> List[List[Tuple[str, float]]]:
+        """Remove ids whose vectors no longer exist (deleted by another worker since the last poll)."""
+        ids = sorted({entity_id for ranked in results for entity_id, _ in ranked})
+        if not ids:
+            return results
+        existing = set()
+        with _open_conn() as conn:
+            for start in range(0, len(ids), 500):
+                chunk = ids[start:start + 500]
+                placeholders = ",".join("?" for _ in chunk)
+                existing.update(row[0] for row in conn.execute(
+                    f"SELECT entity_id FROM {TABLE} WHERE entity_type = ? AND model = ? AND entity_id IN ({placeholders})",
+                    (self.entity_type, model, *chunk),
+                ))
+        return [[hit for hit in ranked if hit[0] in existing] for ranked in results]
+
+    def neighbours(
+        self,
+        texts: Dict[str, str],
+        k: int = 10,
+        min_score: Optional[float] = None,
+        among: bool = False,
+    ) -> Dict[str, List[Tuple[str, float]]]:
+        """
+        The k most similar other entities for each of `texts` ({entity_id: current text}).
+
+        Vectors come from the embedding store, so only new or edited entities are encoded.
+        With `among`, neighbours are drawn only from `texts` itself.
+        """
+        ids = list(texts)
+        if not ids:
+            return {}
+        vectors = embedding_store.get_vectors(self.entity_type, texts)
+        hits = self.search(np.stack([vectors[entity_id] for entity_id in ids]), k, min_score,
+                           exclude=[{entity_id} for entity_id in ids],
+                           allow=set(ids) if among else None)
+        return dict(zip(ids, hits))
+
+    def stats(self) -> Dict[str, Any]:
+        snapshot = self._snapshot
+        return {
+            "backend": snapshot.backend if snapshot is not None else _backend(),
+            "model": self._model,
+            "snapshot_vectors": len(snapshot.ids) if snapshot is not None else 0,
+            "delta_vectors": len(self._delta),
+            "removed": len(self._removed),
+            "rebuilds": self.rebuilds,
+            "rebuild_s": round(self.rebuild_s, 3),
+            "searches": self.searches,
+            "avg_search_ms": round(self.search_s / self.searches * 1000, 3) if self.searches else None,
+        }
+
+
+vector_indexes: Dict[str, VectorIndex] = {
+    "memory": VectorIndex("memory"),
+    "topic": VectorIndex("topic"),
+}
@@ -0,0 +1,312 @@
+"""
+Persistent embeddings for memories and topics.
+
+Vectors live in the `embeddings` table, one row per (entity_type, entity_id,
+model) holding the float32 vector as a BLOB and the SHA-256 `content_hash` of
+the text it was computed from. A stored vector is used only while its hash
+matches the entity's current text, so edits made anywhere (patches, topic
+renames during merges) are picked up on the next read without every writer
+having to know about embeddings.
+
+Vectors are written when a memory or topic is created or a memory's text is
+patched, on a background thread so the create and patch paths (including the
+async topic scan) never wait for the model, and by `backfill()` for rows
+written before the store existed.
+Readers (topic dedup and clustering) call `get_vectors()`, which returns
+stored vectors and encodes only the missing or stale ones, in batches. The
+sentence-transformers model is loaded once per process, on first use; vectors
+are normalized, so a dot product is the cosine similarity.
+
+Every write and delete is also applied to the nearest-neighbour index in
+`app.services.embedding.index`.
+
+Entity types:
+    - "memory": memories.memory
+    - "topic": topics.name
+
+Config (`embeddings` section of config.json):
+    model: sentence-transformers model name (default all-MiniLM-L6-v2)
+    batch_size: texts per encode call (default 64)
+"""
+
+from shared.log_config import get_logger
+logger = get_logger(f"ledger.{__name__}")
+
+from app.util import _load_config, _open_conn
+
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+# Try to import sentence-transformers, fall back gracefully
+try:
+    import numpy as np
+    from sentence_transformers import SentenceTransformer
+    EMBEDDINGS_AVAILABLE = True
+except ImportError as e:
+    EMBEDDINGS_AVAILABLE = False
+    logger.info(f"Sentence-transformers not available; embedding store disabled: {e}")
+
+TABLE = "embeddings"
+
+DEFAULT_EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+DEFAULT_BATCH_SIZE = 64
+
+# Source table and text column of each entity type
+ENTITY_SOURCES = {
+    "memory": ("memories", "memory"),
+    "topic": ("topics", "name"),
+}
+
+# Ids per IN (...) query, below SQLite's bound-parameter limit
+_ID_CHUNK = 500
+
+
+def embedding_setting(key: str, default):
+    """Setting from the `embeddings` config section."""
+    value = _load_config().get("embeddings", {}).get(key)
+    return value if value else default
+
+
+def content_hash(text: str) -> str:
+    """Hash of the text a vector is computed from."""
+    return hashlib.sha256((text or "").encode("utf-8")).hexdigest()
+
+
+def _chunks(items: List[str], size: int) -> Iterable[List[str]]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+class EmbeddingStore:
+    """Process-wide embedding model and the vectors stored in the ledger."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._model = None
+        self._model_name: Optional[str] = None
+        # Model that failed to load, so writes don't retry it on every call
+        self._failed_model: Optional[str] = None
+        # Single worker, so queued writes for an entity are applied in order
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="embedding-index")
+        self.pending = 0
+        self.load_s = 0.0
+        self.hits = 0
+        self.encoded = 0
+        self.encode_s = 0.0
+        self.failures = 0
+
+    def model_name(self) -> str:
+        return embedding_setting("model", DEFAULT_EMBEDDING_MODEL)
+
+    def _get_model(self, model_name: str):
+        if self._model is not None and self._model_name == model_name:
+            return self._model
+        with self._lock:
+            if self._model is None or self._model_name != model_name:
+                started = time.perf_counter()
+                try:
+                    self._model = SentenceTransformer(model_name, device="cpu")
+                except Exception:
+                    self._failed_model = model_name
+                    raise
+                self._model_name = model_name
+                self._failed_model = None
+                self.load_s = time.perf_counter() - started
+                logger.info(f"Loaded embedding model {model_name} in {self.load_s:.1f}s")
+        return self._model
+
+    def encode(self, texts: List[str], model_name: Optional[str] = None) -> "np.ndarray":
+        """
+        Normalized float32 embeddings of `texts`, one row per text.
+
+        Raises:
+            RuntimeError: If sentence-transformers is not installed.
+        """
+        if not EMBEDDINGS_AVAILABLE:
+            raise RuntimeError("sentence-transformers is not installed")
+        model_name = model_name or self.model_name()
+        model = self._get_model(model_name)
+        started = time.perf_counter()
+        vectors = model.encode(
+            texts,
+            batch_size=int(embedding_setting("batch_size", DEFAULT_BATCH_SIZE)),
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+        )
+        self.encode_s += time.perf_counter() - started
+        self.encoded += len(texts)
+        return np.asarray(vectors, dtype=np.float32)
+
+    def _read(self, cur, entity_type: str, model_name: str, ids: List[str]) -> Dict[str, tuple]:
+        """{entity_id: (content_hash, vector blob)} of the stored rows for `ids`."""
+        rows = {}
+        for chunk in _chunks(ids, _ID_CHUNK):
+            placeholders = ",".join("?" for _ in chunk)
+            cur.execute(
+                f"SELECT entity_id, content_hash, vector FROM {TABLE} "
+                f"WHERE entity_type = ? AND model = ? AND entity_id IN ({placeholders})",
+                (entity_type, model_name, *chunk),
+            )
+            rows.update((entity_id, (hash_, blob)) for entity_id, hash_, blob in cur.fetchall())
+        return rows
+
+    def _write(self, cur, entity_type: str, model_name: str, items: List[tuple]):
+        """Upsert (entity_id, content_hash, vector) rows. The caller commits."""
+        cur.executemany(
+            f"INSERT OR REPLACE INTO {TABLE} (entity_type, entity_id, model, content_hash, dim, vector, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, STRFTIME('%Y-%m-%d %H:%M:%f','now','localtime'))",
+            [
+                (entity_type, entity_id, model_name, hash_, int(vector.shape[0]), vector.tobytes())
+                for entity_id, hash_, vector in items
+            ],
+        )
+
+    def get_vectors(self, entity_type: str, texts: Dict[str, str]) -> Dict[str, "np.ndarray"]:
+        """
+        Vectors for `texts` ({entity_id: current text}).
+
+        Stored vectors whose content hash matches the current text are returned
+        as is; the rest are encoded in one batched pass and stored.
+
+        Raises:
+            RuntimeError: If sentence-transformers is not installed.
+        """
+        if not EMBEDDINGS_AVAILABLE:
+            raise RuntimeError("sentence-transformers is not installed")
+        model_name = self.model_name()
+        hashes = {entity_id: content_hash(text) for entity_id, text in texts.items()}
+        vectors: Dict[str, "np.ndarray"] = {}
+        with _open_conn() as conn:
+            cur = conn.cursor()
+            stored = self._read(cur, entity_type, model_name, list(texts))
+            for entity_id, (hash_, blob) in stored.items():
+                if hashes[entity_id] == hash_:
+                    vectors[entity_id] = np.frombuffer(blob, dtype=np.float32)
+            self.hits += len(vectors)
+
+            missing = [entity_id for entity_id in texts if entity_id not in vectors]
+            if missing:
+                encoded = self.encode([texts[entity_id] or "" for entity_id in missing], model_name)
+                self._write(cur, entity_type, model_name,
+                            [(entity_id, hashes[entity_id], vector) for entity_id, vector in zip(missing, encoded)])
+                conn.commit()
+                vectors.update(zip(missing, encoded))
+        if missing:
+            from app.services.embedding.index import vector_indexes
+            vector_indexes[entity_type].add(missing, encoded)
+        return vectors
+
+    def index(self, entity_type: str, entity_id: str, text: str):
+        """
+        Queue the vector of one created or edited entity to be stored.
+
+        Returns immediately; loading the model and encoding happen on the
+        writer thread. Best effort: a missing library or a model that can't be
+        loaded only leaves the vector to be computed on first read or by the
+        backfill.
+        """
+        if not EMBEDDINGS_AVAILABLE or self._failed_model == self.model_name():
+            return
+        self.pending += 1
+        self._writer.submit(self._index_now, entity_type, entity_id, text)
+
+    def _index_now(self, entity_type: str, entity_id: str, text: str):
+        source, _ = ENTITY_SOURCES[entity_type]
+        try:
+            with _open_conn() as conn:
+                exists = conn.execute(f"SELECT 1 FROM {source} WHERE id = ?", (entity_id,)).fetchone()
+            # Skip entities deleted while queued; the backfill prunes any that slip through
+            if exists is not None:
+                self.get_vectors(entity_type, {entity_id: text})
+        except Exception as e:
+            self.failures += 1
+            logger.warning(f"Could not embed {entity_type} {entity_id}: {e}")
+        finally:
+            self.pending -= 1
+
+    def delete(self, entity_type: str, entity_ids: Iterable[str]):
+        """Remove the stored vectors (for every model) of deleted entities."""
+        entity_ids = list(entity_ids)
+        if not entity_ids:
+            return
+        with _open_conn() as conn:
+            conn.executemany(
+                f"DELETE FROM {TABLE} WHERE entity_type = ? AND entity_id = ?",
+                [(entity_type, entity_id) for entity_id in entity_ids],
+            )
+            conn.commit()
+        from app.services.embedding.index import vector_indexes
+        vector_indexes[entity_type].remove(entity_ids)
+
+    def backfill(self, entity_types: Optional[List[str]] = None, batch_size: int = 1000) -> Dict[str, Dict[str, int]]:
+        """
+        Store vectors for every memory and topic that has none, or a stale one,
+        for the current model, and prune vectors of entities that no longer exist.
+
+        Runs in batches of `batch_size` rows, so it is safe to re-run and cheap
+        when little has changed.
+
+        Returns:
+            Dict: Per entity type, rows scanned, vectors encoded and vectors pruned.
+
+        Raises:
+            RuntimeError: If sentence-transformers is not installed.
+            ValueError: If an entity type is unknown.
+        """
+        if not EMBEDDINGS_AVAILABLE:
+            raise RuntimeError("sentence-transformers is not installed")
+        results = {}
+        for entity_type in entity_types or list(ENTITY_SOURCES):
+            if entity_type not in ENTITY_SOURCES:
+                raise ValueError(f"Unknown entity type: {entity_type}")
+            source, column = ENTITY_SOURCES[entity_type]
+            scanned = 0
+            encoded_before = self.encoded
+            last_id = ""
+            while True:
+                with _open_conn() as conn:
+                    rows = conn.execute(
+                        f"SELECT id, {column} FROM {source} WHERE id > ? ORDER BY id LIMIT ?",
+                        (last_id, batch_size),
+                    ).fetchall()
+                if not rows:
+                    break
+                self.get_vectors(entity_type, {entity_id: text or "" for entity_id, text in rows})
+                scanned += len(rows)
+                last_id = rows[-1][0]
+
+            with _open_conn() as conn:
+                cur = conn.execute(
+                    f"DELETE FROM {TABLE} WHERE entity_type = ? "
+                    f"AND entity_id NOT IN (SELECT id FROM {source})",
+                    (entity_type,),
+                )
+                pruned = cur.rowcount
+                conn.commit()
+            results[entity_type] = {"scanned": scanned, "encoded": self.encoded - encoded_before, "pruned": pruned}
+            logger.info(f"Embedding backfill for {entity_type}: {results[entity_type]}")
+        return results
+
+    def stats(self) -> Dict[str, Any]:
+        with _open_conn() as conn:
+            rows = conn.execute(
+                f"SELECT entity_type, model, COUNT(*) FROM {TABLE} GROUP BY entity_type, model"
+            ).fetchall()
+        return {
+            "available": EMBEDDINGS_AVAILABLE,
+            "model": self.model_name(),
+            "model_loaded": self._model_name,
+            "model_load_s": round(self.load_s, 3),
+            "stored": {f"{entity_type}/{model}": count for entity_type, model, count in rows},
+            "hits": self.hits,
+            "encoded": self.encoded,
+            "encode_s": round(self.encode_s, 3),
+            "failures": self.failures,
+            "pending": self.pending,
+        }
+
+
+embedding_store = EmbeddingStore()
@@ -0,0 +1,102 @@
+"""
+Batched access statistics for memories.
+
+Search results bump access_count and last_accessed for every memory they return.
+Instead of one connection and one committed UPDATE per memory, hits are recorded
+in memory and written by `flush()` as a single executemany in one transaction.
+Repeated hits on the same memory between flushes collapse into one row update.
+
+Counters (see `stats()`):
+    - recorded: hits recorded since startup
+    - pending: hits waiting for the next flush
+    - flushed: hits written to the database
+    - rows_written: row updates issued (flushed minus collapsed duplicates)
+    - flushes: committed flush transactions
+"""
+
+from app.util import _open_conn
+
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, Tuple
+
+from shared.log_config import get_logger
+logger = get_logger(f"ledger.{__name__}")
+
+
+class MemoryAccessStats:
+    """Accumulates memory access hits and writes them in batches."""
+
+    def __init__(self):
+        # memory_id -> (hit count, last access timestamp)
+        self._pending: Dict[str, Tuple[int, str]] = {}
+        self._lock = threading.Lock()
+        self.recorded = 0
+        self.flushed = 0
+        self.rows_written = 0
+        self.flushes = 0
+
+    def record(self, memory_ids: Iterable[str]):
+        """Record one access for each memory ID."""
+        now_local = datetime.now().isoformat()
+        with self._lock:
+            for memory_id in memory_ids:
+                count, _ = self._pending.get(memory_id, (0, now_local))
+                self._pending[memory_id] = (count + 1, now_local)
+                self.recorded += 1
+
+    @property
+    def pending(self) -> int:
+        with self._lock:
+            return sum(count for count, _ in self._pending.values())
+
+    def flush(self) -> int:
+        """
+        Write all pending hits in one transaction.
+
+        If the write fails the hits are merged back into the pending set so they
+        are retried by the next flush, and the error is logged rather than raised.
+
+        Returns:
+            int: Number of memory rows updated.
+        """
+        with self._lock:
+            batch, self._pending = self._pending, {}
+        if not batch:
+            return 0
+
+        try:
+            with _open_conn() as conn:
+                conn.executemany(
+                    "UPDATE memories SET access_count = access_count + ?, last_accessed = ? WHERE id = ?",
+                    [(count, last_accessed, memory_id) for memory_id, (count, last_accessed) in batch.items()]
+                )
+                conn.commit()
+        except Exception as e:
+            logger.error(f"Failed to flush access stats for {len(batch)} memories: {e}")
+            with self._lock:
+                for memory_id, (count, last_accessed) in batch.items():
+                    pending_count, pending_accessed = self._pending.get(memory_id, (0, last_accessed))
+                    self._pending[memory_id] = (count + pending_count, max(last_accessed, pending_accessed))
+            return 0
+
+        with self._lock:
+            self.flushed += sum(count for count, _ in batch.values())
+            self.rows_written += len(batch)
+            self.flushes += 1
+        return len(batch)
+
+    def stats(self) -> Dict[str, int]:
+        """Return the accumulator counters."""
+        pending = self.pending
+        with self._lock:
+            return {
+                "recorded": self.recorded,
+                "pending": pending,
+                "flushed": self.flushed,
+                "rows_written": self.rows_written,
+                "flushes": self.flushes,
+            }
+
+
+access_stats = MemoryAccessStats()
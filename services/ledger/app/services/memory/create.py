@@ -2,6 +2,7 @@ from shared.log_config import get_logger
 logger = get_logger(f"ledger.{__name__}")
 
 from shared.models.ledger import MemoryEntry
+from app.services.embedding.store import embedding_store
 from app.util import _open_conn
 
 import uuid
@@ -93,7 +94,8 @@ def _memory_add_memory(memory: str):
             (memory_id, memory, created_at)
         )
         conn.commit()
-    
+
+    embedding_store.index("memory", memory_id, memory)
     return memory_id
 
 
@@ -1,7 +1,8 @@
 """
 Service layer for semantic memory deduplication operations.
 
-This module provides business logic for global memory deduplication using timeframe or keyword grouping.
+This module provides business logic for global memory deduplication using timeframe, keyword or
+embedding similarity grouping.
 """
 
 from shared.log_config import get_logger
@@ -11,12 +12,16 @@ import sqlite3
 import httpx
 import json
 import os
+import asyncio
+from collections import Counter, defaultdict
 from typing import List, Dict
 from datetime import datetime, timedelta
 
 from shared.models.openai import OpenAICompletionRequest
 from shared.models.ledger import MemoryDedupRequest, MemoryDedupResponse
 from shared.prompt_loader import load_prompt
+from app.services.embedding.index import vector_indexes
+from app.services.embedding.store import EMBEDDINGS_AVAILABLE
 from app.util import _open_conn
 
 from fastapi import HTTPException, status
@@ -94,33 +99,74 @@ def _group_memories_by_timeframe(memories: List[Dict], days: int) -> List[List[s
 
 
 def _group_memories_by_keyword_overlap(memories: List[Dict], min_shared: int) -> List[List[str]]:
-    """Group memories by keyword overlap"""
+    """
+    Group memories by keyword overlap.
+
+    Each unprocessed memory, in order, takes every later unprocessed memory sharing at
+    least `min_shared` keywords with it. Shared-keyword counts come from an inverted
+    keyword index, so only memories that share a keyword are ever compared.
+    """
+    keyword_sets = [set(memory['keywords']) for memory in memories]
+    postings = defaultdict(list)
+    for i, keywords in enumerate(keyword_sets):
+        for keyword in keywords:
+            postings[keyword].append(i)
+
     groups = []
     processed = set()
     
     for i, mem1 in enumerate(memories):
-        if mem1['id'] in processed or not mem1['keywords']:
+        if i in processed or not keyword_sets[i]:
             continue
             
-        current_group = [mem1['id']]
-        processed.add(mem1['id'])
+        processed.add(i)
+        shared = Counter(j for keyword in keyword_sets[i] for j in postings[keyword] if j > i and j not in processed)
+        similar = sorted(j for j, count in shared.items() if count >= min_shared)
+        processed.update(similar)
         
-        for j, mem2 in enumerate(memories[i+1:], i+1):
-            if mem2['id'] in processed or not mem2['keywords']:
-                continue
-                
-            # Count shared keywords
-            shared = set(mem1['keywords']) & set(mem2['keywords'])
-            if len(shared) >= min_shared:
-                current_group.append(mem2['id'])
-                processed.add(mem2['id'])
-        
-        if len(current_group) >= 2:
-            groups.append(current_group)
+        if similar:
+            groups.append([mem1['id']] + [memories[j]['id'] for j in similar])
     
     return groups
 
 
+def _group_memories_by_similarity(memories: List[Dict], threshold: float, neighbours: int = 20) -> List[List[str]]:
+    """
+    Group memories by embedding similarity.
+
+    Each unprocessed memory, in order, takes its later unprocessed nearest neighbours
+    among `memories` (from the memory vector index) whose cosine similarity is at
+    least `threshold`.
+    """
+    if not EMBEDDINGS_AVAILABLE:
+        raise HTTPException(
+            status_code=status.HTTP_501_NOT_IMPLEMENTED,
+            detail="Sentence-transformers library is not available. Install with: pip install sentence-transformers"
+        )
+    positions = {memory['id']: i for i, memory in enumerate(memories)}
+    hits = vector_indexes["memory"].neighbours(
+        {memory['id']: memory['memory'] or "" for memory in memories},
+        k=min(neighbours, len(memories)),
+        min_score=threshold,
+        among=True,
+    )
+
+    groups = []
+    processed = set()
+    for i, memory in enumerate(memories):
+        if i in processed:
+            continue
+        processed.add(i)
+        similar = sorted(
+            j for j in (positions.get(memory_id) for memory_id, _ in hits[memory['id']])
+            if j is not None and j > i and j not in processed
+        )
+        processed.update(similar)
+        if similar:
+            groups.append([memory['id']] + [memories[j]['id'] for j in similar])
+    return groups
+
+
 async def _process_memory_groups_semantic(memory_groups: List[List[str]], grouping_type: str) -> List[Dict]:
     """Process memory groups for deduplication using LLM"""
     results = []
@@ -265,20 +311,21 @@ async def _process_memory_groups_semantic(memory_groups: List[List[str]], groupi
     return results
 
 
-async def _memory_deduplicate_semantic(grouping: str, timeframe_days: int = 7, min_shared_keywords: int = 2, dry_run: bool = False) -> MemoryDedupResponse:
+async def _memory_deduplicate_semantic(grouping: str, timeframe_days: int = 7, min_shared_keywords: int = 2, dry_run: bool = False, similarity_threshold: float = 0.85) -> MemoryDedupResponse:
     """
     Semantic memory deduplication service function.
     
     Args:
-        grouping: Grouping strategy ("timeframe" or "keyword")
+        grouping: Grouping strategy ("timeframe", "keyword" or "similarity")
         timeframe_days: Days for timeframe grouping
         min_shared_keywords: Minimum shared keywords for keyword grouping
         dry_run: If True, only analyze without making changes
+        similarity_threshold: Minimum cosine similarity for similarity grouping
         
     Returns:
         MemoryDedupResponse with results or dry run information
     """
-    ALLOWED_GROUPINGS = ["timeframe", "keyword"]
+    ALLOWED_GROUPINGS = ["timeframe", "keyword", "similarity"]
     
     if grouping not in ALLOWED_GROUPINGS:
         raise HTTPException(
@@ -298,8 +345,10 @@ async def _memory_deduplicate_semantic(grouping: str, timeframe_days: int = 7, m
     # Group memories based on strategy
     if grouping == "timeframe":
         memory_groups = _group_memories_by_timeframe(memories, timeframe_days)
-    else:  # keyword
+    elif grouping == "keyword":
         memory_groups = _group_memories_by_keyword_overlap(memories, min_shared_keywords)
+    else:  # similarity
+        memory_groups = await asyncio.to_thread(_group_memories_by_similarity, memories, similarity_threshold)
     
     if dry_run:
         return MemoryDedupResponse(
@@ -312,7 +361,8 @@ async def _memory_deduplicate_semantic(grouping: str, timeframe_days: int = 7, m
                 "estimated_api_calls": len(memory_groups),
                 "parameters": {
                     "timeframe_days": timeframe_days if grouping == "timeframe" else None,
-                    "min_shared_keywords": min_shared_keywords if grouping == "keyword" else None
+                    "min_shared_keywords": min_shared_keywords if grouping == "keyword" else None,
+                    "similarity_threshold": similarity_threshold if grouping == "similarity" else None
                 }
             }
         )
@@ -23,20 +23,14 @@ import asyncio
 from shared.models.openai import OpenAICompletionRequest
 from shared.models.ledger import MemoryEntry, MemoryDedupResponse
 from shared.prompt_loader import load_prompt
+from app.services.embedding.index import vector_indexes
+from app.services.embedding.store import EMBEDDINGS_AVAILABLE
 from app.util import _open_conn
 
 from fastapi import HTTPException, status
 
-# Try to import sentence-transformers for topic similarity
-try:
-    from sentence_transformers import SentenceTransformer
-    from sklearn.metrics.pairwise import cosine_similarity
-    import numpy as np
-    EMBEDDINGS_AVAILABLE = True
-    logger.info("Sentence-transformers available for topic similarity")
-except ImportError as e:
-    EMBEDDINGS_AVAILABLE = False
-    logger.warning(f"Sentence-transformers not available: {e}. Topic similarity disabled.")
+# Nearest neighbours looked up per topic when grouping similar topics
+TOPIC_NEIGHBOURS = 50
 
 
 @dataclass
@@ -121,15 +115,15 @@ def _find_similar_topics(
         return []
     
     try:
-        # Load model for topic name similarity
-        model = SentenceTransformer("all-MiniLM-L6-v2")
-        
-        # Get embeddings for topic names
-        topic_names = [topic.name for topic in topics]
-        embeddings = model.encode(topic_names)
-        
-        # Compute similarity matrix
-        similarity_matrix = cosine_similarity(embeddings)
+        # Nearest neighbours above the threshold among these topics, from the topic
+        # vector index (stored embeddings; only new or renamed topics are encoded)
+        positions = {topic.id: i for i, topic in enumerate(topics)}
+        neighbours = vector_indexes["topic"].neighbours(
+            {topic.id: topic.name or "" for topic in topics},
+            k=min(TOPIC_NEIGHBOURS, len(topics)),
+            min_score=similarity_threshold,
+            among=True,
+        )
         
         # Find similar topic groups
         processed = set()
@@ -140,16 +134,18 @@ def _find_similar_topics(
                 continue
             
             # Find similar topics
-            similar_indices = []
-            for j in range(i + 1, len(topics)):
-                if j in processed and similarity_matrix[i][j] >= similarity_threshold:
-                    similar_indices.append(j)
+            similarities = {}
+            for topic_id, score in neighbours[topic.id]:
+                j = positions.get(topic_id)
+                if j is not None and j > i and j in processed:
+                    similarities[j] = score
+            similar_indices = sorted(similarities)
             
             if similar_indices:
                 similar_topics = [topics[j] for j in similar_indices]
                 primary_topic = topic
                 total_memories = topic.memory_count + sum(t.memory_count for t in similar_topics)
-                avg_similarity = np.mean([similarity_matrix[i][j] for j in similar_indices])
+                avg_similarity = sum(similarities.values()) / len(similarities)
                 
                 topic_groups.append(TopicGroup(
                     primary_topic=primary_topic,
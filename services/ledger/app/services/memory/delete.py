@@ -1,6 +1,7 @@
 from shared.log_config import get_logger
 logger = get_logger(f"ledger.{__name__}")
 
+from app.services.embedding.store import embedding_store
 from app.util import _open_conn
 
 from fastapi import HTTPException, status
@@ -20,4 +21,5 @@ def _memory_delete(memory_id: str):
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="No memory found with that ID."
-            )
\ No newline at end of file
+            )
+    embedding_store.delete("memory", [memory_id])
\ No newline at end of file
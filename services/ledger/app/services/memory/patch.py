@@ -3,6 +3,7 @@ logger = get_logger(f"ledger.{__name__}")
 
 from shared.models.ledger import MemoryEntry
 
+from app.services.embedding.store import embedding_store
 from app.util import _open_conn
 
 import sqlite3
@@ -69,7 +70,9 @@ def _memory_patch(memory: MemoryEntry):
                 )
             
             conn.commit()
-            
+
+        if memory.memory is not None:
+            embedding_store.index("memory", memory.id, memory.memory)
         logger.debug(f"Memory ID {memory.id} updated successfully.")
         return True
     except sqlite3.Error as e:
@@ -2,117 +2,102 @@ from shared.models.ledger import MemorySearchParams, MemoryEntry
 
 from app.services.memory.get_details import _get_memory_details
 from app.services.memory.util import _memory_exists
+from app.services.memory.access_stats import access_stats
 
 from app.util import _open_conn
 
 import sqlite3
-from datetime import datetime
-from typing import List, Set
+from typing import List
 from fastapi import HTTPException, status
 
 from shared.log_config import get_logger
 logger = get_logger(f"ledger.{__name__}")
 
 
-def _apply_filters(params: MemorySearchParams) -> Set[str]:
+def _apply_filters(params: MemorySearchParams) -> List[str]:
     """
     Apply multiple search filters to find memory IDs that match ALL specified criteria.
+
+    All filters are composed into one SQL query so each is answered from its index
+    (lower(tag), category, topic_id, created_at) and only matching IDs leave SQLite.
+
+    Keyword matching requires min_keywords matching tags, relaxed down to the best
+    match count any memory reaches when nobody hits min_keywords. Instead of
+    re-running the GROUP BY at each level, the query counts matches once and uses
+    min(min_keywords, max match count) as the threshold. Results are ranked by match
+    count (newest first within a count) and cut to params.limit when set.
     
     Args:
         params (MemorySearchParams): Search parameters containing various filter criteria.
     
     Returns:
-        Set[str]: Set of memory IDs that match all specified filters.
+        List[str]: Memory IDs that match all specified filters, best matches first.
     """
-    with _open_conn() as conn:
-        cursor = conn.cursor()
-        
-        # Start with all memory IDs, then apply filters to narrow down
-        cursor.execute("SELECT id FROM memories")
-        all_memory_ids = {row[0] for row in cursor.fetchall()}
-        
-        result_ids = all_memory_ids.copy()
-        
-        # Apply keyword filter
-        if params.keywords and len(params.keywords) > 0:
-            keywords_norm = [k.lower() for k in params.keywords]
-            q_marks = ','.join('?' for _ in keywords_norm)
-            
-            # Try progressively lower minimum keyword matches
-            current_min_keywords = min(params.min_keywords, len(keywords_norm))
-            keyword_matches = set()
-            
-            while current_min_keywords > 0 and not keyword_matches:
-                cursor.execute(f"""
-                    SELECT memory_id, COUNT(DISTINCT tag) as match_count
-                    FROM memory_tags 
-                    WHERE lower(tag) IN ({q_marks})
-                    GROUP BY memory_id
-                    HAVING COUNT(DISTINCT tag) >= ?
-                """, keywords_norm + [current_min_keywords])
-                
-                keyword_matches = {row[0] for row in cursor.fetchall()}
-                if not keyword_matches:
-                    current_min_keywords -= 1
-            
-            logger.debug(f"Keyword filter found {len(keyword_matches)} memories with min_keywords={current_min_keywords}")
-            result_ids &= keyword_matches
-        
-        # Apply category filter
-        if params.category:
-            cursor.execute("""
-                SELECT memory_id FROM memory_category WHERE category = ?
-            """, (params.category,))
-            category_matches = {row[0] for row in cursor.fetchall()}
-            logger.debug(f"Category filter found {len(category_matches)} memories")
-            result_ids &= category_matches
-        
-        # Apply topic filter
-        if params.topic_id:
-            cursor.execute("""
-                SELECT memory_id FROM memory_topics WHERE topic_id = ?
-            """, (params.topic_id,))
-            topic_matches = {row[0] for row in cursor.fetchall()}
-            logger.debug(f"Topic filter found {len(topic_matches)} memories")
-            result_ids &= topic_matches
-        
-        # Apply time filters
-        if params.created_after or params.created_before:
-            time_conditions = []
-            time_params = []
-            
-            if params.created_after:
-                time_conditions.append("created_at >= ?")
-                time_params.append(params.created_after)
-            
-            if params.created_before:
-                time_conditions.append("created_at <= ?")
-                time_params.append(params.created_before)
-            
-            time_query = f"SELECT id FROM memories WHERE {' AND '.join(time_conditions)}"
-            cursor.execute(time_query, time_params)
-            time_matches = {row[0] for row in cursor.fetchall()}
-            logger.debug(f"Time filter found {len(time_matches)} memories")
-            result_ids &= time_matches
-        
-        return result_ids
+    ctes = []
+    conditions = []
+    args = []
 
+    if params.keywords and len(params.keywords) > 0:
+        keywords_norm = [k.lower() for k in params.keywords]
+        q_marks = ','.join('?' for _ in keywords_norm)
+        min_keywords = min(params.min_keywords, len(keywords_norm))
+        if min_keywords <= 0:
+            return []
+
+        ctes.append(f"""
+            keyword_matches AS (
+                SELECT memory_id, COUNT(DISTINCT tag) AS match_count
+                FROM memory_tags
+                WHERE lower(tag) IN ({q_marks})
+                GROUP BY memory_id
+            )""")
+        ctes.append("""
+            keyword_level AS (
+                SELECT MIN(?, MAX(match_count)) AS min_count FROM keyword_matches
+            )""")
+        args.extend(keywords_norm)
+        args.append(min_keywords)
+        source = "keyword_matches k JOIN memories m ON m.id = k.memory_id"
+        conditions.append("k.match_count >= (SELECT min_count FROM keyword_level)")
+        order_by = "k.match_count DESC, m.created_at DESC"
+    else:
+        source = "memories m"
+        order_by = "m.created_at DESC"
+
+    if params.category:
+        conditions.append("m.id IN (SELECT memory_id FROM memory_category WHERE category = ?)")
+        args.append(params.category)
+
+    if params.topic_id:
+        conditions.append("m.id IN (SELECT memory_id FROM memory_topics WHERE topic_id = ?)")
+        args.append(params.topic_id)
+
+    if params.created_after:
+        conditions.append("m.created_at >= ?")
+        args.append(params.created_after)
+
+    if params.created_before:
+        conditions.append("m.created_at <= ?")
+        args.append(params.created_before)
+
+    query = ""
+    if ctes:
+        query += "WITH " + ",".join(ctes) + "\n"
+    query += f"SELECT m.id FROM {source}"
+    if conditions:
+        query += " WHERE " + " AND ".join(conditions)
+    query += f" ORDER BY {order_by}"
+    if params.limit:
+        query += " LIMIT ?"
+        args.append(params.limit)
 
-def _update_memory_access_stats(memory_id: str):
-    """
-    Update access statistics for a memory entry.
-    
-    Args:
-        memory_id (str): The ID of the memory to update.
-    """
     with _open_conn() as conn:
         cursor = conn.cursor()
-        now_local = datetime.now().isoformat()
-        cursor.execute(
-            "UPDATE memories SET access_count = access_count + 1, last_accessed = ? WHERE id = ?",
-            (now_local, memory_id)
-        )
-        conn.commit()
+        cursor.execute(query, args)
+        result_ids = [row[0] for row in cursor.fetchall()]
+
+    logger.debug(f"Memory filters matched {len(result_ids)} memories")
+    return result_ids
 
 
 def _memory_search(params: MemorySearchParams) -> List[MemoryEntry]:
@@ -167,14 +152,16 @@ def _memory_search(params: MemorySearchParams) -> List[MemoryEntry]:
             # Combined search using filters
             memory_ids = _apply_filters(params)
             memories = _get_memory_details(memory_ids)
+            rank = {memory_id: i for i, memory_id in enumerate(memory_ids)}
+            memories.sort(key=lambda mem: rank[mem.id])
         
         if not memories:
             logger.debug("No memories found for the given search criteria.")
             return []
         
-        # Update access statistics for all retrieved memories
-        for mem in memories:
-            _update_memory_access_stats(mem.id)
+        # Update access statistics for all retrieved memories in one batch
+        access_stats.record(mem.id for mem in memories)
+        access_stats.flush()
         
         logger.debug(f"Found {len(memories)} memories matching search criteria")
         return memories
@@ -0,0 +1,61 @@
+from shared.models.ledger import MemorySimilarParams, SimilarMemory
+
+from app.services.embedding.index import vector_indexes
+from app.services.embedding.store import EMBEDDINGS_AVAILABLE, embedding_store
+from app.services.memory.get_details import _get_memory_details
+from app.util import _open_conn
+
+from typing import List
+from fastapi import HTTPException, status
+
+from shared.log_config import get_logger
+logger = get_logger(f"ledger.{__name__}")
+
+
+def _memory_similar(params: MemorySimilarParams) -> List[SimilarMemory]:
+    """
+    Find the memories most similar to a stored memory or to a piece of text.
+
+    Scores are cosine similarities between stored memory embeddings, read from
+    the memory vector index; only the query text is encoded (and only if it
+    isn't a stored memory with an up-to-date vector).
+
+    Args:
+        params (MemorySimilarParams): memory_id or text, k and optional min_score.
+
+    Returns:
+        List[SimilarMemory]: Up to k memories, most similar first.
+
+    Raises:
+        HTTPException: 400 if neither memory_id nor text is given, 404 if the
+            memory doesn't exist, 501 if sentence-transformers is not installed.
+    """
+    if not EMBEDDINGS_AVAILABLE:
+        raise HTTPException(
+            status_code=status.HTTP_501_NOT_IMPLEMENTED,
+            detail="Sentence-transformers library is not available. Install with: pip install sentence-transformers"
+        )
+    if not params.memory_id and not params.text:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Either memory_id or text is required."
+        )
+
+    index = vector_indexes["memory"]
+    if params.memory_id:
+        with _open_conn() as conn:
+            row = conn.execute("SELECT memory FROM memories WHERE id = ?", (params.memory_id,)).fetchone()
+        if row is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Memory ID {params.memory_id} not found."
+            )
+        hits = index.neighbours({params.memory_id: row[0] or ""}, params.k, params.min_score)[params.memory_id]
+    else:
+        hits = index.search(embedding_store.encode([params.text]), params.k, params.min_score)[0]
+
+    scores = dict(hits)
+    memories = _get_memory_details(set(scores))
+    memories.sort(key=lambda mem: scores[mem.id], reverse=True)
+    logger.debug(f"Found {len(memories)} memories similar to {params.memory_id or params.text!r}")
+    return [SimilarMemory(**mem.model_dump(), score=scores[mem.id]) for mem in memories]
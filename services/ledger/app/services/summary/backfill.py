@@ -0,0 +1,110 @@
+"""
+Backfill of missing period summaries over a date range.
+
+A (date, period) slot is missing when it has user messages but no summary of
+that period, or a daily summary, overlapping it (before rollups kept them, period
+summaries were deleted once a daily summary was built from them). Missing slots
+are summarized by `_create_periodic_summary`, at most `concurrency` at a time (default
+`summary.backfill_concurrency`, 2); the proxy calls inside them share
+summary_llm's process-wide limit, so a backfill can't starve live summary jobs
+of more than that.
+"""
+from shared.models.ledger import PeriodSummaryCreateRequest, SummaryBackfillRequest
+
+from shared.log_config import get_logger
+logger = get_logger(f"ledger.{__name__}")
+
+from app.services.summary.create_periodic import VALID_PERIODS, _create_periodic_summary
+from app.services.summary.llm import summary_setting
+from app.services.user.get_messages import _sql_timestamp
+from app.services.user.util import _get_period_range
+from app.util import _load_config, _open_conn
+
+from datetime import datetime, timedelta
+from fastapi import HTTPException, status
+from typing import List, Tuple
+import asyncio
+
+DEFAULT_BACKFILL_CONCURRENCY = 2
+
+# Backfills longer than this are rejected; split them into several requests
+MAX_BACKFILL_DAYS = 366
+
+
+def _missing_slots(user_id: str, dates: List[str], periods: List[str]) -> List[Tuple[str, str]]:
+    """(date, period) slots that have messages but no covering summary."""
+    missing = []
+    with _open_conn() as conn:
+        cur = conn.cursor()
+        for date in dates:
+            for period in periods:
+                start_dt, end_dt = _get_period_range(period, date)
+                begin, end = _sql_timestamp(start_dt, round_up=True), _sql_timestamp(end_dt)
+                cur.execute(
+                    "SELECT 1 FROM user_messages WHERE user_id = ? AND created_at BETWEEN ? AND ? AND role = 'user' LIMIT 1",
+                    (user_id, begin, end),
+                )
+                if cur.fetchone() is None:
+                    continue
+                cur.execute(
+                    "SELECT 1 FROM summaries WHERE summary_type IN (?, 'daily') "
+                    "AND timestamp_begin <= ? AND timestamp_end >= ? LIMIT 1",
+                    (period, end, begin),
+                )
+                if cur.fetchone() is None:
+                    missing.append((date, period))
+    return missing
+
+
+async def _backfill_summaries(request: SummaryBackfillRequest) -> List[dict]:
+    """
+    Create the missing period summaries between `start_date` and `end_date`.
+
+    Args:
+        request (SummaryBackfillRequest): Date range, periods and optional concurrency.
+
+    Returns:
+        List[dict]: The summaries that were created. Slots whose summary failed are
+        logged and left missing, so the backfill can simply be re-run.
+
+    Raises:
+        HTTPException: If the dates or periods are invalid.
+    """
+    try:
+        first = datetime.strptime(request.start_date, "%Y-%m-%d")
+        last = datetime.strptime(request.end_date, "%Y-%m-%d")
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Dates must be in YYYY-MM-DD format.")
+    days = (last - first).days + 1
+    if days <= 0 or days > MAX_BACKFILL_DAYS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"end_date must be on or after start_date and at most {MAX_BACKFILL_DAYS} days later."
+        )
+    invalid = [p for p in request.periods if p not in VALID_PERIODS]
+    if invalid:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid periods {invalid}. Must be among: {', '.join(VALID_PERIODS)}."
+        )
+
+    user_id = _load_config().get("user_id")
+    dates = [(first + timedelta(days=i)).strftime("%Y-%m-%d") for i in range(days)]
+    slots = await asyncio.to_thread(_missing_slots, user_id, dates, request.periods)
+    concurrency = request.concurrency or max(1, summary_setting("backfill_concurrency", DEFAULT_BACKFILL_CONCURRENCY))
+    logger.info(f"Backfilling {len(slots)} missing period summaries from {request.start_date} to {request.end_date} (concurrency {concurrency})")
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def _run(date: str, period: str) -> List[dict]:
+        async with semaphore:
+            try:
+                return await _create_periodic_summary(PeriodSummaryCreateRequest(period=period, date=date))
+            except Exception as e:
+                logger.error(f"Backfill of {period} summary for {date} failed: {e}")
+                return []
+
+    results = await asyncio.gather(*(_run(date, period) for date, period in slots))
+    created = [summary for result in results for summary in result]
+    logger.info(f"Backfill created {len(created)}/{len(slots)} period summaries")
+    return created
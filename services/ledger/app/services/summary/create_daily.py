@@ -4,20 +4,24 @@ Functions:
     _create_daily_summary(request: SummaryCreateRequest) -> List[dict]:
         Asynchronously creates a daily summary by:
             1. Loading configuration and environment variables.
-            2. Retrieving all period summaries for the given date.
-            3. Formatting summaries and constructing a prompt for a language model.
-            4. Sending the prompt to an external API to generate the daily summary.
-            5. Storing the generated summary in the ledger.
-            6. Deleting the original period summaries to avoid duplication.
+            2. Bringing the period summaries for the given date up to date (see rollup.py); period
+               summaries stored before input hashes existed are left as they are.
+            3. Reusing the stored daily summary if its period summaries are unchanged.
+            4. Formatting summaries and constructing a prompt for a language model.
+            5. Sending the prompt to an external API to generate the daily summary.
+            6. Storing the generated summary in the ledger and marking the period summaries as rolled up.
+    _ensure_daily_summaries(dates: List[str]):
+        Brings the daily summaries of past dates up to date before a weekly or monthly rollup.
 """
-from shared.models.ledger import SummaryCreateRequest, SummaryMetadata, Summary
+from shared.models.ledger import PeriodSummaryCreateRequest, SummaryCreateRequest, SummaryMetadata, Summary
 
 from shared.models.openai import OpenAICompletionRequest
 from shared.prompt_loader import load_prompt
 
-from app.services.summary.insert import _insert_summary
-from app.services.summary.get import _get_summaries
-from app.services.summary.delete import _delete_summary
+from app.services.summary.create_periodic import VALID_PERIODS, _create_periodic_summary, _period_window
+from app.services.summary.llm import DEFAULT_MAX_CONCURRENCY, summary_setting
+from app.services.summary.rollup import date_window, get_children, get_node, rollup_stats, store_node, summary_inputs_hash
+from app.util import _load_config
 
 from shared.log_config import get_logger
 logger = get_logger(f"ledger.{__name__}")
@@ -25,8 +29,8 @@ logger = get_logger(f"ledger.{__name__}")
 from datetime import datetime
 from fastapi import HTTPException, status
 from typing import List
+import asyncio
 import httpx
-import json
 import os
 
 
@@ -36,11 +40,13 @@ async def _create_daily_summary(request: SummaryCreateRequest) -> List[dict]:
 
     This function performs the following steps:
     1. Loads configuration settings and environment variables.
-    2. Retrieves all period summaries for the specified date.
-    3. Constructs a prompt to generate a daily summary using an external language model API.
-    4. Sends the prompt to the API and receives the generated summary.
-    5. Stores the generated daily summary in the ledger.
-    6. Deletes the original period summaries to avoid duplication.
+    2. Brings the period summaries for the specified date up to date; each is regenerated only if its messages changed.
+       Period summaries stored before input hashes existed are final and are not regenerated.
+    3. Returns the stored daily summary if it was built from the same period summaries.
+    4. Constructs a prompt to generate a daily summary using an external language model API.
+    5. Sends the prompt to the API and receives the generated summary.
+    6. Stores the generated daily summary in the ledger and marks the period summaries as rolled up,
+       which hides them from summary listings as deleting them used to.
 
     Args:
         request (SummaryCreateRequest): The request object containing the target date for the daily summary.
@@ -52,29 +58,54 @@ async def _create_daily_summary(request: SummaryCreateRequest) -> List[dict]:
         HTTPException: If summaries cannot be retrieved, summarized, or stored.
     """
     logger.debug(f"Creating daily summary for date: {request.date}")
-    with open('/app/config/config.json') as f:
-        _config = json.load(f)
+    try:
+        datetime.strptime(request.date, "%Y-%m-%d")
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid date specified. Expected 'YYYY-MM-DD' format."
+        )
+    _config = _load_config()
     timeout = _config["timeout"]
-    daily_max_tokens = _config["summary"]["daily_max_tokens"] if "daily" in _config["summary"] else 512
+    daily_max_tokens = _config["summary"].get("daily_max_tokens", 512)
     api_port = os.getenv("API_PORT", 4200)
+    window = date_window(request.date)
 
+    # Bring the day's period summaries up to date; each is regenerated only if its messages changed.
+    # A period summary stored before input hashes existed has nothing to compare against, so it is
+    # final, as legacy dailies are in _ensure_daily_summaries.
+    periods = []
+    for period in VALID_PERIODS:
+        existing, existing_hash = get_node(period, _period_window(period, request.date))
+        if existing is None or existing_hash is not None:
+            periods.append(period)
+    await asyncio.gather(*(
+        _create_periodic_summary(PeriodSummaryCreateRequest(period=period, date=request.date)) for period in periods
+    ))
 
-    # Use internal function to fetch all period summaries for the date
     try:
-        summaries = [s.model_dump() for s in _get_summaries(timestamp_begin=f"{request.date} 00:00:00", timestamp_end=f"{request.date} 23:59:59")]
+        children = get_children(VALID_PERIODS, window)
     except Exception as e:
         logger.error(f"Failed to get summaries for {request.date}: {e}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to retrieve summaries: {e}")
 
-    if not summaries:
+    if not children:
         logger.warning("No summaries found for the specified period.")
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="No summaries found for the specified period."
         )
 
+    input_hash = summary_inputs_hash(children)
+    existing, existing_hash = get_node("daily", window)
+    if existing is not None and existing_hash == input_hash:
+        logger.debug(f"Daily summary for {request.date} is up to date")
+        rollup_stats.record("daily", reused=True)
+        return [existing.model_dump()]
+    summaries = [s.model_dump() for s in children]
+
     # Build prompt for daily summary
     def format_timestamp(ts: str) -> str:
         dt = datetime.fromisoformat(ts.replace("Z", ""))
@@ -120,10 +151,11 @@ async def _create_daily_summary(request: SummaryCreateRequest) -> List[dict]:
         timestamp_end=summaries[-1]["metadata"]["timestamp_end"]
     )
     summary_obj = Summary(content=summary_text, metadata=metadata)
-    # Store in ledger
+    # Store in ledger, marking the period summaries as rolled up into it
     results = []
     try:
-        result = _insert_summary(summary_obj)
+        result = store_node(summary_obj, input_hash, window, roll_up=[s.id for s in children])
+        rollup_stats.record("daily", reused=False)
         results.append(result.model_dump())
     except Exception as e:
         logger.error(f"Failed to write daily summary to ledger: {e}")
@@ -131,15 +163,29 @@ async def _create_daily_summary(request: SummaryCreateRequest) -> List[dict]:
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to write daily summary: {e}"
         )
-    # Delete original period summaries, skipping duplicates
-    deleted_ids = set()
-    for s in summaries:
-        summary_id = s['id']
-        if summary_id in deleted_ids:
-            continue
-        try:
-            _delete_summary(id=summary_id)
-            deleted_ids.add(summary_id)
-        except Exception as e:
-            logger.warning(f"Failed to delete period summary {summary_id}: {e}")
-    return results
\ No newline at end of file
+    return results
+
+
+async def _ensure_daily_summaries(dates: List[str]):
+    """
+    Bring the daily summaries of past `dates` up to date before a weekly or monthly rollup.
+
+    Days with no conversation are skipped, and so are daily summaries stored before
+    input hashes existed (their period summaries were deleted, so they are final).
+    Days run `summary.max_concurrency` at a time.
+    """
+    today = datetime.now().strftime("%Y-%m-%d")
+    semaphore = asyncio.Semaphore(max(1, summary_setting("max_concurrency", DEFAULT_MAX_CONCURRENCY)))
+
+    async def _ensure(date: str):
+        existing, existing_hash = get_node("daily", date_window(date))
+        if existing is not None and existing_hash is None:
+            return
+        async with semaphore:
+            try:
+                await _create_daily_summary(SummaryCreateRequest(period=["daily"], date=date))
+            except HTTPException as e:
+                if e.status_code != status.HTTP_404_NOT_FOUND:
+                    raise
+
+    await asyncio.gather(*(_ensure(date) for date in dates if date < today))
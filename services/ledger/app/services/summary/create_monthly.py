@@ -14,7 +14,8 @@ Process:
     - Validates the input date and ensures it is the first day of the month.
     - Rolls back to the last day of the previous month to determine the month to summarize.
     - Loads configuration and environment variables.
-    - Fetches all daily summaries for the target month.
+    - Brings the month's daily summaries up to date and fetches them.
+    - Returns the stored monthly summary if it was built from the same daily summaries.
     - Constructs a prompt for the language model to generate a monthly summary.
     - Calls an external API to generate the summary using the prompt.
     - Inserts the generated summary into the ledger.
@@ -28,14 +29,14 @@ logger = get_logger(f"ledger.{__name__}")
 from shared.models.openai import OpenAICompletionRequest
 from shared.prompt_loader import load_prompt
 
-from app.services.summary.insert import _insert_summary
-from app.services.summary.get import _get_summaries
+from app.services.summary.create_daily import _ensure_daily_summaries
+from app.services.summary.rollup import date_window, get_children, get_node, rollup_stats, store_node, summary_inputs_hash
+from app.util import _load_config
 
 from datetime import datetime, timedelta
 from fastapi import HTTPException, status
 from typing import List
 import httpx
-import json
 import os
 
 
@@ -56,7 +57,8 @@ async def _create_monthly_summary(request: SummaryCreateRequest) -> List[dict]:
         - Validates the input date and ensures it is the first day of the month.
         - Loads configuration and environment variables.
         - Determines the time range for the month.
-        - Fetches daily summaries for the specified month.
+        - Brings the month's daily summaries up to date and fetches them.
+        - Returns the stored monthly summary if its daily summaries are unchanged.
         - Constructs a prompt for summarization using the daily summaries.
         - Calls an external API to generate the monthly summary.
         - Stores the generated summary in the ledger.
@@ -77,25 +79,34 @@ async def _create_monthly_summary(request: SummaryCreateRequest) -> List[dict]:
     request_date = request_date - timedelta(days=1)
     from calendar import monthrange
     logger.debug(f"Creating monthly summary for date: {request.date}")
-    with open('/app/config/config.json') as f:
-        _config = json.load(f)
+    _config = _load_config()
     timeout = _config["timeout"]
     monthly_max_tokens = _config["summary"].get("monthly_max_tokens", 2048)
     api_port = os.getenv("API_PORT", 4200)
-    timestamp_begin = request_date.replace(day=1).strftime("%Y-%m-%d 00:00:00")
     last_day = monthrange(request_date.year, request_date.month)[1]
-    timestamp_end = request_date.replace(day=last_day).strftime("%Y-%m-%d 23:59:59")
-    # Use internal function to fetch daily summaries for the month
+    dates = [request_date.replace(day=day).strftime("%Y-%m-%d") for day in range(1, last_day + 1)]
+    window = date_window(dates[0], dates[-1])
+    # Bring the month's daily summaries up to date, then build only from them
     try:
-        summaries = [s.model_dump() for s in _get_summaries(period="daily", timestamp_begin=timestamp_begin, timestamp_end=timestamp_end)]
+        await _ensure_daily_summaries(dates)
+        children = get_children(("daily",), window)
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Failed to get daily summaries for month {request.date}: {e}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to retrieve summaries: {e}")
-    if not summaries:
+    if not children:
         logger.warning("No summaries found for the specified period.")
         return []
+    input_hash = summary_inputs_hash(children)
+    existing, existing_hash = get_node("monthly", window)
+    if existing is not None and existing_hash == input_hash:
+        logger.debug(f"Monthly summary for {request.date} is up to date")
+        rollup_stats.record("monthly", reused=True)
+        return [existing.model_dump()]
+    summaries = [s.model_dump() for s in children]
     # Build prompt for monthly summary
     def format_timestamp(ts: str) -> str:
         dt = datetime.fromisoformat(ts.replace("Z", ""))
@@ -142,7 +153,8 @@ async def _create_monthly_summary(request: SummaryCreateRequest) -> List[dict]:
     summary_obj = Summary(content=summary_text, metadata=metadata)
     results = []
     try:
-        result = _insert_summary(summary_obj)
+        result = store_node(summary_obj, input_hash, window)
+        rollup_stats.record("monthly", reused=False)
         results.append(result.model_dump())
     except Exception as e:
         logger.error(f"Failed to write monthly summary to ledger: {e}")
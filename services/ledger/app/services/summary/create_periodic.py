@@ -2,8 +2,8 @@
 This module provides functionality to asynchronously create periodic summaries of user-assistant conversations for specified periods and dates.
 
 Functions:
-    create_periodic_summary(request: SummaryCreateRequest) -> List[dict]:
-        Asynchronously generates a summary of conversations for a given user, period, and date. The function retrieves messages, chunks them to fit within token limits, summarizes each chunk using an external language model API, and combines summaries if necessary. The final summary is then inserted into the database.
+    create_periodic_summary(request: PeriodSummaryCreateRequest) -> List[dict]:
+        Asynchronously generates a summary of conversations for a given user, period, and date. The function retrieves messages, chunks them to fit within token limits, summarizes the chunks concurrently using an external language model API, and combines summaries if necessary (map-reduce when there are many). The final summary is then inserted into the database, unless the stored summary was built from the same messages (see rollup.py).
 
 Constants:
     VALID_PERIODS: List of valid period strings for which summaries can be created.
@@ -11,39 +11,140 @@ Constants:
 
     The module uses structured logging to trace the summary creation process, including debug, warning, and error messages.
 """
-from shared.models.ledger import SummaryCreateRequest, SummaryMetadata, Summary, CanonicalUserMessage, UserMessagesRequest
+from shared.models.ledger import PeriodSummaryCreateRequest, SummaryMetadata, Summary, CanonicalUserMessage, UserMessagesRequest
 from shared.prompt_loader import load_prompt
-from shared.models.proxy import SingleTurnRequest
 
 from shared.log_config import get_logger
 logger = get_logger(f"ledger.{__name__}")
 
-from app.services.user.get_messages import _get_user_messages
-from app.services.summary.insert import _insert_summary
+from app.services.user.get_messages import _get_user_messages, _sql_timestamp
+from app.services.user.tokens import SUMMARY_TOKENIZER, _get_message_tokens, count_tokens_batch
+from app.services.summary.llm import DEFAULT_CHUNK_TOKENS, DEFAULT_COMBINE_FAN_IN, summary_llm, summary_setting
+from app.services.summary.rollup import get_node, message_inputs_hash, rollup_stats, store_node
+from app.services.user.util import _get_period_range
+from app.util import _load_config, _open_conn
 
 from datetime import datetime, timedelta
 from fastapi import HTTPException, status
-from typing import List
-import httpx
-import json
-import os
-
-from transformers import AutoTokenizer
+from typing import List, Tuple
+import asyncio
 
 
 VALID_PERIODS = ["night", "morning", "afternoon", "evening"]
 ALL_PERIODS = VALID_PERIODS + ["daily", "weekly", "monthly"]
 
-async def _create_periodic_summary(request: SummaryCreateRequest) -> List[dict]:
+def _period_window(period: str, date: str) -> Tuple[str, str]:
+    """The (start, end) SQL timestamps a period summary for `date` is stored under."""
+    start_dt, end_dt = _get_period_range(period, date)
+    return (_sql_timestamp(start_dt, round_up=True), _sql_timestamp(end_dt))
+
+
+def _chunk_messages(messages: List[CanonicalUserMessage], max_tokens: int) -> List[List[CanonicalUserMessage]]:
+    """Split messages into consecutive chunks of at most `max_tokens` gpt2 tokens (one oversized message is its own chunk)."""
+    with _open_conn() as conn:
+        token_counts = _get_message_tokens(conn.cursor(), [msg.id for msg in messages], SUMMARY_TOKENIZER)
+
+    # Rows written outside the ledger's sync paths have no stored count; count them in one batch.
+    uncounted = [msg for msg in messages if msg.id not in token_counts]
+    if uncounted:
+        counts = count_tokens_batch(SUMMARY_TOKENIZER, [msg.content for msg in uncounted])
+        token_counts = {**token_counts, **{msg.id: tokens for msg, tokens in zip(uncounted, counts)}}
+
+    chunks = []
+    current_chunk = []
+    current_tokens = 0
+    for msg in messages:
+        tokens = token_counts[msg.id]
+        if current_tokens + tokens > max_tokens and current_chunk:
+            chunks.append(current_chunk)
+            current_chunk = []
+            current_tokens = 0
+        current_chunk.append(msg)
+        current_tokens += tokens
+    if current_chunk:
+        chunks.append(current_chunk)
+    return chunks
+
+
+async def _summarize_chunk(chunk: List[CanonicalUserMessage], period: str, max_tokens: int) -> Summary:
+    """Summarize one chunk of conversation through the proxy."""
+    # Prompt construction (moved from proxy/app/summary.py)
+    user_label = "Randi"
+    assistant_label = "Kirishima"
+    lines = []
+    for msg in chunk:
+        if hasattr(msg, 'role') and msg.role == "user":
+            lines.append(f"{user_label}: {msg.content}")
+        elif hasattr(msg, 'role') and msg.role == "assistant":
+            lines.append(f"{assistant_label}: {msg.content}")
+    conversation_str = "\n".join(lines)
+
+    logger.debug(f"Conversation string for summary: {conversation_str}")
+
+    prompt = load_prompt("ledger", "summary", "periodic",
+                       conversation_str=conversation_str,
+                       max_tokens=max_tokens)
+    summary_text = await summary_llm.summarize(prompt)
+    metadata = SummaryMetadata(
+        summary_type=period,
+        timestamp_begin=chunk[0].created_at,
+        timestamp_end=chunk[-1].created_at
+    )
+    return Summary(content=summary_text, metadata=metadata)
+
+
+def _format_timestamp(ts: str) -> str:
+    dt = datetime.fromisoformat(ts.replace("Z", ""))
+    return dt.strftime("%A, %B %d")
+
+
+async def _combine_summaries(summaries: List[Summary], period: str, max_tokens: int) -> Summary:
+    """
+    Merge chunk summaries into one.
+
+    Up to `summary.combine_fan_in` summaries are combined in a single call. With
+    more, they are combined in groups of that size concurrently, and the group
+    results are combined again (map-reduce) until one summary is left.
+    """
+    if len(summaries) == 1:
+        return summaries[0]
+
+    fan_in = max(2, summary_setting("combine_fan_in", DEFAULT_COMBINE_FAN_IN))
+    if len(summaries) > fan_in:
+        groups = [summaries[i:i + fan_in] for i in range(0, len(summaries), fan_in)]
+        logger.debug(f"Combining {len(summaries)} summaries in {len(groups)} groups")
+        combined = await asyncio.gather(*(_combine_summaries(group, period, max_tokens) for group in groups))
+        return await _combine_summaries(list(combined), period, max_tokens)
+
+    # Add formatted_date to each summary for template (from proxy/app/summary.py)
+    formatted_summaries = []
+    for summary in summaries:
+        summary_dict = summary.model_dump()
+        summary_dict['formatted_date'] = _format_timestamp(summary.metadata.timestamp_begin)
+        formatted_summaries.append(summary_dict)
+
+    combined_prompt = load_prompt("ledger", "summary", "combine",
+                                summaries=formatted_summaries,
+                                max_tokens=max_tokens)
+    combined_text = await summary_llm.summarize(combined_prompt)
+    metadata = SummaryMetadata(
+        summary_type=period,
+        timestamp_begin=summaries[0].metadata.timestamp_begin,
+        timestamp_end=summaries[-1].metadata.timestamp_end
+    )
+    return Summary(content=combined_text, metadata=metadata)
+
+
+async def _create_periodic_summary(request: PeriodSummaryCreateRequest) -> List[dict]:
     """
     Asynchronously creates a periodic summary of user-assistant conversations for a specified period and date.
 
     This function retrieves user messages for the given period and date, chunks them to fit within token limits,
-    and generates concise summaries using an external language model API. If multiple chunks are summarized,
-    their summaries are combined into a single summary. The final summary is then inserted into the database.
+    and generates concise summaries of the chunks concurrently using an external language model API. If multiple
+    chunks are summarized, their summaries are combined into a single summary. The final summary is then inserted into the database.
 
     Args:
-        request (SummaryCreateRequest): The request object containing the period and date for which to create the summary.
+        request (PeriodSummaryCreateRequest): The period and date for which to create the summary.
 
     Returns:
         List[dict]: A list containing the created summary as a dictionary.
@@ -56,10 +157,7 @@ async def _create_periodic_summary(request: SummaryCreateRequest) -> List[dict]:
     """
     logger.debug(f"Creating periodic summary for period: {request.period} and date: {request.date}")
 
-    with open('/app/config/config.json') as f:
-        _config = json.load(f)
-
-    timeout = _config["timeout"]
+    _config = _load_config()
     user_id = _config.get("user_id")
     summaries_created = []
     params = {}
@@ -92,127 +190,48 @@ async def _create_periodic_summary(request: SummaryCreateRequest) -> List[dict]:
 
     logger.debug(f"Got messages: {messages}")
 
-    # Chunk messages into 8192-token chunks using AutoTokenizer (gpt2)
-    tokenizer = AutoTokenizer.from_pretrained("gpt2")
-    max_tokens = 8192
-
     # Ensure all messages are CanonicalUserMessage
     canon_msgs = [CanonicalUserMessage.model_validate(m) if not isinstance(m, CanonicalUserMessage) else m for m in messages]
 
-    def chunk_messages(messages, max_tokens):
-        chunks = []
-        current_chunk = []
-        current_tokens = 0
-        for msg in messages:
-            content = msg.content
-            tokens = len(tokenizer.encode(content))
-            if current_tokens + tokens > max_tokens and current_chunk:
-                chunks.append(current_chunk)
-                current_chunk = []
-                current_tokens = 0
-            current_chunk.append(msg)
-            current_tokens += tokens
-        if current_chunk:
-            chunks.append(current_chunk)
-        return chunks
-
-    message_chunks = chunk_messages(canon_msgs, max_tokens)
-    summaries = []
-
+    # Reuse the stored summary if the window's messages haven't changed since it was generated
+    window = _period_window(params["period"], params["date"])
+    input_hash = message_inputs_hash(canon_msgs)
+    existing, existing_hash = get_node(request.period, window)
+    if existing is not None and existing_hash == input_hash:
+        logger.debug(f"Period summary for {params['period']} on {params['date']} is up to date")
+        rollup_stats.record(request.period, reused=True)
+        return [existing.model_dump()]
+
+    max_tokens = summary_setting("chunk_tokens", DEFAULT_CHUNK_TOKENS)
+    message_chunks = _chunk_messages(canon_msgs, max_tokens)
     periodic_max_tokens = _config["summary"]["periodic_max_tokens"] or 512
-    proxy_port = os.getenv("PROXY_PORT", 4205)
-    for chunk in message_chunks:
-        # Prompt construction (moved from proxy/app/summary.py)
-        user_label = "Randi"
-        assistant_label = "Kirishima"
-        lines = []
-        for msg in chunk:
-            if hasattr(msg, 'role') and msg.role == "user":
-                lines.append(f"{user_label}: {msg.content}")
-            elif hasattr(msg, 'role') and msg.role == "assistant":
-                lines.append(f"{assistant_label}: {msg.content}")
-        conversation_str = "\n".join(lines)
-
-        logger.debug(f"Conversation string for summary: {conversation_str}")
-
-        prompt = load_prompt("ledger", "summary", "periodic",
-                           conversation_str=conversation_str,
-                           max_tokens=periodic_max_tokens)
-
-        summary_req = SingleTurnRequest(
-            model="summarize",
-            prompt=prompt
-        )
-        try:
-            async with httpx.AsyncClient(timeout=timeout) as client:
-                response = await client.post(
-                    f"http://proxy:{proxy_port}/api/singleturn",
-                    json=summary_req.model_dump()
-                )
-                response.raise_for_status()
-            summary_data = response.json()
-            summary_text = summary_data['response']
-            metadata = SummaryMetadata(
-                summary_type=request.period,
-                timestamp_begin=chunk[0].created_at,
-                timestamp_end=chunk[-1].created_at
-            )
-            summaries.append(Summary(content=summary_text, metadata=metadata))
-        except Exception as e:
-            logger.error(f"Failed to summarize chunk for period {params['period']}, date {params['date']}: {e}")
-            return []
+
+    # Summarize all chunks concurrently; summary_llm bounds the fan-out
+    results = await asyncio.gather(
+        *(_summarize_chunk(chunk, request.period, periodic_max_tokens) for chunk in message_chunks),
+        return_exceptions=True,
+    )
+    failed = [e for e in results if isinstance(e, BaseException)]
+    if failed:
+        logger.error(f"Failed to summarize {len(failed)}/{len(results)} chunks for period {params['period']}, date {params['date']}: {failed[0]}")
+        return []
+    summaries = list(results)
 
     # If more than 1 Summary is created, combine them
-    if len(summaries) > 1:
-        # Build combined summary prompt (from proxy/app/summary.py)
-        def format_timestamp(ts: str) -> str:
-            dt = datetime.fromisoformat(ts.replace("Z", ""))
-            return dt.strftime("%A, %B %d")
-        
-        # Add formatted_date to each summary for template
-        formatted_summaries = []
-        for summary in summaries:
-            summary_dict = summary.model_dump()
-            summary_dict['formatted_date'] = format_timestamp(summary.metadata.timestamp_begin)
-            formatted_summaries.append(summary_dict)
-        
-        combined_prompt = load_prompt("ledger", "summary", "combine",
-                                    summaries=formatted_summaries,
-                                    max_tokens=periodic_max_tokens)
-
-        combined_req = SingleTurnRequest(
-            model="summarize",
-            prompt=combined_prompt
+    try:
+        final_summary = await _combine_summaries(summaries, request.period, periodic_max_tokens)
+    except Exception as e:
+        logger.error(f"Failed to combine summaries for period {params['period']}, date {params['date']}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to combine summaries: {e}"
         )
 
-        try:
-            async with httpx.AsyncClient(timeout=timeout) as client:
-                response = await client.post(
-                    f"http://proxy:{proxy_port}/api/singleturn",
-                    json=combined_req.model_dump()
-                )
-                response.raise_for_status()
-            combined_data = response.json()
-            combined_text = combined_data['response']
-            metadata = SummaryMetadata(
-                summary_type=request.period,
-                timestamp_begin=summaries[0].metadata.timestamp_begin,
-                timestamp_end=summaries[-1].metadata.timestamp_end
-            )
-            final_summary = Summary(content=combined_text, metadata=metadata)
-        except Exception as e:
-            logger.error(f"Failed to combine summaries for period {params['period']}, date {params['date']}: {e}")
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"Failed to combine summaries: {e}"
-            )
-    else:
-        final_summary = summaries[0]
-
     logger.debug(f"Final summary: {final_summary}")
 
     try:
-        result = _insert_summary(final_summary)
+        result = store_node(final_summary, input_hash, window)
+        rollup_stats.record(request.period, reused=False)
         summaries_created.append(result.model_dump())
     except Exception as e:
         logger.error(f"Failed to create summary for period {params['period']}, date {params['date']}: {e}")
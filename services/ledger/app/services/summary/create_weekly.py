@@ -13,7 +13,8 @@ Raises:
 Process:
     - Validates that the provided date is a Monday in 'YYYY-MM-DD' format.
     - Loads configuration and environment variables.
-    - Fetches all daily summaries for the week (Monday-Sunday).
+    - Brings the week's daily summaries up to date and fetches them (Monday-Sunday).
+    - Returns the stored weekly summary if it was built from the same daily summaries.
     - Constructs a prompt for the language model to generate a weekly summary.
     - Calls the OpenAI API (or compatible provider) to generate the summary.
     - Stores the generated weekly summary in the ledger.
@@ -25,14 +26,14 @@ from shared.prompt_loader import load_prompt
 from shared.log_config import get_logger
 logger = get_logger(f"ledger.{__name__}")
 
-from app.services.summary.insert import _insert_summary
-from app.services.summary.get import _get_summaries
+from app.services.summary.create_daily import _ensure_daily_summaries
+from app.services.summary.rollup import date_window, get_children, get_node, rollup_stats, store_node, summary_inputs_hash
+from app.util import _load_config
 
 from datetime import datetime, timedelta
 from fastapi import HTTPException, status
 from typing import List
 import httpx
-import json
 import os
 
 
@@ -52,7 +53,8 @@ async def _create_weekly_summary(request: SummaryCreateRequest) -> List[dict]:
     Process:
         - Validates the input date and ensures it is a Monday.
         - Loads configuration parameters from a JSON file.
-        - Fetches daily summaries for the week.
+        - Brings the week's daily summaries up to date and fetches them.
+        - Returns the stored weekly summary if its daily summaries are unchanged.
         - Constructs a prompt for summarization using the daily summaries.
         - Calls an internal API to generate the weekly summary using an LLM.
         - Stores the generated summary in the ledger.
@@ -71,25 +73,33 @@ async def _create_weekly_summary(request: SummaryCreateRequest) -> List[dict]:
     if request_date.weekday() != 0:
         return []
     logger.debug(f"Creating weekly summary for date: {request.date}")
-    with open('/app/config/config.json') as f:
-        _config = json.load(f)
+    _config = _load_config()
     timeout = _config["timeout"]
     weekly_max_tokens = _config["summary"].get("weekly_max_tokens", 1024)
     api_port = os.getenv("API_PORT", 4200)
-    timestamp_begin = request_date.strftime("%Y-%m-%d 00:00:00")
-    sunday = request_date + timedelta(days=6)
-    timestamp_end = sunday.strftime("%Y-%m-%d 23:59:59")
-    # Use internal function to fetch daily summaries for the week
+    dates = [(request_date + timedelta(days=i)).strftime("%Y-%m-%d") for i in range(7)]
+    window = date_window(dates[0], dates[-1])
+    # Bring the week's daily summaries up to date, then build only from them
     try:
-        summaries = [s.model_dump() for s in _get_summaries(period="daily", timestamp_begin=timestamp_begin, timestamp_end=timestamp_end)]
+        await _ensure_daily_summaries(dates)
+        children = get_children(("daily",), window)
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Failed to get daily summaries for week {request.date}: {e}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to retrieve summaries: {e}")
-    if not summaries:
+    if not children:
         logger.warning("No summaries found for the specified period.")
         return []
+    input_hash = summary_inputs_hash(children)
+    existing, existing_hash = get_node("weekly", window)
+    if existing is not None and existing_hash == input_hash:
+        logger.debug(f"Weekly summary for {request.date} is up to date")
+        rollup_stats.record("weekly", reused=True)
+        return [existing.model_dump()]
+    summaries = [s.model_dump() for s in children]
     # Build prompt for weekly summary
     def format_timestamp(ts: str) -> str:
         dt = datetime.fromisoformat(ts.replace("Z", ""))
@@ -136,7 +146,8 @@ async def _create_weekly_summary(request: SummaryCreateRequest) -> List[dict]:
     summary_obj = Summary(content=summary_text, metadata=metadata)
     results = []
     try:
-        result = _insert_summary(summary_obj)
+        result = store_node(summary_obj, input_hash, window)
+        rollup_stats.record("weekly", reused=False)
         results.append(result.model_dump())
     except Exception as e:
         logger.error(f"Failed to write weekly summary to ledger: {e}")
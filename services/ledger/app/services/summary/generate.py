@@ -1,4 +1,4 @@
-from shared.models.ledger import SummaryCreateRequest
+from shared.models.ledger import PeriodSummaryCreateRequest, SummaryCreateRequest
 
 from shared.log_config import get_logger
 logger = get_logger(f"ledger.{__name__}")
@@ -8,6 +8,10 @@ from app.services.summary.create_daily import _create_daily_summary
 from app.services.summary.create_weekly import _create_weekly_summary
 from app.services.summary.create_monthly import _create_monthly_summary
 
+from app.services.summary.rollup import date_window, get_node
+
+from calendar import monthrange
+from datetime import datetime, timedelta
 from fastapi import HTTPException, status
 from typing import List
 
@@ -31,7 +35,7 @@ async def _generate_summary(request: SummaryCreateRequest) -> List[dict]:
     results = []
     for period in request.period:
         if period in VALID_PERIODS:
-            results.extend(await _create_periodic_summary(request.model_copy(update={"period": period})))
+            results.extend(await _create_periodic_summary(PeriodSummaryCreateRequest(period=period, date=request.date)))
         elif period == "daily":
             results.extend(await _create_daily_summary(request.model_copy(update={"period": period})))
         elif period == "weekly":
@@ -43,4 +47,41 @@ async def _generate_summary(request: SummaryCreateRequest) -> List[dict]:
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"Invalid period: {period}"
             )
-    return results
\ No newline at end of file
+    return results
+
+
+async def _refresh_summaries(date: str) -> List[dict]:
+    """
+    Regenerate the summaries on the path above `date`, leaving everything else alone.
+
+    The daily summary (and, through it, the period summaries) is always brought up
+    to date; the weekly and monthly summaries containing the date only if they
+    already exist. Each level is regenerated only if its inputs changed.
+
+    Args:
+        date (str): The date whose messages changed, in YYYY-MM-DD format.
+
+    Returns:
+        List[dict]: The daily, weekly and monthly summaries on the path.
+    """
+    try:
+        day = datetime.strptime(date, "%Y-%m-%d")
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid date specified. Expected 'YYYY-MM-DD' format."
+        )
+    results = await _create_daily_summary(SummaryCreateRequest(period=["daily"], date=date))
+
+    monday = day - timedelta(days=day.weekday())
+    week = [(monday + timedelta(days=i)).strftime("%Y-%m-%d") for i in range(7)]
+    if get_node("weekly", date_window(week[0], week[-1]))[0] is not None:
+        results.extend(await _create_weekly_summary(SummaryCreateRequest(period=["weekly"], date=week[0])))
+
+    last_day = monthrange(day.year, day.month)[1]
+    month = (day.replace(day=1).strftime("%Y-%m-%d"), day.replace(day=last_day).strftime("%Y-%m-%d"))
+    if get_node("monthly", date_window(*month))[0] is not None:
+        # The monthly creator takes the first day of the following month
+        next_month = (day.replace(day=last_day) + timedelta(days=1)).strftime("%Y-%m-%d")
+        results.extend(await _create_monthly_summary(SummaryCreateRequest(period=["monthly"], date=next_month)))
+    return results
@@ -29,6 +29,9 @@ def _get_summaries(request: SummaryGetRequest) -> List[Summary]:
         if id:
             clauses.append("id = ?")
             params.append(id)
+        elif not request.include_rolled_up:
+            # Period summaries that a daily summary was built from (see rollup.py)
+            clauses.append("rolled_up = 0")
         if period:
             clauses.append("summary_type = ?")
             params.append(period)
@@ -0,0 +1,107 @@
+"""
+Proxy calls for summary generation.
+
+Every summary job sends its prompts through `summarize()`, which reuses one
+pooled httpx.AsyncClient for the proxy instead of opening a client per call,
+and caps the number of summarize calls in flight across the whole process at
+`summary.max_concurrency` (default 4). Chunk fan-out within one summary and
+backfill jobs running several summaries at once therefore share one limit.
+
+Config (`summary` section of config.json):
+    max_concurrency: concurrent summarize calls (default 4)
+    chunk_tokens: gpt2 tokens of conversation per chunk (default 8192)
+    combine_fan_in: chunk summaries merged per combine call (default 8)
+"""
+
+from shared.models.proxy import SingleTurnRequest
+
+from shared.log_config import get_logger
+logger = get_logger(f"ledger.{__name__}")
+
+from app.util import _load_config
+
+import asyncio
+import os
+from typing import Any, Dict, Optional
+
+import httpx
+
+DEFAULT_MAX_CONCURRENCY = 4
+DEFAULT_CHUNK_TOKENS = 8192
+DEFAULT_COMBINE_FAN_IN = 8
+
+
+def summary_setting(key: str, default: int) -> int:
+    """Integer setting from the `summary` config section."""
+    value = _load_config().get("summary", {}).get(key)
+    return int(value) if value else default
+
+
+class SummaryLLM:
+    """Shared proxy client and concurrency limit for summarize calls."""
+
+    def __init__(self):
+        self._client: Optional[httpx.AsyncClient] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._limit: Optional[int] = None
+        self.calls = 0
+        self.failures = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(timeout=_load_config()["timeout"])
+        return self._client
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        limit = max(1, summary_setting("max_concurrency", DEFAULT_MAX_CONCURRENCY))
+        if self._semaphore is None or limit != self._limit:
+            # Calls already holding the old semaphore finish under it
+            self._semaphore = asyncio.Semaphore(limit)
+            self._limit = limit
+        return self._semaphore
+
+    async def summarize(self, prompt: str) -> str:
+        """
+        Send a prompt to the proxy's `summarize` mode and return the response text.
+
+        Raises:
+            httpx.HTTPError: If the proxy call fails.
+        """
+        proxy_port = os.getenv("PROXY_PORT", 4205)
+        request = SingleTurnRequest(model="summarize", prompt=prompt)
+        async with self._get_semaphore():
+            self.calls += 1
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            try:
+                response = await self._get_client().post(
+                    f"http://proxy:{proxy_port}/api/singleturn",
+                    json=request.model_dump()
+                )
+                response.raise_for_status()
+                return response.json()['response']
+            except Exception:
+                self.failures += 1
+                raise
+            finally:
+                self.in_flight -= 1
+
+    async def close(self):
+        """Close the pooled client (at shutdown)."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "max_concurrency": self._limit,
+            "calls": self.calls,
+            "failures": self.failures,
+            "in_flight": self.in_flight,
+            "max_in_flight": self.max_in_flight,
+        }
+
+
+summary_llm = SummaryLLM()
@@ -0,0 +1,148 @@
+"""
+Incremental summary DAG: message windows -> period -> daily -> weekly/monthly.
+
+Period summaries are the leaves, built from the messages of their window. Each
+higher level is built only from its children's stored summaries: daily from the
+day's period summaries, weekly and monthly from daily summaries. Every node
+stores `input_hash`, a SHA-256 of the inputs it was generated from (message ids,
+roles and contents for leaves; child summaries for rollups). A node is
+regenerated only when the hash of its current inputs differs, so re-running a
+rollup costs no LLM call unless something below it changed, and an edit to one
+day's messages only regenerates that period, its day, and the week and month
+containing it.
+
+Period summaries used by a daily summary are kept (marked `rolled_up`) rather
+than deleted, so the daily can be rebuilt from them; `GET /summary` hides them
+unless asked for, as it did when they were deleted.
+
+Nodes written before input hashes existed have `input_hash` NULL and are
+treated as final when reached as children.
+"""
+from shared.models.ledger import Summary, SummaryMetadata
+
+from shared.log_config import get_logger
+logger = get_logger(f"ledger.{__name__}")
+
+from app.util import _open_conn
+
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+import hashlib
+
+TABLE = "summaries"
+
+
+def _inputs_hash(parts: Iterable[str]) -> str:
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\x1f")
+    return digest.hexdigest()
+
+
+def message_inputs_hash(messages) -> str:
+    """Hash of the messages a leaf summary is generated from."""
+    return _inputs_hash(f"{msg.id}\x1e{msg.role}\x1e{msg.content}" for msg in messages)
+
+
+def summary_inputs_hash(summaries: Sequence[Summary]) -> str:
+    """Hash of the child summaries a rollup is generated from."""
+    return _inputs_hash(
+        f"{s.metadata.summary_type}\x1e{s.metadata.timestamp_begin}\x1e{s.metadata.timestamp_end}\x1e{s.content}"
+        for s in summaries
+    )
+
+
+def date_window(first_date: str, last_date: Optional[str] = None) -> Tuple[str, str]:
+    """Timestamp window covering whole days, from `first_date` to `last_date` (YYYY-MM-DD)."""
+    return f"{first_date} 00:00:00.000", f"{last_date or first_date} 23:59:59.999"
+
+
+def _row_to_summary(row) -> Summary:
+    return Summary(
+        id=row[0],
+        content=row[1],
+        metadata=SummaryMetadata(timestamp_begin=row[2], timestamp_end=row[3], summary_type=row[4]),
+    )
+
+
+def get_node(summary_type: str, window: Tuple[str, str]) -> Tuple[Optional[Summary], Optional[str]]:
+    """
+    The stored summary of `summary_type` for a window, and its input hash.
+
+    Returns (None, None) if there is none. A node belongs to the window its
+    timestamp_begin falls in.
+    """
+    with _open_conn() as conn:
+        row = conn.execute(
+            f"SELECT id, summary, timestamp_begin, timestamp_end, summary_type, input_hash FROM {TABLE} "
+            "WHERE summary_type = ? AND timestamp_begin BETWEEN ? AND ? "
+            "ORDER BY timestamp_end DESC LIMIT 1",
+            (summary_type, window[0], window[1]),
+        ).fetchone()
+    if row is None:
+        return None, None
+    return _row_to_summary(row), row[5]
+
+
+def get_children(child_types: Sequence[str], window: Tuple[str, str]) -> List[Summary]:
+    """Stored summaries of `child_types` that begin inside the window, oldest first (rolled-up ones included)."""
+    placeholders = ",".join("?" for _ in child_types)
+    with _open_conn() as conn:
+        rows = conn.execute(
+            f"SELECT id, summary, timestamp_begin, timestamp_end, summary_type FROM {TABLE} "
+            f"WHERE summary_type IN ({placeholders}) AND timestamp_begin BETWEEN ? AND ? "
+            "ORDER BY timestamp_begin",
+            (*child_types, window[0], window[1]),
+        ).fetchall()
+    return [_row_to_summary(row) for row in rows]
+
+
+def store_node(summary: Summary, input_hash: str, window: Tuple[str, str], roll_up: Iterable[str] = ()) -> Summary:
+    """
+    Replace the window's node of the summary's type with `summary` in one transaction.
+
+    Args:
+        summary: The new node.
+        input_hash: Hash of the inputs it was generated from.
+        window: The node's window; older nodes of the same type beginning in it are removed.
+        roll_up: Ids of child summaries to mark as rolled up into this node.
+    """
+    metadata = summary.metadata
+    with _open_conn() as conn:
+        conn.execute(
+            f"DELETE FROM {TABLE} WHERE summary_type = ? AND "
+            "((timestamp_begin BETWEEN ? AND ?) OR (timestamp_begin = ? AND timestamp_end = ?))",
+            (metadata.summary_type, window[0], window[1], metadata.timestamp_begin, metadata.timestamp_end),
+        )
+        conn.execute(
+            f"INSERT INTO {TABLE} (id, summary, timestamp_begin, timestamp_end, summary_type, input_hash) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (summary.id, summary.content, metadata.timestamp_begin, metadata.timestamp_end,
+             metadata.summary_type, input_hash),
+        )
+        child_ids = list(roll_up)
+        if child_ids:
+            conn.executemany(f"UPDATE {TABLE} SET rolled_up = 1 WHERE id = ?", [(child_id,) for child_id in child_ids])
+        conn.commit()
+    return summary
+
+
+class RollupStats:
+    """Per summary type: nodes reused because their inputs were unchanged, and nodes (re)generated."""
+
+    def __init__(self):
+        self.reused: Dict[str, int] = defaultdict(int)
+        self.generated: Dict[str, int] = defaultdict(int)
+
+    def record(self, summary_type: str, reused: bool):
+        (self.reused if reused else self.generated)[summary_type] += 1
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        return {
+            summary_type: {"reused": self.reused.get(summary_type, 0), "generated": self.generated.get(summary_type, 0)}
+            for summary_type in sorted(set(self.reused) | set(self.generated))
+        }
+
+
+rollup_stats = RollupStats()
@@ -3,9 +3,11 @@ from shared.models.ledger import AssistantSyncRequest
 from shared.log_config import get_logger
 logger = get_logger(f"ledger.{__name__}")
 
-from app.util import _open_conn
+from app.util import _open_conn, _load_config
+from app.services.sync.buffer_cache import buffer_cache
+from app.services.user.broadcast import message_broadcaster
+from app.services.user.tokens import _store_message_tokens
 
-import json
 
 TABLE = "user_messages"
 
@@ -16,8 +18,7 @@ def _sync_assistant_buffer_helper(request: AssistantSyncRequest):
         request: AssistantSyncRequest containing assistant message content
     """
 
-    with open('/app/config/config.json') as f:
-            _config = json.load(f)
+    _config = _load_config()
     # if turns isn't set, default to 15
     user_id = _config.get("user_id")
 
@@ -41,4 +42,8 @@ def _sync_assistant_buffer_helper(request: AssistantSyncRequest):
             f"INSERT INTO {TABLE} (user_id, model, platform, role, content) VALUES (?, ?, ?, ?, ?)",
             (user_id, request.model, request.platform, "assistant", request.content),
         )
+        row_id = cur.lastrowid
+        _store_message_tokens(cur, [row_id])
         conn.commit()
+        buffer_cache.record_insert(conn, user_id, [row_id])
+        message_broadcaster.publish_rows(conn, user_id, [row_id])
@@ -0,0 +1,245 @@
+"""
+In-process cache of each user's hot conversation buffer.
+
+`/sync/get` runs on every brain turn and only ever needs the newest messages that
+fit inside `conversation.length` tokens. This module keeps that tail per user as a
+ring of (CanonicalUserMessage, token_count) pairs so the read path is a memory copy
+instead of a full-table scan. Token counts come from user_message_tokens, so
+nothing is re-tokenized here; rows written without one (by scripts, or before the
+backfill reached them) are counted and stored once, when the cache first reads them.
+
+Write paths keep it current:
+    - /sync/user, /sync/assistant, /sync/tool and /user/{user_id}/sync append newly
+      inserted rows. An append reads every row past the newest one the entry holds,
+      not just the ids it was called with, so handlers that commit ids 10 and 11 but
+      record them in reverse order never leave a hole.
+    - Edits and deletes (including the dedup/edit branches of the sync paths)
+      invalidate the user's entry; the next read reloads it from the database.
+
+Writes by other processes (scripts, other workers) are caught on read: triggers
+bump user_messages_version on every UPDATE or DELETE of user_messages, and each
+read compares that version and the user's MAX(id) with the entry, two indexed
+lookups. A changed version reloads the entry; newer rows are appended.
+
+Entries are filled lazily on the first read, so a cold cache never costs the write
+paths any extra SQL.
+"""
+
+from shared.models.ledger import CanonicalUserMessage
+
+from shared.log_config import get_logger
+logger = get_logger(f"ledger.{__name__}")
+
+from app.util import _open_conn
+from app.services.user.tokens import BUFFER_TOKENIZER, TOKENS_TABLE, _store_message_tokens
+
+import json
+import threading
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+TABLE = "user_messages"
+
+
+def _row_to_message(colnames, row) -> CanonicalUserMessage:
+    msg = dict(zip(colnames, row))
+    msg.pop("_tokens", None)
+    msg.pop("_running_tokens", None)
+    for field in ("tool_calls", "function_call"):
+        if msg.get(field):
+            try:
+                msg[field] = json.loads(msg[field])
+            except Exception:
+                msg[field] = None
+    return CanonicalUserMessage(**msg)
+
+
+class _BufferEntry:
+    """Token-bounded tail of one user's buffer, oldest message on the left."""
+
+    __slots__ = ("messages", "total_tokens", "token_limit", "last_id", "version")
+
+    def __init__(self, token_limit: int, version: int = 0):
+        self.messages: Deque[Tuple[CanonicalUserMessage, int]] = deque()
+        self.total_tokens = 0
+        self.token_limit = token_limit
+        # Newest row id the entry has seen (its messages may have been trimmed away)
+        self.last_id = 0
+        # user_messages_version the entry was loaded at
+        self.version = version
+
+    def append(self, msg: CanonicalUserMessage, tokens: int):
+        """Append a row newer than every row already seen; callers read rows past last_id in id order."""
+        self.messages.append((msg, tokens))
+        self.total_tokens += tokens
+        self.last_id = msg.id
+        # Anything older than the first message that no longer fits can never be
+        # returned by the backwards token walk, so drop it.
+        while self.messages and self.total_tokens > self.token_limit:
+            _, dropped = self.messages.popleft()
+            self.total_tokens -= dropped
+
+
+class ConversationBufferCache:
+    """
+    Per-user ring buffer of recent CanonicalUserMessages with precomputed token counts.
+
+    The cache is keyed by user_id and by the token limit it was filled with; a change
+    to `conversation.length` simply causes a reload on the next read.
+    """
+
+    def __init__(self):
+        self._entries: Dict[str, _BufferEntry] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _version(cur) -> int:
+        cur.execute("SELECT version FROM user_messages_version WHERE id = 1")
+        row = cur.fetchone()
+        return row[0] if row else 0
+
+    @staticmethod
+    def _max_id(cur, user_id: str) -> int:
+        cur.execute(f"SELECT COALESCE(MAX(id), 0) FROM {TABLE} WHERE user_id = ?", (user_id,))
+        return cur.fetchone()[0]
+
+    @staticmethod
+    def _store_missing_tokens(conn, user_id: str, after_id: int, upto_id: int):
+        """Count and store tokens for user_id's rows in (after_id, upto_id] that have no stored buffer count."""
+        cur = conn.cursor()
+        cur.execute(
+            f"""
+            SELECT m.id FROM {TABLE} m
+            LEFT JOIN {TOKENS_TABLE} t ON t.message_id = m.id AND t.tokenizer = ?
+            WHERE m.user_id = ? AND m.id > ? AND m.id <= ? AND t.message_id IS NULL
+            """,
+            (BUFFER_TOKENIZER, user_id, after_id, upto_id),
+        )
+        row_ids = [row[0] for row in cur.fetchall()]
+        if row_ids:
+            _store_message_tokens(cur, row_ids)
+            conn.commit()
+
+    def _load(self, user_id: str, token_limit: int) -> _BufferEntry:
+        """
+        Fill an entry with the newest rows whose stored token counts fit the limit.
+
+        The running total is a SQL window sum over user_message_tokens, so nothing is
+        re-encoded and only the rows that fit are decoded into models. Reads stop at
+        the MAX(id) taken up front; anything committed later is appended on the next read.
+        """
+        with _open_conn() as conn:
+            cur = conn.cursor()
+            entry = _BufferEntry(token_limit, self._version(cur))
+            entry.last_id = self._max_id(cur, user_id)
+            self._store_missing_tokens(conn, user_id, 0, entry.last_id)
+            cur.execute(
+                f"""
+                SELECT * FROM (
+                    SELECT m.*,
+                           t.tokens AS _tokens,
+                           SUM(t.tokens) OVER (ORDER BY m.id DESC) AS _running_tokens
+                    FROM {TABLE} m
+                    JOIN {TOKENS_TABLE} t ON t.message_id = m.id AND t.tokenizer = ?
+                    WHERE m.user_id = ? AND m.id <= ?
+                )
+                WHERE _running_tokens <= ?
+                ORDER BY id
+                """,
+                (BUFFER_TOKENIZER, user_id, entry.last_id, token_limit),
+            )
+            colnames = [desc[0] for desc in cur.description]
+            tokens_idx = colnames.index("_tokens")
+            for row in cur.fetchall():
+                entry.messages.append((_row_to_message(colnames, row), row[tokens_idx]))
+                entry.total_tokens += row[tokens_idx]
+        return entry
+
+    def _append_new_rows(self, conn, user_id: str, entry: _BufferEntry, upto_id: int):
+        """Append user_id's rows in (entry.last_id, upto_id], in id order."""
+        self._store_missing_tokens(conn, user_id, entry.last_id, upto_id)
+        cur = conn.cursor()
+        cur.execute(
+            f"""
+            SELECT m.*, t.tokens AS _tokens
+            FROM {TABLE} m
+            JOIN {TOKENS_TABLE} t ON t.message_id = m.id AND t.tokenizer = ?
+            WHERE m.user_id = ? AND m.id > ? AND m.id <= ?
+            ORDER BY m.id
+            """,
+            (BUFFER_TOKENIZER, user_id, entry.last_id, upto_id),
+        )
+        colnames = [desc[0] for desc in cur.description]
+        tokens_idx = colnames.index("_tokens")
+        for row in cur.fetchall():
+            entry.append(_row_to_message(colnames, row), row[tokens_idx])
+
+    def _refresh(self, user_id: str, entry: _BufferEntry) -> Optional[_BufferEntry]:
+        """
+        Bring a cached entry up to date with writes made outside this process.
+
+        Returns the entry, or None when rows were edited or deleted and it must be reloaded.
+        """
+        with _open_conn() as conn:
+            cur = conn.cursor()
+            if self._version(cur) != entry.version:
+                return None
+            max_id = self._max_id(cur, user_id)
+            if max_id > entry.last_id:
+                self._append_new_rows(conn, user_id, entry, max_id)
+        return entry
+
+    def get(self, user_id: str, token_limit: int) -> List[CanonicalUserMessage]:
+        """
+        Return the newest messages for user_id whose combined token count fits token_limit.
+
+        A warm entry costs two indexed lookups to check for writes from other
+        processes; only a cold or stale entry is reloaded.
+
+        Args:
+            user_id: The user whose buffer is requested.
+            token_limit: Maximum total tokens (conversation.length).
+
+        Returns:
+            List[CanonicalUserMessage]: Messages in chronological order.
+        """
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None and entry.token_limit == token_limit:
+                entry = self._refresh(user_id, entry)
+            if entry is not None and entry.token_limit == token_limit:
+                self.hits += 1
+            else:
+                self.misses += 1
+                entry = self._load(user_id, token_limit)
+                self._entries[user_id] = entry
+            return [msg for msg, _ in entry.messages]
+
+    def record_insert(self, conn, user_id: str, row_ids: List[int]):
+        """
+        Append freshly committed rows to a warm entry.
+
+        Reads every row past the entry's newest one, so a concurrent insert recorded
+        out of order is picked up by whichever call comes first. Does nothing when
+        the user has no cached entry yet; the next read loads it.
+        """
+        if not row_ids:
+            return
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return
+            self._append_new_rows(conn, user_id, entry, max(row_ids))
+
+    def invalidate(self, user_id: Optional[str] = None):
+        """Drop the cached entry for user_id, or every entry when user_id is None."""
+        with self._lock:
+            if user_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(user_id, None)
+
+
+buffer_cache = ConversationBufferCache()
@@ -1,36 +1,49 @@
-from shared.models.ledger import ToolSyncRequest
+from shared.models.ledger import ToolSyncRequest, ToolSyncBatchRequest
 
 from shared.log_config import get_logger
 logger = get_logger(f"ledger.{__name__}")
 
-from app.util import _open_conn
+from typing import Union
+
+from app.util import _open_conn, _load_config
+from app.services.sync.buffer_cache import buffer_cache
+from app.services.user.broadcast import message_broadcaster
+from app.services.user.tokens import _store_message_tokens
 
-import json
 
 TABLE = "user_messages"
 
 
-def _sync_tool_buffer_helper(request: ToolSyncRequest):
+def _sync_tool_buffer_helper(request: Union[ToolSyncRequest, ToolSyncBatchRequest]):
     """
+    Store tool calls and their outputs in the user's buffer, in order, in one transaction.
+
     Args:
-        request: ToolSyncRequest containing tool_call, tool_output, and tool_call_id
+        request: A single ToolSyncRequest (tool_call, tool_output, tool_call_id), or a
+            ToolSyncBatchRequest holding several
     """
+    calls = request.calls if isinstance(request, ToolSyncBatchRequest) else [request]
 
-    with open('/app/config/config.json') as f:
-            _config = json.load(f)
-    # if turns isn't set, default to 15
+    _config = _load_config()
     user_id = _config.get("user_id")
 
     with _open_conn() as conn:
         cur = conn.cursor()
-        # first, insert the tool call
-        cur.execute(
-            f"INSERT INTO {TABLE} (user_id, model, platform, role, content, tool_calls, tool_call_id) VALUES (?, ?, ?, ?, ?, ?, ?)",
-            (user_id, request.model, request.platform, "assistant", "", request.tool_call, request.tool_call_id),
-        )
-        # then, insert the tool output
-        cur.execute(
-            f"INSERT INTO {TABLE} (user_id, model, platform, role, content, tool_call_id) VALUES (?, ?, ?, ?, ?, ?)",
-            (user_id, request.model, request.platform, "tool", request.tool_output, request.tool_call_id),
-        )
+        row_ids = []
+        for call in calls:
+            # first, insert the tool call
+            cur.execute(
+                f"INSERT INTO {TABLE} (user_id, model, platform, role, content, tool_calls, tool_call_id) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (user_id, call.model, call.platform, "assistant", "", call.tool_call, call.tool_call_id),
+            )
+            row_ids.append(cur.lastrowid)
+            # then, insert the tool output
+            cur.execute(
+                f"INSERT INTO {TABLE} (user_id, model, platform, role, content, tool_call_id) VALUES (?, ?, ?, ?, ?, ?)",
+                (user_id, call.model, call.platform, "tool", call.tool_output, call.tool_call_id),
+            )
+            row_ids.append(cur.lastrowid)
+        _store_message_tokens(cur, row_ids)
         conn.commit()
+        buffer_cache.record_insert(conn, user_id, row_ids)
+        message_broadcaster.publish_rows(conn, user_id, row_ids)
@@ -3,7 +3,10 @@ from shared.models.ledger import UserSyncRequest
 from shared.log_config import get_logger
 logger = get_logger(f"ledger.{__name__}")
 
-from app.util import _open_conn
+from app.util import _open_conn, _load_config
+from app.services.sync.buffer_cache import buffer_cache
+from app.services.user.broadcast import message_broadcaster
+from app.services.user.tokens import _store_message_tokens
 
 import json
 
@@ -28,9 +31,7 @@ def _sync_user_buffer_helper(request: UserSyncRequest):
     
     # Default to config user_id if not provided
     if not user_id:
-        with open('/app/config/config.json') as f:
-            _config = json.load(f)
-        user_id = _config.get("user_id")
+        user_id = _load_config().get("user_id")
     
     logger.debug(f"Syncing user buffer for {user_id}: {snapshot}")
 
@@ -64,12 +65,17 @@ def _sync_user_buffer_helper(request: UserSyncRequest):
         if last_db_row and last_db_row[1] == "user" and snapshot and snapshot[-1].role == "user":
             cur.execute(f"DELETE FROM {TABLE} WHERE id = ?", (last_db_row[0],))
             conn.commit()
+            buffer_cache.invalidate(user_id)
             # After deletion, insert the new incoming user message
             cur.execute(
                 f"INSERT INTO {TABLE} (user_id, platform, platform_msg_id, role, content, model, tool_calls, function_call, tool_call_id) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
                 _msg_fields(last_msg),
             )
+            row_id = cur.lastrowid
+            _store_message_tokens(cur, [row_id])
             conn.commit()
+            buffer_cache.record_insert(conn, user_id, [row_id])
+            message_broadcaster.publish_rows(conn, user_id, [row_id])
             return
 
     # ----------------- Non‑API fast path -----------------
@@ -80,7 +86,11 @@ def _sync_user_buffer_helper(request: UserSyncRequest):
                 f"INSERT INTO {TABLE} (user_id, platform, platform_msg_id, role, content, model, tool_calls, function_call, tool_call_id) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
                 _msg_fields(last_msg),
             )
+            row_id = cur.lastrowid
+            _store_message_tokens(cur, [row_id])
             conn.commit()
+            buffer_cache.record_insert(conn, user_id, [row_id])
+            message_broadcaster.publish_rows(conn, user_id, [row_id])
             return
 
     # ----------------- API logic -----------------
@@ -97,7 +107,11 @@ def _sync_user_buffer_helper(request: UserSyncRequest):
                 f"INSERT INTO {TABLE} (user_id, platform, platform_msg_id, role, content, model, tool_calls, function_call, tool_call_id) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
                 _msg_fields(last_msg),
             )
+            row_id = cur.lastrowid
+            _store_message_tokens(cur, [row_id])
             conn.commit()
+            buffer_cache.record_insert(conn, user_id, [row_id])
+            message_broadcaster.publish_rows(conn, user_id, [row_id])
             return
 
         # Get last user message
@@ -128,6 +142,7 @@ def _sync_user_buffer_helper(request: UserSyncRequest):
                         f"DELETE FROM {TABLE} WHERE id = ?", (last_assistant_id,)
                     )
                     conn.commit()
+                    buffer_cache.invalidate(user_id)
                 return
             
             # --- Check for assistant edit before appending user ---
@@ -146,14 +161,20 @@ def _sync_user_buffer_helper(request: UserSyncRequest):
                         f"UPDATE {TABLE} SET content = ?, updated_at = (STRFTIME('%Y-%m-%d %H:%M:%f','now')) WHERE id = ?",
                         (incoming_assistant_content, last_assistant_id),
                     )
+                    _store_message_tokens(cur, [last_assistant_id])
                     conn.commit()
+                    buffer_cache.invalidate(user_id)
             
             # Insert the new user message
             cur.execute(
                 f"INSERT INTO {TABLE} (user_id, platform, platform_msg_id, role, content, model, tool_calls, function_call, tool_call_id) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
                 _msg_fields(last_msg),
             )
+            row_id = cur.lastrowid
+            _store_message_tokens(cur, [row_id])
             conn.commit()
+            buffer_cache.record_insert(conn, user_id, [row_id])
+            message_broadcaster.publish_rows(conn, user_id, [row_id])
             return
 
         # Handle assistant edit detection for non-user last messages
@@ -170,7 +191,9 @@ def _sync_user_buffer_helper(request: UserSyncRequest):
                     f"UPDATE {TABLE} SET content = ?, updated_at = (STRFTIME('%Y-%m-%d %H:%M:%f','now')) WHERE id = ?",
                     (incoming_assistant[-1].content, last_assistant_id),
                 )
+                _store_message_tokens(cur, [last_assistant_id])
                 conn.commit()
+                buffer_cache.invalidate(user_id)
             return
 
         # Fallback append for other message types
@@ -178,4 +201,8 @@ def _sync_user_buffer_helper(request: UserSyncRequest):
             f"INSERT INTO {TABLE} (user_id, platform, platform_msg_id, role, content, model, tool_calls, function_call, tool_call_id) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
             _msg_fields(last_msg),
         )
+        row_id = cur.lastrowid
+        _store_message_tokens(cur, [row_id])
         conn.commit()
+        buffer_cache.record_insert(conn, user_id, [row_id])
+        message_broadcaster.publish_rows(conn, user_id, [row_id])
@@ -19,20 +19,14 @@ import asyncio
 
 from shared.models.openai import OpenAICompletionRequest
 from shared.prompt_loader import load_prompt
+from app.services.embedding.index import vector_indexes
+from app.services.embedding.store import EMBEDDINGS_AVAILABLE, embedding_store
 from app.util import _open_conn
 
 from fastapi import HTTPException, status
 
-# Try to import sentence-transformers, fall back gracefully
-try:
-    from sentence_transformers import SentenceTransformer
-    from sklearn.metrics.pairwise import cosine_similarity
-    from sklearn.cluster import DBSCAN
-    EMBEDDINGS_AVAILABLE = True
-    logger.info("Sentence-transformers available for topic deduplication")
-except ImportError as e:
-    EMBEDDINGS_AVAILABLE = False
-    logger.warning(f"Sentence-transformers not available: {e}")
+# Nearest neighbours looked up per topic when clustering
+CLUSTER_NEIGHBOURS = 50
 
 @dataclass
 class TopicWithEmbedding:
@@ -83,44 +77,58 @@ def _get_topics_with_memory_counts() -> List[TopicWithEmbedding]:
 
 
 def _generate_embeddings(topics: List[TopicWithEmbedding]) -> None:
-    """Generate embeddings for topic names using sentence-transformers"""
+    """Attach topic name embeddings from the embedding store (only new or renamed topics are encoded)"""
     if not EMBEDDINGS_AVAILABLE:
         raise HTTPException(
             status_code=status.HTTP_501_NOT_IMPLEMENTED,
-            detail="Sentence-transformers library is not available. Install with: pip install sentence-transformers scikit-learn"
+            detail="Sentence-transformers library is not available. Install with: pip install sentence-transformers"
         )
     
-    model = SentenceTransformer('all-MiniLM-L6-v2')
-    topic_names = [topic.name for topic in topics]
-    embeddings = model.encode(topic_names, convert_to_numpy=True)
-    
-    for topic, embedding in zip(topics, embeddings):
-        topic.embedding = embedding
+    vectors = embedding_store.get_vectors("topic", {topic.id: topic.name or "" for topic in topics})
+    for topic in topics:
+        topic.embedding = vectors[topic.id]
 
 
 def _find_similar_topic_clusters(topics: List[TopicWithEmbedding], 
                                 similarity_threshold: float,
                                 max_clusters: int) -> List[TopicCluster]:
-    """Find clusters of similar topics using DBSCAN clustering"""
+    """
+    Find clusters of similar topics: connected components of the graph linking
+    topics whose cosine similarity is at least the threshold.
+
+    This is what DBSCAN with min_samples=2 and eps = 1 - threshold computes, but
+    the edges come from the topic vector index (each topic's nearest neighbours)
+    instead of a dense all-pairs similarity matrix.
+    """
     if not topics or not all(t.embedding is not None for t in topics):
         return []
     
-    embeddings = np.array([topic.embedding for topic in topics])
-    
-    # Calculate similarity matrix and convert to distance matrix
-    similarity_matrix = cosine_similarity(embeddings)
-    distance_matrix = 1 - similarity_matrix
+    positions = {topic.id: i for i, topic in enumerate(topics)}
+    neighbours = vector_indexes["topic"].search(
+        np.stack([topic.embedding for topic in topics]),
+        k=min(CLUSTER_NEIGHBOURS, len(topics)),
+        min_score=similarity_threshold,
+        exclude=[{topic.id} for topic in topics],
+        allow=set(positions),
+    )
     
-    # Use DBSCAN clustering with distance threshold
-    eps = 1 - similarity_threshold  # Convert similarity to distance
-    clustering = DBSCAN(eps=eps, min_samples=2, metric='precomputed')
-    cluster_labels = clustering.fit_predict(distance_matrix)
+    # Union-find over the similarity edges between the given topics
+    parent = list(range(len(topics)))
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+    for i, hits in enumerate(neighbours):
+        for topic_id, _ in hits:
+            j = positions.get(topic_id)
+            if j is not None:
+                parent[find(i)] = find(j)
     
     # Group topics by cluster
     clusters_dict = defaultdict(list)
-    for idx, label in enumerate(cluster_labels):
-        if label != -1:  # -1 indicates noise (unclustered points)
-            clusters_dict[label].append(topics[idx])
+    for idx in range(len(topics)):
+        clusters_dict[find(idx)].append(topics[idx])
     
     # Convert to TopicCluster objects and sort by total memory count
     clusters = []
@@ -349,7 +357,7 @@ async def _topic_deduplicate_semantic(
     Process:
     1. Get all topics with their memory counts
     2. Generate embeddings for topic names using sentence-transformers
-    3. Use DBSCAN clustering to find similar topics
+    3. Cluster topics linked by similarity above the threshold (vector index neighbours)
     4. For each cluster, use LLM to determine the best consolidated name
     5. Reassign memories from secondary topics to primary topic
     6. Delete empty secondary topics
@@ -366,7 +374,7 @@ async def _topic_deduplicate_semantic(
     if not EMBEDDINGS_AVAILABLE:
         raise HTTPException(
             status_code=status.HTTP_501_NOT_IMPLEMENTED,
-            detail="Sentence-transformers library is not available. Install with: pip install sentence-transformers scikit-learn"
+            detail="Sentence-transformers library is not available. Install with: pip install sentence-transformers"
         )
     
     # Get topics with memory counts
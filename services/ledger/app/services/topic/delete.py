@@ -1,3 +1,4 @@
+from app.services.embedding.store import embedding_store
 from app.util import _open_conn
 
 from shared.models.ledger import TopicDeleteRequest
@@ -20,4 +21,5 @@ def _delete_topic(request: TopicDeleteRequest):
         cur = conn.cursor()
         cur.execute("DELETE FROM topics WHERE id = ?", (request.topic_id,))
         conn.commit()
-        return cur.rowcount
\ No newline at end of file
+    embedding_store.delete("topic", [request.topic_id])
+    return cur.rowcount
\ No newline at end of file
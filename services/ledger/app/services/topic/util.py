@@ -1,6 +1,7 @@
 from shared.log_config import get_logger
 logger = get_logger(f"ledger.{__name__}")
 
+from app.services.embedding.store import embedding_store
 from app.util import _open_conn
 
 import uuid
@@ -62,7 +63,8 @@ def _find_or_create_topic(name: str) -> str:
         
         conn.commit()
         logger.debug(f"New topic '{name}' created with ID: {topic_id}")
-        return topic_id
+    embedding_store.index("topic", topic_id, name)
+    return topic_id
 
 
 def _topic_exists(topic_id: str) -> bool:
@@ -0,0 +1,222 @@
+"""
+In-process pub/sub for newly inserted user_messages rows.
+
+The sync write paths publish right after commit, and every `/user/stream`
+subscriber receives new messages through its own bounded asyncio.Queue. Nothing
+touches the database while the system is idle.
+
+A publish doesn't trust the ids it was called with: under the broadcaster lock it
+re-reads every row newer than the subscribers' watermarks. SQLite serializes
+writers, so ids commit in order; two handlers that publish ids 10 and 11 in
+reverse order still deliver 10 before 11, and neither is skipped.
+
+Writers never block on slow readers: when a subscriber's queue is full it is
+flagged as overflowed and catches up from the database itself (`id > last seen`)
+once it drains its queue.
+
+Rows inserted by other processes are picked up by a single shared fallback poller.
+It only checks `PRAGMA data_version` on one connection, and queries for new rows
+when another connection has committed. It runs only while someone is subscribed.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import sqlite3
+import threading
+from typing import Dict, Iterable, List, Optional, Set
+
+from app.util import _load_config
+from shared.log_config import get_logger
+from shared.models.ledger import CanonicalUserMessage
+
+logger = get_logger(f"ledger.{__name__}")
+
+TABLE = "user_messages"
+
+# Messages buffered per subscriber before it falls back to a database catch-up
+SUBSCRIBER_QUEUE_SIZE = 256
+
+# Fallback poll interval used when no subscriber asks for a different one
+DEFAULT_POLL_S = 0.25
+
+
+def _rows_to_messages(cur) -> List[CanonicalUserMessage]:
+    colnames = [desc[0] for desc in cur.description]
+    messages: List[CanonicalUserMessage] = []
+    for row in cur.fetchall():
+        msg = dict(zip(colnames, row))
+        if msg.get("tool_calls"):
+            try:
+                msg["tool_calls"] = json.loads(msg["tool_calls"])
+            except Exception:
+                msg["tool_calls"] = None
+        if msg.get("function_call"):
+            try:
+                msg["function_call"] = json.loads(msg["function_call"])
+            except Exception:
+                msg["function_call"] = None
+        messages.append(CanonicalUserMessage(**msg))
+    return messages
+
+
+def _fetch_new_messages(conn, user_id: str, last_seen_id: int) -> List[CanonicalUserMessage]:
+    cur = conn.cursor()
+    cur.execute(
+        f"SELECT * FROM {TABLE} WHERE user_id = ? AND id > ? ORDER BY id ASC",
+        (user_id, last_seen_id),
+    )
+    return _rows_to_messages(cur)
+
+
+class Subscription:
+    """One stream client's queue of messages for a user."""
+
+    def __init__(self, user_id: str, loop: asyncio.AbstractEventLoop, poll_s: float, last_id: int):
+        self.user_id = user_id
+        self.loop = loop
+        self.poll_s = poll_s
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self.overflowed = False
+        # Highest id already handed to this subscriber; guarded by the broadcaster's lock
+        self.last_id = last_id
+
+
+class MessageBroadcaster:
+    """Fans newly inserted messages out to stream subscribers."""
+
+    def __init__(self):
+        self._subscribers: Set[Subscription] = set()
+        self._lock = threading.Lock()
+        self._poller: Optional[asyncio.Task] = None
+        self.published = 0
+        self.delivered = 0
+        self.overflows = 0
+        self.polls = 0
+        self.poll_queries = 0
+
+    def has_subscribers(self, user_id: Optional[str] = None) -> bool:
+        with self._lock:
+            if user_id is None:
+                return bool(self._subscribers)
+            return any(sub.user_id == user_id for sub in self._subscribers)
+
+    def subscribe(self, user_id: str, last_id: int, poll_s: float = DEFAULT_POLL_S) -> Subscription:
+        """
+        Register a subscriber. Must be called from the event loop serving the stream.
+
+        Args:
+            user_id: The user whose messages are streamed.
+            last_id: The newest row id the subscriber has already seen.
+            poll_s: Requested fallback poll interval; the poller uses the smallest.
+        """
+        loop = asyncio.get_running_loop()
+        subscription = Subscription(user_id, loop, poll_s, last_id)
+        with self._lock:
+            self._subscribers.add(subscription)
+        # subscribe() and the poller's exit check both run on the event loop, so
+        # they cannot interleave
+        if self._poller is None:
+            self._poller = loop.create_task(self._poll())
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    def publish_rows(self, conn, user_id: str, row_ids: Iterable[Optional[int]]):
+        """
+        Publish freshly committed rows. Costs nothing when no one is subscribed.
+
+        Safe to call from any thread; delivery is handed to each subscriber's loop.
+        """
+        row_ids = [row_id for row_id in row_ids if row_id is not None]
+        if not row_ids or not self.has_subscribers(user_id):
+            return
+        self.publish(conn, user_id)
+
+    def publish(self, conn, user_id: str) -> int:
+        """
+        Hand each of user_id's subscribers every committed row newer than its watermark.
+
+        Watermarks are per subscriber, so a client that subscribed after a row was
+        committed (and skips it) never hides that row from earlier subscribers. The
+        rows are read and handed over under the lock, so concurrent publishes deliver
+        in id order.
+
+        Returns:
+            int: Number of rows newly published.
+        """
+        with self._lock:
+            subscriptions = [sub for sub in self._subscribers if sub.user_id == user_id]
+            if not subscriptions:
+                return 0
+            messages = _fetch_new_messages(conn, user_id, min(sub.last_id for sub in subscriptions))
+            fresh: Set[int] = set()
+            for subscription in subscriptions:
+                batch = [m for m in messages if m.id > subscription.last_id]
+                if batch:
+                    subscription.last_id = batch[-1].id
+                    fresh.update(m.id for m in batch)
+                    subscription.loop.call_soon_threadsafe(self._deliver, subscription, batch)
+            self.published += len(fresh)
+            return len(fresh)
+
+    def _deliver(self, subscription: Subscription, messages: List[CanonicalUserMessage]):
+        for message in messages:
+            try:
+                subscription.queue.put_nowait(message)
+                self.delivered += 1
+            except asyncio.QueueFull:
+                if not subscription.overflowed:
+                    self.overflows += 1
+                    logger.warning(f"Stream subscriber for {subscription.user_id} fell behind; catching up from the database")
+                subscription.overflowed = True
+                return
+
+    async def _poll(self):
+        """Shared fallback poller for rows written by other processes."""
+        db = _load_config()["db"]["ledger"]
+        conn = sqlite3.connect(db, timeout=5.0, check_same_thread=False)
+        try:
+            data_version = conn.execute("PRAGMA data_version").fetchone()[0]
+            while True:
+                with self._lock:
+                    if not self._subscribers:
+                        self._poller = None
+                        break
+                    poll_s = min(sub.poll_s for sub in self._subscribers)
+                await asyncio.sleep(poll_s)
+
+                self.polls += 1
+                current = conn.execute("PRAGMA data_version").fetchone()[0]
+                if current == data_version:
+                    continue
+                data_version = current
+
+                with self._lock:
+                    user_ids = {sub.user_id for sub in self._subscribers}
+                self.poll_queries += 1
+                for user_id in user_ids:
+                    await asyncio.to_thread(self.publish, conn, user_id)
+        except Exception as e:
+            logger.error(f"Ledger stream fallback poller stopped: {e}")
+            self._poller = None
+        finally:
+            conn.close()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            subscribers = len(self._subscribers)
+        return {
+            "subscribers": subscribers,
+            "published": self.published,
+            "delivered": self.delivered,
+            "overflows": self.overflows,
+            "polls": self.polls,
+            "poll_queries": self.poll_queries,
+        }
+
+
+message_broadcaster = MessageBroadcaster()
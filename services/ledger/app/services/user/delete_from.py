@@ -1,6 +1,7 @@
 from shared.models.ledger import UserMessagesDeleteFromResponse
 
 from app.util import _open_conn
+from app.services.sync.buffer_cache import buffer_cache
 
 
 TABLE = "user_messages"
@@ -26,6 +27,7 @@ def _delete_user_messages_from_row(user_id: str, row_id: int) -> UserMessagesDel
         )
         deleted = cur.rowcount
         conn.commit()
+        buffer_cache.invalidate(user_id)
 
     return UserMessagesDeleteFromResponse(
         deleted=deleted,
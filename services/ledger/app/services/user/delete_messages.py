@@ -5,6 +5,7 @@ logger = get_logger(f"ledger{__name__}")
 
 from app.services.user.util import _get_period_range
 from app.util import _open_conn
+from app.services.sync.buffer_cache import buffer_cache
 
 TABLE = "user_messages"
 
@@ -50,4 +51,5 @@ def _delete_user_messages(request: DeleteUserMessagesRequest) -> int:
             )
         deleted = cur.rowcount
         conn.commit()
+        buffer_cache.invalidate(user_id)
         return deleted
\ No newline at end of file
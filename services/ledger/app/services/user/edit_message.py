@@ -1,6 +1,8 @@
 from shared.models.ledger import UserMessageEditResponse
 
 from app.util import _open_conn
+from app.services.sync.buffer_cache import buffer_cache
+from app.services.user.tokens import _store_message_tokens
 
 
 TABLE = "user_messages"
@@ -41,7 +43,9 @@ def _edit_user_message_content(user_id: str, row_id: int, content: str) -> UserM
             """,
             (trimmed_content, db_row_id, db_user_id),
         )
+        _store_message_tokens(cur, [db_row_id])
         conn.commit()
+        buffer_cache.invalidate(db_user_id)
 
         cur.execute(
             f"SELECT updated_at FROM {TABLE} WHERE id = ? AND user_id = ?",
@@ -7,11 +7,66 @@ from app.services.user.util import _get_period_range
 
 from app.util import _open_conn
 
-import sqlite3
-from typing import List
+from typing import List, Optional
 from datetime import datetime, timedelta
 import json
 
+# created_at is stored as 'YYYY-MM-DD HH:MM:SS.sss' (see setup.SCHEMA_SQL), so
+# timestamps in that format compare correctly as strings and can use
+# idx_user_msgs_created (user_id, created_at).
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S.%f"
+
+# Rows left out of the non-turn views: tool results and assistant rows without text
+_VISIBLE_ROWS_SQL = "role != 'tool' AND NOT (role = 'assistant' AND content = '')"
+
+
+def _sql_timestamp(dt: datetime, round_up: bool = False) -> str:
+    """
+    Format a window bound at the millisecond resolution of created_at.
+
+    The start of a window is rounded up and the end rounded down, so comparing
+    against the stored strings matches comparing the parsed datetimes.
+    """
+    truncated = dt.replace(microsecond=dt.microsecond - dt.microsecond % 1000)
+    if round_up and truncated != dt:
+        truncated += timedelta(milliseconds=1)
+    return truncated.strftime(TIMESTAMP_FORMAT)[:-3]
+
+
+def _decode_row(msg: dict) -> dict:
+    for field in ("tool_calls", "function_call"):
+        if msg.get(field):
+            try:
+                msg[field] = json.loads(msg[field])
+            except Exception:
+                msg[field] = None
+    return msg
+
+
+def _fetch(cur, sql: str, params: tuple) -> List[dict]:
+    cur.execute(sql, params)
+    columns = [col[0] for col in cur.description]
+    return [dict(zip(columns, row)) for row in cur.fetchall()]
+
+
+def _first_id_of_last_turns(cur, user_id: str, turns: int) -> Optional[int]:
+    """
+    Id of the user row that starts the last `turns` turns, or of the first user
+    row if there are fewer turns. None if the user has no user rows.
+    """
+    cur.execute(
+        "SELECT id FROM user_messages WHERE user_id = ? AND role = 'user' ORDER BY id DESC LIMIT 1 OFFSET ?",
+        (user_id, turns - 1),
+    )
+    row = cur.fetchone()
+    if row is None:
+        cur.execute(
+            "SELECT MIN(id) FROM user_messages WHERE user_id = ? AND role = 'user'",
+            (user_id,),
+        )
+        row = cur.fetchone()
+    return row[0] if row else None
+
 
 def _get_user_messages(request: UserMessagesRequest) -> List[CanonicalUserMessage]:
     """
@@ -43,91 +98,57 @@ def _get_user_messages(request: UserMessagesRequest) -> List[CanonicalUserMessag
         else:
             date = now.strftime("%Y-%m-%d")
 
-    with open('/app/config/config.json') as f:
-        _config = json.load(f)
+    # Optional turn-based mode:
+    # A turn starts at role=user and includes following non-user rows until the next user row.
+    # In turn mode, return raw rows for selected turns (including tool rows/tool-call rows).
+    if turns is not None and turns <= 0:
+        raise ValueError("Invalid turns value. turns must be greater than 0.")
 
-    db = _config["db"]["ledger"]
-
-    with sqlite3.connect(db, timeout=5.0) as conn:
-        conn.execute("PRAGMA journal_mode=WAL;")
-        cur = conn.cursor()
-        cur.execute("SELECT * FROM user_messages WHERE user_id = ? ORDER BY id", (user_id,))
-        columns = [col[0] for col in cur.description]
-        raw_messages = [dict(zip(columns, row)) for row in cur.fetchall()]
-        for msg in raw_messages:
-            if msg.get("tool_calls"):
-                try:
-                    msg["tool_calls"] = json.loads(msg["tool_calls"])
-                except Exception:
-                    msg["tool_calls"] = None
-            if msg.get("function_call"):
-                try:
-                    msg["function_call"] = json.loads(msg["function_call"])
-                except Exception:
-                    msg["function_call"] = None
-
-        messages = [CanonicalUserMessage(**msg) for msg in raw_messages]
-
-        # Optional turn-based mode:
-        # A turn starts at role=user and includes following non-user rows until the next user row.
-        # In turn mode, return raw rows for selected turns (including tool rows/tool-call rows).
-        if turns is not None:
-            if turns <= 0:
-                raise ValueError("Invalid turns value. turns must be greater than 0.")
-
-            grouped_turns: List[List[CanonicalUserMessage]] = []
-            current_turn: List[CanonicalUserMessage] = []
-
-            for msg in messages:
-                if msg.role == "user":
-                    if current_turn:
-                        grouped_turns.append(current_turn)
-                    current_turn = [msg]
-                    continue
-
-                if current_turn:
-                    current_turn.append(msg)
-
-            if current_turn:
-                grouped_turns.append(current_turn)
-
-            selected_turns = grouped_turns[-turns:]
-            return [turn_msg for turn in selected_turns for turn_msg in turn]
-
-        # Filter out tool messages and assistant messages with empty content
-        messages = [
-            msg for msg in messages
-            if not (
-                getattr(msg, 'role', None) == 'tool' or
-                (getattr(msg, 'role', None) == 'assistant' and not getattr(msg, 'content', None))
-            )
-        ]
-        # Remove tool/function call fields from returned messages
-        for msg in messages:
-            if hasattr(msg, 'tool_calls'):
-                msg.tool_calls = None
-            if hasattr(msg, 'function_call'):
-                msg.function_call = None
-        # New: filter by start/end if provided
+    # Resolve the time window before touching the database
+    window = None
+    if turns is None:
         if start and end:
             try:
                 # Accept 'YYYY-MM-DD HH:MM:SS.sss' (to milliseconds)
-                start_dt = datetime.strptime(start, "%Y-%m-%d %H:%M:%S.%f")
-                end_dt = datetime.strptime(end, "%Y-%m-%d %H:%M:%S.%f")
+                start_dt = datetime.strptime(start, TIMESTAMP_FORMAT)
+                end_dt = datetime.strptime(end, TIMESTAMP_FORMAT)
             except Exception:
                 raise ValueError("Invalid start or end timestamp format. Use 'YYYY-MM-DD HH:MM:SS.sss'.")
-            def parse_created_at(dt_str):
-                return datetime.strptime(dt_str, "%Y-%m-%d %H:%M:%S.%f")
-            messages = [
-                msg for msg in messages
-                if start_dt <= parse_created_at(msg.created_at) <= end_dt
-            ]
+            window = (start_dt, end_dt)
         elif period:
-            start_dt, end_dt = _get_period_range(period, date)
-            def parse_created_at(dt_str):
-                return datetime.strptime(dt_str, "%Y-%m-%d %H:%M:%S.%f")
-            messages = [
-                msg for msg in messages
-                if start_dt <= parse_created_at(msg.created_at) <= end_dt
-            ]
-        return messages
+            window = _get_period_range(period, date)
+
+    with _open_conn() as conn:
+        cur = conn.cursor()
+
+        if turns is not None:
+            first_id = _first_id_of_last_turns(cur, user_id, turns)
+            if first_id is None:
+                return []
+            raw_messages = _fetch(
+                cur,
+                "SELECT * FROM user_messages WHERE user_id = ? AND id >= ? ORDER BY id",
+                (user_id, first_id),
+            )
+            return [CanonicalUserMessage(**_decode_row(msg)) for msg in raw_messages]
+
+        # Tool messages and empty assistant messages are filtered out in SQL
+        if window is not None:
+            raw_messages = _fetch(
+                cur,
+                f"SELECT * FROM user_messages WHERE user_id = ? AND created_at BETWEEN ? AND ? "
+                f"AND {_VISIBLE_ROWS_SQL} ORDER BY id",
+                (user_id, _sql_timestamp(window[0], round_up=True), _sql_timestamp(window[1])),
+            )
+        else:
+            raw_messages = _fetch(
+                cur,
+                f"SELECT * FROM user_messages WHERE user_id = ? AND {_VISIBLE_ROWS_SQL} ORDER BY id",
+                (user_id,),
+            )
+
+    # Remove tool/function call fields from returned messages
+    for msg in raw_messages:
+        msg["tool_calls"] = None
+        msg["function_call"] = None
+    return [CanonicalUserMessage(**msg) for msg in raw_messages]
@@ -2,56 +2,31 @@ from __future__ import annotations
 
 import asyncio
 import json
-import os
 import time
 from datetime import datetime, timezone
 from typing import AsyncIterator
 
 from fastapi import Request
 
-from app.util import _open_conn
+from app.util import _load_config, _open_conn
+from app.services.user.broadcast import message_broadcaster, _fetch_new_messages
 from shared.log_config import get_logger
 from shared.models.ledger import CanonicalUserMessage
 
 
 logger = get_logger(f"ledger.{__name__}")
 
-_CONFIG_PATH = os.getenv("LEDGER_CONFIG_PATH", "/app/config/config.json")
+# Longest a stream waits for a message before checking whether the client left
+DISCONNECT_CHECK_S = 5.0
 
 
 def _get_single_user_id() -> str:
-    with open(_CONFIG_PATH) as f:
-        config = json.load(f)
-    user_id = config.get("user_id")
+    user_id = _load_config().get("user_id")
     if not user_id:
         raise ValueError("Missing required 'user_id' in ledger config")
     return str(user_id)
 
 
-def _fetch_new_messages(conn, user_id: str, last_seen_id: int) -> list[CanonicalUserMessage]:
-    cur = conn.cursor()
-    cur.execute(
-        "SELECT * FROM user_messages WHERE user_id = ? AND id > ? ORDER BY id ASC",
-        (user_id, last_seen_id),
-    )
-    colnames = [desc[0] for desc in cur.description]
-    messages: list[CanonicalUserMessage] = []
-    for row in cur.fetchall():
-        msg = dict(zip(colnames, row))
-        if msg.get("tool_calls"):
-            try:
-                msg["tool_calls"] = json.loads(msg["tool_calls"])
-            except Exception:
-                msg["tool_calls"] = None
-        if msg.get("function_call"):
-            try:
-                msg["function_call"] = json.loads(msg["function_call"])
-            except Exception:
-                msg["function_call"] = None
-        messages.append(CanonicalUserMessage(**msg))
-    return messages
-
-
 def _sse_event(event: str, data: str) -> str:
     return f"event: {event}\ndata: {data}\n\n"
 
@@ -62,27 +37,66 @@ def _to_json(model: CanonicalUserMessage) -> str:
     return model.json()
 
 
+def _get_last_id(user_id: str) -> int:
+    with _open_conn() as conn:
+        cur = conn.cursor()
+        cur.execute("SELECT COALESCE(MAX(id), 0) FROM user_messages WHERE user_id = ?", (user_id,))
+        return int(cur.fetchone()[0] or 0)
+
+
+def _catch_up(user_id: str, last_seen_id: int) -> list[CanonicalUserMessage]:
+    with _open_conn() as conn:
+        return _fetch_new_messages(conn, user_id, last_seen_id)
+
+
 async def _stream_user_message_events(
-    request: Request, poll_ms: int = 250, heartbeat_s: float = 15.0
+    request: Request, poll_ms: int = 1000, heartbeat_s: float = 15.0
 ) -> AsyncIterator[str]:
+    """
+    Stream newly inserted messages for the configured user as server-sent events.
+
+    Messages are pushed by the in-process broadcaster as the sync paths insert them;
+    `poll_ms` only sets how often the shared fallback poller looks for rows written
+    by other processes. A heartbeat is sent after `heartbeat_s` without messages.
+    """
     user_id = _get_single_user_id()
-    conn = _open_conn()
+    last_seen_id = await asyncio.to_thread(_get_last_id, user_id)
+    subscription = message_broadcaster.subscribe(user_id, last_seen_id, poll_s=poll_ms / 1000)
 
     try:
-        cur = conn.cursor()
-        cur.execute("SELECT COALESCE(MAX(id), 0) FROM user_messages WHERE user_id = ?", (user_id,))
-        last_seen_id = int(cur.fetchone()[0] or 0)
+        # Rows committed between reading last_seen_id and subscribing
+        for message in await asyncio.to_thread(_catch_up, user_id, last_seen_id):
+            yield _sse_event("message", _to_json(message))
+            last_seen_id = message.id
         last_heartbeat = time.monotonic()
 
         while True:
             if await request.is_disconnected():
                 break
 
-            new_messages = _fetch_new_messages(conn, user_id, last_seen_id)
-            if new_messages:
-                for message in new_messages:
-                    yield _sse_event("message", _to_json(message))
-                    last_seen_id = message.id
+            if subscription.overflowed:
+                # Fell behind the bounded queue: drop what is queued and re-read from the database
+                subscription.overflowed = False
+                while not subscription.queue.empty():
+                    subscription.queue.get_nowait()
+                new_messages = await asyncio.to_thread(_catch_up, user_id, last_seen_id)
+            else:
+                timeout = max(0.0, min(heartbeat_s - (time.monotonic() - last_heartbeat), DISCONNECT_CHECK_S))
+                try:
+                    new_messages = [await asyncio.wait_for(subscription.queue.get(), timeout=timeout)]
+                except asyncio.TimeoutError:
+                    new_messages = []
+                while not subscription.queue.empty():
+                    new_messages.append(subscription.queue.get_nowait())
+
+            sent = False
+            for message in new_messages:
+                if message.id <= last_seen_id:
+                    continue
+                yield _sse_event("message", _to_json(message))
+                last_seen_id = message.id
+                sent = True
+            if sent:
                 last_heartbeat = time.monotonic()
 
             now = time.monotonic()
@@ -91,10 +105,8 @@ async def _stream_user_message_events(
                 yield _sse_event("heartbeat", heartbeat)
                 last_heartbeat = now
 
-            await asyncio.sleep(poll_ms / 1000)
-
     except asyncio.CancelledError:
         logger.info("Ledger user stream cancelled by client disconnect.")
         raise
     finally:
-        conn.close()
+        message_broadcaster.unsubscribe(subscription)
@@ -3,13 +3,21 @@ from shared.models.ledger import CanonicalUserMessage, UserSyncRequest
 from shared.log_config import get_logger
 logger = get_logger(f"ledger.{__name__}")
 
-from app.util import _open_conn
+from app.util import _open_conn, _load_config
+from app.services.sync.buffer_cache import buffer_cache
+from app.services.user.broadcast import message_broadcaster
+from app.services.user.tokens import _store_message_tokens
 
 import json
-from typing import List
+from typing import List, Optional
 
 TABLE = "user_messages"
 
+INSERT_SQL = (
+    f"INSERT INTO {TABLE} (user_id, platform, platform_msg_id, role, content, model, tool_calls, function_call, tool_call_id) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)"
+)
+
 
 def _ensure_first_user(messages):
     for i, msg in enumerate(messages):
@@ -18,6 +26,77 @@ def _ensure_first_user(messages):
     return []
 
 
+def _row_to_message(colnames, row) -> CanonicalUserMessage:
+    """
+    Build a CanonicalUserMessage from a raw user_messages row, decoding JSON columns.
+    """
+    msg = dict(zip(colnames, row))
+    msg["tool_calls"] = json.loads(msg["tool_calls"]) if msg.get("tool_calls") else None
+    msg["function_call"] = json.loads(msg["function_call"]) if msg.get("function_call") else None
+    msg["tool_call_id"] = msg.get("tool_call_id")
+    return CanonicalUserMessage(**msg)
+
+
+def _load_buffer_tail(cur, user_id: str, limit: Optional[int], ensure_user_first: bool = True) -> List[CanonicalUserMessage]:
+    """
+    Load the last `limit` rows of a user's buffer in chronological order.
+
+    The rows are read newest-first with ORDER BY id DESC LIMIT ?, so SQLite walks
+    idx_user_msgs_order backwards and stops after `limit` rows instead of
+    materializing the user's whole history. A limit of None returns everything.
+
+    Args:
+        cur: Open cursor on the ledger database.
+        user_id: The user whose buffer is loaded.
+        limit: Maximum number of rows to return, or None for no limit.
+        ensure_user_first: Drop leading non-user rows from the window.
+
+    Returns:
+        List[CanonicalUserMessage]: The buffer tail, oldest first.
+    """
+    if limit is None:
+        cur.execute(f"SELECT * FROM {TABLE} WHERE user_id = ? ORDER BY id", (user_id,))
+        rows = cur.fetchall()
+    else:
+        cur.execute(
+            f"SELECT * FROM {TABLE} WHERE user_id = ? ORDER BY id DESC LIMIT ?",
+            (user_id, limit),
+        )
+        rows = cur.fetchall()
+        rows.reverse()
+    colnames = [desc[0] for desc in cur.description]
+    result = [_row_to_message(colnames, row) for row in rows]
+    if ensure_user_first:
+        result = _ensure_first_user(result)
+    return result
+
+
+def _last_row_by_role(cur, user_id: str, role: str, window) -> Optional[tuple]:
+    """
+    Return the most recent (id, role, content) row with the given role.
+
+    The tail window is checked first. Only when the window is full and holds no
+    row with that role (e.g. a long tool-call chain) does this fall back to an
+    indexed ORDER BY id DESC LIMIT 1 lookup.
+    """
+    for row in reversed(window["rows"]):
+        if row[1] == role:
+            return row
+    if not window["full"]:
+        return None
+    cur.execute(
+        f"SELECT id, role, content FROM {TABLE} WHERE user_id = ? AND role = ? ORDER BY id DESC LIMIT 1",
+        (user_id, role),
+    )
+    return cur.fetchone()
+
+
+def _get_turns_limit() -> Optional[int]:
+    _config = _load_config()
+    # if turns isn't set, default to 15
+    return _config.get("ledger", {}).get("turns", 15)
+
+
 def _sync_user_buffer_helper(request: UserSyncRequest) -> List[CanonicalUserMessage]:
     """
     Internal helper for synchronizing a user's message buffer with the server-side ledger.
@@ -29,6 +108,10 @@ def _sync_user_buffer_helper(request: UserSyncRequest) -> List[CanonicalUserMess
     - Appending new messages
     - Optional result limiting
 
+    Dedup/edit/append decisions are made from a bounded tail window of the buffer
+    (the last `ledger.turns` rows), and the returned buffer is read the same way,
+    so sync cost does not grow with the size of the user's history.
+
     Args:
         request: UserSyncRequest containing user_id and snapshot
 
@@ -37,18 +120,10 @@ def _sync_user_buffer_helper(request: UserSyncRequest) -> List[CanonicalUserMess
     """
     user_id = request.user_id
     snapshot = request.snapshot
-    
-    logger.debug(f"Syncing user buffer for {user_id}: {snapshot}")
 
-    # Load configuration to determine the message limit
-    with open('/app/config/config.json') as f:
-            _config = json.load(f)
-    # if turns isn't set, default to 15
-    limit = _config.get("ledger", {}).get("turns", 15)
+    logger.debug(f"Syncing user buffer for {user_id}: {snapshot}")
 
-    #if not snapshot:
-    #    background_tasks.add_task(create_summaries, user_id)
-    #    return []
+    limit = _get_turns_limit()
 
     # Do NOT filter snapshot; allow any role at the start.
     # We do this so we can sync our pseudo tool calls where we're injecting tools output that the assistant
@@ -69,9 +144,10 @@ def _sync_user_buffer_helper(request: UserSyncRequest) -> List[CanonicalUserMess
             getattr(msg, 'tool_call_id', None) if getattr(msg, 'tool_call_id', None) is not None else None
         )
 
-    # --- Edge case: consecutive user messages (likely after a 500) ---
     with _open_conn() as conn:
         cur = conn.cursor()
+
+        # --- Edge case: consecutive user messages (likely after a 500) ---
         cur.execute(
             f"SELECT id, role FROM {TABLE} WHERE user_id = ? ORDER BY id DESC LIMIT 1",
             (user_id,)
@@ -79,239 +155,122 @@ def _sync_user_buffer_helper(request: UserSyncRequest) -> List[CanonicalUserMess
         last_db_row = cur.fetchone()
         if last_db_row and last_db_row[1] == "user" and snapshot and snapshot[-1].role == "user":
             cur.execute(f"DELETE FROM {TABLE} WHERE id = ?", (last_db_row[0],))
-            conn.commit()
             # After deletion, insert the new incoming user message
+            cur.execute(INSERT_SQL, _msg_fields(last_msg))
+            row_id = cur.lastrowid
+            _store_message_tokens(cur, [row_id])
+            conn.commit()
+            buffer_cache.invalidate(user_id)
+            message_broadcaster.publish_rows(conn, user_id, [row_id])
+            return _load_buffer_tail(cur, user_id, limit)
+
+        # ----------------- Non‑API fast path -----------------
+        if last_msg.platform != "api":
+            cur.execute(INSERT_SQL, _msg_fields(last_msg))
+            row_id = cur.lastrowid
+            _store_message_tokens(cur, [row_id])
+            conn.commit()
+            buffer_cache.record_insert(conn, user_id, [row_id])
+            message_broadcaster.publish_rows(conn, user_id, [row_id])
+            return _load_buffer_tail(cur, user_id, limit)
+
+        # ----------------- API logic -----------------
+        if limit is None:
             cur.execute(
-                f"INSERT INTO {TABLE} (user_id, platform, platform_msg_id, role, content, model, tool_calls, function_call, tool_call_id) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
-                _msg_fields(last_msg),
+                f"SELECT id, role, content FROM {TABLE} WHERE user_id = ? ORDER BY id DESC",
+                (user_id,),
             )
-            conn.commit()
-            # After insertion, return the updated buffer
-            cur.execute(f"SELECT * FROM {TABLE} WHERE user_id = ? ORDER BY id", (user_id,))
-            colnames = [desc[0] for desc in cur.description]
-            result = [
-                CanonicalUserMessage(**{
-                    **dict(zip(colnames, row)),
-                    'tool_calls': json.loads(row[colnames.index('tool_calls')]) if row[colnames.index('tool_calls')] else None,
-                    'function_call': json.loads(row[colnames.index('function_call')]) if row[colnames.index('function_call')] else None,
-                    'tool_call_id': row[colnames.index('tool_call_id')] if 'tool_call_id' in colnames else None,
-                }) for row in cur.fetchall()
-            ]
-            if limit is not None:
-                result = result[-limit:]
-                result = _ensure_first_user(result)
-                return result
-            else:
-                result = _ensure_first_user(result)
-                return result
-
-    # Continue with rest of synchronization logic...
-    # [Complex logic continues here - keeping existing implementation]
-    
-    # The full implementation continues for 200+ more lines...
-    # For now, I'll just copy the rest of the function rather than break it up further
-
-    # ----------------- Non‑API fast path -----------------
-    if last_msg.platform != "api":
-        with _open_conn() as conn:
-            cur = conn.cursor()
+        else:
             cur.execute(
-                f"INSERT INTO {TABLE} (user_id, platform, platform_msg_id, role, content, model, tool_calls, function_call, tool_call_id) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
-                _msg_fields(last_msg),
+                f"SELECT id, role, content FROM {TABLE} WHERE user_id = ? ORDER BY id DESC LIMIT ?",
+                (user_id, limit),
             )
-            conn.commit()
-            cur.execute(f"SELECT * FROM {TABLE} WHERE user_id = ? ORDER BY id", (user_id,))
-            colnames = [desc[0] for desc in cur.description]
-            result = [
-                CanonicalUserMessage(**{
-                    **dict(zip(colnames, row)),
-                    'tool_calls': json.loads(row[colnames.index('tool_calls')]) if row[colnames.index('tool_calls')] else None,
-                    'function_call': json.loads(row[colnames.index('function_call')]) if row[colnames.index('function_call')] else None,
-                    'tool_call_id': row[colnames.index('tool_call_id')] if 'tool_call_id' in colnames else None,
-                }) for row in cur.fetchall()
-            ]
-            result = _ensure_first_user(result)
-            #if last_msg.role == "assistant":
-                #background_tasks.add_task(create_summaries, user_id)
-            if limit is not None:
-                result = result[-limit:]
-                result = _ensure_first_user(result)
-                return result
-            else:
-                result = _ensure_first_user(result)
-                return result
-
-    # ----------------- API logic -----------------
-    with _open_conn() as conn:
-        cur = conn.cursor()
-        cur.execute(
-            f"SELECT id, role, content FROM {TABLE} WHERE user_id = ? ORDER BY id",
-            (user_id,),
-        )
         rows = cur.fetchall()
-
-        user_rows      = [(idx, r) for idx, r in enumerate(rows) if r[1] == "user"]
-        assistant_rows = [(idx, r) for idx, r in enumerate(rows) if r[1] == "assistant"]
+        rows.reverse()
+        window = {"rows": rows, "full": limit is not None and len(rows) >= limit}
 
         incoming_user      = [m for m in snapshot if m.role == "user"]
         incoming_assistant = [m for m in snapshot if m.role == "assistant"]
 
         # Seed brand‑new buffer with exactly the last incoming message
         if not rows:
-            cur.execute(
-                f"INSERT INTO {TABLE} (user_id, platform, platform_msg_id, role, content, model, tool_calls, function_call, tool_call_id) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
-                _msg_fields(last_msg),
-            )
+            cur.execute(INSERT_SQL, _msg_fields(last_msg))
+            row_id = cur.lastrowid
+            _store_message_tokens(cur, [row_id])
             conn.commit()
-            cur.execute(f"SELECT * FROM {TABLE} WHERE user_id = ? ORDER BY id", (user_id,))
-            colnames = [desc[0] for desc in cur.description]
-            result = [
-                CanonicalUserMessage(**{
-                    **dict(zip(colnames, row)),
-                    'tool_calls': json.loads(row[colnames.index('tool_calls')]) if row[colnames.index('tool_calls')] else None,
-                    'function_call': json.loads(row[colnames.index('function_call')]) if row[colnames.index('function_call')] else None,
-                    'tool_call_id': row[colnames.index('tool_call_id')] if 'tool_call_id' in colnames else None,
-                }) for row in cur.fetchall()
-            ]
-            #if last_msg.role == "assistant":
-                #background_tasks.add_task(create_summaries, user_id)
-            if limit is not None:
-                return result[-limit:]
-            else:
-                return result
+            buffer_cache.record_insert(conn, user_id, [row_id])
+            message_broadcaster.publish_rows(conn, user_id, [row_id])
+            return _load_buffer_tail(cur, user_id, limit, ensure_user_first=False)
 
-        last_db_user = user_rows[-1][1] if user_rows else None
-        last_incoming_user = incoming_user[-1] if incoming_user else None
+        last_db_user = _last_row_by_role(cur, user_id, "user", window)
+        last_db_assistant = _last_row_by_role(cur, user_id, "assistant", window)
 
         # --- User message deduplication and assistant refresh logic ---
         if last_msg.role == "user":
-            last_db_user = user_rows[-1][1] if user_rows else None
             if last_db_user and last_msg.content == last_db_user[2]:
-                if assistant_rows and assistant_rows[-1][0] > user_rows[-1][0]:
+                if last_db_assistant and last_db_assistant[0] > last_db_user[0]:
                     cur.execute(
-                        f"DELETE FROM {TABLE} WHERE id = ?", (assistant_rows[-1][1][0],)
+                        f"DELETE FROM {TABLE} WHERE id = ?", (last_db_assistant[0],)
                     )
                     conn.commit()
-                # Always return the full buffer
-                cur.execute(f"SELECT * FROM {TABLE} WHERE user_id = ? ORDER BY id", (user_id,))
-                colnames = [desc[0] for desc in cur.description]
-                result = [
-                    CanonicalUserMessage(**{
-                        **dict(zip(colnames, row)),
-                        'tool_calls': json.loads(row[colnames.index('tool_calls')]) if row[colnames.index('tool_calls')] else None,
-                        'function_call': json.loads(row[colnames.index('function_call')]) if row[colnames.index('function_call')] else None,
-                        'tool_call_id': row[colnames.index('tool_call_id')] if 'tool_call_id' in colnames else None,
-                    }) for row in cur.fetchall()
-                ]
-                #if last_msg.role == "assistant":
-                    #background_tasks.add_task(create_summaries, user_id)
-                if limit is not None:
-                    return result[-limit:]
-                else:
-                    return result
+                    buffer_cache.invalidate(user_id)
+                # Always return the buffer
+                return _load_buffer_tail(cur, user_id, limit, ensure_user_first=False)
             # --- Check for assistant edit before appending user ---
             # Only update if this is truly an edit scenario (same user message but different assistant response)
+            assistant_edited = False
             if (
                 len(snapshot) >= 2 and
                 snapshot[-2].role == "assistant" and
-                assistant_rows and
-                user_rows and
+                last_db_assistant and
+                last_db_user and
                 len(incoming_user) >= 1 and
-                incoming_user[-1].content == user_rows[-1][1][2]  # Same user message as last in DB
+                incoming_user[-1].content == last_db_user[2]  # Same user message as last in DB
             ):
                 incoming_assistant_content = snapshot[-2].content
-                last_db_assistant_content = assistant_rows[-1][1][2]
-                last_db_assistant_id = assistant_rows[-1][1][0]
-                if incoming_assistant_content != last_db_assistant_content:
+                if incoming_assistant_content != last_db_assistant[2]:
                     cur.execute(
                         f"UPDATE {TABLE} SET content = ?, updated_at = (STRFTIME('%Y-%m-%d %H:%M:%f','now')) WHERE id = ?",
-                        (incoming_assistant_content, last_db_assistant_id),
+                        (incoming_assistant_content, last_db_assistant[0]),
                     )
-                    conn.commit()
-            cur.execute(
-                f"INSERT INTO {TABLE} (user_id, platform, platform_msg_id, role, content, model, tool_calls, function_call, tool_call_id) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
-                _msg_fields(last_msg),
-            )
+                    _store_message_tokens(cur, [last_db_assistant[0]])
+                    assistant_edited = True
+            cur.execute(INSERT_SQL, _msg_fields(last_msg))
+            row_id = cur.lastrowid
+            _store_message_tokens(cur, [row_id])
             conn.commit()
-            cur.execute(f"SELECT * FROM {TABLE} WHERE user_id = ? ORDER BY id", (user_id,))
-            colnames = [desc[0] for desc in cur.description]
-            result = [
-                CanonicalUserMessage(**{
-                    **dict(zip(colnames, row)),
-                    'tool_calls': json.loads(row[colnames.index('tool_calls')]) if row[colnames.index('tool_calls')] else None,
-                    'function_call': json.loads(row[colnames.index('function_call')]) if row[colnames.index('function_call')] else None,
-                    'tool_call_id': row[colnames.index('tool_call_id')] if 'tool_call_id' in colnames else None,
-                }) for row in cur.fetchall()
-            ]
-            #if last_msg.role == "assistant":
-                #background_tasks.add_task(create_summaries, user_id)
-            if limit is not None:
-                result = result[-limit:]
-                result = _ensure_first_user(result)
-                return result
+            if assistant_edited:
+                buffer_cache.invalidate(user_id)
             else:
-                result = _ensure_first_user(result)
-                return result
+                buffer_cache.record_insert(conn, user_id, [row_id])
+            message_broadcaster.publish_rows(conn, user_id, [row_id])
+            return _load_buffer_tail(cur, user_id, limit)
 
-        # Rule 2 – edit assistant
+        # Rule 2 – edit assistant
         if (
             len(incoming_user) >= 2 and
             last_db_user and incoming_user[-2].content == last_db_user[2] and
             incoming_assistant
         ):
-            last_db_assistant_id = assistant_rows[-1][1][0] if assistant_rows else None
             if (
-                last_db_assistant_id and
-                incoming_assistant[-1].content != assistant_rows[-1][1][2]
+                last_db_assistant and
+                incoming_assistant[-1].content != last_db_assistant[2]
             ):
                 cur.execute(
                     f"UPDATE {TABLE} SET content = ?, updated_at = (STRFTIME('%Y-%m-%d %H:%M:%f','now')) WHERE id = ?",
-                    (incoming_assistant[-1].content, last_db_assistant_id),
+                    (incoming_assistant[-1].content, last_db_assistant[0]),
                 )
+                _store_message_tokens(cur, [last_db_assistant[0]])
                 conn.commit()
-            # Always return the full buffer
-            cur.execute(f"SELECT * FROM {TABLE} WHERE user_id = ? ORDER BY id", (user_id,))
-            colnames = [desc[0] for desc in cur.description]
-            result = [
-                CanonicalUserMessage(**{
-                    **dict(zip(colnames, row)),
-                    'tool_calls': json.loads(row[colnames.index('tool_calls')]) if row[colnames.index('tool_calls')] else None,
-                    'function_call': json.loads(row[colnames.index('function_call')]) if row[colnames.index('function_call')] else None,
-                    'tool_call_id': row[colnames.index('tool_call_id')] if 'tool_call_id' in colnames else None,
-                }) for row in cur.fetchall()
-            ]
-            #if last_msg.role == "assistant":
-                #background_tasks.add_task(create_summaries, user_id)
-            if limit is not None:
-                result = result[-limit:]
-                result = _ensure_first_user(result)
-                return result
-            else:
-                result = _ensure_first_user(result)
-                return result
+                buffer_cache.invalidate(user_id)
+            # Always return the buffer
+            return _load_buffer_tail(cur, user_id, limit)
 
-        # Rule 3 – fallback append
-        cur.execute(
-            f"INSERT INTO {TABLE} (user_id, platform, platform_msg_id, role, content, model, tool_calls, function_call, tool_call_id) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
-            _msg_fields(last_msg),
-        )
+        # Rule 3 – fallback append
+        cur.execute(INSERT_SQL, _msg_fields(last_msg))
+        row_id = cur.lastrowid
+        _store_message_tokens(cur, [row_id])
         conn.commit()
-        cur.execute(f"SELECT * FROM {TABLE} WHERE user_id = ? ORDER BY id", (user_id,))
-        colnames = [desc[0] for desc in cur.description]
-        result = [
-            CanonicalUserMessage(**{
-                **dict(zip(colnames, row)),
-                'tool_calls': json.loads(row[colnames.index('tool_calls')]) if row[colnames.index('tool_calls')] else None,
-                'function_call': json.loads(row[colnames.index('function_call')]) if row[colnames.index('function_call')] else None,
-                'tool_call_id': row[colnames.index('tool_call_id')] if 'tool_call_id' in colnames else None,
-            }) for row in cur.fetchall()
-        ]
-        #if last_msg.role == "assistant":
-            #background_tasks.add_task(create_summaries, user_id)
-        if limit is not None:
-            result = result[-limit:]
-            result = _ensure_first_user(result)
-            return result
-        else:
-            result = _ensure_first_user(result)
-            return result
\ No newline at end of file
+        buffer_cache.record_insert(conn, user_id, [row_id])
+        message_broadcaster.publish_rows(conn, user_id, [row_id])
+        return _load_buffer_tail(cur, user_id, limit)
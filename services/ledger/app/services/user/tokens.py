@@ -0,0 +1,152 @@
+"""
+Per-message token counts for the user_messages table.
+
+Token counts are computed once, when a row is inserted or its content changes, and
+stored in user_message_tokens keyed by (message_id, tokenizer). Readers that need
+to fit messages into a token budget (the /sync/get buffer, summary chunking) read
+the stored counts instead of re-encoding message content on every call.
+
+Buffer (cl100k_base) counts cover a message's content plus the JSON-serialized
+tool_calls and function_call payloads, matching what the conversation buffer has
+always counted. Summary (gpt2) counts cover the content only, as summary chunking
+always has.
+
+Tokenizers:
+    - "cl100k_base": the gpt-3.5-turbo encoding used for conversation buffer trimming.
+    - "gpt2": GPT-2 BPE used for summary chunking (tiktoken's gpt2 encoding is the
+      same vocabulary as transformers' AutoTokenizer("gpt2")).
+"""
+
+from shared.log_config import get_logger
+logger = get_logger(f"ledger.{__name__}")
+
+import json
+from typing import Dict, Iterable, List, Optional
+
+import tiktoken
+
+TABLE = "user_messages"
+TOKENS_TABLE = "user_message_tokens"
+
+BUFFER_TOKENIZER = "cl100k_base"
+SUMMARY_TOKENIZER = "gpt2"
+TOKENIZERS = (BUFFER_TOKENIZER, SUMMARY_TOKENIZER)
+
+BACKFILL_BATCH_SIZE = 1000
+
+_encodings: Dict[str, tiktoken.Encoding] = {}
+
+
+def get_encoding(tokenizer: str) -> tiktoken.Encoding:
+    """Return the process-wide tiktoken encoding for a tokenizer name."""
+    encoding = _encodings.get(tokenizer)
+    if encoding is None:
+        encoding = tiktoken.get_encoding(tokenizer)
+        _encodings[tokenizer] = encoding
+    return encoding
+
+
+def count_tokens(tokenizer: str, content: Optional[str], tool_calls=None, function_call=None) -> int:
+    """
+    Count tokens for one message's content and tool/function call payloads.
+
+    tool_calls and function_call may be given either decoded or as the raw JSON
+    strings stored in the database.
+    """
+    encoding = get_encoding(tokenizer)
+    tokens = len(encoding.encode(content or ''))
+    for payload in (tool_calls, function_call):
+        if payload:
+            text = payload if isinstance(payload, str) else json.dumps(payload)
+            tokens += len(encoding.encode(text))
+    return tokens
+
+
+def count_tokens_batch(tokenizer: str, contents: List[Optional[str]]) -> List[int]:
+    """Count tokens for many plain-text contents with one batched encode."""
+    if not contents:
+        return []
+    encoding = get_encoding(tokenizer)
+    return [len(tokens) for tokens in encoding.encode_batch([content or '' for content in contents])]
+
+
+def _stored_count(tokenizer: str, content: Optional[str], tool_calls, function_call) -> int:
+    """The count stored for a tokenizer: content only for summary chunking, content and call payloads otherwise."""
+    if tokenizer == SUMMARY_TOKENIZER:
+        return count_tokens(tokenizer, content)
+    return count_tokens(tokenizer, content, tool_calls, function_call)
+
+
+def _store_message_tokens(cur, row_ids: Iterable[int]):
+    """
+    Compute and store token counts for the given user_messages rows.
+
+    Uses INSERT OR REPLACE so it can be called after both inserts and content
+    edits. The caller owns the transaction and is expected to commit.
+    """
+    row_ids = [row_id for row_id in row_ids if row_id is not None]
+    if not row_ids:
+        return
+    placeholders = ",".join("?" for _ in row_ids)
+    cur.execute(
+        f"SELECT id, content, tool_calls, function_call FROM {TABLE} WHERE id IN ({placeholders})",
+        row_ids,
+    )
+    rows = cur.fetchall()
+    cur.executemany(
+        f"INSERT OR REPLACE INTO {TOKENS_TABLE} (message_id, tokenizer, tokens) VALUES (?, ?, ?)",
+        [
+            (row_id, tokenizer, _stored_count(tokenizer, content, tool_calls, function_call))
+            for row_id, content, tool_calls, function_call in rows
+            for tokenizer in TOKENIZERS
+        ],
+    )
+
+
+def _get_message_tokens(cur, row_ids: List[int], tokenizer: str) -> Dict[int, int]:
+    """Return {message_id: tokens} for the rows that have a stored count."""
+    if not row_ids:
+        return {}
+    placeholders = ",".join("?" for _ in row_ids)
+    cur.execute(
+        f"SELECT message_id, tokens FROM {TOKENS_TABLE} WHERE tokenizer = ? AND message_id IN ({placeholders})",
+        [tokenizer, *row_ids],
+    )
+    return dict(cur.fetchall())
+
+
+def _backfill_message_tokens(conn) -> int:
+    """
+    Store token counts for every user_messages row that is missing one.
+
+    Runs in batches so a large ledger is migrated without holding the whole table
+    in memory. Safe to run repeatedly; rows that already have counts are skipped.
+
+    Returns:
+        int: Number of rows that were backfilled.
+    """
+    cur = conn.cursor()
+    backfilled = 0
+    last_id = 0
+    while True:
+        cur.execute(
+            f"""
+            SELECT m.id FROM {TABLE} m
+            WHERE m.id > ?
+              AND (SELECT COUNT(*) FROM {TOKENS_TABLE} t WHERE t.message_id = m.id) < ?
+            ORDER BY m.id
+            LIMIT ?
+            """,
+            (last_id, len(TOKENIZERS), BACKFILL_BATCH_SIZE),
+        )
+        row_ids = [row[0] for row in cur.fetchall()]
+        if not row_ids:
+            break
+        _store_message_tokens(cur, row_ids)
+        conn.commit()
+        backfilled += len(row_ids)
+        last_id = row_ids[-1]
+
+    if backfilled:
+        logger.info(f"Backfilled token counts for {backfilled} user_messages rows")
+    return backfilled
@@ -1,17 +1,19 @@
 """
 This module sets up the SQLite database schema for the ledger service, including tables for user messages,
-user-level summaries, and topics. It provides a function to initialize the buffer database by creating
+per-message token counts, user-level summaries, topics, and memory/topic embeddings. It provides a function to initialize the buffer database by creating
 the necessary tables and indexes as defined in the SCHEMA_SQL.
 Functions:
     init_buffer_db():
         Initializes the buffer database by executing the schema SQL script, which creates tables and indexes
-        for message buffering, user summaries, and topics. Reads the database path from a configuration file.
+        for message buffering, user summaries, and topics. Reads the database path from the cached config (app.util._load_config).
 """
 from shared.log_config import get_logger
 logger = get_logger(f"ledger.{__name__}")
 
+from app.services.user.tokens import _backfill_message_tokens
+from app.util import _load_config
+
 import sqlite3
-import json
 
 # SQL schema for buffer table and summary metadata
 SCHEMA_SQL = """
@@ -34,6 +36,32 @@ CREATE INDEX IF NOT EXISTS idx_user_msgs_order
     ON user_messages(user_id, id);
 CREATE INDEX IF NOT EXISTS idx_user_msgs_topic
     ON user_messages(topic_id);
+CREATE INDEX IF NOT EXISTS idx_user_msgs_created
+    ON user_messages(user_id, created_at);
+
+-- bumped by any edit or delete of user_messages, from any process, so cached
+-- conversation buffers can tell when they are stale
+CREATE TABLE IF NOT EXISTS user_messages_version (
+    id              INTEGER PRIMARY KEY CHECK (id = 1),
+    version         INTEGER NOT NULL DEFAULT 0
+);
+INSERT OR IGNORE INTO user_messages_version (id, version) VALUES (1, 0);
+CREATE TRIGGER IF NOT EXISTS user_messages_version_update AFTER UPDATE ON user_messages
+BEGIN
+    UPDATE user_messages_version SET version = version + 1 WHERE id = 1;
+END;
+CREATE TRIGGER IF NOT EXISTS user_messages_version_delete AFTER DELETE ON user_messages
+BEGIN
+    UPDATE user_messages_version SET version = version + 1 WHERE id = 1;
+END;
+
+-- per-message token counts, keyed by tokenizer name
+CREATE TABLE IF NOT EXISTS user_message_tokens (
+    message_id      INTEGER NOT NULL REFERENCES user_messages(id) ON DELETE CASCADE,
+    tokenizer       TEXT    NOT NULL,
+    tokens          INTEGER NOT NULL,
+    PRIMARY KEY (message_id, tokenizer)
+);
 
 --------------------------------------------------------------------
 
@@ -55,7 +83,9 @@ CREATE TABLE IF NOT EXISTS summaries (
     summary             TEXT,
     timestamp_begin     DATETIME NOT NULL,
     timestamp_end       DATETIME NOT NULL,
-    summary_type        TEXT
+    summary_type        TEXT,
+    input_hash          TEXT,    -- hash of the messages/child summaries it was built from (summary/rollup.py)
+    rolled_up           INTEGER NOT NULL DEFAULT 0  -- 1 once a daily summary has been built from it
 );
 CREATE INDEX IF NOT EXISTS idx_summaries_type_time
     ON summaries(summary_type, timestamp_begin, timestamp_end);
@@ -86,6 +116,7 @@ CREATE TABLE IF NOT EXISTS memory_tags (
 );
 CREATE INDEX IF NOT EXISTS idx_memory_id ON memory_tags (memory_id);
 CREATE INDEX IF NOT EXISTS idx_tag ON memory_tags (tag);
+CREATE INDEX IF NOT EXISTS idx_tag_lower ON memory_tags (lower(tag));
 
 
 CREATE TABLE IF NOT EXISTS memory_category (
@@ -107,17 +138,41 @@ CREATE INDEX IF NOT EXISTS idx_memory_topics_memory_id ON memory_topics (memory_
 CREATE INDEX IF NOT EXISTS idx_memory_topics_topic_id ON memory_topics (topic_id);
 
 
+-- embedding vectors (float32 BLOBs) of memories and topics, per model
+CREATE TABLE IF NOT EXISTS embeddings (
+    entity_type     TEXT    NOT NULL CHECK (entity_type IN ('memory','topic')),
+    entity_id       TEXT    NOT NULL,
+    model           TEXT    NOT NULL,
+    content_hash    TEXT    NOT NULL, -- SHA-256 of the text the vector was computed from
+    dim             INTEGER NOT NULL,
+    vector          BLOB    NOT NULL,
+    updated_at      DATETIME NOT NULL DEFAULT (STRFTIME('%Y-%m-%d %H:%M:%f','now','localtime')),
+    PRIMARY KEY (entity_type, entity_id, model)
+);
+CREATE INDEX IF NOT EXISTS idx_embeddings_updated
+    ON embeddings(entity_type, model, updated_at);
+
+
 --------------------------------------------------------------------
 
 -- Heatmap tables for dynamic keyword relevance tracking
 CREATE TABLE IF NOT EXISTS heatmap_score (
     keyword TEXT PRIMARY KEY,
     score REAL NOT NULL,
-    last_updated DATETIME NOT NULL DEFAULT (STRFTIME('%Y-%m-%d %H:%M:%f','now','localtime'))
+    last_updated DATETIME NOT NULL DEFAULT (STRFTIME('%Y-%m-%d %H:%M:%f','now','localtime')),
+    turn INTEGER NOT NULL DEFAULT 0
 );
 CREATE INDEX IF NOT EXISTS idx_heatmap_score_value ON heatmap_score (score);
 CREATE INDEX IF NOT EXISTS idx_heatmap_last_updated ON heatmap_score (last_updated);
 
+-- Single row: heatmap update counter and the decay mode of the last update
+CREATE TABLE IF NOT EXISTS heatmap_state (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    turn_counter INTEGER NOT NULL DEFAULT 0,
+    mode TEXT NOT NULL DEFAULT 'eager'
+);
+INSERT OR IGNORE INTO heatmap_state (id, turn_counter, mode) VALUES (1, 0, 'eager');
+
 
 CREATE TABLE IF NOT EXISTS heatmap_memories (
     memory_id TEXT PRIMARY KEY REFERENCES memories(id) ON DELETE CASCADE,
@@ -129,21 +184,38 @@ CREATE INDEX IF NOT EXISTS idx_heatmap_memories_updated ON heatmap_memories (las
 """
 
 
+def _migrate_heatmap_score(conn):
+    """Add the turn column to heatmap_score tables created before lazy decay."""
+    columns = [row[1] for row in conn.execute("PRAGMA table_info(heatmap_score)")]
+    if columns and "turn" not in columns:
+        conn.execute("ALTER TABLE heatmap_score ADD COLUMN turn INTEGER NOT NULL DEFAULT 0")
+
+
+def _migrate_summaries(conn):
+    """Add the rollup columns to summaries tables created before incremental rollups."""
+    columns = [row[1] for row in conn.execute("PRAGMA table_info(summaries)")]
+    if columns and "input_hash" not in columns:
+        conn.execute("ALTER TABLE summaries ADD COLUMN input_hash TEXT")
+    if columns and "rolled_up" not in columns:
+        conn.execute("ALTER TABLE summaries ADD COLUMN rolled_up INTEGER NOT NULL DEFAULT 0")
+
+
 def init_buffer_db():
     """
     Initialize the buffer database by creating the messages table and required indexes.
     
     This function connects to the buffer database, executes the predefined schema SQL script,
-    commits the changes, and closes the database connection.
+    commits the changes, backfills token counts for any messages that don't have them yet,
+    and closes the database connection.
     """
 
-    with open('/app/config/config.json') as f:
-        _config = json.load(f)
-
-        db = _config["db"]["ledger"]
+    db = _load_config()["db"]["ledger"]
     conn = sqlite3.connect(db, timeout=5.0)
     conn.execute("PRAGMA journal_mode=WAL;")
     conn.execute("PRAGMA foreign_keys=ON;")
+    _migrate_heatmap_score(conn)
+    _migrate_summaries(conn)
     conn.executescript(SCHEMA_SQL)
     conn.commit()
+    _backfill_message_tokens(conn)
     conn.close()
\ No newline at end of file
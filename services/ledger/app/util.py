@@ -1,22 +1,201 @@
 import sqlite3
 import json
+import os
+import threading
+from typing import Dict, List
 
 from shared.log_config import get_logger
 logger = get_logger(f"ledger.{__name__}")
 
+CONFIG_PATH = '/app/config/config.json'
+
+# Applied once per pooled connection, right after it is opened
+CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode=WAL;",
+    "PRAGMA foreign_keys=ON;",
+    "PRAGMA synchronous=NORMAL;",
+    "PRAGMA temp_store=MEMORY;",
+    "PRAGMA cache_size=-16000;",      # 16 MiB page cache
+    "PRAGMA mmap_size=268435456;",    # 256 MiB memory-mapped I/O
+)
+
+# Prepared statements kept per connection; reused across requests with the connection
+CACHED_STATEMENTS = 256
+
+# Idle connections kept per thread; extra connections are closed on release
+MAX_IDLE_PER_THREAD = 4
+
+_config_lock = threading.Lock()
+_config_cache = {"mtime": None, "config": None}
+
+
+def _load_config() -> dict:
+    """
+    Return the parsed config.json, re-reading it only when the file's mtime changes.
+
+    The returned dict is shared between callers and must not be modified.
+    """
+    mtime = os.stat(CONFIG_PATH).st_mtime_ns
+    with _config_lock:
+        if _config_cache["mtime"] != mtime:
+            with open(CONFIG_PATH) as f:
+                _config_cache["config"] = json.load(f)
+            _config_cache["mtime"] = mtime
+        return _config_cache["config"]
+
+
+class _PooledConnection:
+    """
+    Proxy for a pooled sqlite3.Connection.
+
+    Behaves like the wrapped connection, except that close() hands it back to the
+    pool instead of closing it. Like sqlite3, the context manager commits or rolls
+    back but does not close; a proxy that is simply dropped is released when it is
+    garbage collected, which is what the `with _open_conn() as conn:` callers rely on.
+    """
+
+    __slots__ = ("_conn", "_pool", "_db", "_thread")
+
+    def __init__(self, conn: sqlite3.Connection, pool: "ConnectionPool", db: str):
+        object.__setattr__(self, "_conn", conn)
+        object.__setattr__(self, "_pool", pool)
+        object.__setattr__(self, "_db", db)
+        object.__setattr__(self, "_thread", threading.get_ident())
+
+    def __getattr__(self, name):
+        conn = object.__getattribute__(self, "_conn")
+        if conn is None:
+            raise sqlite3.ProgrammingError("Cannot operate on a closed database.")
+        return getattr(conn, name)
+
+    def __setattr__(self, name, value):
+        setattr(self._conn, name, value)
+
+    def __enter__(self):
+        self._conn.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return self._conn.__exit__(exc_type, exc, tb)
+
+    def close(self):
+        conn = object.__getattribute__(self, "_conn")
+        if conn is not None:
+            object.__setattr__(self, "_conn", None)
+            self._pool._release(self._db, conn, self._thread)
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+
+
+class ConnectionPool:
+    """
+    Per-thread pool of SQLite connections to the ledger database.
+
+    sqlite3 connections may only be used from the thread that opened them, so each
+    thread keeps its own stack of idle connections. A checkout never blocks: if the
+    thread has no idle connection a new one is opened. Connections keep their
+    statement cache and PRAGMAs for their whole life.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.reused = 0
+        self.opened = 0
+        self.closed = 0
+        self.in_use = 0
+
+    def _idle(self, db: str) -> List[sqlite3.Connection]:
+        idle: Dict[str, List[sqlite3.Connection]] = getattr(self._local, "idle", None)
+        if idle is None:
+            idle = self._local.idle = {}
+        return idle.setdefault(db, [])
+
+    def _connect(self, db: str) -> sqlite3.Connection:
+        conn = sqlite3.connect(db, timeout=5.0, cached_statements=CACHED_STATEMENTS)
+        for pragma in CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        with self._lock:
+            self.opened += 1
+        return conn
+
+    def checkout(self, db: str) -> _PooledConnection:
+        idle = self._idle(db)
+        conn = idle.pop() if idle else None
+        with self._lock:
+            self.checkouts += 1
+            self.in_use += 1
+            if conn is not None:
+                self.reused += 1
+        if conn is None:
+            try:
+                conn = self._connect(db)
+            except Exception:
+                with self._lock:
+                    self.in_use -= 1
+                raise
+        return _PooledConnection(conn, self, db)
+
+    def _release(self, db: str, conn: sqlite3.Connection, thread: int):
+        with self._lock:
+            self.in_use -= 1
+        if threading.get_ident() != thread:
+            # Only the owning thread may use (or reuse) a sqlite3 connection
+            self._close(conn)
+            return
+        try:
+            if conn.in_transaction:
+                # Same outcome as closing with uncommitted changes
+                conn.rollback()
+            conn.row_factory = None
+        except sqlite3.Error:
+            self._close(conn)
+            return
+
+        idle = self._idle(db)
+        if len(idle) >= MAX_IDLE_PER_THREAD:
+            self._close(conn)
+        else:
+            idle.append(conn)
+
+    def _close(self, conn: sqlite3.Connection):
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+        with self._lock:
+            self.closed += 1
+
+    def stats(self) -> Dict[str, int]:
+        """Return pool counters; `open` is connections opened and not yet closed."""
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "reused": self.reused,
+                "opened": self.opened,
+                "closed": self.closed,
+                "open": self.opened - self.closed,
+                "in_use": self.in_use,
+            }
+
+
+db_pool = ConnectionPool()
+
+
 def _open_conn() -> sqlite3.Connection:
     """
     Opens a SQLite database connection using the path specified in the configuration file.
-    Reads the database path from '/app/config/config.json' under the key ["db"]["ledger"],
-    establishes a connection with a 5-second timeout, sets the journal mode to WAL,
-    and enables foreign key constraints.
+    Reads the database path from '/app/config/config.json' under the key ["db"]["ledger"]
+    (cached until the file changes) and checks out a pooled connection for this thread.
+    Pooled connections are opened with a 5-second timeout and WAL, foreign keys and the
+    rest of CONNECTION_PRAGMAS applied once. Calling close() returns it to the pool.
     Returns:
         sqlite3.Connection: An open connection to the specified SQLite database.
     """
-    with open('/app/config/config.json') as f:
-        _config = json.load(f)
-    db = _config["db"]["ledger"]
-    conn = sqlite3.connect(db, timeout=5.0)
-    conn.execute("PRAGMA journal_mode=WAL;")
-    conn.execute("PRAGMA foreign_keys=ON;")
-    return conn
+    db = _load_config()["db"]["ledger"]
+    return db_pool.checkout(db)
@@ -3,20 +3,69 @@ This module initializes and configures the FastAPI application for the proxy ser
 """
 
 from app.routes.openai import router as openai_router
+from app.routes.queue import router as queue_router
+from app.prompts.centralized_loader import prompt_cache_stats
+from app.services.http_clients import provider_clients
+from app.services.response_cache import response_cache
 
+from shared.config_store import config_store
 from shared.docs_exporter import router as docs_router
 from shared.routes import router as routes_router, register_list_routes
 
 from shared.models.middleware import CacheRequestBodyMiddleware
+
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await provider_clients.start()
+    yield
+    await provider_clients.aclose()
+    response_cache.close()
+
+
+app = FastAPI(lifespan=lifespan)
 app.add_middleware(CacheRequestBodyMiddleware)
 
 app.include_router(routes_router, tags=["system"])
 app.include_router(docs_router, tags=["docs"])
 
 app.include_router(openai_router, tags=["openai"])
+app.include_router(queue_router, prefix="/queue", tags=["queue"])
+
+
+@app.get("/_http_clients", tags=["system"])
+def http_client_stats():
+    """Connection-reuse counters for the pooled provider HTTP clients."""
+    return {"status": "ok", "stats": provider_clients.stats()}
+
+
+@app.get("/_response_cache", tags=["system"])
+def response_cache_stats():
+    """Single-turn response cache hit/miss counters and tokens saved by hits."""
+    return {"status": "ok", "stats": response_cache.stats()}
+
+
+@app.delete("/_response_cache", tags=["system"])
+async def clear_response_cache():
+    """Drop every cached single-turn response."""
+    await response_cache.clear()
+    return {"status": "ok"}
+
+
+@app.get("/_prompt_cache", tags=["system"])
+def prompt_cache():
+    """Hit/load counters for cached prompt contexts and compiled templates."""
+    return {"status": "ok", "stats": prompt_cache_stats()}
+
+
+@app.get("/_config", tags=["system"])
+def config_stats():
+    """Config hot-reload counters: reloads, failures and when the current version was loaded."""
+    return {"status": "ok", "stats": config_store.stats()}
+
 
 register_list_routes(app)
 
@@ -6,11 +6,52 @@ prompt system (from the private config repo) or the legacy local prompt modules.
 """
 
 import importlib
+from types import ModuleType
+from typing import Dict, List, Tuple
+
 from app.prompts.centralized_loader import load_proxy_prompt
 
 from shared.log_config import get_logger
 logger = get_logger(f"proxy.{__name__}")
 
+# (provider, mode) -> legacy modules with a build_prompt(), in fallback order.
+# Resolved once per key: failed imports are slow and their outcome can't change
+# without a restart.
+_legacy_chains: Dict[Tuple[str, str], List[ModuleType]] = {}
+
+
+def _legacy_module_names(provider, mode) -> List[str]:
+    return list(dict.fromkeys([
+        f"app.prompts.{provider}-{mode}",
+        f"app.prompts.{provider}-default",
+        "app.prompts.openai-default",
+    ]))
+
+
+def _legacy_chain(provider, mode) -> List[ModuleType]:
+    """Importable legacy prompt modules for (provider, mode), memoized."""
+    key = (provider, mode)
+    chain = _legacy_chains.get(key)
+    if chain is not None:
+        return chain
+
+    chain = []
+    for module_name in _legacy_module_names(provider, mode):
+        try:
+            logger.debug(f"Trying to import module: {module_name}")
+            module = importlib.import_module(module_name)
+        except ImportError as e:
+            logger.debug(f"Module {module_name} not found: {e}")
+            continue
+        except Exception as e:
+            logger.error(f"Error importing prompt module {module_name}: {e}")
+            continue
+        if hasattr(module, "build_prompt"):
+            chain.append(module)
+    _legacy_chains[key] = chain
+    return chain
+
+
 def get_system_prompt(request, provider=None, mode=None):
     """
     Select and generate the appropriate system prompt based on provider and mode.
@@ -29,9 +70,8 @@ def get_system_prompt(request, provider=None, mode=None):
 
     # Try centralized prompt system first
     try:
-        logger.info(f"Attempting centralized prompt for {provider}-{mode}")
         result = load_proxy_prompt(provider, mode, request)
-        logger.info(f"Successfully loaded centralized prompt for {provider}-{mode}")
+        logger.debug(f"Loaded centralized prompt for {provider}-{mode}")
         return result
     except FileNotFoundError as e:
         logger.info(f"Centralized prompt not found: {e}")
@@ -42,30 +82,15 @@ def get_system_prompt(request, provider=None, mode=None):
 
     # Fall back to legacy module system
     logger.debug(f"Falling back to legacy modules for {provider}-{mode}")
-    
-    tried_modules = []
-    module_names = [
-        f"app.prompts.{provider}-{mode}",
-        f"app.prompts.{provider}-default",
-        "app.prompts.openai-default",
-    ]
 
-    for module_name in module_names:
+    for module in _legacy_chain(provider, mode):
         try:
-            tried_modules.append(module_name)
-            logger.debug(f"Trying to import module: {module_name}")
-            module = importlib.import_module(module_name)
-            if hasattr(module, "build_prompt"):
-                logger.debug(f"Successfully loaded module: {module_name}")
-                return module.build_prompt(request)
-        except ImportError as e:
-            logger.debug(f"Module {module_name} not found: {e}")
-            continue
+            return module.build_prompt(request)
         except Exception as e:
-            logger.error(f"Error building prompt with module {module_name}: {e}")
+            logger.error(f"Error building prompt with module {module.__name__}: {e}")
             continue
 
     # If we get here, no prompt source worked
-    error_msg = f"No prompt found for provider={provider}, mode={mode}. Tried centralized system and modules: {tried_modules}"
+    error_msg = f"No prompt found for provider={provider}, mode={mode}. Tried centralized system and modules: {_legacy_module_names(provider, mode)}"
     logger.error(error_msg)
     raise RuntimeError(error_msg)
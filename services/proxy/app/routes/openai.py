@@ -1,16 +1,25 @@
-from app.services.chat_completions import _chat_completions
+from app.services.chat_completions import _chat_completions, _chat_completions_stream
 from app.services.completions import _completions
-from shared.models.proxy import ProxyResponse, MultiTurnRequest, SingleTurnRequest
-from fastapi import APIRouter
+from app.services.queue import cancel_on_disconnect
+from shared.models.proxy import ProxyResponse, ProxyStreamChunk, MultiTurnRequest, SingleTurnRequest
+from shared.sse import prime_stream
+from shared.log_config import get_logger
+logger = get_logger(f"proxy.{__name__}")
+
+from typing import AsyncIterator
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import StreamingResponse
 
 router = APIRouter()
 @router.post("/api/singleturn", response_model=ProxyResponse)
-async def completions(message: SingleTurnRequest) -> ProxyResponse:
+async def completions(message: SingleTurnRequest, http_request: Request) -> ProxyResponse:
     """
     Handle single-turn language model completion requests.
 
     This endpoint accepts a SingleTurnRequest (mode-based resolution), resolves the appropriate provider,
     constructs the request, enqueues it, and returns the response as a ProxyResponse.
+    Requests default to 'batch' priority in the dispatch queue and are cancelled if
+    the caller disconnects.
 
     Args:
         message (SingleTurnRequest): The completion request.
@@ -23,17 +32,19 @@ async def completions(message: SingleTurnRequest) -> ProxyResponse:
     Raises:
         HTTPException: If there are connection or communication errors with the model service.
     """
-    return await _completions(message)
+    return await cancel_on_disconnect(http_request, _completions(message))
 
 
 @router.post("/api/multiturn", response_model=ProxyResponse)
-async def chat_completions(request: MultiTurnRequest) -> ProxyResponse:
+async def chat_completions(request: MultiTurnRequest, http_request: Request) -> ProxyResponse:
     """
     Handle multi-turn API requests by generating prompts for language models.
 
     Processes a multi-turn conversation request, validates model compatibility,
     builds an instruct-style prompt, and sends a request to the Ollama API.
-    Returns a ProxyResponse with the generated text and metadata.
+    Returns a ProxyResponse with the generated text and metadata. Requests default
+    to 'interactive' priority in the dispatch queue and are cancelled if the caller
+    disconnects.
 
     Args:
         request (MultiTurnRequest): Multi-turn conversation request details.
@@ -44,5 +55,36 @@ async def chat_completions(request: MultiTurnRequest) -> ProxyResponse:
     Raises:
         HTTPException: If the model is not instruct-compatible or API request fails.
     """
-    
-    return await _chat_completions(request)
\ No newline at end of file
+    return await cancel_on_disconnect(http_request, _chat_completions(request))
+
+
+@router.post("/api/multiturn/stream")
+async def chat_completions_stream(request: MultiTurnRequest) -> StreamingResponse:
+    """
+    Streaming variant of /api/multiturn.
+
+    Returns a text/event-stream of ProxyStreamChunk events (`data: <json>`): content
+    and tool-call deltas as the provider generates them, then a final 'done' event
+    with token counts. Errors raised before the first event are returned as a
+    normal HTTP error; later failures end the stream with an 'error' event.
+
+    Args:
+        request (MultiTurnRequest): Multi-turn conversation request details.
+
+    Returns:
+        StreamingResponse: Server-sent events of ProxyStreamChunk objects.
+    """
+    chunks = await prime_stream(_chat_completions_stream(request))
+    return StreamingResponse(_sse_events(chunks), media_type="text/event-stream")
+
+
+async def _sse_events(chunks: AsyncIterator[ProxyStreamChunk]) -> AsyncIterator[str]:
+    try:
+        async for chunk in chunks:
+            yield chunk.to_sse()
+    except HTTPException as e:
+        logger.error(f"Provider stream failed: {e.detail}")
+        yield ProxyStreamChunk(type="error", detail=str(e.detail)).to_sse()
+    except Exception as e:
+        logger.error(f"Provider stream failed: {e}")
+        yield ProxyStreamChunk(type="error", detail=f"Provider stream failed: {e}").to_sse()
@@ -1,10 +1,13 @@
-from fastapi import APIRouter, HTTPException
-from shared.log_config import get_logger
-logger = get_logger(f"proxy.{__name__}")
+from app.services.queue import dispatch_queue
+from fastapi import APIRouter
 
 router = APIRouter()
 
-@router.get("/{path:path}")
-async def queue_removed(path: str):
-    logger.warning("Queue endpoint accessed after removal: /queue/%s", path)
-    raise HTTPException(status_code=410, detail="Queue system removed. Use direct /api endpoints.")
\ No newline at end of file
+
+@router.get("/status")
+def queue_status():
+    """
+    Per-provider dispatch queue metrics: active and maximum concurrency, queue
+    depth by priority, admitted/rejected/cancelled counts and average wait times.
+    """
+    return {"status": "ok", "stats": dispatch_queue.stats()}
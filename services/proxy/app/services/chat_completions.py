@@ -1,4 +1,4 @@
-from shared.models.proxy import MultiTurnRequest, ProxyResponse, OllamaRequest, OpenAIRequest, AnthropicRequest
+from shared.models.proxy import MultiTurnRequest, ProxyResponse, ProxyStreamChunk, OllamaRequest, OpenAIRequest, AnthropicRequest
 from shared.models.prompt import BuildSystemPrompt
 
 from app.services.util import _build_multiturn_prompt, _resolve_model_provider_options
@@ -8,6 +8,7 @@ from shared.log_config import get_logger
 logger = get_logger(f"proxy.{__name__}")
 
 import json
+from typing import AsyncIterator, Tuple, Union
 
 from datetime import datetime
 from dateutil import tz
@@ -17,32 +18,26 @@ ts_with_offset = datetime.now(local_tz).isoformat(timespec="seconds")
 
 from fastapi import HTTPException, status
 
-from app.services.send_to_ollama import send_to_ollama
-from app.services.send_to_openai import send_to_openai
-from app.services.send_to_anthropic import send_to_anthropic
+from app.services.send_to_ollama import send_to_ollama, stream_to_ollama
+from app.services.send_to_openai import send_to_openai, stream_to_openai
+from app.services.send_to_anthropic import send_to_anthropic, stream_to_anthropic
 
-async def _chat_completions(request: MultiTurnRequest) -> ProxyResponse:
-    """ 
-    Handle multi-turn API requests by generating prompts for language models.
+from app.services.queue import dispatch_queue
 
-    Processes a multi-turn conversation request, validates model compatibility,
-    builds an instruct-style prompt, and directly dispatches to the provider API (no queue).
-    Returns a ProxyResponse with the generated text and metadata.
+ProviderRequest = Union[OllamaRequest, OpenAIRequest, AnthropicRequest]
 
-    Args:
-        request (ProxyMultiTurnRequest): Multi-turn conversation request details.
+
+def _build_provider_request(request: MultiTurnRequest) -> Tuple[str, str, ProviderRequest]:
+    """
+    Resolve the mode to a provider and model, render the system prompt, and build
+    the provider-specific request.
 
     Returns:
-        ProxyResponse: Generated response from the language model.
+        Tuple[str, str, ProviderRequest]: The provider, model and request payload.
 
     Raises:
-        HTTPException: If the model is not instruct-compatible or API request fails.
+        HTTPException: If the mode resolves to an unknown provider.
     """
-    logger.debug(f"/api/multiturn Request:\n{json.dumps(request.model_dump(), indent=4, ensure_ascii=False)}")
-
-    with open('/app/config/config.json') as f:
-        _config = json.load(f)
-
     # resolve provider/model/options from mode (request.model is interpreted as a mode)
     provider, model, options = _resolve_model_provider_options(request.model)
     logger.debug(f"Resolved provider/model/options: {provider}, {model}, {options}")
@@ -96,6 +91,31 @@ async def _chat_completions(request: MultiTurnRequest) -> ProxyResponse:
     else:
         raise HTTPException(status_code=400, detail=f"Unknown provider: {provider}")
 
+    return provider, model, payload
+
+
+async def _chat_completions(request: MultiTurnRequest) -> ProxyResponse:
+    """ 
+    Handle multi-turn API requests by generating prompts for language models.
+
+    Processes a multi-turn conversation request, validates model compatibility,
+    builds an instruct-style prompt, and dispatches to the provider API through the
+    priority dispatch queue.
+    Returns a ProxyResponse with the generated text and metadata.
+
+    Args:
+        request (ProxyMultiTurnRequest): Multi-turn conversation request details.
+
+    Returns:
+        ProxyResponse: Generated response from the language model.
+
+    Raises:
+        HTTPException: If the model is not instruct-compatible or API request fails.
+    """
+    logger.debug(f"/api/multiturn Request:\n{json.dumps(request.model_dump(), indent=4, ensure_ascii=False)}")
+
+    provider, model, payload = _build_provider_request(request)
+
     # Direct dispatch helper
     async def _dispatch(p):
         if isinstance(p, OllamaRequest):
@@ -106,9 +126,11 @@ async def _chat_completions(request: MultiTurnRequest) -> ProxyResponse:
             return await send_to_anthropic(p)
         raise HTTPException(status_code=500, detail="Unsupported payload type for dispatch")
 
-    logger.debug(f"Dispatching directly to provider={provider} model={model} (no queue)")
+    priority = request.priority or "interactive"
+    logger.debug(f"Dispatching to provider={provider} model={model} (priority={priority})")
     try:
-        result = await _dispatch(payload)
+        async with dispatch_queue.slot(provider, priority):
+            result = await _dispatch(payload)
     except HTTPException:
         raise
     except Exception as e:
@@ -124,4 +146,42 @@ async def _chat_completions(request: MultiTurnRequest) -> ProxyResponse:
         timestamp=datetime.now().isoformat()
     )
 
-    return proxy_response
\ No newline at end of file
+    return proxy_response
+
+
+async def _chat_completions_stream(request: MultiTurnRequest) -> AsyncIterator[ProxyStreamChunk]:
+    """
+    Streaming variant of `_chat_completions`.
+
+    Builds the same provider request and yields ProxyStreamChunks as the provider
+    generates them: 'delta' chunks with content or tool-call fragments, then one
+    'done' chunk with the finish reason and token counts.
+
+    Args:
+        request (MultiTurnRequest): Multi-turn conversation request details.
+
+    Yields:
+        ProxyStreamChunk: Normalized stream events.
+
+    Raises:
+        HTTPException: If the provider is unknown or the provider request fails.
+    """
+    logger.debug(f"/api/multiturn/stream Request:\n{json.dumps(request.model_dump(), indent=4, ensure_ascii=False)}")
+
+    provider, model, payload = _build_provider_request(request)
+
+    if isinstance(payload, OllamaRequest):
+        chunks = stream_to_ollama(payload)
+    elif isinstance(payload, OpenAIRequest):
+        chunks = stream_to_openai(payload)
+    elif isinstance(payload, AnthropicRequest):
+        chunks = stream_to_anthropic(payload)
+    else:
+        raise HTTPException(status_code=500, detail="Unsupported payload type for dispatch")
+
+    priority = request.priority or "interactive"
+    logger.debug(f"Streaming from provider={provider} model={model} (priority={priority})")
+    # The slot is held until the stream ends or the caller disconnects
+    async with dispatch_queue.slot(provider, priority):
+        async for chunk in chunks:
+            yield chunk
@@ -8,7 +8,6 @@ logger = get_logger(f"proxy.{__name__}")
 
 from app.services.util import _resolve_model_provider_options
 
-import json
 from datetime import datetime
 
 from fastapi import HTTPException
@@ -16,12 +15,11 @@ from fastapi import HTTPException
 from app.services.send_to_ollama import send_to_ollama
 from app.services.send_to_openai import send_to_openai
 from app.services.send_to_anthropic import send_to_anthropic
+from app.services.queue import dispatch_queue
+from app.services.response_cache import response_cache
 
 
 async def _completions(message: SingleTurnRequest) -> ProxyResponse:
-    with open('/app/config/config.json') as f:
-        _config = json.load(f)
-
     logger.debug(f"/api/singleturn Request (mode-based):\n{message.model_dump_json(indent=4)}")
 
     provider, actual_model, options = _resolve_model_provider_options(message.model)
@@ -58,22 +56,27 @@ async def _completions(message: SingleTurnRequest) -> ProxyResponse:
             return await send_to_anthropic(p)
         raise HTTPException(status_code=500, detail="Unsupported payload type for dispatch")
 
-    logger.debug(f"Dispatching directly to provider={provider} model={actual_model} (no queue)")
-    try:
-        result = await _dispatch(payload)
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Error during provider dispatch: {e}")
-        raise HTTPException(status_code=500, detail=f"Provider dispatch failed: {e}")
+    priority = message.priority or "batch"
+
+    async def _run() -> ProxyResponse:
+        logger.debug(f"Dispatching to provider={provider} model={actual_model} (priority={priority})")
+        try:
+            async with dispatch_queue.slot(provider, priority):
+                result = await _dispatch(payload)
+        except HTTPException:
+            raise
+        except Exception as e:
+            logger.error(f"Error during provider dispatch: {e}")
+            raise HTTPException(status_code=500, detail=f"Provider dispatch failed: {e}")
 
-    proxy_response = ProxyResponse(
-        response=getattr(result, 'response', None),
-        eval_count=getattr(result, 'eval_count', None),
-        prompt_eval_count=getattr(result, 'prompt_eval_count', None),
-        tool_calls=getattr(result, 'tool_calls', None),
-        function_call=getattr(result, 'function_call', None),
-        timestamp=datetime.now().isoformat()
-    )
+        return ProxyResponse(
+            response=getattr(result, 'response', None),
+            eval_count=getattr(result, 'eval_count', None),
+            prompt_eval_count=getattr(result, 'prompt_eval_count', None),
+            tool_calls=getattr(result, 'tool_calls', None),
+            function_call=getattr(result, 'function_call', None),
+            timestamp=datetime.now().isoformat()
+        )
 
-    return proxy_response
\ No newline at end of file
+    # Served from the response cache when the mode opts in and the call is deterministic
+    return await response_cache.get_or_dispatch(message.model, provider, actual_model, options, message.prompt, _run)
\ No newline at end of file
@@ -0,0 +1,151 @@
+"""
+Long-lived pooled HTTP clients for the LLM providers.
+
+Each provider (openai, anthropic, ollama) gets one httpx.AsyncClient for the life of
+the proxy process, created in the app lifespan, so requests reuse keep-alive (and,
+for the HTTPS APIs, HTTP/2) connections instead of paying TCP and TLS setup on
+every call.
+
+Settings come from `proxy.http` in config.json; every key is optional:
+
+    "proxy": {
+        "http": {
+            "http2": true,
+            "max_connections": 20,
+            "max_keepalive_connections": 10,
+            "keepalive_expiry": 60,
+            "providers": {
+                "ollama": {"timeout": 300, "max_connections": 4}
+            }
+        }
+    }
+
+Provider entries override the top-level values; `timeout` defaults to the global
+`timeout`. HTTP/2 needs the `h2` package (httpx[http2]) and is never used for
+Ollama, which speaks plain HTTP/1.1.
+
+Connection reuse is measured with httpcore's trace extension: every new TCP
+connection and TLS handshake is counted per provider next to the request count.
+"""
+
+from shared.config_store import config_store
+
+from shared.log_config import get_logger
+logger = get_logger(f"proxy.{__name__}")
+
+import httpx
+from typing import Dict, Optional
+
+PROVIDERS = ("openai", "anthropic", "ollama")
+
+# Providers reached over plain HTTP, where HTTP/2 is not negotiated
+PLAIN_HTTP_PROVIDERS = ("ollama",)
+
+DEFAULT_MAX_CONNECTIONS = 20
+DEFAULT_MAX_KEEPALIVE_CONNECTIONS = 10
+DEFAULT_KEEPALIVE_EXPIRY = 60.0
+
+
+def _h2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class ProviderClientRegistry:
+    """One pooled httpx.AsyncClient per provider, plus connection-reuse counters."""
+
+    def __init__(self):
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+        self._metrics: Dict[str, Dict[str, int]] = {}
+
+    def _settings(self, provider: str) -> dict:
+        _config = config_store.config
+        http_config = _config.get("proxy", {}).get("http", {})
+        settings = {
+            "timeout": _config.get("timeout"),
+            "http2": True,
+            "max_connections": DEFAULT_MAX_CONNECTIONS,
+            "max_keepalive_connections": DEFAULT_MAX_KEEPALIVE_CONNECTIONS,
+            "keepalive_expiry": DEFAULT_KEEPALIVE_EXPIRY,
+        }
+        settings.update({k: v for k, v in http_config.items() if k != "providers"})
+        settings.update(http_config.get("providers", {}).get(provider, {}))
+        return settings
+
+    def _create(self, provider: str) -> httpx.AsyncClient:
+        settings = self._settings(provider)
+        http2 = bool(settings["http2"]) and provider not in PLAIN_HTTP_PROVIDERS
+        if http2 and not _h2_available():
+            logger.warning("HTTP/2 requested but the h2 package is not installed; using HTTP/1.1 keep-alive")
+            http2 = False
+
+        metrics = self._metrics.setdefault(provider, {
+            "requests": 0,
+            "connections_opened": 0,
+            "tls_handshakes": 0,
+        })
+
+        async def _trace(event: str, info: dict):
+            if event == "connection.connect_tcp.complete":
+                metrics["connections_opened"] += 1
+            elif event == "connection.start_tls.complete":
+                metrics["tls_handshakes"] += 1
+
+        async def _on_request(request: httpx.Request):
+            metrics["requests"] += 1
+            request.extensions["trace"] = _trace
+
+        logger.info(f"Creating pooled HTTP client for {provider} (http2={http2}, max_connections={settings['max_connections']})")
+        return httpx.AsyncClient(
+            http2=http2,
+            timeout=settings["timeout"],
+            limits=httpx.Limits(
+                max_connections=settings["max_connections"],
+                max_keepalive_connections=settings["max_keepalive_connections"],
+                keepalive_expiry=settings["keepalive_expiry"],
+            ),
+            event_hooks={"request": [_on_request]},
+        )
+
+    async def start(self):
+        """Create a client for every provider. Called from the app lifespan."""
+        for provider in PROVIDERS:
+            if provider not in self._clients:
+                self._clients[provider] = self._create(provider)
+
+    def get(self, provider: str) -> httpx.AsyncClient:
+        """
+        Return the shared client for a provider, creating it on first use if the
+        lifespan has not (e.g. when called outside the app).
+        """
+        client = self._clients.get(provider)
+        if client is None or client.is_closed:
+            client = self._clients[provider] = self._create(provider)
+        return client
+
+    async def aclose(self):
+        """Close every client and its pooled connections."""
+        clients, self._clients = self._clients, {}
+        for client in clients.values():
+            await client.aclose()
+
+    def stats(self, provider: Optional[str] = None) -> Dict[str, Dict[str, int]]:
+        """
+        Per-provider counters. `reused` is the number of requests that did not need
+        a new connection.
+        """
+        result = {}
+        for name, metrics in self._metrics.items():
+            if provider and name != provider:
+                continue
+            result[name] = {
+                **metrics,
+                "reused": max(0, metrics["requests"] - metrics["connections_opened"]),
+            }
+        return result
+
+
+provider_clients = ProviderClientRegistry()
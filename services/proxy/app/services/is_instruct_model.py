@@ -1,5 +1,6 @@
 import httpx
-import json
+
+from shared.config_store import config_store
 
 from shared.log_config import get_logger
 logger = get_logger(f"proxy.{__name__}")
@@ -18,8 +19,7 @@ async def is_instruct_model(model_name: str) -> bool:
     Returns:
         bool: True if the instruct format is detected, False otherwise.
     """
-    with open('/app/config/config.json') as f:
-        _config = json.load(f)
+    _config = config_store.config
     TIMEOUT = _config["timeout"]
     _ollama = _config["ollama"]
 
@@ -1,4 +1,263 @@
+"""
+Priority-aware dispatch queue and per-provider concurrency limiter.
+
+Every provider call made by the proxy holds a slot for its provider while it runs.
+When all of a provider's slots are busy, callers wait in a priority queue:
+
+    interactive  multi-turn chat (the default for /api/multiturn)
+    router       cheap calls on the interactive path: tool routing, keyword
+                 extraction, smart home requests
+    batch        summaries, memory scans, email processing (the default for
+                 /api/singleturn)
+
+A freed slot always goes to the oldest waiter of the best priority, so background
+jobs on a local Ollama never delay a chat turn by more than the calls already
+running. Admission control answers 503 once a provider's queue is full: a new
+request that outranks the worst waiter takes its place and that waiter is
+rejected instead. Callers that disconnect are removed from the queue, or have
+their running provider request cancelled.
+
+Limits come from `proxy.queue` in config.json; every key is optional:
+
+    "proxy": {
+        "queue": {
+            "max_concurrency": 8,
+            "max_queue_depth": 64,
+            "providers": {
+                "ollama": {"max_concurrency": 1, "max_queue_depth": 32}
+            }
+        }
+    }
+
+Provider entries override the top-level values. A `max_concurrency` of 0 or less
+disables the limit for that provider.
+"""
+
+from shared.config_store import config_store
+
 from shared.log_config import get_logger
 logger = get_logger(f"proxy.{__name__}")
 
-logger.info("queue.py loaded: task queue system has been removed.")
\ No newline at end of file
+import asyncio
+import heapq
+import itertools
+import time
+from contextlib import asynccontextmanager
+from typing import Awaitable, Dict, List, Optional, TypeVar
+
+from fastapi import HTTPException, Request, status
+
+T = TypeVar("T")
+
+# Lower rank is served first
+PRIORITIES = {"interactive": 0, "router": 1, "batch": 2}
+
+DEFAULT_MAX_CONCURRENCY = 8
+DEFAULT_MAX_QUEUE_DEPTH = 64
+
+# Built-in per-provider defaults; a local Ollama serves one generation at a time
+PROVIDER_DEFAULTS = {
+    "ollama": {"max_concurrency": 1},
+}
+
+# How often a waiting or running request checks whether its caller went away
+DISCONNECT_POLL_S = 0.5
+
+# Suggested client back-off when a queue is full
+RETRY_AFTER_S = 5
+
+# HTTP status reported (to logs only) for requests whose caller disconnected
+CLIENT_CLOSED_REQUEST = 499
+
+
+def _queue_full(provider: str) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail=f"{provider} queue is full; retry later",
+        headers={"Retry-After": str(RETRY_AFTER_S)},
+    )
+
+
+class _ProviderQueue:
+    """Slots and waiting callers for one provider."""
+
+    def __init__(self, provider: str, max_concurrency: int, max_queue_depth: int):
+        self.provider = provider
+        self.max_concurrency = max_concurrency
+        self.max_queue_depth = max_queue_depth
+        self.active = 0
+        # (rank, sequence, future, priority); cancelled waiters are skipped lazily
+        self._waiters: List[tuple] = []
+        self.queued = {name: 0 for name in PRIORITIES}
+        self.admitted = {name: 0 for name in PRIORITIES}
+        self.rejected = {name: 0 for name in PRIORITIES}
+        self.cancelled = 0
+        self.completed = 0
+        self.max_depth_seen = 0
+        self.wait_s = {name: 0.0 for name in PRIORITIES}
+
+    @property
+    def depth(self) -> int:
+        return sum(self.queued.values())
+
+    def _has_free_slot(self) -> bool:
+        return self.max_concurrency <= 0 or self.active < self.max_concurrency
+
+    def shed(self, rank: int) -> bool:
+        """
+        Make room for a request of `rank` by rejecting the newest waiter of the
+        worst priority, if that priority is strictly lower. Returns True on success.
+        """
+        live = [entry for entry in self._waiters if not entry[2].done()]
+        if not live:
+            return False
+        victim = max(live, key=lambda entry: (entry[0], entry[1]))
+        victim_rank, _, future, priority = victim
+        if victim_rank <= rank:
+            return False
+        self.queued[priority] -= 1
+        self.rejected[priority] += 1
+        future.set_exception(_queue_full(self.provider))
+        logger.warning(f"Dispatch queue for {self.provider} is full; shed a queued {priority} request")
+        return True
+
+    def release(self):
+        """Free a slot and hand it to the best live waiter, if any."""
+        self.active -= 1
+        self.completed += 1
+        while self._waiters and self._has_free_slot():
+            _, _, future, priority = heapq.heappop(self._waiters)
+            if future.done():
+                continue
+            self.queued[priority] -= 1
+            self.active += 1
+            future.set_result(None)
+
+
+class DispatchQueue:
+    """Per-provider concurrency limits with a shared priority order."""
+
+    def __init__(self):
+        self._queues: Dict[str, _ProviderQueue] = {}
+        self._sequence = itertools.count()
+
+    def _settings(self, provider: str) -> dict:
+        _config = config_store.config
+        queue_config = _config.get("proxy", {}).get("queue", {})
+        settings = {
+            "max_concurrency": DEFAULT_MAX_CONCURRENCY,
+            "max_queue_depth": DEFAULT_MAX_QUEUE_DEPTH,
+            **PROVIDER_DEFAULTS.get(provider, {}),
+        }
+        settings.update({k: v for k, v in queue_config.items() if k != "providers"})
+        settings.update(queue_config.get("providers", {}).get(provider, {}))
+        return settings
+
+    def _queue(self, provider: str) -> _ProviderQueue:
+        queue = self._queues.get(provider)
+        if queue is None:
+            settings = self._settings(provider)
+            queue = self._queues[provider] = _ProviderQueue(
+                provider,
+                max_concurrency=int(settings["max_concurrency"]),
+                max_queue_depth=int(settings["max_queue_depth"]),
+            )
+            logger.info(f"Dispatch queue for {provider}: max_concurrency={queue.max_concurrency}, max_queue_depth={queue.max_queue_depth}")
+        return queue
+
+    @asynccontextmanager
+    async def slot(self, provider: str, priority: Optional[str] = None):
+        """
+        Hold one of the provider's concurrency slots for the duration of the block.
+
+        Args:
+            provider: The provider being called (e.g. 'ollama').
+            priority: 'interactive', 'router' or 'batch'; unknown values count as batch.
+
+        Raises:
+            HTTPException: 503 if the provider's queue is full.
+        """
+        if priority not in PRIORITIES:
+            priority = "batch"
+        queue = self._queue(provider)
+
+        if queue._has_free_slot() and not queue.depth:
+            queue.active += 1
+        else:
+            if queue.depth >= queue.max_queue_depth and not queue.shed(PRIORITIES[priority]):
+                queue.rejected[priority] += 1
+                logger.warning(f"Dispatch queue for {provider} is full ({queue.depth} waiting); rejecting {priority} request")
+                raise _queue_full(provider)
+            future = asyncio.get_running_loop().create_future()
+            heapq.heappush(queue._waiters, (PRIORITIES[priority], next(self._sequence), future, priority))
+            queue.queued[priority] += 1
+            queue.max_depth_seen = max(queue.max_depth_seen, queue.depth)
+            started = time.monotonic()
+            try:
+                await future
+            except asyncio.CancelledError:
+                if future.done() and not future.cancelled():
+                    # The slot was handed over just as we were cancelled
+                    queue.release()
+                else:
+                    future.cancel()
+                    queue.queued[priority] -= 1
+                queue.cancelled += 1
+                raise
+            queue.wait_s[priority] += time.monotonic() - started
+
+        queue.admitted[priority] += 1
+        try:
+            yield
+        finally:
+            queue.release()
+
+    def stats(self) -> Dict[str, dict]:
+        """Per-provider slot usage, queue depth by priority and admission counters."""
+        result = {}
+        for name, queue in self._queues.items():
+            result[name] = {
+                "active": queue.active,
+                "max_concurrency": queue.max_concurrency,
+                "depth": queue.depth,
+                "max_queue_depth": queue.max_queue_depth,
+                "max_depth_seen": queue.max_depth_seen,
+                "queued": dict(queue.queued),
+                "admitted": dict(queue.admitted),
+                "rejected": dict(queue.rejected),
+                "avg_wait_ms": {
+                    priority: round(1000 * queue.wait_s[priority] / queue.admitted[priority], 2) if queue.admitted[priority] else 0.0
+                    for priority in PRIORITIES
+                },
+                "cancelled": queue.cancelled,
+                "completed": queue.completed,
+            }
+        return result
+
+
+dispatch_queue = DispatchQueue()
+
+
+async def cancel_on_disconnect(request: Request, work: Awaitable[T]) -> T:
+    """
+    Await `work`, cancelling it if the HTTP caller disconnects first.
+
+    Cancellation removes a queued request from its provider queue, or aborts the
+    provider call (and frees its slot) if it is already running.
+
+    Raises:
+        HTTPException: 499 if the caller disconnected.
+    """
+    task = asyncio.ensure_future(work)
+    try:
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=DISCONNECT_POLL_S)
+            if done:
+                return task.result()
+            if await request.is_disconnected():
+                logger.info(f"Caller of {request.url.path} disconnected; cancelling its request")
+                task.cancel()
+                raise HTTPException(status_code=CLIENT_CLOSED_REQUEST, detail="Client closed request")
+    finally:
+        if not task.done():
+            task.cancel()
@@ -0,0 +1,332 @@
+"""
+Content-addressed response cache for single-turn proxy calls.
+
+Many `/api/singleturn` callers (the tool router, smart home device matching,
+keyword extraction, email summaries) send byte-identical prompts. For modes that
+opt in, responses are cached under a SHA-256 of the resolved provider, model,
+options and prompt, so a config change to the mode naturally misses.
+
+Caching is enabled per mode in `llm.mode`:
+
+    "router": {
+        "provider": "openai",
+        "model": "gpt-4.1-nano",
+        "options": {"temperature": 0},
+        "cache": {"enabled": true, "ttl": 3600, "force": false}
+    }
+
+Only deterministic calls are cached: the mode's `temperature` option must be 0
+(a missing temperature means the provider's non-zero default). `force: true`
+caches regardless. Responses with tool calls or empty text are never stored.
+
+Entries live in an in-memory LRU tier and, when `proxy.cache.sqlite_path` is
+set, in a SQLite tier that survives restarts:
+
+    "proxy": {
+        "cache": {
+            "max_entries": 1024,
+            "sqlite_path": "/app/data/proxy_cache.db",
+            "sqlite_max_entries": 20000
+        }
+    }
+
+Concurrent misses for the same key share one provider call.
+"""
+
+from shared.models.proxy import ProxyResponse
+
+from shared.config_store import config_store
+
+from shared.log_config import get_logger
+logger = get_logger(f"proxy.{__name__}")
+
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+from app.services.util import _get_mode_config
+
+DEFAULT_TTL_S = 3600
+DEFAULT_MAX_ENTRIES = 1024
+DEFAULT_SQLITE_MAX_ENTRIES = 20000
+
+# Expired and surplus SQLite rows are pruned once per this many stores
+PRUNE_INTERVAL = 100
+
+
+def _cache_key(provider: str, model: str, options: dict, prompt: str) -> str:
+    material = json.dumps(
+        {"provider": provider, "model": model, "options": options or {}, "prompt": prompt},
+        sort_keys=True,
+        ensure_ascii=False,
+        default=str,
+    )
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+def _cache_ttl(mode: str, options: dict) -> Optional[float]:
+    """Return the TTL for a cacheable call in this mode, or None to bypass the cache."""
+    cache_config = _get_mode_config(mode).get("cache") or {}
+    if not cache_config.get("enabled"):
+        return None
+    if not cache_config.get("force") and (options or {}).get("temperature") != 0:
+        return None
+    return float(cache_config.get("ttl", DEFAULT_TTL_S))
+
+
+class _SQLiteTier:
+    """Persistent cache tier. Calls are made from worker threads."""
+
+    def __init__(self, path: str, max_entries: int):
+        self.path = path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=5.0, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL;")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS response_cache (
+                key TEXT PRIMARY KEY,
+                response TEXT NOT NULL,
+                expires_at REAL NOT NULL,
+                last_hit REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_response_cache_last_hit ON response_cache (last_hit)")
+        self._conn.commit()
+        self._stores = 0
+
+    def get(self, key: str, now: float) -> Optional[Tuple[float, dict]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, expires_at FROM response_cache WHERE key = ? AND expires_at > ?",
+                (key, now),
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute("UPDATE response_cache SET last_hit = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+        return row[1], json.loads(row[0])
+
+    def put(self, key: str, response: dict, expires_at: float, now: float):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO response_cache (key, response, expires_at, last_hit) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(response), expires_at, now),
+            )
+            self._stores += 1
+            if self._stores % PRUNE_INTERVAL == 0:
+                self._conn.execute("DELETE FROM response_cache WHERE expires_at <= ?", (now,))
+                self._conn.execute("""
+                    DELETE FROM response_cache WHERE key IN (
+                        SELECT key FROM response_cache ORDER BY last_hit DESC LIMIT -1 OFFSET ?
+                    )
+                """, (self.max_entries,))
+            self._conn.commit()
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM response_cache")
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class ResponseCache:
+    """Two-tier (memory LRU + optional SQLite) cache of single-turn ProxyResponses."""
+
+    def __init__(self):
+        # key -> (expires_at, ProxyResponse fields)
+        self._entries: "OrderedDict[str, Tuple[float, dict]]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._persistent: Optional[_SQLiteTier] = None
+        self._configured = False
+        self.max_entries = DEFAULT_MAX_ENTRIES
+        self.memory_hits = 0
+        self.persistent_hits = 0
+        self.coalesced = 0
+        self.misses = 0
+        self.bypassed = 0
+        self.stores = 0
+        self.evictions = 0
+        self.expired = 0
+        self.saved_prompt_tokens = 0
+        self.saved_completion_tokens = 0
+
+    def _configure(self):
+        if self._configured:
+            return
+        self._configured = True
+        _config = config_store.config
+        cache_config = _config.get("proxy", {}).get("cache", {})
+        self.max_entries = int(cache_config.get("max_entries", DEFAULT_MAX_ENTRIES))
+        sqlite_path = cache_config.get("sqlite_path")
+        if sqlite_path:
+            try:
+                self._persistent = _SQLiteTier(
+                    sqlite_path,
+                    int(cache_config.get("sqlite_max_entries", DEFAULT_SQLITE_MAX_ENTRIES)),
+                )
+            except sqlite3.Error as e:
+                logger.error(f"Response cache SQLite tier disabled; could not open {sqlite_path}: {e}")
+
+    def _remember(self, key: str, expires_at: float, response: dict):
+        self._entries[key] = (expires_at, response)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def _hit(self, response: dict) -> ProxyResponse:
+        self.saved_prompt_tokens += response.get("prompt_eval_count") or 0
+        self.saved_completion_tokens += response.get("eval_count") or 0
+        return ProxyResponse(**{**response, "timestamp": datetime.now().isoformat()})
+
+    async def _lookup(self, key: str, now: float) -> Optional[ProxyResponse]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, response = entry
+            if expires_at > now:
+                self._entries.move_to_end(key)
+                self.memory_hits += 1
+                return self._hit(response)
+            del self._entries[key]
+            self.expired += 1
+
+        if self._persistent is not None:
+            try:
+                stored = await asyncio.to_thread(self._persistent.get, key, now)
+            except sqlite3.Error as e:
+                logger.error(f"Response cache SQLite lookup failed: {e}")
+                stored = None
+            if stored is not None:
+                expires_at, response = stored
+                self._remember(key, expires_at, response)
+                self.persistent_hits += 1
+                return self._hit(response)
+        return None
+
+    async def _store(self, key: str, ttl: float, response: ProxyResponse):
+        if not response.response or response.tool_calls or response.function_call:
+            return
+        now = time.time()
+        fields = response.model_dump(exclude={"timestamp"})
+        self._remember(key, now + ttl, fields)
+        self.stores += 1
+        if self._persistent is not None:
+            try:
+                await asyncio.to_thread(self._persistent.put, key, fields, now + ttl, now)
+            except sqlite3.Error as e:
+                logger.error(f"Response cache SQLite store failed: {e}")
+
+    async def get_or_dispatch(
+        self,
+        mode: str,
+        provider: str,
+        model: str,
+        options: dict,
+        prompt: str,
+        dispatch: Callable[[], Awaitable[ProxyResponse]],
+    ) -> ProxyResponse:
+        """
+        Return a cached response for this call if the mode allows it, otherwise run
+        `dispatch()` and cache its result.
+
+        Args:
+            mode: The requested mode name, used to look up its cache settings.
+            provider, model, options: The mode's resolved provider settings (part of the key).
+            prompt: The caller's prompt (part of the key).
+            dispatch: Coroutine function performing the provider call.
+        """
+        self._configure()
+        ttl = _cache_ttl(mode, options)
+        if ttl is None:
+            self.bypassed += 1
+            return await dispatch()
+
+        key = _cache_key(provider, model, options, prompt)
+        cached = await self._lookup(key, time.time())
+        if cached is not None:
+            logger.debug(f"Response cache hit for mode={mode} key={key[:12]}")
+            return cached
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            try:
+                response = await asyncio.shield(inflight)
+            except asyncio.CancelledError:
+                if not inflight.cancelled():
+                    raise
+                # The caller making this request went away; make it ourselves
+            else:
+                self.coalesced += 1
+                return self._hit(response.model_dump(exclude={"timestamp"}))
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            response = await dispatch()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Waiters re-raise it; mark it retrieved in case there are none
+            future.exception()
+            raise
+        else:
+            future.set_result(response)
+            await self._store(key, ttl, response)
+            return response
+        finally:
+            self._inflight.pop(key, None)
+
+    async def clear(self):
+        """Drop every cached response from both tiers."""
+        self._entries.clear()
+        if self._persistent is not None:
+            await asyncio.to_thread(self._persistent.clear)
+
+    def close(self):
+        if self._persistent is not None:
+            self._persistent.close()
+            self._persistent = None
+        self._configured = False
+
+    def stats(self) -> Dict[str, object]:
+        """Hit/miss counters and estimated tokens saved by cache hits."""
+        hits = self.memory_hits + self.persistent_hits + self.coalesced
+        lookups = hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "persistent": self._persistent.path if self._persistent is not None else None,
+            "hits": hits,
+            "memory_hits": self.memory_hits,
+            "persistent_hits": self.persistent_hits,
+            "coalesced": self.coalesced,
+            "misses": self.misses,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+            "bypassed": self.bypassed,
+            "stores": self.stores,
+            "evictions": self.evictions,
+            "expired": self.expired,
+            "saved_prompt_tokens": self.saved_prompt_tokens,
+            "saved_completion_tokens": self.saved_completion_tokens,
+            "saved_tokens": self.saved_prompt_tokens + self.saved_completion_tokens,
+        }
+
+
+response_cache = ResponseCache()
@@ -1,8 +1,8 @@
 from shared.log_config import get_logger
 logger = get_logger(f"proxy.{__name__}")
 
-import httpx
-import json
+from app.services.http_clients import provider_clients
+from shared.config_store import config_store
 
 
 async def _send_prompt_to_llm(prompt: str) -> dict:
@@ -24,30 +24,28 @@ async def _send_prompt_to_llm(prompt: str) -> dict:
     """
     logger.debug(f"Sending prompt to LLM: {prompt}")
 
-    with open('/app/config/config.json') as f:
-        _config = json.load(f)
-    TIMEOUT = _config["timeout"]
+    _config = config_store.config
     _ollama = _config["ollama"]
 
     try:
-        async with httpx.AsyncClient(timeout=TIMEOUT) as client:
-            response = await client.post(
-                f"http://{_ollama['server_url']}/api/generate",
-                json={
-                    "model": _ollama['model_name'],
-                    "prompt": prompt,
-                    "stream": False,
-                    "stop": ["<|im_end|>", "[USER]"]
-                }
-            )
-
-            response.raise_for_status()
-            data = response.json()
-            return {
-                "reply": data.get("response", ""),
+        client = provider_clients.get("ollama")
+        response = await client.post(
+            f"http://{_ollama['server_url']}/api/generate",
+            json={
                 "model": _ollama['model_name'],
-                "raw": data
+                "prompt": prompt,
+                "stream": False,
+                "stop": ["<|im_end|>", "[USER]"]
             }
+        )
+
+        response.raise_for_status()
+        data = response.json()
+        return {
+            "reply": data.get("response", ""),
+            "model": _ollama['model_name'],
+            "raw": data
+        }
 
     except Exception as e:
         logger.error(f"🔥 Failed to get response from Ollama: {e}")
@@ -1,24 +1,23 @@
-from shared.models.proxy import AnthropicRequest, AnthropicResponse
+from shared.models.proxy import AnthropicRequest, AnthropicResponse, ProxyStreamChunk
+
+from shared.config_store import config_store
 
 from shared.log_config import get_logger
 logger = get_logger(f"proxy.{__name__}")
 
 import httpx
 import json
+from typing import AsyncIterator, Tuple
 
-from fastapi import HTTPException, status
-
+from app.services.http_clients import provider_clients
+from app.services.streaming import iter_openai_chunks, raise_for_stream_status
 
-async def send_to_anthropic(request: AnthropicRequest) -> AnthropicResponse:
-    """
-    Send a payload to the Anthropic API for generation using their OpenAI-compatible endpoint.
-    """
-    logger.debug(f"🎭 Request to Anthropic API:\n{json.dumps(request.model_dump(), indent=4, ensure_ascii=False)}")
+from fastapi import HTTPException, status
 
-    with open('/app/config/config.json') as f:
-        _config = json.load(f)
 
-    TIMEOUT = _config["timeout"]
+def _prepare_request(request: AnthropicRequest) -> Tuple[dict, dict]:
+    """Build the JSON payload and headers for a chat completions call."""
+    _config = config_store.config
 
     # Normalize tool_calls to always be a list (OpenAI-compatible format expects an array)
     def _normalize_tool_calls(messages):
@@ -48,32 +47,43 @@ async def send_to_anthropic(request: AnthropicRequest) -> AnthropicResponse:
         "Content-Type": "application/json"
     }
 
-    async with httpx.AsyncClient(timeout=TIMEOUT) as client:
-        try:
-            response = await client.post(
-                "https://api.anthropic.com/v1/chat/completions",
-                headers=headers,
-                json=payload
-            )
-            response.raise_for_status()
-        except httpx.HTTPStatusError as http_err:
-            logger.error(f"HTTP error from Anthropic API: {http_err.response.status_code} - {http_err.response.text}")
-            raise HTTPException(
-                status_code=http_err.response.status_code,
-                detail=f"Error from Anthropic: {http_err.response.text}"
-            )
-        except httpx.RequestError as req_err:
-            logger.error(f"Request error connecting to Anthropic API: {req_err}")
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"Connection error: {req_err}"
-            )
-        except Exception as e:
-            logger.error(f"Unexpected error: {e}")
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"Unexpected error: {e}"
-            )
+    return payload, headers
+
+
+async def send_to_anthropic(request: AnthropicRequest) -> AnthropicResponse:
+    """
+    Send a payload to the Anthropic API for generation using their OpenAI-compatible endpoint.
+    """
+    logger.debug(f"🎭 Request to Anthropic API:\n{json.dumps(request.model_dump(), indent=4, ensure_ascii=False)}")
+
+    payload, headers = _prepare_request(request)
+
+    client = provider_clients.get("anthropic")
+    try:
+        response = await client.post(
+            "https://api.anthropic.com/v1/chat/completions",
+            headers=headers,
+            json=payload
+        )
+        response.raise_for_status()
+    except httpx.HTTPStatusError as http_err:
+        logger.error(f"HTTP error from Anthropic API: {http_err.response.status_code} - {http_err.response.text}")
+        raise HTTPException(
+            status_code=http_err.response.status_code,
+            detail=f"Error from Anthropic: {http_err.response.text}"
+        )
+    except httpx.RequestError as req_err:
+        logger.error(f"Request error connecting to Anthropic API: {req_err}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Connection error: {req_err}"
+        )
+    except Exception as e:
+        logger.error(f"Unexpected error: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Unexpected error: {e}"
+        )
 
     json_response = response.json()
     logger.debug(f"🎭 Response from Anthropic API:\n{json.dumps(json_response, indent=4, ensure_ascii=False)}")
@@ -81,3 +91,29 @@ async def send_to_anthropic(request: AnthropicRequest) -> AnthropicResponse:
     # Parse OpenAI-compatible response format
     anthropic_response = AnthropicResponse.from_api(json_response)
     return anthropic_response
+
+
+async def stream_to_anthropic(request: AnthropicRequest) -> AsyncIterator[ProxyStreamChunk]:
+    """
+    Stream a chat completion from Anthropic's OpenAI-compatible endpoint, yielding
+    content and tool-call deltas as they are generated, then a 'done' chunk with
+    token usage.
+    """
+    logger.debug(f"🎭 Streaming request to Anthropic API:\n{json.dumps(request.model_dump(), indent=4, ensure_ascii=False)}")
+
+    payload, headers = _prepare_request(request)
+    payload["stream"] = True
+    payload["stream_options"] = {"include_usage": True}
+
+    client = provider_clients.get("anthropic")
+    try:
+        async with client.stream("POST", "https://api.anthropic.com/v1/chat/completions", headers=headers, json=payload) as response:
+            await raise_for_stream_status(response, "Anthropic")
+            async for chunk in iter_openai_chunks(response):
+                yield chunk
+    except httpx.RequestError as req_err:
+        logger.error(f"Request error connecting to Anthropic API: {req_err}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Connection error: {req_err}"
+        )
@@ -1,13 +1,40 @@
-from shared.models.proxy import OllamaRequest, OllamaResponse
+from shared.models.proxy import OllamaRequest, OllamaResponse, ProxyStreamChunk
+
+from shared.config_store import config_store
 
 from shared.log_config import get_logger
 logger = get_logger(f"proxy.{__name__}")
 
 import httpx
 import json
+from typing import AsyncIterator
+
+from app.services.http_clients import provider_clients
+from app.services.streaming import iter_ollama_chunks, raise_for_stream_status
 
 from fastapi import HTTPException, status
 
+
+def _prepare_request(request: OllamaRequest, stream: bool):
+    """Return the Ollama server URL and the /api/generate payload."""
+    _config = config_store.config
+
+    ollama_url = _config.get("ollama", {}).get("server_url", "http://localhost:11434")
+
+    payload = {
+        "model": request.model,
+        "prompt": request.prompt,
+        **(request.options or {}),
+        "stream": stream,
+        "raw": True
+    }
+
+    if request.format:
+        payload['format'] = request.format
+
+    return ollama_url, payload
+
+
 async def send_to_ollama(request: OllamaRequest) -> OllamaResponse:
     """
     Send a payload to the Ollama API for generation.
@@ -26,52 +53,37 @@ async def send_to_ollama(request: OllamaRequest) -> OllamaResponse:
     """
     logger.debug(f"🦙 Request to Ollama API:\n{json.dumps(request.model_dump(), indent=4, ensure_ascii=False)}")
 
-    with open('/app/config/config.json') as f:
-        _config = json.load(f)
+    ollama_url, payload = _prepare_request(request, stream=False)
 
-    TIMEOUT = _config["timeout"]
-    ollama_url = _config.get("ollama", {}).get("server_url", "http://localhost:11434")
+    # Send the POST request on the shared pooled client
+    client = provider_clients.get("ollama")
+    try:
+        response = await client.post(f"{ollama_url}/api/generate", json=payload)
+        response.raise_for_status()
 
-    payload = {
-        "model": request.model,
-        "prompt": request.prompt,
-        **(request.options or {}),
-        "stream": False,
-        "raw": True
-    }
+    except httpx.HTTPStatusError as http_err:
+        logger.error(f"HTTP error from Ollama API: {http_err.response.status_code} - {http_err.response.text}")
 
-    if request.format:
-        payload['format'] = request.format
+        raise HTTPException(
+            status_code=http_err.response.status_code,
+            detail=f"Error from language model service: {http_err.response.text}"
+        )
 
-    # Send the POST request using an async HTTP client
-    async with httpx.AsyncClient(timeout=TIMEOUT) as client:
-        try:
-            response = await client.post(f"{ollama_url}/api/generate", json=payload)
-            response.raise_for_status()
+    except httpx.RequestError as req_err:
+        logger.error(f"Request error connecting to Ollama API: {req_err}")
 
-        except httpx.HTTPStatusError as http_err:
-            logger.error(f"HTTP error from Ollama API: {http_err.response.status_code} - {http_err.response.text}")
-
-            raise HTTPException(
-                status_code=http_err.response.status_code,
-                detail=f"Error from language model service: {http_err.response.text}"
-            )
-
-        except httpx.RequestError as req_err:
-            logger.error(f"Request error connecting to Ollama API: {req_err}")
-
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"Connection error: {req_err}"
-            )
-        
-        except Exception as e:
-            logger.error(f"Unexpected error: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Connection error: {req_err}"
+        )
+    
+    except Exception as e:
+        logger.error(f"Unexpected error: {e}")
 
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"Unexpected error: {e}"
-            )
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Unexpected error: {e}"
+        )
 
     json_response = response.json()
     logger.debug(f"🦙 Response from Ollama API:\n{json.dumps(json_response, indent=4, ensure_ascii=False)}")
@@ -80,4 +92,27 @@ async def send_to_ollama(request: OllamaRequest) -> OllamaResponse:
 
     ollama_response = OllamaResponse(**json_response)
 
-    return ollama_response
\ No newline at end of file
+    return ollama_response
+
+
+async def stream_to_ollama(request: OllamaRequest) -> AsyncIterator[ProxyStreamChunk]:
+    """
+    Stream a generation from the Ollama API, yielding content deltas as they are
+    generated, then a 'done' chunk with token counts.
+    """
+    logger.debug(f"🦙 Streaming request to Ollama API:\n{json.dumps(request.model_dump(), indent=4, ensure_ascii=False)}")
+
+    ollama_url, payload = _prepare_request(request, stream=True)
+
+    client = provider_clients.get("ollama")
+    try:
+        async with client.stream("POST", f"{ollama_url}/api/generate", json=payload) as response:
+            await raise_for_stream_status(response, "Ollama")
+            async for chunk in iter_ollama_chunks(response):
+                yield chunk
+    except httpx.RequestError as req_err:
+        logger.error(f"Request error connecting to Ollama API: {req_err}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Connection error: {req_err}"
+        )
@@ -1,24 +1,23 @@
-from shared.models.proxy import OpenAIRequest, OpenAIResponse
+from shared.models.proxy import OpenAIRequest, OpenAIResponse, ProxyStreamChunk
+
+from shared.config_store import config_store
 
 from shared.log_config import get_logger
 logger = get_logger(f"proxy.{__name__}")
 
 import httpx
 import json
+from typing import AsyncIterator, Tuple
 
-from fastapi import HTTPException, status
-
+from app.services.http_clients import provider_clients
+from app.services.streaming import iter_openai_chunks, raise_for_stream_status
 
-async def send_to_openai(request: OpenAIRequest) -> OpenAIResponse:
-    """
-    Send a payload to the OpenAI API for generation.
-    """
-    logger.debug(f"🤖 Request to OpenAI API:\n{json.dumps(request.model_dump(), indent=4, ensure_ascii=False)}")
+from fastapi import HTTPException, status
 
-    with open('/app/config/config.json') as f:
-        _config = json.load(f)
 
-    TIMEOUT = _config["timeout"]
+def _prepare_request(request: OpenAIRequest) -> Tuple[dict, dict]:
+    """Build the JSON payload and headers for a chat completions call."""
+    _config = config_store.config
 
     # Normalize tool_calls to always be a list (OpenAI expects an array)
     def _normalize_tool_calls(messages):
@@ -48,32 +47,43 @@ async def send_to_openai(request: OpenAIRequest) -> OpenAIResponse:
         "Content-Type": "application/json"
     }
 
-    async with httpx.AsyncClient(timeout=TIMEOUT) as client:
-        try:
-            response = await client.post(
-                "https://api.openai.com/v1/chat/completions",
-                headers=headers,
-                json=payload
-            )
-            response.raise_for_status()
-        except httpx.HTTPStatusError as http_err:
-            logger.error(f"HTTP error from OpenAI API: {http_err.response.status_code} - {http_err.response.text}")
-            raise HTTPException(
-                status_code=http_err.response.status_code,
-                detail=f"Error from OpenAI: {http_err.response.text}"
-            )
-        except httpx.RequestError as req_err:
-            logger.error(f"Request error connecting to OpenAI API: {req_err}")
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"Connection error: {req_err}"
-            )
-        except Exception as e:
-            logger.error(f"Unexpected error: {e}")
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"Unexpected error: {e}"
-            )
+    return payload, headers
+
+
+async def send_to_openai(request: OpenAIRequest) -> OpenAIResponse:
+    """
+    Send a payload to the OpenAI API for generation.
+    """
+    logger.debug(f"🤖 Request to OpenAI API:\n{json.dumps(request.model_dump(), indent=4, ensure_ascii=False)}")
+
+    payload, headers = _prepare_request(request)
+
+    client = provider_clients.get("openai")
+    try:
+        response = await client.post(
+            "https://api.openai.com/v1/chat/completions",
+            headers=headers,
+            json=payload
+        )
+        response.raise_for_status()
+    except httpx.HTTPStatusError as http_err:
+        logger.error(f"HTTP error from OpenAI API: {http_err.response.status_code} - {http_err.response.text}")
+        raise HTTPException(
+            status_code=http_err.response.status_code,
+            detail=f"Error from OpenAI: {http_err.response.text}"
+        )
+    except httpx.RequestError as req_err:
+        logger.error(f"Request error connecting to OpenAI API: {req_err}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Connection error: {req_err}"
+        )
+    except Exception as e:
+        logger.error(f"Unexpected error: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Unexpected error: {e}"
+        )
 
     json_response = response.json()
     logger.debug(f"🤖 Response from OpenAI API:\n{json.dumps(json_response, indent=4, ensure_ascii=False)}")
@@ -81,3 +91,28 @@ async def send_to_openai(request: OpenAIRequest) -> OpenAIResponse:
     # Parse OpenAI response to OpenAIResponse (you may need to adjust this)
     openai_response = OpenAIResponse.from_api(json_response)
     return openai_response
+
+
+async def stream_to_openai(request: OpenAIRequest) -> AsyncIterator[ProxyStreamChunk]:
+    """
+    Stream a chat completion from the OpenAI API, yielding content and
+    tool-call deltas as they are generated, then a 'done' chunk with token usage.
+    """
+    logger.debug(f"🤖 Streaming request to OpenAI API:\n{json.dumps(request.model_dump(), indent=4, ensure_ascii=False)}")
+
+    payload, headers = _prepare_request(request)
+    payload["stream"] = True
+    payload["stream_options"] = {"include_usage": True}
+
+    client = provider_clients.get("openai")
+    try:
+        async with client.stream("POST", "https://api.openai.com/v1/chat/completions", headers=headers, json=payload) as response:
+            await raise_for_stream_status(response, "OpenAI")
+            async for chunk in iter_openai_chunks(response):
+                yield chunk
+    except httpx.RequestError as req_err:
+        logger.error(f"Request error connecting to OpenAI API: {req_err}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Connection error: {req_err}"
+        )
@@ -0,0 +1,100 @@
+"""
+Normalization of streamed provider responses into ProxyStreamChunk events.
+
+OpenAI and Anthropic's OpenAI-compatible endpoint stream `chat.completion.chunk`
+objects as server-sent events; Ollama streams newline-delimited JSON objects.
+Both are turned into the same sequence of 'delta' chunks followed by one 'done'
+chunk carrying the finish reason and token counts.
+"""
+
+from shared.models.proxy import ProxyStreamChunk
+from shared.sse import iter_sse_data
+
+from shared.log_config import get_logger
+logger = get_logger(f"proxy.{__name__}")
+
+import httpx
+import json
+from datetime import datetime
+from typing import AsyncIterator
+
+from fastapi import HTTPException
+
+
+async def raise_for_stream_status(response: httpx.Response, provider_label: str):
+    """Read the body of a failed streaming response and raise it as an HTTPException."""
+    if not response.is_error:
+        return
+    await response.aread()
+    logger.error(f"HTTP error from {provider_label} API: {response.status_code} - {response.text}")
+    raise HTTPException(
+        status_code=response.status_code,
+        detail=f"Error from {provider_label}: {response.text}"
+    )
+
+
+async def iter_openai_chunks(response: httpx.Response) -> AsyncIterator[ProxyStreamChunk]:
+    """
+    Convert an OpenAI-format chat completion stream into ProxyStreamChunks.
+
+    Usage arrives in a final chunk with no choices when the request set
+    `stream_options.include_usage`.
+    """
+    finish_reason = None
+    usage = {}
+    async for data in iter_sse_data(response):
+        event = json.loads(data)
+        if event.get("usage"):
+            usage = event["usage"]
+        for choice in event.get("choices") or []:
+            delta = choice.get("delta") or {}
+            if delta.get("content") or delta.get("tool_calls"):
+                yield ProxyStreamChunk(
+                    type="delta",
+                    content=delta.get("content") or None,
+                    tool_calls=delta.get("tool_calls") or None,
+                )
+            if choice.get("finish_reason"):
+                finish_reason = choice["finish_reason"]
+
+    yield ProxyStreamChunk(
+        type="done",
+        finish_reason=finish_reason or "stop",
+        eval_count=usage.get("completion_tokens"),
+        prompt_eval_count=usage.get("prompt_tokens"),
+        timestamp=datetime.now().isoformat(),
+    )
+
+
+async def iter_ollama_chunks(response: httpx.Response) -> AsyncIterator[ProxyStreamChunk]:
+    """
+    Convert an Ollama /api/generate NDJSON stream into ProxyStreamChunks.
+
+    Leading whitespace of the response is dropped, matching the stripped
+    non-streaming response; trailing whitespace cannot be known in advance and is
+    left to the consumer.
+    """
+    started = False
+    async for line in response.aiter_lines():
+        if not line.strip():
+            continue
+        event = json.loads(line)
+        if event.get("error"):
+            raise HTTPException(status_code=500, detail=f"Error from language model service: {event['error']}")
+        text = event.get("response") or ""
+        if not started:
+            text = text.lstrip()
+            started = bool(text)
+        if text:
+            yield ProxyStreamChunk(type="delta", content=text)
+        if event.get("done"):
+            yield ProxyStreamChunk(
+                type="done",
+                finish_reason=event.get("done_reason") or "stop",
+                eval_count=event.get("eval_count"),
+                prompt_eval_count=event.get("prompt_eval_count"),
+                timestamp=datetime.now().isoformat(),
+            )
+            return
+
+    raise HTTPException(status_code=502, detail="Ollama stream ended before completion")
@@ -1,6 +1,6 @@
-import json
 from typing import List
 from shared.models.memory import MemoryEntryFull
+from shared.config_store import config_store
 
 
 def _create_memory_str(memories: List[MemoryEntryFull]) -> str:
@@ -43,6 +43,14 @@ def _build_multiturn_prompt(messages: list, system_prompt: str, provider: str =
     return prompt
 
 
+def _get_mode_config(mode: str) -> dict:
+    """
+    Return the `llm.mode` config entry for a mode, falling back to 'default'.
+    Returns an empty dict if neither exists. Served from the in-memory config store.
+    """
+    return config_store.mode(mode)
+
+
 def _resolve_model_provider_options(mode: str):
     """
     Given a mode string, return (provider, model, options) for the LLM.
@@ -52,17 +60,7 @@ def _resolve_model_provider_options(mode: str):
         model (str): actual model name for the provider
         options (dict): provider-specific options (temperature, max_tokens, etc.)
     Raises:
-        ValueError: If provider is missing from the config for the mode.
+        ValueError: If the mode is missing or its config entry is invalid
+            (e.g. no provider).
     """
-    with open('/app/config/config.json') as f:
-        _config = json.load(f)
-    llm_modes = _config.get("llm", {}).get("mode", {})
-    mode_config = llm_modes.get(mode) or llm_modes.get("default")
-    if not mode_config:
-        raise ValueError(f"No config found for mode '{mode}' and no default mode present.")
-    provider = mode_config.get("provider")
-    if not provider:
-        raise ValueError(f"No provider specified for mode '{mode}'. Please specify a provider in config.")
-    model = mode_config.get("model")
-    options = mode_config.get("options", {})
-    return provider, model, options
\ No newline at end of file
+    return config_store.resolve_mode(mode)
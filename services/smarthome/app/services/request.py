@@ -51,7 +51,8 @@ async def _handle_media_recommendation(request: UserRequest, media_types: list,
         
         singleturn_request = SingleTurnRequest(
             model="smarthome",
-            prompt=prompt_content
+            prompt=prompt_content,
+            priority="router"
         )
 
         proxy_port = os.getenv("PROXY_PORT", 4205)
@@ -154,7 +155,8 @@ async def _user_request(request: UserRequest) -> dict:
 
     singleturn_request = SingleTurnRequest(
         model="smarthome",
-        prompt=prompt
+        prompt=prompt,
+        priority="router"
     )
     async with httpx.AsyncClient(timeout=TIMEOUT) as client:
         try:
@@ -300,7 +302,8 @@ async def _user_request(request: UserRequest) -> dict:
 
     singleturn_request = SingleTurnRequest(
         model="smarthome",
-        prompt=prompt
+        prompt=prompt,
+        priority="router"
     )
     async with httpx.AsyncClient(timeout=TIMEOUT) as client:
         try:
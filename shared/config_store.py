@@ -0,0 +1,217 @@
+"""
+Hot-reloadable, parsed view of config.json for request paths.
+
+Request handlers used to open and parse `/app/config/config.json` on every call.
+`config_store` parses it once, indexes the `llm.mode` entries for constant-time
+lookup, and re-reads the file from a background thread when its mtime changes, so
+request paths never touch the filesystem.
+
+Usage:
+    from shared.config_store import config_store
+
+    provider, model, options = config_store.resolve_mode("router")
+    api_key = config_store.get("openai", {}).get("api_key")
+
+A reload that fails to parse or validate keeps the previous configuration and is
+reported in `stats()` (`failed_reloads`, `last_error`). Individual `llm.mode`
+entries that fail validation are left out of the index; looking them up raises
+ValueError with the validation error.
+
+The file is checked every `config.reload_interval` seconds (default 2).
+"""
+
+from shared.log_config import get_logger
+logger = get_logger(__name__)
+
+import json
+import os
+import threading
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+from pydantic import BaseModel, ConfigDict, Field, ValidationError
+
+CONFIG_PATH = os.environ.get("KIRISHIMA_CONFIG", "/app/config/config.json")
+
+DEFAULT_RELOAD_INTERVAL_S = 2.0
+
+
+class ModeConfig(BaseModel):
+    """One `llm.mode` entry. Unknown keys are kept for feature-specific settings."""
+    model_config = ConfigDict(extra="allow", protected_namespaces=())
+
+    provider: str = Field(..., min_length=1, description="LLM provider, e.g. 'openai', 'ollama', 'anthropic'.")
+    model: Optional[str] = Field(None, description="Provider model name.")
+    options: Dict[str, Any] = Field(default_factory=dict, description="Provider options (temperature, max_tokens, ...).")
+    cache: Optional[Dict[str, Any]] = Field(None, description="Single-turn response cache settings.")
+
+
+class _Snapshot:
+    """One parsed, validated version of the config file. Never mutated after creation."""
+
+    def __init__(self, raw: dict, signature: Tuple[int, int]):
+        if not isinstance(raw, dict):
+            raise ValueError("config root must be a JSON object")
+        llm_modes = raw.get("llm", {}).get("mode", {})
+        if not isinstance(llm_modes, dict):
+            raise ValueError("llm.mode must be an object")
+
+        self.raw = raw
+        self.signature = signature
+        self.modes: Dict[str, dict] = {}
+        self.invalid_modes: Dict[str, str] = {}
+        for name, entry in llm_modes.items():
+            try:
+                self.modes[name] = ModeConfig.model_validate(entry).model_dump(exclude_none=True)
+            except ValidationError as e:
+                self.invalid_modes[name] = str(e)
+        for name, error in self.invalid_modes.items():
+            logger.error(f"Invalid llm.mode.{name} in config: {error}")
+
+
+class ConfigStore:
+    """Parsed config.json with O(1) mode lookup and background hot reload."""
+
+    def __init__(self, path: str = CONFIG_PATH):
+        self.path = path
+        self._snapshot: Optional[_Snapshot] = None
+        self._lock = threading.Lock()
+        self._watcher: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        # Signature of the last file version that failed to load, so it is reported once
+        self._failed_signature: Optional[Tuple[int, int]] = None
+        self.reloads = 0
+        self.failed_reloads = 0
+        self.loaded_at: Optional[str] = None
+        self.last_error: Optional[str] = None
+
+    def _signature(self) -> Tuple[int, int]:
+        st = os.stat(self.path)
+        return st.st_mtime_ns, st.st_size
+
+    def _read(self) -> _Snapshot:
+        signature = self._signature()
+        with open(self.path) as f:
+            return _Snapshot(json.load(f), signature)
+
+    def _current(self) -> _Snapshot:
+        snapshot = self._snapshot
+        if snapshot is None:
+            with self._lock:
+                if self._snapshot is None:
+                    self._snapshot = self._read()
+                    self.loaded_at = datetime.now().isoformat()
+                    self._start_watcher()
+                snapshot = self._snapshot
+        return snapshot
+
+    def reload(self, force: bool = False) -> bool:
+        """
+        Re-read the file if it changed (or unconditionally with `force`).
+
+        Returns True if a new configuration was loaded. Errors are logged and
+        counted; the previous configuration stays active.
+        """
+        with self._lock:
+            signature = None
+            try:
+                signature = self._signature()
+                if not force and self._snapshot is not None and signature in (self._snapshot.signature, self._failed_signature):
+                    return False
+                snapshot = self._read()
+            except (OSError, ValueError) as e:
+                self._failed_signature = signature
+                self.failed_reloads += 1
+                self.last_error = f"{type(e).__name__}: {e}"
+                logger.error(f"Config reload from {self.path} failed; keeping previous config: {self.last_error}")
+                return False
+            self._snapshot = snapshot
+            self._failed_signature = None
+            self.reloads += 1
+            self.loaded_at = datetime.now().isoformat()
+            self.last_error = None
+        logger.info(f"Reloaded config from {self.path} (reload #{self.reloads})")
+        return True
+
+    def _start_watcher(self):
+        if self._watcher is not None:
+            return
+        self._watcher = threading.Thread(target=self._watch, name="config-watcher", daemon=True)
+        self._watcher.start()
+
+    def _watch(self):
+        while not self._stop.wait(self.reload_interval):
+            self.reload()
+
+    @property
+    def reload_interval(self) -> float:
+        snapshot = self._snapshot
+        if snapshot is None:
+            return DEFAULT_RELOAD_INTERVAL_S
+        return float(snapshot.raw.get("config", {}).get("reload_interval", DEFAULT_RELOAD_INTERVAL_S))
+
+    def stop(self):
+        """Stop the background watcher (it restarts on the next first load)."""
+        self._stop.set()
+        if self._watcher is not None:
+            self._watcher.join(timeout=1)
+        self._watcher = None
+        self._stop = threading.Event()
+
+    @property
+    def config(self) -> dict:
+        """The whole parsed config. Shared between callers; do not modify."""
+        return self._current().raw
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Top-level config value, like `dict.get`."""
+        return self._current().raw.get(key, default)
+
+    def mode(self, mode: str) -> dict:
+        """
+        Validated `llm.mode` entry for a mode, falling back to 'default'.
+        Returns an empty dict if neither exists. Do not modify the result.
+
+        Raises:
+            ValueError: If the entry exists but failed validation.
+        """
+        snapshot = self._current()
+        for name in (mode, "default"):
+            entry = snapshot.modes.get(name)
+            if entry is not None:
+                return entry
+            if name in snapshot.invalid_modes:
+                raise ValueError(f"Invalid config for mode '{name}': {snapshot.invalid_modes[name]}")
+        return {}
+
+    def resolve_mode(self, mode: str) -> Tuple[str, Optional[str], dict]:
+        """
+        Return (provider, model, options) for a mode, falling back to 'default'.
+
+        Raises:
+            ValueError: If neither the mode nor 'default' is configured.
+        """
+        mode_config = self.mode(mode)
+        if not mode_config:
+            raise ValueError(f"No config found for mode '{mode}' and no default mode present.")
+        return mode_config["provider"], mode_config.get("model"), mode_config.get("options", {})
+
+    def stats(self) -> Dict[str, Any]:
+        """Reload counters and the current file version, for ops endpoints."""
+        snapshot = self._snapshot
+        return {
+            "path": self.path,
+            "loaded": snapshot is not None,
+            "loaded_at": self.loaded_at,
+            "mtime_ns": snapshot.signature[0] if snapshot is not None else None,
+            "reloads": self.reloads,
+            "failed_reloads": self.failed_reloads,
+            "last_error": self.last_error,
+            "reload_interval": self.reload_interval,
+            "watching": self._watcher is not None and self._watcher.is_alive(),
+            "modes": len(snapshot.modes) if snapshot is not None else 0,
+            "invalid_modes": sorted(snapshot.invalid_modes) if snapshot is not None else [],
+        }
+
+
+config_store = ConfigStore()
@@ -6,6 +6,8 @@ Classes:
     ChatCompletionChoice: Represents an individual choice in a chat completion response, including the generated message and finish reason.
     ChatUsage: Represents token usage statistics for a chat completion.
     ChatCompletionResponse: Represents a complete chat completion response, including choices and usage statistics.
+    ChatCompletionChunkChoice: Represents an individual choice delta in a streamed chat completion chunk.
+    ChatCompletionChunk: Represents one streamed chat completion chunk (`stream: true`).
 Configuration:
     Loads default model configuration from a JSON config file specified by the KIRISHIMA_CONFIG environment variable or a default path.
 Intended Usage:
@@ -50,6 +52,8 @@ class ChatCompletionRequest(BaseModel):
         model (str): The model to be used, e.g. 'nemo'.
         messages (List[Dict[str, str]]): A list of messages representing the conversation history.
         options (Optional[Dict[str, Any]]): Provider-specific options (temperature, max_tokens, etc.).
+        stream (Optional[bool]): Stream the response as `chat.completion.chunk` server-sent events.
+        stream_options (Optional[Dict[str, Any]]): Streaming options; `include_usage` adds a final usage chunk.
 
     Example:
         {
@@ -64,6 +68,8 @@ class ChatCompletionRequest(BaseModel):
     model: str                          = Field(_default_mode["model"], description="The model to be used, e.g. 'nemo'.")
     messages: List[Dict[str, str]]      = Field(..., description="A list of messages representing the conversation history.")
     options: Optional[Dict[str, Any]]   = Field(None, description="Provider-specific options (temperature, max_tokens, etc.)")
+    stream: Optional[bool]              = Field(False, description="Stream the response as chat.completion.chunk server-sent events.")
+    stream_options: Optional[Dict[str, Any]] = Field(None, description="Streaming options; include_usage adds a final usage chunk.")
 
     model_config = {
         "json_schema_extra": {
@@ -175,3 +181,59 @@ class ChatCompletionResponse(BaseModel):
             }
         }
     }
+
+
+class ChatCompletionChunkChoice(BaseModel):
+    """
+    Represents an individual choice delta in a streamed chat completion chunk.
+
+    Attributes:
+        index (int): The index of the choice.
+        delta (Dict[str, str]): The role and/or content generated since the previous chunk.
+        finish_reason (Optional[str]): The reason for finishing, set on the last chunk only.
+    """
+    index: int                          = Field(0, description="Index of the completion choice.")
+    delta: Dict[str, str]               = Field(default_factory=dict, description="Role and/or content generated since the previous chunk.")
+    finish_reason: Optional[str]        = Field(None, description="Reason for finishing the completion.")
+
+
+class ChatCompletionChunk(BaseModel):
+    """
+    Represents one OpenAI-compatible streamed chat completion chunk.
+
+    Every chunk of a stream shares the same id and created timestamp. The optional
+    usage chunk (requested with `stream_options.include_usage`) has no choices.
+
+    Attributes:
+        id (str): A unique identifier shared by all chunks of the response.
+        object (str): The object type, "chat.completion.chunk".
+        created (int): UNIX timestamp of creation.
+        model (str): The model used.
+        choices (List[ChatCompletionChunkChoice]): The choice deltas.
+        usage (Optional[ChatUsage]): Token usage, on the usage chunk only.
+    """
+    id: str                                 = Field(..., description="Unique response ID.")
+    object: str                             = Field("chat.completion.chunk", description="Response type.")
+    created: int                            = Field(..., description="Creation timestamp (UNIX epoch).")
+    model: str                              = Field(..., description="The model used.")
+    choices: List[ChatCompletionChunkChoice] = Field(default_factory=list, description="List of choice deltas.")
+    usage: Optional[ChatUsage]              = Field(None, description="Token usage details.")
+
+    model_config = {
+        "json_schema_extra": {
+            "example": {
+                "id": "chatcmpl-1234567890",
+                "object": "chat.completion.chunk",
+                "created": 1696147200,
+                "model": "nemo",
+                "choices": [
+                    {
+                        "index": 0,
+                        "delta": {"content": "The weather"},
+                        "finish_reason": None
+                    }
+                ],
+                "usage": None
+            }
+        }
+    }
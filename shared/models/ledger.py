@@ -311,6 +311,53 @@ class SummaryCreateRequest(BaseModel):
         }
     }
 
+class PeriodSummaryCreateRequest(BaseModel):
+    """
+    Represents a request to create the summary of a single intra-day period.
+
+    Attributes:
+        period (str): The period to summarize: 'night', 'morning', 'afternoon' or 'evening'.
+        date (str): Date of the period in YYYY-MM-DD format.
+                    Defaults to the current date if not specified.
+    """
+    period: str                     = Field(..., description="Period to summarize (e.g., 'morning', 'evening')")
+    date: str                       = Field(default_factory=lambda: datetime.now().strftime("%Y-%m-%d"), description="Date in YYYY-MM-DD format.")
+    model_config = {
+        "json_schema_extra": {
+            "examples": [
+                {
+                    "period": "morning",
+                    "date": "2023-10-01"
+                }
+            ]
+        }
+    }
+
+class SummaryBackfillRequest(BaseModel):
+    """
+    Represents a request to create the missing period summaries for a range of dates.
+
+    Attributes:
+        start_date (str): First date to backfill, in YYYY-MM-DD format.
+        end_date (str): Last date to backfill (inclusive), in YYYY-MM-DD format.
+        periods (List[str]): Periods to backfill for each date. Defaults to all four.
+        concurrency (Optional[int]): Summaries generated at once. Defaults to `summary.backfill_concurrency`.
+    """
+    start_date: str                 = Field(..., description="First date to backfill (YYYY-MM-DD).")
+    end_date: str                   = Field(..., description="Last date to backfill, inclusive (YYYY-MM-DD).")
+    periods: List[str]              = Field(default_factory=lambda: ["night", "morning", "afternoon", "evening"], description="Periods to backfill for each date.")
+    concurrency: Optional[int]      = Field(None, ge=1, description="Summaries generated at once; defaults to summary.backfill_concurrency.")
+    model_config = {
+        "json_schema_extra": {
+            "examples": [
+                {
+                    "start_date": "2023-10-01",
+                    "end_date": "2023-10-31"
+                }
+            ]
+        }
+    }
+
 class CombinedSummaryRequest(BaseModel):
     """
     Request model for combining multiple summaries into a single summary.
@@ -408,6 +455,7 @@ class MemorySearchParams(BaseModel):
         min_keywords (int): Minimum number of matching keywords required when searching by keywords.
         created_after (Optional[str]): Return memories created after this timestamp (ISO format).
         created_before (Optional[str]): Return memories created before this timestamp (ISO format).
+        limit (Optional[int]): Maximum number of memories to return, best keyword matches first.
     """
     keywords: Optional[List[str]]   = Field(None, description="List of keywords to search for.")
     category: Optional[str]         = Field(None, description="Category to search for.")
@@ -416,6 +464,7 @@ class MemorySearchParams(BaseModel):
     min_keywords: int               = Field(2, description="Minimum number of matching keywords required when searching by keywords.")
     created_after: Optional[str]    = Field(None, description="Return memories created after this timestamp (ISO format).")
     created_before: Optional[str]   = Field(None, description="Return memories created before this timestamp (ISO format).")
+    limit: Optional[int]            = Field(None, ge=1, description="Maximum number of memories to return, best keyword matches first.")
 
     model_config = {
         "json_schema_extra": {
@@ -433,6 +482,35 @@ class MemorySearchParams(BaseModel):
         }
     }
 
+
+class MemorySimilarParams(BaseModel):
+    """
+    Parameters for finding the memories most similar to a memory or a piece of text.
+
+    Attributes:
+        memory_id (Optional[str]): Find memories similar to this memory (excluding itself).
+        text (Optional[str]): Find memories similar to this text (used if memory_id is not given).
+        k (int): Maximum number of memories to return.
+        min_score (Optional[float]): Minimum cosine similarity of returned memories.
+    """
+    memory_id: Optional[str]        = Field(None, description="Find memories similar to this memory (excluding itself).")
+    text: Optional[str]             = Field(None, description="Find memories similar to this text (used if memory_id is not given).")
+    k: int                          = Field(10, ge=1, le=100, description="Maximum number of memories to return.")
+    min_score: Optional[float]      = Field(None, ge=-1.0, le=1.0, description="Minimum cosine similarity of returned memories.")
+
+    model_config = {
+        "json_schema_extra": {
+            "examples": [
+                {
+                    "memory_id": None,
+                    "text": "Project kickoff meeting",
+                    "k": 5,
+                    "min_score": 0.5
+                }
+            ]
+        }
+    }
+
 class MemoryEntry(BaseModel):
     """
     Unified memory model that can represent any memory state.
@@ -503,6 +581,16 @@ class MemoryEntry(BaseModel):
     }
 
 
+class SimilarMemory(MemoryEntry):
+    """
+    A memory returned by similarity search, with its cosine similarity to the query.
+
+    Attributes:
+        score (float): Cosine similarity between the memory and the query.
+    """
+    score: float                    = Field(..., description="Cosine similarity between the memory and the query")
+
+
 class TopicIDsTimeframeRequest(BaseModel):
     """
     Request model for retrieving topic IDs in a given time frame.
@@ -1199,6 +1287,18 @@ class ToolSyncRequest(BaseModel):
     }
 
 
+class ToolSyncBatchRequest(BaseModel):
+    """
+    Request model for synchronizing several tool calls in one request.
+
+    The calls are stored in order, in a single transaction.
+
+    Attributes:
+        calls (List[ToolSyncRequest]): The tool calls and outputs to synchronize, in order
+    """
+    calls: List[ToolSyncRequest] = Field(..., min_length=1, description="The tool calls and outputs to synchronize, in order")
+
+
 class AssistantSyncRequest(BaseModel):
     """
     Request model for synchronizing assistant messages.
@@ -1227,6 +1327,7 @@ class SummaryGetRequest(BaseModel):
         timestamp_end (Optional[str]): End timestamp for filtering summaries.
         keywords (Optional[List[str]]): List of keywords to search within summary text.
         limit (Optional[int]): Maximum number of summaries to return in the query result.
+        include_rolled_up (bool): Also return period summaries already rolled up into a daily summary.
     """
     id: Optional[str]               = Field(None, description="Filter by summary ID")
     period: Optional[str]           = Field(None, description="Filter summaries by summary period")
@@ -1234,6 +1335,7 @@ class SummaryGetRequest(BaseModel):
     timestamp_end: Optional[str]    = Field(None, description="Upper bound for summary timestamp")
     keywords: Optional[List[str]]   = Field(None, description="List of keywords to search for in summary text")
     limit: Optional[int]            = Field(None, description="Maximum number of summaries to return")
+    include_rolled_up: bool         = Field(False, description="Also return period summaries already rolled up into a daily summary")
 
     model_config = {
         "json_schema_extra": {
@@ -7,6 +7,7 @@ Models:
     - SingleTurnRequest (mode-based single turn)
     - MultiTurnRequest
     - ProxyResponse
+    - ProxyStreamChunk
     - ProxyDiscordDMRequest
     - OllamaRequest / OpenAIRequest / AnthropicRequest
     - RespondJsonRequest / DivoomRequest
@@ -123,9 +124,11 @@ class SingleTurnRequest(BaseModel):
     Attributes:
         model (str): The mode name to resolve from config.json (e.g., 'default', 'work', 'claude').
         prompt (str): The input text or prompt to be processed by the model.
+        priority (Optional[str]): Proxy queue priority: 'interactive', 'router' or 'batch' (default).
     """
     model: str = Field(..., description="The mode name to resolve from config.json.")
     prompt: str = Field(..., description="The prompt or input text for the model.")
+    priority: Optional[Literal["interactive", "router", "batch"]] = Field(None, description="Proxy queue priority; defaults to 'batch'.")
     
     model_config = {
         "json_schema_extra": {
@@ -152,6 +155,7 @@ class MultiTurnRequest(BaseModel):
         tools (Optional[List[Dict[str, Any]]]): A list of tools available for the model to call.
         user_id (Optional[int]): The user ID associated with the request.
         agent_prompt (Optional[str]): An optional agent prompt to guide the model's behavior.
+        priority (Optional[str]): Proxy queue priority: 'interactive' (default), 'router' or 'batch'.
     """
     model: str                                 = Field(..., description="The model to be used for generating the response.")
     provider: Optional[str]                    = Field(None, description="The provider for the model (e.g., 'openai', 'ollama').")
@@ -164,6 +168,7 @@ class MultiTurnRequest(BaseModel):
     tools: Optional[List[Dict[str, Any]]]      = Field(None, description="List of tools available for the model to call.")
     user_id: Optional[str]                     = Field(None, description="The user ID associated with the request.")
     agent_prompt: Optional[str]                = Field(None, description="An optional agent prompt to guide the model's behavior.")
+    priority: Optional[Literal["interactive", "router", "batch"]] = Field(None, description="Proxy queue priority; defaults to 'interactive'.")
 
     model_config = {
         "json_schema_extra": {
@@ -249,6 +254,49 @@ class ProxyResponse(BaseModel):
     }
 
 
+class ProxyStreamChunk(BaseModel):
+    """
+    One server-sent event of a streamed multi-turn response.
+
+    The proxy emits these on /api/multiturn/stream for every provider, and brain
+    relays them on its own /api/multiturn/stream. Each event is sent as
+    `data: <json>` with unset fields omitted.
+
+    Attributes:
+        type (str): 'delta' for generated content or tool-call fragments, 'done' when the
+            response is complete, 'error' if generation failed mid-stream.
+        content (Optional[str]): Text generated since the previous delta.
+        tool_calls (Optional[list]): OpenAI-format tool-call deltas, keyed by `index`. Brain
+            buffers these and does not relay them.
+        finish_reason (Optional[str]): Why generation stopped (on 'done').
+        eval_count (Optional[int]): Tokens generated (on 'done', when the provider reports it).
+        prompt_eval_count (Optional[int]): Tokens in the prompt (on 'done', when reported).
+        timestamp (Optional[str]): ISO 8601 completion timestamp (on 'done').
+        detail (Optional[str]): Error description (on 'error').
+    """
+    type: Literal["delta", "done", "error"]  = Field(..., description="Event type: 'delta', 'done' or 'error'.")
+    content: Optional[str]                  = Field(None, description="Text generated since the previous delta.")
+    tool_calls: Optional[list]              = Field(None, description="OpenAI-format tool-call deltas, keyed by index.")
+    finish_reason: Optional[str]            = Field(None, description="Why generation stopped.")
+    eval_count: Optional[int]               = Field(None, description="The number of tokens used in the response.")
+    prompt_eval_count: Optional[int]        = Field(None, description="The number of tokens used in the prompt.")
+    timestamp: Optional[str]                = Field(None, description="ISO 8601 formatted timestamp of when the response completed.")
+    detail: Optional[str]                   = Field(None, description="Error description.")
+
+    model_config = {
+        "json_schema_extra": {
+            "example": {
+                "type": "delta",
+                "content": "Don't forget "
+            }
+        }
+    }
+
+    def to_sse(self) -> str:
+        """Serialize as a server-sent event."""
+        return f"data: {self.model_dump_json(exclude_none=True)}\n\n"
+
+
 class ProxyDiscordDMRequest(BaseModel):
     """
     Represents a proxy request for a Discord direct message interaction.
@@ -13,6 +13,11 @@ For proxy service, additional support for context-driven prompts:
 - /app/config/prompts/proxy/contexts/{provider}-{mode}.json (context data)
 - /app/config/prompts/proxy/templates/{template_name}.j2 (Jinja templates)
 
+Text prompts, parsed context files and compiled templates are kept in memory and
+reloaded when the file's mtime changes. A file is stat'ed at most once per
+STAT_TTL_S, so edits in the prompt repository show up within a second without
+touching the filesystem on every render.
+
 Usage:
     from shared.prompt_loader import load_prompt
     
@@ -30,8 +35,10 @@ Usage:
 import os
 import json
 import logging
+import threading
+import time
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Any, Callable, Dict, Optional
 from jinja2 import Template, FileSystemLoader, Environment
 
 logger = logging.getLogger(__name__)
@@ -39,12 +46,101 @@ logger = logging.getLogger(__name__)
 # Base path for prompts in Docker containers
 PROMPTS_BASE_PATH = "/app/config/prompts"
 
+# How long a file's stat result is trusted before its mtime is checked again
+STAT_TTL_S = 1.0
+
+
+class _FileCache:
+    """
+    Values derived from files (text, parsed JSON, compiled templates), keyed by path
+    and invalidated when the file's mtime or size changes. Missing files are cached
+    too, so fallback lookups (.j2 before .txt) don't hit the filesystem each call.
+    """
+
+    def __init__(self, stat_ttl: float = STAT_TTL_S):
+        self.stat_ttl = stat_ttl
+        self._lock = threading.Lock()
+        # path -> [checked_at, (mtime_ns, size) or None if missing, value]
+        self._entries: Dict[str, list] = {}
+        self.hits = 0
+        self.loads = 0
+        self.stat_calls = 0
+
+    def get(self, path: Path, load: Callable[[Path], Any]) -> Any:
+        """
+        Return `load(path)`, reusing the previous result while the file is unchanged.
+
+        Raises:
+            FileNotFoundError: If the file doesn't exist.
+        """
+        key = str(path)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now - entry[0] < self.stat_ttl:
+                if entry[1] is None:
+                    raise FileNotFoundError(key)
+                self.hits += 1
+                return entry[2]
+
+        self.stat_calls += 1
+        try:
+            st = os.stat(key)
+            signature = (st.st_mtime_ns, st.st_size)
+        except FileNotFoundError:
+            signature = None
+
+        with self._lock:
+            if entry is not None and entry[1] == signature:
+                entry[0] = now
+                if signature is None:
+                    raise FileNotFoundError(key)
+                self.hits += 1
+                return entry[2]
+
+        if signature is None:
+            with self._lock:
+                self._entries[key] = [now, None, None]
+            raise FileNotFoundError(key)
+
+        value = load(path)
+        with self._lock:
+            self._entries[key] = [now, signature, value]
+            self.loads += 1
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            missing = sum(1 for entry in self._entries.values() if entry[1] is None)
+            return {
+                "entries": len(self._entries) - missing,
+                "missing": missing,
+                "hits": self.hits,
+                "loads": self.loads,
+                "stat_calls": self.stat_calls,
+            }
+
+
+def _read_text(path: Path) -> str:
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.read().strip()
+
+
+def _read_json(path: Path) -> dict:
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
 class PromptLoader:
     """Handles loading and rendering of prompts from the centralized prompt repository."""
     
     def __init__(self, base_path: str = PROMPTS_BASE_PATH):
         self.base_path = Path(base_path)
         self._jinja_env = None
+        self._files = _FileCache()
     
     @property
     def jinja_env(self) -> Environment:
@@ -56,6 +152,23 @@ class PromptLoader:
                 lstrip_blocks=True
             )
         return self._jinja_env
+
+    def _template(self, template_path: str) -> Template:
+        """Compiled template at `template_path` (relative to base_path), cached by mtime."""
+        return self._files.get(
+            self.base_path / template_path,
+            lambda _: self.jinja_env.get_template(template_path),
+        )
+
+    def cache_stats(self) -> Dict[str, int]:
+        """Hit/load counters for cached prompt files."""
+        return self._files.stats()
+
+    def clear_cache(self):
+        """Forget every cached prompt file; the next render reloads from disk."""
+        self._files.clear()
+        if self._jinja_env is not None:
+            self._jinja_env.cache.clear()
     
     def load_prompt(self, service: str, module: str, prompt_name: str, **kwargs) -> str:
         """
@@ -79,24 +192,28 @@ class PromptLoader:
         text_path = f"{service}/{module}/{prompt_name}.txt"
         
         # Check for Jinja template
-        full_template_path = self.base_path / template_path
-        if full_template_path.exists():
-            logger.debug(f"Loading Jinja template: {template_path}")
+        try:
+            template = self._template(template_path)
+        except FileNotFoundError:
+            template = None
+        if template is not None:
+            logger.debug(f"Rendering Jinja template: {template_path}")
             try:
-                template = self.jinja_env.get_template(template_path)
                 return template.render(**kwargs)
             except Exception as e:
                 logger.error(f"Failed to render template {template_path}: {e}")
                 raise
         
         # Check for plain text file
-        full_text_path = self.base_path / text_path
-        if full_text_path.exists():
+        try:
+            text = self._files.get(self.base_path / text_path, _read_text)
+        except FileNotFoundError:
+            text = None
+        if text is not None:
             logger.debug(f"Loading text prompt: {text_path}")
             if kwargs:
                 logger.warning(f"Variables provided for text prompt {text_path}, but text prompts don't support variables")
-            with open(full_text_path, 'r', encoding='utf-8') as f:
-                return f.read().strip()
+            return text
         
         # Neither found
         raise FileNotFoundError(f"Prompt not found: {service}/{module}/{prompt_name} (tried .j2 and .txt)")
@@ -122,14 +239,12 @@ class PromptLoader:
         """
         # Load context data
         context_file = f"proxy/contexts/{provider}-{mode}.json"
-        context_path = self.base_path / context_file
-        
-        if not context_path.exists():
-            raise FileNotFoundError(f"Proxy context not found: {context_file}")
         
         try:
-            with open(context_path, 'r', encoding='utf-8') as f:
-                context = json.load(f)
+            # Copy so per-request values never leak into the cached context
+            context = dict(self._files.get(self.base_path / context_file, _read_json))
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Proxy context not found: {context_file}") from None
         except json.JSONDecodeError as e:
             logger.error(f"Failed to parse context JSON {context_file}: {e}")
             raise
@@ -164,7 +279,7 @@ class PromptLoader:
         
         # Render template
         try:
-            template = self.jinja_env.get_template(template_file)
+            template = self._template(template_file)
             return template.render(**context)
         except Exception as e:
             logger.error(f"Failed to render proxy template {template_file}: {e}")
@@ -202,6 +317,10 @@ def load_proxy_prompt(provider: str, mode: str, request) -> str:
     """
     return _prompt_loader.load_proxy_prompt(provider, mode, request)
 
+def prompt_cache_stats() -> Dict[str, int]:
+    """Cache counters of the global PromptLoader instance."""
+    return _prompt_loader.cache_stats()
+
 def list_prompts(service: Optional[str] = None, module: Optional[str] = None) -> Dict[str, Any]:
     """
     List available prompts in the repository.
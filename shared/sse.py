@@ -0,0 +1,79 @@
+"""
+Helpers for relaying server-sent event (SSE) streams between services.
+
+Usage:
+    from shared.sse import iter_sse_data, prime_stream
+
+    # Read the `data:` payloads of an upstream httpx streaming response
+    async for data in iter_sse_data(response):
+        ...
+
+    # Start a generator before handing it to StreamingResponse, so errors raised
+    # before its first event still become a normal HTTP error response
+    events = await prime_stream(generate_events())
+    return StreamingResponse(events, media_type="text/event-stream")
+"""
+
+from typing import AsyncIterator, TypeVar
+
+T = TypeVar("T")
+
+SSE_DONE = "[DONE]"
+
+
+async def iter_sse_data(response) -> AsyncIterator[str]:
+    """
+    Yield the data of each event in an SSE response, stopping at `[DONE]`.
+
+    Multi-line data fields are joined with newlines; comments and other fields
+    (event, id, retry) are ignored.
+
+    Args:
+        response: An httpx.Response opened with `client.stream(...)`.
+    """
+    data_lines = []
+    async for line in response.aiter_lines():
+        if not line:
+            if data_lines:
+                data = "\n".join(data_lines)
+                data_lines = []
+                if data == SSE_DONE:
+                    return
+                yield data
+            continue
+        if line.startswith("data:"):
+            value = line[5:]
+            data_lines.append(value[1:] if value.startswith(" ") else value)
+    if data_lines:
+        data = "\n".join(data_lines)
+        if data != SSE_DONE:
+            yield data
+
+
+async def prime_stream(stream: AsyncIterator[T]) -> AsyncIterator[T]:
+    """
+    Run `stream` up to its first item and return an iterator over all of its items.
+
+    Exceptions raised before the first item (e.g. an HTTPException from an upstream
+    service refusing the request) propagate to the caller, while the response
+    status can still be chosen.
+    """
+    try:
+        first = await stream.__anext__()
+    except StopAsyncIteration:
+        return _empty()
+
+    async def _resume():
+        try:
+            yield first
+            async for item in stream:
+                yield item
+        finally:
+            await stream.aclose()
+
+    return _resume()
+
+
+async def _empty():
+    return
+    yield
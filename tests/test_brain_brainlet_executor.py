@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+import sys
+import types
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+EXECUTOR_PATH = ROOT / "services" / "brain" / "app" / "services" / "brainlet_executor.py"
+
+
+def _load_executor_module(brainlets):
+    logger = types.SimpleNamespace(
+        debug=lambda *a, **k: None,
+        info=lambda *a, **k: None,
+        warning=lambda *a, **k: None,
+        error=lambda *a, **k: None,
+    )
+
+    async def timed(_name, awaitable):
+        return await awaitable
+
+    app_pkg = types.ModuleType("app")
+    brainlets_module = types.ModuleType("app.brainlets")
+    timings_module = types.ModuleType("app.services.timings")
+    proxy_models_module = types.ModuleType("shared.models.proxy")
+    log_config_module = types.ModuleType("shared.log_config")
+
+    for name, func in brainlets.items():
+        setattr(brainlets_module, name, func)
+    app_pkg.brainlets = brainlets_module
+    timings_module.brainlet_timings = types.SimpleNamespace(timed=timed, stats=lambda: {})
+    proxy_models_module.MultiTurnRequest = object
+    log_config_module.get_logger = lambda _name: logger
+
+    stubs = {
+        "app": app_pkg,
+        "app.brainlets": brainlets_module,
+        "app.services.timings": timings_module,
+        "shared.models.proxy": proxy_models_module,
+        "shared.log_config": log_config_module,
+    }
+    original_modules = {key: sys.modules.get(key) for key in stubs}
+    sys.modules.update(stubs)
+
+    try:
+        spec = importlib.util.spec_from_file_location("brain_brainlet_executor_test_module", EXECUTOR_PATH)
+        module = importlib.util.module_from_spec(spec)
+        assert spec.loader is not None
+        spec.loader.exec_module(module)
+        return module
+    finally:
+        for name, original in original_modules.items():
+            if original is None:
+                sys.modules.pop(name, None)
+            else:
+                sys.modules[name] = original
+
+
+def _brainlet(name, depends_on=(), stage="pre", **extra):
+    return {"name": name, "depends_on": list(depends_on), "execution_stage": stage, "modes": ["default"], **extra}
+
+
+class TopoLevelsTests(unittest.TestCase):
+    def setUp(self):
+        self.module = _load_executor_module({})
+
+    def _names(self, levels):
+        return [sorted(b["name"] for b in level) for level in levels]
+
+    def test_brainlets_are_grouped_after_their_dependencies(self):
+        levels = self.module.topo_levels([
+            _brainlet("summary", ["memory", "topic"]),
+            _brainlet("memory"),
+            _brainlet("topic", ["memory"]),
+            _brainlet("weather"),
+        ])
+
+        self.assertEqual(self._names(levels), [["memory", "weather"], ["topic"], ["summary"]])
+
+    def test_cycles_and_missing_dependencies_are_left_out(self):
+        levels = self.module.topo_levels([
+            _brainlet("a", ["b"]),
+            _brainlet("b", ["a"]),
+            _brainlet("orphan", ["missing"]),
+            _brainlet("ok"),
+        ])
+
+        self.assertEqual(self._names(levels), [["ok"]])
+
+
+class BrainletExecutorTests(unittest.TestCase):
+    def setUp(self):
+        self.events = []
+
+        def brainlet(name, delay=0.0, result=None, error=None):
+            async def run(brainlets_output, _request):
+                self.events.append((name, "start", sorted(brainlets_output)))
+                await asyncio.sleep(delay)
+                if error is not None:
+                    raise error
+                self.events.append((name, "end"))
+                return result if result is not None else name
+            return run
+
+        self.module = _load_executor_module({
+            "first": brainlet("first", delay=0.02),
+            "second": brainlet("second"),
+            "dependent": brainlet("dependent"),
+            "slow": brainlet("slow", delay=1.0),
+            "broken": brainlet("broken", error=RuntimeError("boom")),
+        })
+        self.executor = self.module.BrainletExecutor()
+
+    def _run_stage(self, brainlets, stage="pre"):
+        levels = self.module.topo_levels(brainlets)
+        output = {}
+        return asyncio.run(self.executor.run_stage(levels, stage, "default", output, None, output))
+
+    def test_levels_run_in_order_and_brainlets_within_a_level_concurrently(self):
+        results = self._run_stage([
+            _brainlet("first"),
+            _brainlet("second"),
+            _brainlet("dependent", ["first", "second"]),
+        ])
+
+        self.assertEqual(results, {"first": "first", "second": "second", "dependent": "dependent"})
+        # second starts before first (which sleeps) ends; dependent sees both outputs
+        self.assertEqual(self.events, [
+            ("first", "start", []),
+            ("second", "start", []),
+            ("second", "end"),
+            ("first", "end"),
+            ("dependent", "start", ["first", "second"]),
+            ("dependent", "end"),
+        ])
+
+    def test_timed_out_brainlet_is_left_out(self):
+        results = self._run_stage([
+            _brainlet("slow", timeout=0.01),
+            _brainlet("dependent", ["slow"]),
+        ])
+
+        self.assertEqual(results, {"dependent": "dependent"})
+        self.assertEqual(self.executor.stats()["brainlets"]["slow"]["timeouts"], 1)
+
+    def test_failed_brainlet_is_left_out_and_others_still_run(self):
+        results = self._run_stage([_brainlet("broken"), _brainlet("second")])
+
+        self.assertEqual(results, {"second": "second"})
+        self.assertEqual(self.executor.stats()["brainlets"]["broken"]["errors"], 1)
+
+    def test_only_the_requested_stage_and_mode_run(self):
+        results = self._run_stage([
+            _brainlet("first", stage="post"),
+            {**_brainlet("second"), "modes": ["other"]},
+            _brainlet("dependent"),
+        ])
+
+        self.assertEqual(results, {"dependent": "dependent"})
+
+    def test_drain_waits_for_background_brainlets(self):
+        async def scenario():
+            levels = self.module.topo_levels([_brainlet("first", stage="post")])
+            self.executor.run_in_background(levels, "post", "default", {}, None)
+            running = self.executor.stats()["background_running"]
+            await self.executor.drain(timeout=1.0)
+            return running
+
+        self.assertEqual(asyncio.run(scenario()), 1)
+        self.assertIn(("first", "end"), self.events)
+        self.assertEqual(self.executor.stats()["background_running"], 0)
+
+    def test_drain_cancels_background_brainlets_past_the_timeout(self):
+        async def scenario():
+            levels = self.module.topo_levels([_brainlet("slow", stage="post")])
+            self.executor.run_in_background(levels, "post", "default", {}, None)
+            await asyncio.sleep(0)
+            await self.executor.drain(timeout=0.01)
+            # Let the cancellation reach the task
+            await asyncio.sleep(0)
+
+        asyncio.run(scenario())
+
+        self.assertNotIn(("slow", "end"), self.events)
+        stats = self.executor.stats()
+        self.assertEqual((stats["background_running"], stats["background_failed"]), (0, 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
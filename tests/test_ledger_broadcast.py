@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+import os
+import sqlite3
+import sys
+import tempfile
+import types
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+LEDGER_APP = ROOT / "services" / "ledger" / "app"
+BROADCAST_PATH = LEDGER_APP / "services" / "user" / "broadcast.py"
+SETUP_PATH = LEDGER_APP / "setup.py"
+
+
+def _load_module(name, path, stubs):
+    original_modules = {key: sys.modules.get(key) for key in stubs}
+    sys.modules.update(stubs)
+
+    try:
+        spec = importlib.util.spec_from_file_location(name, path)
+        module = importlib.util.module_from_spec(spec)
+        assert spec.loader is not None
+        spec.loader.exec_module(module)
+        return module
+    finally:
+        for key, original in original_modules.items():
+            if original is None:
+                sys.modules.pop(key, None)
+            else:
+                sys.modules[key] = original
+
+
+def _load_modules(db_path):
+    logger = types.SimpleNamespace(
+        debug=lambda *a, **k: None,
+        info=lambda *a, **k: None,
+        warning=lambda *a, **k: None,
+        error=lambda *a, **k: None,
+    )
+
+    log_config_module = types.ModuleType("shared.log_config")
+    tokens_module = types.ModuleType("app.services.user.tokens")
+    util_module = types.ModuleType("app.util")
+
+    log_config_module.get_logger = lambda _name: logger
+    tokens_module._backfill_message_tokens = lambda _conn: None
+    util_module._load_config = lambda: {"db": {"ledger": db_path}}
+
+    setup = _load_module("ledger_setup_test_module", SETUP_PATH, {
+        "shared.log_config": log_config_module,
+        "app.services.user.tokens": tokens_module,
+        "app.util": util_module,
+    })
+    broadcast = _load_module("ledger_broadcast_test_module", BROADCAST_PATH, {
+        "shared.log_config": log_config_module,
+        "app.util": util_module,
+    })
+    return setup, broadcast
+
+
+class MessageBroadcasterTests(unittest.TestCase):
+    def setUp(self):
+        handle, self.db_path = tempfile.mkstemp(suffix=".db")
+        os.close(handle)
+        self.addCleanup(os.remove, self.db_path)
+        setup, broadcast = _load_modules(self.db_path)
+        self.broadcaster = broadcast.MessageBroadcaster()
+
+        self.conn = sqlite3.connect(self.db_path)
+        self.addCleanup(self.conn.close)
+        self.conn.executescript(setup.SCHEMA_SQL)
+
+    def _insert(self, content, user_id="u"):
+        cur = self.conn.execute(
+            "INSERT INTO user_messages (user_id, platform, role, content) VALUES (?, 'api', 'user', ?)",
+            (user_id, content),
+        )
+        self.conn.commit()
+        return cur.lastrowid
+
+    def _run(self, scenario):
+        async def main():
+            subscriptions = []
+            try:
+                await scenario(subscriptions)
+                # Let the call_soon_threadsafe deliveries run
+                await asyncio.sleep(0)
+                return [[message.id for message in sub.queue._queue] for sub in subscriptions]
+            finally:
+                for sub in subscriptions:
+                    self.broadcaster.unsubscribe(sub)
+
+        return asyncio.run(main())
+
+    def test_rows_published_out_of_order_are_delivered_in_order(self):
+        first = self._insert("one")
+        second = self._insert("two")
+
+        async def scenario(subscriptions):
+            subscriptions.append(self.broadcaster.subscribe("u", first - 1))
+            # The handler that committed `second` publishes before the one that committed `first`
+            self.broadcaster.publish_rows(self.conn, "u", [second])
+            self.broadcaster.publish_rows(self.conn, "u", [first])
+
+        self.assertEqual(self._run(scenario), [[first, second]])
+
+    def test_late_subscriber_does_not_hide_rows_from_earlier_ones(self):
+        existing = self._insert("seen")
+        committed = self._insert("committed, not yet published")
+
+        async def scenario(subscriptions):
+            subscriptions.append(self.broadcaster.subscribe("u", existing))
+            subscriptions.append(self.broadcaster.subscribe("u", committed))
+            self.broadcaster.publish_rows(self.conn, "u", [committed])
+
+        self.assertEqual(self._run(scenario), [[committed], []])
+
+    def test_other_users_rows_are_not_delivered(self):
+        self._insert("other user", user_id="v")
+        own = self._insert("own")
+
+        async def scenario(subscriptions):
+            subscriptions.append(self.broadcaster.subscribe("u", 0))
+            self.broadcaster.publish_rows(self.conn, "u", [own])
+
+        self.assertEqual(self._run(scenario), [[own]])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+import importlib.util
+import os
+import sqlite3
+import sys
+import tempfile
+import types
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+LEDGER_APP = ROOT / "services" / "ledger" / "app"
+BUFFER_CACHE_PATH = LEDGER_APP / "services" / "sync" / "buffer_cache.py"
+SETUP_PATH = LEDGER_APP / "setup.py"
+
+TOKENIZER = "cl100k_base"
+
+
+def _load_module(name, path, stubs):
+    original_modules = {key: sys.modules.get(key) for key in stubs}
+    sys.modules.update(stubs)
+
+    try:
+        spec = importlib.util.spec_from_file_location(name, path)
+        module = importlib.util.module_from_spec(spec)
+        assert spec.loader is not None
+        spec.loader.exec_module(module)
+        return module
+    finally:
+        for key, original in original_modules.items():
+            if original is None:
+                sys.modules.pop(key, None)
+            else:
+                sys.modules[key] = original
+
+
+def _store_message_tokens(cur, row_ids):
+    """Stand-in for the tiktoken counter: one token per character."""
+    placeholders = ",".join("?" for _ in row_ids)
+    cur.execute(
+        f"INSERT OR REPLACE INTO user_message_tokens (message_id, tokenizer, tokens) "
+        f"SELECT id, ?, LENGTH(content) FROM user_messages WHERE id IN ({placeholders})",
+        [TOKENIZER, *row_ids],
+    )
+
+
+def _load_modules(db_path):
+    logger = types.SimpleNamespace(
+        debug=lambda *a, **k: None,
+        info=lambda *a, **k: None,
+        warning=lambda *a, **k: None,
+        error=lambda *a, **k: None,
+    )
+
+    log_config_module = types.ModuleType("shared.log_config")
+    tokens_module = types.ModuleType("app.services.user.tokens")
+    util_module = types.ModuleType("app.util")
+
+    log_config_module.get_logger = lambda _name: logger
+    tokens_module._backfill_message_tokens = lambda _conn: None
+    tokens_module.BUFFER_TOKENIZER = TOKENIZER
+    tokens_module.TOKENS_TABLE = "user_message_tokens"
+    tokens_module._store_message_tokens = _store_message_tokens
+    util_module._open_conn = lambda: sqlite3.connect(db_path)
+    util_module._load_config = lambda: {"db": {"ledger": db_path}}
+
+    setup = _load_module("ledger_setup_test_module", SETUP_PATH, {
+        "shared.log_config": log_config_module,
+        "app.services.user.tokens": tokens_module,
+        "app.util": util_module,
+    })
+    buffer_cache = _load_module("ledger_buffer_cache_test_module", BUFFER_CACHE_PATH, {
+        "shared.log_config": log_config_module,
+        "app.services.user.tokens": tokens_module,
+        "app.util": util_module,
+    })
+    return setup, buffer_cache
+
+
+class ConversationBufferCacheTests(unittest.TestCase):
+    def setUp(self):
+        handle, self.db_path = tempfile.mkstemp(suffix=".db")
+        os.close(handle)
+        self.addCleanup(os.remove, self.db_path)
+        setup, buffer_cache = _load_modules(self.db_path)
+        self.cache = buffer_cache.ConversationBufferCache()
+
+        self.conn = sqlite3.connect(self.db_path)
+        self.addCleanup(self.conn.close)
+        self.conn.executescript(setup.SCHEMA_SQL)
+
+    def _insert(self, content, tokens=10, user_id="u", conn=None):
+        conn = conn or self.conn
+        cur = conn.execute(
+            "INSERT INTO user_messages (user_id, platform, role, content) VALUES (?, 'api', 'user', ?)",
+            (user_id, content),
+        )
+        if tokens is not None:
+            conn.execute(
+                "INSERT INTO user_message_tokens (message_id, tokenizer, tokens) VALUES (?, ?, ?)",
+                (cur.lastrowid, TOKENIZER, tokens),
+            )
+        conn.commit()
+        return cur.lastrowid
+
+    def _get(self, token_limit=100):
+        return [message.content for message in self.cache.get("u", token_limit)]
+
+    def test_load_keeps_newest_rows_that_fit(self):
+        for content in ("one", "two", "three"):
+            self._insert(content, tokens=40)
+
+        self.assertEqual(self._get(), ["two", "three"])
+        self.assertEqual(self.cache.misses, 1)
+
+    def test_record_insert_appends_and_trims(self):
+        self._insert("one", tokens=40)
+        self._insert("two", tokens=40)
+        self.assertEqual(self._get(), ["one", "two"])
+
+        row_id = self._insert("three", tokens=40)
+        self.cache.record_insert(self.conn, "u", [row_id])
+
+        self.assertEqual(self._get(), ["two", "three"])
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+
+    def test_inserts_recorded_out_of_order_are_all_appended(self):
+        self._insert("one")
+        self._get()
+
+        first = self._insert("two")
+        second = self._insert("three")
+        # The handler that committed `second` records it before the one that committed `first`
+        self.cache.record_insert(self.conn, "u", [second])
+        self.cache.record_insert(self.conn, "u", [first])
+
+        self.assertEqual(self._get(), ["one", "two", "three"])
+
+    def test_rows_without_stored_counts_are_counted(self):
+        self._insert("x" * 70, tokens=None)
+        self._insert("two", tokens=40)
+        self.assertEqual(self._get(), ["two"])
+
+        with sqlite3.connect(self.db_path) as other:
+            self._insert("y" * 30, tokens=None, conn=other)
+        self.assertEqual(self._get(), ["two", "y" * 30])
+
+        with sqlite3.connect(self.db_path) as conn:
+            stored = dict(conn.execute("SELECT message_id, tokens FROM user_message_tokens"))
+        self.assertEqual(sorted(stored.values()), [30, 40, 70])
+
+    def test_invalidate_reloads_on_next_read(self):
+        row_id = self._insert("one")
+        self._get()
+
+        self.conn.execute("UPDATE user_messages SET content = 'edited' WHERE id = ?", (row_id,))
+        self.conn.commit()
+        self.cache.invalidate("u")
+
+        self.assertEqual(self._get(), ["edited"])
+        self.assertEqual(self.cache.misses, 2)
+
+    def test_changed_token_limit_reloads(self):
+        self._insert("one", tokens=40)
+        self._insert("two", tokens=40)
+        self._get()
+
+        self.assertEqual(self._get(token_limit=50), ["two"])
+        self.assertEqual(self.cache.misses, 2)
+
+    def test_rows_inserted_by_another_process_are_picked_up(self):
+        self._insert("one")
+        self._get()
+
+        with sqlite3.connect(self.db_path) as other:
+            self._insert("two", conn=other)
+
+        self.assertEqual(self._get(), ["one", "two"])
+        self.assertEqual(self.cache.hits, 1)
+
+    def test_rows_edited_or_deleted_by_another_process_reload_the_entry(self):
+        first = self._insert("one")
+        second = self._insert("two")
+        self._get()
+
+        with sqlite3.connect(self.db_path) as other:
+            other.execute("DELETE FROM user_messages WHERE id = ?", (first,))
+        self.assertEqual(self._get(), ["two"])
+
+        with sqlite3.connect(self.db_path) as other:
+            other.execute("UPDATE user_messages SET content = 'edited' WHERE id = ?", (second,))
+        self.assertEqual(self._get(), ["edited"])
+        self.assertEqual(self.cache.misses, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
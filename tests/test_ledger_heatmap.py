@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+import os
+import sqlite3
+import sys
+import tempfile
+import types
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+LEDGER_APP = ROOT / "services" / "ledger" / "app"
+HEATMAP_PATH = LEDGER_APP / "services" / "context" / "heatmap.py"
+SETUP_PATH = LEDGER_APP / "setup.py"
+
+
+def _load_module(name, path, stubs):
+    original_modules = {key: sys.modules.get(key) for key in stubs}
+    sys.modules.update(stubs)
+
+    try:
+        spec = importlib.util.spec_from_file_location(name, path)
+        module = importlib.util.module_from_spec(spec)
+        assert spec.loader is not None
+        spec.loader.exec_module(module)
+        return module
+    finally:
+        for key, original in original_modules.items():
+            if original is None:
+                sys.modules.pop(key, None)
+            else:
+                sys.modules[key] = original
+
+
+def _load_modules(db_path):
+    logger = types.SimpleNamespace(
+        debug=lambda *a, **k: None,
+        info=lambda *a, **k: None,
+        warning=lambda *a, **k: None,
+        error=lambda *a, **k: None,
+    )
+
+    log_config_module = types.ModuleType("shared.log_config")
+    tokens_module = types.ModuleType("app.services.user.tokens")
+    util_module = types.ModuleType("app.util")
+
+    log_config_module.get_logger = lambda _name: logger
+    tokens_module._backfill_message_tokens = lambda _conn: None
+    util_module._open_conn = lambda: sqlite3.connect(db_path)
+    util_module._load_config = lambda: {"ledger": {"heatmap_decay": "eager"}}
+
+    setup = _load_module("ledger_setup_test_module", SETUP_PATH, {
+        "shared.log_config": log_config_module,
+        "app.services.user.tokens": tokens_module,
+        "app.util": util_module,
+    })
+    heatmap = _load_module("ledger_heatmap_test_module", HEATMAP_PATH, {
+        "shared.log_config": log_config_module,
+        "app.util": util_module,
+    })
+    return setup, heatmap
+
+
+class IncrementalMemoryScoreTests(unittest.TestCase):
+    def setUp(self):
+        handle, self.db_path = tempfile.mkstemp(suffix=".db")
+        os.close(handle)
+        self.addCleanup(os.remove, self.db_path)
+        setup, self.heatmap = _load_modules(self.db_path)
+
+        with sqlite3.connect(self.db_path) as conn:
+            conn.executescript(setup.SCHEMA_SQL)
+
+    def _add_memory(self, memory_id, *tags):
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute("INSERT INTO memories (id, memory, created_at) VALUES (?, ?, '2026-01-01')", (memory_id, memory_id))
+            conn.executemany("INSERT INTO memory_tags (memory_id, tag) VALUES (?, ?)", [(memory_id, tag) for tag in tags])
+
+    def _update(self, keywords):
+        return asyncio.run(self.heatmap.update_heatmap(keywords))
+
+    def _memory_scores(self):
+        with sqlite3.connect(self.db_path) as conn:
+            return dict(conn.execute("SELECT memory_id, score FROM heatmap_memories"))
+
+    def _full_rescore(self):
+        with sqlite3.connect(self.db_path) as conn:
+            asyncio.run(self.heatmap._recalculate_memory_scores(conn.cursor()))
+        return self._memory_scores()
+
+    def test_new_memory_with_hot_tag_gets_full_score(self):
+        self._add_memory("old", "cooking")
+        self._update({"cooking": "high"})
+
+        self._add_memory("new", "cooking", "travel")
+        self._update({"travel": "low"})
+
+        incremental = self._memory_scores()
+        expected = self._full_rescore()
+        self.assertEqual(set(incremental), {"old", "new"})
+        for memory_id, score in expected.items():
+            self.assertAlmostEqual(incremental[memory_id], score)
+
+    def test_scored_memories_follow_keyword_deltas(self):
+        self._add_memory("a", "cooking", "travel")
+        self._add_memory("b", "travel")
+        self._update({"cooking": "high", "travel": "medium"})
+        self._update({"travel": "high"})
+        self._update({"work": "low"})
+
+        incremental = self._memory_scores()
+        expected = self._full_rescore()
+        self.assertEqual(set(incremental), set(expected))
+        for memory_id, score in expected.items():
+            self.assertAlmostEqual(incremental[memory_id], score)
+
+
+if __name__ == "__main__":
+    unittest.main()
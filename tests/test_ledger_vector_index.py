@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import importlib.util
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import types
+import unittest
+from pathlib import Path
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+ROOT = Path(__file__).resolve().parents[1]
+LEDGER_APP = ROOT / "services" / "ledger" / "app"
+INDEX_PATH = LEDGER_APP / "services" / "embedding" / "index.py"
+SETUP_PATH = LEDGER_APP / "setup.py"
+
+MODEL = "test-model"
+
+
+class FakeEmbeddingStore:
+    """Embedding store serving the vectors already written to the embeddings table."""
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+
+    def model_name(self):
+        return MODEL
+
+    def get_vectors(self, entity_type, texts):
+        with sqlite3.connect(self.db_path) as conn:
+            return {
+                entity_id: np.frombuffer(vector, dtype=np.float32)
+                for entity_id, vector in conn.execute(
+                    "SELECT entity_id, vector FROM embeddings WHERE entity_type = ? AND model = ?",
+                    (entity_type, MODEL),
+                )
+                if entity_id in texts
+            }
+
+
+def _load_module(name, path, stubs):
+    original_modules = {key: sys.modules.get(key) for key in stubs}
+    sys.modules.update(stubs)
+
+    try:
+        spec = importlib.util.spec_from_file_location(name, path)
+        module = importlib.util.module_from_spec(spec)
+        assert spec.loader is not None
+        spec.loader.exec_module(module)
+        return module
+    finally:
+        for key, original in original_modules.items():
+            if original is None:
+                sys.modules.pop(key, None)
+            else:
+                sys.modules[key] = original
+
+
+def _load_modules(db_path, index_dir):
+    logger = types.SimpleNamespace(
+        debug=lambda *a, **k: None,
+        info=lambda *a, **k: None,
+        warning=lambda *a, **k: None,
+        error=lambda *a, **k: None,
+    )
+
+    log_config_module = types.ModuleType("shared.log_config")
+    tokens_module = types.ModuleType("app.services.user.tokens")
+    store_module = types.ModuleType("app.services.embedding.store")
+    util_module = types.ModuleType("app.util")
+
+    log_config_module.get_logger = lambda _name: logger
+    tokens_module._backfill_message_tokens = lambda _conn: None
+    store_module.EMBEDDINGS_AVAILABLE = True
+    store_module.TABLE = "embeddings"
+    store_module.embedding_setting = lambda key, default: {"index_dir": index_dir}.get(key, default)
+    store_module.embedding_store = FakeEmbeddingStore(db_path)
+    util_module._open_conn = lambda: sqlite3.connect(db_path)
+    util_module._load_config = lambda: {"db": {"ledger": db_path}}
+
+    setup = _load_module("ledger_setup_test_module", SETUP_PATH, {
+        "shared.log_config": log_config_module,
+        "app.services.user.tokens": tokens_module,
+        "app.util": util_module,
+    })
+    index = _load_module("ledger_vector_index_test_module", INDEX_PATH, {
+        "shared.log_config": log_config_module,
+        "app.services.embedding.store": store_module,
+        "app.util": util_module,
+    })
+    return setup, index
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class RestrictedTopicSearchTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp)
+        self.db_path = os.path.join(self.tmp, "ledger.db")
+        setup, self.index = _load_modules(self.db_path, os.path.join(self.tmp, "vector_index"))
+
+        with sqlite3.connect(self.db_path) as conn:
+            conn.executescript(setup.SCHEMA_SQL)
+
+        # "cooking" and "recipes" are similar; the empty topics sit even closer to "cooking"
+        base = np.array([1.0, 0.0, 0.0, 0.0])
+        self._store("cooking", base)
+        self._store("recipes", base + np.array([0.0, 0.5, 0.0, 0.0]))
+        self._store("travel", np.array([0.0, 0.0, 1.0, 0.0]))
+        for n in range(5):
+            self._store(f"empty-{n}", base + np.array([0.0, 0.0, 0.0, 0.05 * (n + 1)]))
+
+    def _store(self, topic_id, vector):
+        vector = (vector / np.linalg.norm(vector)).astype(np.float32)
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute(
+                "INSERT INTO embeddings (entity_type, entity_id, model, content_hash, dim, vector) "
+                "VALUES ('topic', ?, ?, '', ?, ?)",
+                (topic_id, MODEL, len(vector), vector.tobytes()),
+            )
+
+    def _query(self, topic_id):
+        return FakeEmbeddingStore(self.db_path).get_vectors("topic", {topic_id: ""})[topic_id]
+
+    def test_unrestricted_search_returns_nearest_topics(self):
+        hits = self.index.vector_indexes["topic"].search(self._query("cooking"), k=2, exclude=[{"cooking"}])
+
+        self.assertEqual([topic_id for topic_id, _ in hits[0]], ["empty-0", "empty-1"])
+
+    def test_allow_restricts_search_to_candidates(self):
+        hits = self.index.vector_indexes["topic"].search(
+            self._query("cooking"), k=2, exclude=[{"cooking"}], allow={"cooking", "recipes", "travel"},
+        )
+
+        self.assertEqual([topic_id for topic_id, _ in hits[0]], ["recipes", "travel"])
+
+    def test_neighbours_among_candidates_found_past_nearer_empty_topics(self):
+        neighbours = self.index.vector_indexes["topic"].neighbours(
+            {name: name for name in ("cooking", "recipes", "travel")}, k=2, min_score=0.8, among=True,
+        )
+
+        self.assertEqual([topic_id for topic_id, _ in neighbours["cooking"]], ["recipes"])
+        self.assertEqual(neighbours["travel"], [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+import sys
+import types
+import unittest
+from pathlib import Path
+
+from fastapi import HTTPException
+
+ROOT = Path(__file__).resolve().parents[1]
+QUEUE_PATH = ROOT / "services" / "proxy" / "app" / "services" / "queue.py"
+
+
+def _load_module(name, path, stubs):
+    original_modules = {key: sys.modules.get(key) for key in stubs}
+    sys.modules.update(stubs)
+
+    try:
+        spec = importlib.util.spec_from_file_location(name, path)
+        module = importlib.util.module_from_spec(spec)
+        assert spec.loader is not None
+        spec.loader.exec_module(module)
+        return module
+    finally:
+        for key, original in original_modules.items():
+            if original is None:
+                sys.modules.pop(key, None)
+            else:
+                sys.modules[key] = original
+
+
+def _load_queue_module(queue_config):
+    logger = types.SimpleNamespace(
+        debug=lambda *a, **k: None,
+        info=lambda *a, **k: None,
+        warning=lambda *a, **k: None,
+        error=lambda *a, **k: None,
+    )
+
+    log_config_module = types.ModuleType("shared.log_config")
+    config_store_module = types.ModuleType("shared.config_store")
+
+    log_config_module.get_logger = lambda _name: logger
+    config_store_module.config_store = types.SimpleNamespace(config={"proxy": {"queue": queue_config}})
+
+    return _load_module("proxy_queue_test_module", QUEUE_PATH, {
+        "shared.log_config": log_config_module,
+        "shared.config_store": config_store_module,
+    })
+
+
+class DispatchQueueTests(unittest.TestCase):
+    def setUp(self):
+        self.queue_module = _load_queue_module({"max_concurrency": 1, "max_queue_depth": 2})
+        self.dispatch = self.queue_module.DispatchQueue()
+
+    def _run(self, scenario):
+        return asyncio.run(scenario())
+
+    async def _hold(self, provider, priority, order, release):
+        async with self.dispatch.slot(provider, priority):
+            order.append(priority)
+            await release.wait()
+
+    async def _settle(self):
+        for _ in range(5):
+            await asyncio.sleep(0)
+
+    def test_freed_slot_goes_to_best_priority_then_oldest(self):
+        async def scenario():
+            order = []
+            release = asyncio.Event()
+            release.set()
+            running = asyncio.Event()
+
+            async def first():
+                async with self.dispatch.slot("ollama", "batch"):
+                    order.append("first")
+                    await running.wait()
+
+            holder = asyncio.create_task(first())
+            await self._settle()
+            waiters = [
+                asyncio.create_task(self._hold("ollama", priority, order, release))
+                for priority in ("batch", "interactive")
+            ]
+            await self._settle()
+            running.set()
+            await asyncio.gather(holder, *waiters)
+            return order
+
+        self.assertEqual(self._run(scenario), ["first", "interactive", "batch"])
+
+    def test_full_queue_sheds_lower_priority_waiter(self):
+        async def scenario():
+            order = []
+            release = asyncio.Event()
+            holder = asyncio.create_task(self._hold("ollama", "interactive", order, release))
+            await self._settle()
+            batch = [asyncio.create_task(self._hold("ollama", "batch", order, release)) for _ in range(2)]
+            await self._settle()
+
+            interactive = asyncio.create_task(self._hold("ollama", "interactive", order, release))
+            await self._settle()
+            release.set()
+            results = await asyncio.gather(holder, *batch, interactive, return_exceptions=True)
+            return order, results, self.dispatch.stats()["ollama"]
+
+        order, results, stats = self._run(scenario)
+
+        # The newest batch waiter made room for the interactive request
+        self.assertIsInstance(results[2], HTTPException)
+        self.assertEqual(order, ["interactive", "interactive", "batch"])
+        self.assertEqual(stats["rejected"], {"interactive": 0, "router": 0, "batch": 1})
+
+    def test_full_queue_answers_503_with_retry_after(self):
+        async def scenario():
+            order = []
+            release = asyncio.Event()
+            holder = asyncio.create_task(self._hold("ollama", "batch", order, release))
+            await self._settle()
+            waiters = [asyncio.create_task(self._hold("ollama", "interactive", order, release)) for _ in range(2)]
+            await self._settle()
+
+            try:
+                async with self.dispatch.slot("ollama", "batch"):
+                    self.fail("a full queue must not admit another request")
+            except HTTPException as e:
+                rejection = e
+            finally:
+                release.set()
+                await asyncio.gather(holder, *waiters)
+            return rejection
+
+        rejection = self._run(scenario)
+
+        self.assertEqual(rejection.status_code, 503)
+        self.assertEqual(rejection.headers, {"Retry-After": str(self.queue_module.RETRY_AFTER_S)})
+
+    def test_cancelled_waiter_leaves_the_queue(self):
+        async def scenario():
+            order = []
+            release = asyncio.Event()
+            holder = asyncio.create_task(self._hold("ollama", "batch", order, release))
+            await self._settle()
+            waiter = asyncio.create_task(self._hold("ollama", "batch", order, release))
+            await self._settle()
+
+            waiter.cancel()
+            await self._settle()
+            depth = self.dispatch.stats()["ollama"]["depth"]
+            release.set()
+            await holder
+            return depth, order, self.dispatch.stats()["ollama"]
+
+        depth, order, stats = self._run(scenario)
+
+        self.assertEqual(depth, 0)
+        self.assertEqual(order, ["batch"])
+        self.assertEqual((stats["active"], stats["cancelled"]), (0, 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
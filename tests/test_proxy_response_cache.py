@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+import sys
+import types
+import unittest
+from pathlib import Path
+from typing import Optional
+
+from pydantic import BaseModel
+
+ROOT = Path(__file__).resolve().parents[1]
+RESPONSE_CACHE_PATH = ROOT / "services" / "proxy" / "app" / "services" / "response_cache.py"
+
+
+class ProxyResponse(BaseModel):
+    """The ProxyResponse fields the cache reads; shared.models.proxy needs config.json at import."""
+
+    response: Optional[str] = None
+    tool_calls: Optional[list] = None
+    function_call: Optional[dict] = None
+    eval_count: Optional[int] = None
+    prompt_eval_count: Optional[int] = None
+    timestamp: Optional[str] = None
+
+
+def _load_module(name, path, stubs):
+    original_modules = {key: sys.modules.get(key) for key in stubs}
+    sys.modules.update(stubs)
+
+    try:
+        spec = importlib.util.spec_from_file_location(name, path)
+        module = importlib.util.module_from_spec(spec)
+        assert spec.loader is not None
+        spec.loader.exec_module(module)
+        return module
+    finally:
+        for key, original in original_modules.items():
+            if original is None:
+                sys.modules.pop(key, None)
+            else:
+                sys.modules[key] = original
+
+
+def _load_cache_module(modes):
+    logger = types.SimpleNamespace(
+        debug=lambda *a, **k: None,
+        info=lambda *a, **k: None,
+        warning=lambda *a, **k: None,
+        error=lambda *a, **k: None,
+    )
+
+    log_config_module = types.ModuleType("shared.log_config")
+    config_store_module = types.ModuleType("shared.config_store")
+    proxy_models_module = types.ModuleType("shared.models.proxy")
+    util_module = types.ModuleType("app.services.util")
+
+    log_config_module.get_logger = lambda _name: logger
+    config_store_module.config_store = types.SimpleNamespace(config={})
+    proxy_models_module.ProxyResponse = ProxyResponse
+    util_module._get_mode_config = lambda mode: modes[mode]
+
+    return _load_module("proxy_response_cache_test_module", RESPONSE_CACHE_PATH, {
+        "shared.log_config": log_config_module,
+        "shared.config_store": config_store_module,
+        "shared.models.proxy": proxy_models_module,
+        "app.services.util": util_module,
+    })
+
+
+class ResponseCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.module = _load_cache_module({
+            "router": {"cache": {"enabled": True}},
+            "forced": {"cache": {"enabled": True, "force": True}},
+            "chat": {},
+        })
+        self.cache = self.module.ResponseCache()
+        self.calls = []
+
+    def _dispatcher(self, text="ok", delay=0.0):
+        async def dispatch():
+            self.calls.append(text)
+            await asyncio.sleep(delay)
+            return ProxyResponse(response=text, eval_count=3, prompt_eval_count=7)
+        return dispatch
+
+    def _call(self, prompt="hello", mode="router", model="gpt-4.1-nano", options=None, text="ok"):
+        options = {"temperature": 0} if options is None else options
+        return asyncio.run(self.cache.get_or_dispatch(
+            mode, "openai", model, options, prompt, self._dispatcher(text),
+        ))
+
+    def test_identical_calls_are_served_from_the_cache(self):
+        first = self._call(text="first")
+        second = self._call(text="second")
+
+        self.assertEqual((first.response, second.response), ("first", "first"))
+        self.assertEqual(self.calls, ["first"])
+        stats = self.cache.stats()
+        self.assertEqual((stats["memory_hits"], stats["misses"], stats["saved_tokens"]), (1, 1, 10))
+
+    def test_key_covers_prompt_model_and_options(self):
+        self._call()
+        self._call(prompt="goodbye")
+        self._call(model="gpt-4.1-mini")
+        self._call(options={"temperature": 0, "max_tokens": 10})
+
+        self.assertEqual(len(self.calls), 4)
+        self.assertEqual(
+            self.module._cache_key("openai", "m", {"a": 1, "b": 2}, "p"),
+            self.module._cache_key("openai", "m", {"b": 2, "a": 1}, "p"),
+        )
+
+    def test_non_zero_or_missing_temperature_bypasses_the_cache(self):
+        for options in ({"temperature": 0.7}, {}, {"temperature": 0.7}, {}):
+            self._call(options=options)
+        self._call(mode="chat")
+
+        self.assertEqual(len(self.calls), 5)
+        self.assertEqual(self.cache.stats()["bypassed"], 5)
+
+    def test_force_caches_regardless_of_temperature(self):
+        self._call(mode="forced", options={"temperature": 0.7})
+        self._call(mode="forced", options={"temperature": 0.7})
+
+        self.assertEqual(len(self.calls), 1)
+
+    def test_concurrent_misses_share_one_provider_call(self):
+        async def scenario():
+            return await asyncio.gather(*(
+                self.cache.get_or_dispatch(
+                    "router", "openai", "gpt-4.1-nano", {"temperature": 0}, "hello",
+                    self._dispatcher(f"call-{n}", delay=0.01),
+                )
+                for n in range(3)
+            ))
+
+        responses = asyncio.run(scenario())
+
+        self.assertEqual(self.calls, ["call-0"])
+        self.assertEqual([response.response for response in responses], ["call-0"] * 3)
+        self.assertEqual(self.cache.stats()["coalesced"], 2)
+
+    def test_failed_call_is_not_cached_and_reaches_coalesced_waiters(self):
+        async def failing():
+            self.calls.append("failing")
+            await asyncio.sleep(0.01)
+            raise RuntimeError("provider down")
+
+        async def scenario():
+            return await asyncio.gather(*(
+                self.cache.get_or_dispatch("router", "openai", "gpt-4.1-nano", {"temperature": 0}, "hello", failing)
+                for _ in range(2)
+            ), return_exceptions=True)
+
+        results = asyncio.run(scenario())
+
+        self.assertTrue(all(isinstance(result, RuntimeError) for result in results))
+        self.assertEqual(self.calls, ["failing"])
+        self.assertEqual(self._call(text="recovered").response, "recovered")
+
+
+if __name__ == "__main__":
+    unittest.main()